@@ -1,6 +1,7 @@
 """Loader utilities for model weights, LoRAs, and safetensor operations."""
 
 from ltx_core.loader.fuse_loras import apply_loras
+from ltx_core.loader.lora_adapters import LoraAdapters
 from ltx_core.loader.module_ops import ModuleOps
 from ltx_core.loader.primitives import (
     LoRAAdaptableProtocol,
@@ -31,6 +32,7 @@ __all__ = [
     "KeyValueOperation",
     "KeyValueOperationResult",
     "LoRAAdaptableProtocol",
+    "LoraAdapters",
     "LoraPathStrengthAndSDOps",
     "LoraStateDictWithStrength",
     "ModelBuilderProtocol",
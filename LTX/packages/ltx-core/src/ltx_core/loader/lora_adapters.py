@@ -0,0 +1,144 @@
+import itertools
+import weakref
+from collections.abc import Hashable
+
+import torch
+
+from ltx_core.loader.primitives import LoraStateDictWithStrength
+
+ADAPTERS_ATTR = "_ltx_lora_adapters"
+
+
+class LoraAdapters(torch.nn.Module):
+    """
+    Switchable, unfused LoRA deltas on a resident model.
+    Instead of fusing ``B @ A * strength`` into the weights (see :func:`~ltx_core.loader.fuse_loras.apply_loras`),
+    each adapter keeps its low-rank factors and adds ``strength * (x @ A.T) @ B.T`` to the output of the
+    targeted linear layers through forward hooks. Switching the active adapters only re-registers hooks,
+    so one set of base weights serves several LoRA configurations (e.g. the stage 1 and stage 2
+    transformers of a two-stage pipeline) and moving between them takes milliseconds. Base weights are
+    never modified, so switching is exact and reversible, including for FP8 base weights.
+    Adapters are registered under a name (:meth:`add`) once and activated by name (:meth:`activate`).
+    LoRA keys follow the fusing convention: ``<module>.lora_A.weight`` / ``<module>.lora_B.weight`` target
+    the layer whose weight is ``<module>.weight`` in the model state dict.
+    The adapters are a submodule of the model and keep their factors as (non-persistent) buffers, so
+    ``model.to(...)`` moves them along with the base weights and they count towards the model's size.
+    """
+
+    def __init__(self, model: torch.nn.Module):
+        super().__init__()
+        # Weak: the model owns its adapters, a strong reference back would be a cycle through the module tree.
+        self._model = weakref.ref(model)
+        # Adapter name -> targeted module -> buffer names of its (A, B) factor pairs
+        self._factors: dict[str, dict[str, list[tuple[str, str]]]] = {}
+        self._buffer_ids = itertools.count()
+        self._active: tuple[str, ...] = ()
+        self._hooks: list[torch.utils.hooks.RemovableHandle] = []
+        # Identifies the base weights the adapters apply to (set by whoever built the model)
+        self.base: Hashable | None = None
+
+    @staticmethod
+    def of(model: torch.nn.Module) -> "LoraAdapters":
+        """The adapters attached to ``model``, attaching an empty set on first use."""
+        adapters = getattr(model, ADAPTERS_ATTR, None)
+        if adapters is None:
+            adapters = LoraAdapters(model)
+            setattr(model, ADAPTERS_ATTR, adapters)
+        return adapters
+
+    @property
+    def model(self) -> torch.nn.Module:
+        model = self._model()
+        if model is None:
+            raise RuntimeError("The model these LoRA adapters belong to was released")
+        return model
+
+    @property
+    def active(self) -> tuple[str, ...]:
+        return self._active
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._factors
+
+    def add(
+        self,
+        name: str,
+        lora_sd_and_strengths: list[LoraStateDictWithStrength],
+        dtype: torch.dtype,
+        device: torch.device,
+    ) -> None:
+        """Register LoRAs as adapter ``name`` (inactive until :meth:`activate`)."""
+        if name in self._factors:
+            self._drop_buffers(name)
+        modules = dict(self.model.named_modules())
+        factors: dict[str, list[tuple[str, str]]] = {}
+        for lsd, strength in lora_sd_and_strengths:
+            for key, lora_a in lsd.sd.items():
+                if not key.endswith(".lora_A.weight"):
+                    continue
+                prefix = key[: -len(".lora_A.weight")]
+                lora_b = lsd.sd.get(f"{prefix}.lora_B.weight")
+                if lora_b is None:
+                    continue
+                module = modules.get(prefix)
+                if module is None or getattr(module, "weight", None) is None or module.weight.dim() != 2:
+                    raise ValueError(f"LoRA key {key} does not target a linear layer of the model")
+                factors.setdefault(prefix, []).append(
+                    (
+                        self._add_buffer(lora_a.to(dtype=dtype, device=device)),
+                        self._add_buffer((lora_b * strength).to(dtype=dtype, device=device)),
+                    )
+                )
+        self._factors[name] = factors
+        if name in self._active:
+            self.activate(*self._active)
+
+    def remove(self, name: str) -> None:
+        if name in self._active:
+            self.activate(*(n for n in self._active if n != name))
+        if name in self._factors:
+            self._drop_buffers(name)
+            del self._factors[name]
+
+    def activate(self, *names: str) -> None:
+        """Make exactly ``names`` active (none: the plain base model)."""
+        missing = [name for name in names if name not in self._factors]
+        if missing:
+            raise KeyError(f"Unknown LoRA adapters: {missing}")
+        for handle in self._hooks:
+            handle.remove()
+        self._hooks = []
+
+        per_module: dict[str, list[tuple[str, str]]] = {}
+        for name in names:
+            for prefix, pairs in self._factors[name].items():
+                per_module.setdefault(prefix, []).extend(pairs)
+        modules = dict(self.model.named_modules())
+        for prefix, pairs in per_module.items():
+            self._hooks.append(modules[prefix].register_forward_hook(_lora_hook(self._buffers, pairs)))
+        self._active = tuple(names)
+
+    def _add_buffer(self, tensor: torch.Tensor) -> str:
+        buffer_name = f"factor_{next(self._buffer_ids)}"
+        self.register_buffer(buffer_name, tensor, persistent=False)
+        return buffer_name
+
+    def _drop_buffers(self, name: str) -> None:
+        for pairs in self._factors[name].values():
+            for buffer_names in pairs:
+                for buffer_name in buffer_names:
+                    del self._buffers[buffer_name]
+
+
+def _lora_hook(buffers: dict[str, torch.Tensor], pairs: list[tuple[str, str]]):  # noqa: ANN202
+    def hook(_module: torch.nn.Module, inputs: tuple[torch.Tensor, ...], output: torch.Tensor) -> torch.Tensor:
+        x = inputs[0]
+        # Factors are looked up on every call: moving the model replaces the buffer tensors
+        for name_a, name_b in pairs:
+            lora_a, lora_b = buffers[name_a], buffers[name_b]
+            output = output + torch.nn.functional.linear(
+                torch.nn.functional.linear(x.to(lora_a.dtype), lora_a), lora_b
+            ).to(output.dtype)
+        return output
+
+    return hook
@@ -0,0 +1,80 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from ltx_core.loader.lora_adapters import LoraAdapters  # noqa: E402
+from ltx_core.loader.primitives import LoraStateDictWithStrength, StateDict  # noqa: E402
+
+
+def _model() -> torch.nn.Module:
+    torch.manual_seed(0)
+    return torch.nn.Sequential(torch.nn.Linear(8, 8), torch.nn.ReLU(), torch.nn.Linear(8, 4))
+
+
+def _lora(target: str, rank: int = 2, out_features: int = 8, in_features: int = 8) -> StateDict:
+    sd = {
+        f"{target}.lora_A.weight": torch.randn(rank, in_features),
+        f"{target}.lora_B.weight": torch.randn(out_features, rank),
+    }
+    return StateDict(sd=sd, device=torch.device("cpu"), size=0, dtype={torch.float32})
+
+
+def _fused(model: torch.nn.Module, lora: StateDict, target: str, strength: float) -> torch.nn.Module:
+    """A copy of ``model`` with the LoRA delta ``strength * B @ A`` fused into the target weight."""
+    fused = _model()
+    fused.load_state_dict(model.state_dict())
+    delta = strength * lora.sd[f"{target}.lora_B.weight"] @ lora.sd[f"{target}.lora_A.weight"]
+    with torch.no_grad():
+        dict(fused.named_modules())[target].weight.add_(delta)
+    return fused
+
+
+def test_adapter_output_matches_fused_weights() -> None:
+    model = _model()
+    lora = _lora("0")
+    adapters = LoraAdapters.of(model)
+    adapters.add("style", [LoraStateDictWithStrength(lora, 0.5)], torch.float32, torch.device("cpu"))
+    x = torch.randn(3, 8)
+    base = model(x)
+
+    adapters.activate("style")
+    torch.testing.assert_close(model(x), _fused(model, lora, "0", 0.5)(x))
+    adapters.activate()
+    torch.testing.assert_close(model(x), base)
+
+
+def test_switching_adapters() -> None:
+    model = _model()
+    first, second = _lora("0"), _lora("2", out_features=4)
+    adapters = LoraAdapters.of(model)
+    cpu = torch.device("cpu")
+    adapters.add("first", [LoraStateDictWithStrength(first, 1.0)], torch.float32, cpu)
+    adapters.add("second", [LoraStateDictWithStrength(second, 1.0)], torch.float32, cpu)
+    x = torch.randn(3, 8)
+
+    adapters.activate("first")
+    torch.testing.assert_close(model(x), _fused(model, first, "0", 1.0)(x))
+    adapters.activate("second")
+    assert adapters.active == ("second",)
+    torch.testing.assert_close(model(x), _fused(model, second, "2", 1.0)(x))
+
+    adapters.remove("second")
+    assert "second" not in adapters
+    assert adapters.active == ()
+
+
+def test_factors_move_and_count_with_the_model() -> None:
+    model = _model()
+    base_bytes = sum(t.numel() * t.element_size() for t in model.buffers())
+    adapters = LoraAdapters.of(model)
+    adapters.add("style", [LoraStateDictWithStrength(_lora("0"), 1.0)], torch.float32, torch.device("cpu"))
+    adapters.activate("style")
+    x = torch.randn(3, 8)
+    expected = model(x)
+
+    # The factors are (non-persistent) buffers of the model: sized with it, moved by .to(), not saved
+    assert sum(t.numel() * t.element_size() for t in model.buffers()) - base_bytes == (2 * 8 + 8 * 2) * 4
+    assert not any("lora" in key or "factor" in key for key in model.state_dict())
+    model.to(torch.float64)
+    assert {t.dtype for t in adapters.buffers()} == {torch.float64}
+    torch.testing.assert_close(model(x.double()).float(), expected)
@@ -11,23 +11,25 @@ from ltx_core.model.audio_vae import decode_audio as vae_decode_audio
 from ltx_core.model.upsampler import upsample_video
 from ltx_core.model.video_vae import TilingConfig, get_video_chunks_number
 from ltx_core.model.video_vae import decode_video as vae_decode_video
-from ltx_core.text_encoders.gemma import encode_text
 from ltx_core.types import LatentState, VideoPixelShape
-from ltx_pipelines.utils import ModelLedger
+from ltx_pipelines.utils import ModelCache, ModelLedger
 from ltx_pipelines.utils.args import default_2_stage_distilled_arg_parser
 from ltx_pipelines.utils.constants import AUDIO_SAMPLE_RATE, DISTILLED_SIGMA_VALUES, STAGE_2_DISTILLED_SIGMA_VALUES
 from ltx_pipelines.utils.helpers import (
     assert_resolution,
     cleanup_memory,
-    denoise_audio_video,
+    denoise_audio_video_batch,
+    encode_prompts,
     euler_denoising_loop,
     generate_enhanced_prompt,
     get_device,
     image_conditionings_by_replacing_latent,
+    micro_batches,
     simple_denoising_func,
 )
 from ltx_pipelines.utils.media_io import encode_video
-from ltx_pipelines.utils.types import PipelineComponents
+from ltx_pipelines.utils.telemetry import record_metrics, stage
+from ltx_pipelines.utils.types import BatchItem, BatchOutput, DenoisingLoopFunc, PipelineComponents
 
 device = get_device()
 
@@ -37,6 +39,8 @@ class DistilledPipeline:
     Two-stage distilled video generation pipeline.
     Stage 1 generates video at the target resolution, then Stage 2 upsamples
     by 2x and refines with additional denoising steps for higher quality output.
+    Several generations (e.g. takes of a shot with different seeds) can share one call and its model
+    loads through :meth:`generate_batch`.
     """
 
     def __init__(
@@ -47,6 +51,7 @@ class DistilledPipeline:
         loras: list[LoraPathStrengthAndSDOps],
         device: torch.device = device,
         fp8transformer: bool = False,
+        model_cache: ModelCache | None = None,
     ):
         self.device = device
         self.dtype = torch.bfloat16
@@ -59,6 +64,7 @@ class DistilledPipeline:
             gemma_root_path=gemma_root,
             loras=loras,
             fp8transformer=fp8transformer,
+            cache=model_cache,
         )
 
         self.pipeline_components = PipelineComponents(
@@ -78,114 +84,188 @@ class DistilledPipeline:
         tiling_config: TilingConfig | None = None,
         enhance_prompt: bool = False,
     ) -> tuple[Iterator[torch.Tensor], torch.Tensor]:
-        assert_resolution(height=height, width=width, is_two_stage=True)
+        item = BatchItem(prompt=prompt, seed=seed, height=height, width=width, num_frames=num_frames, images=images)
+        (output,) = self.generate_batch(
+            [item], frame_rate=frame_rate, tiling_config=tiling_config, enhance_prompt=enhance_prompt
+        )
+        return output.video, output.audio
 
-        generator = torch.Generator(device=self.device).manual_seed(seed)
-        noiser = GaussianNoiser(generator=generator)
+    @torch.inference_mode()
+    def generate_batch(  # noqa: PLR0915
+        self,
+        items: list[BatchItem],
+        frame_rate: float,
+        tiling_config: TilingConfig | None = None,
+        enhance_prompt: bool = False,
+        max_batch_size: int = 4,
+    ) -> Iterator[BatchOutput]:
+        """
+        Generate several items (prompt, seed, shape and image conditionings each) in one call.
+        Every model is loaded once and every distinct prompt encoded once. Items of the same shape are
+        denoised and upsampled together, in micro-batches of up to ``max_batch_size``. Once all items are
+        denoised, their outputs are yielded one by one, in micro-batch order (see ``BatchOutput.index``).
+        """
+        for item in items:
+            assert_resolution(height=item.height, width=item.width, is_two_stage=True)
+        batches = micro_batches([item.shape for item in items], max_batch_size)
+        noisers = [
+            GaussianNoiser(generator=torch.Generator(device=self.device).manual_seed(item.seed)) for item in items
+        ]
         stepper = EulerDiffusionStep()
         dtype = torch.bfloat16
 
-        text_encoder = self.model_ledger.text_encoder()
-        if enhance_prompt:
-            prompt = generate_enhanced_prompt(text_encoder, prompt, images[0][0] if len(images) > 0 else None)
-        context_p = encode_text(text_encoder, prompts=[prompt])[0]
-        video_context, audio_context = context_p
+        with stage("model_load"):
+            text_encoder = self.model_ledger.text_encoder()
+        with stage("text_encode"):
+            prompts = [
+                generate_enhanced_prompt(text_encoder, item.prompt, item.images[0][0] if len(item.images) > 0 else None)
+                if enhance_prompt
+                else item.prompt
+                for item in items
+            ]
+            contexts = encode_prompts(text_encoder, prompts)
 
         torch.cuda.synchronize()
+        self.model_ledger.release(text_encoder)
         del text_encoder
         cleanup_memory()
 
         # Stage 1: Initial low resolution video generation.
-        video_encoder = self.model_ledger.video_encoder()
-        transformer = self.model_ledger.transformer()
+        with stage("model_load"):
+            video_encoder = self.model_ledger.video_encoder()
+            transformer = self.model_ledger.transformer()
         stage_1_sigmas = torch.Tensor(DISTILLED_SIGMA_VALUES).to(self.device)
 
-        def denoising_loop(
-            sigmas: torch.Tensor, video_state: LatentState, audio_state: LatentState, stepper: DiffusionStepProtocol
-        ) -> tuple[LatentState, LatentState]:
-            return euler_denoising_loop(
-                sigmas=sigmas,
-                video_state=video_state,
-                audio_state=audio_state,
-                stepper=stepper,
-                denoise_fn=simple_denoising_func(
-                    video_context=video_context,
-                    audio_context=audio_context,
-                    transformer=transformer,  # noqa: F821
-                ),
-            )
+        def denoising_loop_for(batch: list[int]) -> DenoisingLoopFunc:
+            video_context = torch.cat([contexts[prompts[i]][0] for i in batch])
+            audio_context = torch.cat([contexts[prompts[i]][1] for i in batch])
 
-        stage_1_output_shape = VideoPixelShape(
-            batch=1,
-            frames=num_frames,
-            width=width // 2,
-            height=height // 2,
-            fps=frame_rate,
-        )
-        stage_1_conditionings = image_conditionings_by_replacing_latent(
-            images=images,
-            height=stage_1_output_shape.height,
-            width=stage_1_output_shape.width,
-            video_encoder=video_encoder,
-            dtype=dtype,
-            device=self.device,
-        )
+            def denoising_loop(
+                sigmas: torch.Tensor, video_state: LatentState, audio_state: LatentState, stepper: DiffusionStepProtocol
+            ) -> tuple[LatentState, LatentState]:
+                return euler_denoising_loop(
+                    sigmas=sigmas,
+                    video_state=video_state,
+                    audio_state=audio_state,
+                    stepper=stepper,
+                    denoise_fn=simple_denoising_func(
+                        video_context=video_context,
+                        audio_context=audio_context,
+                        transformer=transformer,  # noqa: F821
+                    ),
+                )
 
-        video_state, audio_state = denoise_audio_video(
-            output_shape=stage_1_output_shape,
-            conditionings=stage_1_conditionings,
-            noiser=noiser,
-            sigmas=stage_1_sigmas,
-            stepper=stepper,
-            denoising_loop_fn=denoising_loop,
-            components=self.pipeline_components,
-            dtype=dtype,
-            device=self.device,
-        )
+            return denoising_loop
+
+        latents = []
+        for batch in batches:
+            height, width, num_frames = items[batch[0]].shape
+            stage_1_output_shape = VideoPixelShape(
+                batch=len(batch),
+                frames=num_frames,
+                width=width // 2,
+                height=height // 2,
+                fps=frame_rate,
+            )
+            with stage("stage_1_denoise", steps=len(stage_1_sigmas) - 1):
+                stage_1_conditionings = [
+                    image_conditionings_by_replacing_latent(
+                        images=items[i].images,
+                        height=stage_1_output_shape.height,
+                        width=stage_1_output_shape.width,
+                        video_encoder=video_encoder,
+                        dtype=dtype,
+                        device=self.device,
+                    )
+                    for i in batch
+                ]
+                video_state, audio_state = denoise_audio_video_batch(
+                    output_shape=stage_1_output_shape,
+                    conditionings=stage_1_conditionings,
+                    noisers=[noisers[i] for i in batch],
+                    sigmas=stage_1_sigmas,
+                    stepper=stepper,
+                    denoising_loop_fn=denoising_loop_for(batch),
+                    components=self.pipeline_components,
+                    dtype=dtype,
+                    device=self.device,
+                )
+            latents.append((video_state.latent, audio_state.latent))
 
         # Stage 2: Upsample and refine the video at higher resolution with distilled LORA.
-        upscaled_video_latent = upsample_video(
-            latent=video_state.latent[:1], video_encoder=video_encoder, upsampler=self.model_ledger.spatial_upsampler()
-        )
+        with stage("model_load"):
+            spatial_upsampler = self.model_ledger.spatial_upsampler()
+        with stage("upsample"):
+            upscaled_video_latents = [
+                upsample_video(latent=video_latent, video_encoder=video_encoder, upsampler=spatial_upsampler)
+                for video_latent, _ in latents
+            ]
+        self.model_ledger.release(spatial_upsampler)
+        del spatial_upsampler
 
         torch.cuda.synchronize()
         cleanup_memory()
 
         stage_2_sigmas = torch.Tensor(STAGE_2_DISTILLED_SIGMA_VALUES).to(self.device)
-        stage_2_output_shape = VideoPixelShape(batch=1, frames=num_frames, width=width, height=height, fps=frame_rate)
-        stage_2_conditionings = image_conditionings_by_replacing_latent(
-            images=images,
-            height=stage_2_output_shape.height,
-            width=stage_2_output_shape.width,
-            video_encoder=video_encoder,
-            dtype=dtype,
-            device=self.device,
-        )
-        video_state, audio_state = denoise_audio_video(
-            output_shape=stage_2_output_shape,
-            conditionings=stage_2_conditionings,
-            noiser=noiser,
-            sigmas=stage_2_sigmas,
-            stepper=stepper,
-            denoising_loop_fn=denoising_loop,
-            components=self.pipeline_components,
-            dtype=dtype,
-            device=self.device,
-            noise_scale=stage_2_sigmas[0],
-            initial_video_latent=upscaled_video_latent,
-            initial_audio_latent=audio_state.latent,
-        )
+        for n, batch in enumerate(batches):
+            height, width, num_frames = items[batch[0]].shape
+            stage_2_output_shape = VideoPixelShape(
+                batch=len(batch), frames=num_frames, width=width, height=height, fps=frame_rate
+            )
+            with stage("stage_2_denoise", steps=len(stage_2_sigmas) - 1):
+                stage_2_conditionings = [
+                    image_conditionings_by_replacing_latent(
+                        images=items[i].images,
+                        height=stage_2_output_shape.height,
+                        width=stage_2_output_shape.width,
+                        video_encoder=video_encoder,
+                        dtype=dtype,
+                        device=self.device,
+                    )
+                    for i in batch
+                ]
+                video_state, audio_state = denoise_audio_video_batch(
+                    output_shape=stage_2_output_shape,
+                    conditionings=stage_2_conditionings,
+                    noisers=[noisers[i] for i in batch],
+                    sigmas=stage_2_sigmas,
+                    stepper=stepper,
+                    denoising_loop_fn=denoising_loop_for(batch),
+                    components=self.pipeline_components,
+                    dtype=dtype,
+                    device=self.device,
+                    noise_scale=stage_2_sigmas[0],
+                    initial_video_latent=upscaled_video_latents[n],
+                    initial_audio_latent=latents[n][1],
+                )
+            latents[n] = (video_state.latent, audio_state.latent)
 
         torch.cuda.synchronize()
+        self.model_ledger.release(transformer, video_encoder)
         del transformer
         del video_encoder
+        del upscaled_video_latents
         cleanup_memory()
 
-        decoded_video = vae_decode_video(video_state.latent, self.model_ledger.video_decoder(), tiling_config)
-        decoded_audio = vae_decode_audio(
-            audio_state.latent, self.model_ledger.audio_decoder(), self.model_ledger.vocoder()
-        )
-        return decoded_video, decoded_audio
+        with stage("model_load"):
+            video_decoder = self.model_ledger.video_decoder()
+            audio_decoder = self.model_ledger.audio_decoder()
+            vocoder = self.model_ledger.vocoder()
+        outputs = [
+            (index, video_latent[j : j + 1], audio_latent[j : j + 1])
+            for batch, (video_latent, audio_latent) in zip(batches, latents, strict=True)
+            for j, index in enumerate(batch)
+        ]
+        for n, (index, video_latent, audio_latent) in enumerate(outputs):
+            # Video tiles are decoded lazily while encoding (see encode_video); audio is decoded here.
+            decoded_video = vae_decode_video(video_latent, video_decoder, tiling_config)
+            if n == len(outputs) - 1:
+                # The video decoder stays leased until the last video has been decoded
+                decoded_video = self.model_ledger.release_after(decoded_video, video_decoder)
+            with stage("vae_decode"):
+                decoded_audio = vae_decode_audio(audio_latent, audio_decoder, vocoder)
+            yield BatchOutput(index=index, video=decoded_video, audio=decoded_audio)
+        self.model_ledger.release(audio_decoder, vocoder)
 
 
 @torch.inference_mode()
@@ -193,35 +273,38 @@ def main() -> None:
     logging.getLogger().setLevel(logging.INFO)
     parser = default_2_stage_distilled_arg_parser()
     args = parser.parse_args()
-    pipeline = DistilledPipeline(
-        checkpoint_path=args.checkpoint_path,
-        spatial_upsampler_path=args.spatial_upsampler_path,
-        gemma_root=args.gemma_root,
-        loras=args.lora,
-        fp8transformer=args.enable_fp8,
-    )
-    tiling_config = TilingConfig.default()
-    video_chunks_number = get_video_chunks_number(args.num_frames, tiling_config)
-    video, audio = pipeline(
-        prompt=args.prompt,
-        seed=args.seed,
-        height=args.height,
-        width=args.width,
-        num_frames=args.num_frames,
-        frame_rate=args.frame_rate,
-        images=args.images,
-        tiling_config=tiling_config,
-        enhance_prompt=args.enhance_prompt,
-    )
-
-    encode_video(
-        video=video,
-        fps=args.frame_rate,
-        audio=audio,
-        audio_sample_rate=AUDIO_SAMPLE_RATE,
-        output_path=args.output_path,
-        video_chunks_number=video_chunks_number,
-    )
+    with record_metrics(args.metrics_path, args.output_path):
+        pipeline = DistilledPipeline(
+            checkpoint_path=args.checkpoint_path,
+            spatial_upsampler_path=args.spatial_upsampler_path,
+            gemma_root=args.gemma_root,
+            loras=args.lora,
+            fp8transformer=args.enable_fp8,
+        )
+        tiling_config = TilingConfig.default()
+        video_chunks_number = get_video_chunks_number(args.num_frames, tiling_config)
+        video, audio = pipeline(
+            prompt=args.prompt,
+            seed=args.seed,
+            height=args.height,
+            width=args.width,
+            num_frames=args.num_frames,
+            frame_rate=args.frame_rate,
+            images=args.images,
+            tiling_config=tiling_config,
+            enhance_prompt=args.enhance_prompt,
+        )
+
+        encode_video(
+            video=video,
+            fps=args.frame_rate,
+            audio=audio,
+            audio_sample_rate=AUDIO_SAMPLE_RATE,
+            output_path=args.output_path,
+            video_chunks_number=video_chunks_number,
+            preset=args.x264_preset,
+            threads=args.x264_threads,
+        )
 
 
 if __name__ == "__main__":
@@ -14,7 +14,7 @@ from ltx_core.model.video_vae import TilingConfig, VideoEncoder, get_video_chunk
 from ltx_core.model.video_vae import decode_video as vae_decode_video
 from ltx_core.text_encoders.gemma import encode_text
 from ltx_core.types import LatentState, VideoPixelShape
-from ltx_pipelines.utils import ModelLedger
+from ltx_pipelines.utils import ModelCache, ModelLedger
 from ltx_pipelines.utils.args import VideoConditioningAction, default_2_stage_distilled_arg_parser
 from ltx_pipelines.utils.constants import AUDIO_SAMPLE_RATE, DISTILLED_SIGMA_VALUES, STAGE_2_DISTILLED_SIGMA_VALUES
 from ltx_pipelines.utils.helpers import (
@@ -28,6 +28,7 @@ from ltx_pipelines.utils.helpers import (
     simple_denoising_func,
 )
 from ltx_pipelines.utils.media_io import encode_video, load_video_conditioning
+from ltx_pipelines.utils.telemetry import record_metrics
 from ltx_pipelines.utils.types import PipelineComponents
 
 device = get_device()
@@ -51,17 +52,9 @@ class ICLoraPipeline:
         loras: list[LoraPathStrengthAndSDOps],
         device: torch.device = device,
         fp8transformer: bool = False,
+        model_cache: ModelCache | None = None,
     ):
         self.dtype = torch.bfloat16
-        self.stage_1_model_ledger = ModelLedger(
-            dtype=self.dtype,
-            device=device,
-            checkpoint_path=checkpoint_path,
-            spatial_upsampler_path=spatial_upsampler_path,
-            gemma_root_path=gemma_root,
-            loras=loras,
-            fp8transformer=fp8transformer,
-        )
         self.stage_2_model_ledger = ModelLedger(
             dtype=self.dtype,
             device=device,
@@ -70,7 +63,10 @@ class ICLoraPipeline:
             gemma_root_path=gemma_root,
             loras=[],
             fp8transformer=fp8transformer,
+            cache=model_cache,
         )
+        # The IC-LoRAs are switched on as adapters for stage 1 only, so both stages share one transformer.
+        self.stage_1_model_ledger = self.stage_2_model_ledger.with_lora_adapters(loras=loras)
         self.pipeline_components = PipelineComponents(
             dtype=self.dtype,
             device=device,
@@ -107,6 +103,7 @@ class ICLoraPipeline:
         video_context, audio_context = encode_text(text_encoder, prompts=[prompt])[0]
 
         torch.cuda.synchronize()
+        self.stage_1_model_ledger.release(text_encoder)
         del text_encoder
         cleanup_memory()
 
@@ -158,20 +155,22 @@ class ICLoraPipeline:
         )
 
         torch.cuda.synchronize()
-        del transformer
         cleanup_memory()
 
         # Stage 2: Upsample and refine the video at higher resolution with distilled LORA.
+        spatial_upsampler = self.stage_2_model_ledger.spatial_upsampler()
         upscaled_video_latent = upsample_video(
             latent=video_state.latent[:1],
             video_encoder=video_encoder,
-            upsampler=self.stage_2_model_ledger.spatial_upsampler(),
+            upsampler=spatial_upsampler,
         )
+        self.stage_2_model_ledger.release(spatial_upsampler)
+        del spatial_upsampler
 
         torch.cuda.synchronize()
         cleanup_memory()
 
-        transformer = self.stage_2_model_ledger.transformer()
+        transformer = self.stage_2_model_ledger.switch_transformer(transformer)
         distilled_sigmas = torch.Tensor(STAGE_2_DISTILLED_SIGMA_VALUES).to(self.device)
 
         def second_stage_denoising_loop(
@@ -215,14 +214,19 @@ class ICLoraPipeline:
         )
 
         torch.cuda.synchronize()
+        self.stage_2_model_ledger.release(transformer, video_encoder)
         del transformer
         del video_encoder
         cleanup_memory()
 
-        decoded_video = vae_decode_video(video_state.latent, self.stage_2_model_ledger.video_decoder(), tiling_config)
-        decoded_audio = vae_decode_audio(
-            audio_state.latent, self.stage_2_model_ledger.audio_decoder(), self.stage_2_model_ledger.vocoder()
+        video_decoder = self.stage_2_model_ledger.video_decoder()
+        audio_decoder = self.stage_2_model_ledger.audio_decoder()
+        vocoder = self.stage_2_model_ledger.vocoder()
+        decoded_video = self.stage_2_model_ledger.release_after(
+            vae_decode_video(video_state.latent, video_decoder, tiling_config), video_decoder
         )
+        decoded_audio = vae_decode_audio(audio_state.latent, audio_decoder, vocoder)
+        self.stage_2_model_ledger.release(audio_decoder, vocoder)
         return decoded_video, decoded_audio
 
     def _create_conditionings(
@@ -270,35 +274,38 @@ def main() -> None:
         required=True,
     )
     args = parser.parse_args()
-    pipeline = ICLoraPipeline(
-        checkpoint_path=args.checkpoint_path,
-        spatial_upsampler_path=args.spatial_upsampler_path,
-        gemma_root=args.gemma_root,
-        loras=args.lora,
-        fp8transformer=args.enable_fp8,
-    )
-    tiling_config = TilingConfig.default()
-    video_chunks_number = get_video_chunks_number(args.num_frames, tiling_config)
-    video, audio = pipeline(
-        prompt=args.prompt,
-        seed=args.seed,
-        height=args.height,
-        width=args.width,
-        num_frames=args.num_frames,
-        frame_rate=args.frame_rate,
-        images=args.images,
-        video_conditioning=args.video_conditioning,
-        tiling_config=tiling_config,
-    )
+    with record_metrics(args.metrics_path, args.output_path):
+        pipeline = ICLoraPipeline(
+            checkpoint_path=args.checkpoint_path,
+            spatial_upsampler_path=args.spatial_upsampler_path,
+            gemma_root=args.gemma_root,
+            loras=args.lora,
+            fp8transformer=args.enable_fp8,
+        )
+        tiling_config = TilingConfig.default()
+        video_chunks_number = get_video_chunks_number(args.num_frames, tiling_config)
+        video, audio = pipeline(
+            prompt=args.prompt,
+            seed=args.seed,
+            height=args.height,
+            width=args.width,
+            num_frames=args.num_frames,
+            frame_rate=args.frame_rate,
+            images=args.images,
+            video_conditioning=args.video_conditioning,
+            tiling_config=tiling_config,
+        )
 
-    encode_video(
-        video=video,
-        fps=args.frame_rate,
-        audio=audio,
-        audio_sample_rate=AUDIO_SAMPLE_RATE,
-        output_path=args.output_path,
-        video_chunks_number=video_chunks_number,
-    )
+        encode_video(
+            video=video,
+            fps=args.frame_rate,
+            audio=audio,
+            audio_sample_rate=AUDIO_SAMPLE_RATE,
+            output_path=args.output_path,
+            video_chunks_number=video_chunks_number,
+            preset=args.x264_preset,
+            threads=args.x264_threads,
+        )
 
 
 if __name__ == "__main__":
@@ -15,7 +15,7 @@ from ltx_core.model.video_vae import TilingConfig, get_video_chunks_number
 from ltx_core.model.video_vae import decode_video as vae_decode_video
 from ltx_core.text_encoders.gemma import encode_text
 from ltx_core.types import LatentState, VideoPixelShape
-from ltx_pipelines.utils import ModelLedger
+from ltx_pipelines.utils import ModelCache, ModelLedger
 from ltx_pipelines.utils.args import default_2_stage_arg_parser
 from ltx_pipelines.utils.constants import AUDIO_SAMPLE_RATE, STAGE_2_DISTILLED_SIGMA_VALUES
 from ltx_pipelines.utils.helpers import (
@@ -30,6 +30,7 @@ from ltx_pipelines.utils.helpers import (
     simple_denoising_func,
 )
 from ltx_pipelines.utils.media_io import encode_video
+from ltx_pipelines.utils.telemetry import record_metrics
 from ltx_pipelines.utils.types import PipelineComponents
 
 device = get_device()
@@ -41,6 +42,7 @@ class KeyframeInterpolationPipeline:
     Interpolates between keyframes to generate a video with smoother transitions.
     Stage 1 generates video at the target resolution, then Stage 2 upsamples
     by 2x and refines with additional denoising steps for higher quality output.
+    Both stages share one transformer; stage 2 switches the distilled LoRA on as an adapter.
     """
 
     def __init__(
@@ -52,6 +54,7 @@ class KeyframeInterpolationPipeline:
         loras: list[LoraPathStrengthAndSDOps],
         device: torch.device = device,
         fp8transformer: bool = False,
+        model_cache: ModelCache | None = None,
     ):
         self.device = device
         self.dtype = torch.bfloat16
@@ -63,8 +66,9 @@ class KeyframeInterpolationPipeline:
             gemma_root_path=gemma_root,
             loras=loras,
             fp8transformer=fp8transformer,
+            cache=model_cache,
         )
-        self.stage_2_model_ledger = self.stage_1_model_ledger.with_loras(
+        self.stage_2_model_ledger = self.stage_1_model_ledger.with_lora_adapters(
             loras=distilled_lora,
         )
         self.pipeline_components = PipelineComponents(
@@ -106,6 +110,7 @@ class KeyframeInterpolationPipeline:
         v_context_n, a_context_n = context_n
 
         torch.cuda.synchronize()
+        self.stage_1_model_ledger.release(text_encoder)
         del text_encoder
         cleanup_memory()
 
@@ -160,20 +165,22 @@ class KeyframeInterpolationPipeline:
         )
 
         torch.cuda.synchronize()
-        del transformer
         cleanup_memory()
 
         # Stage 2: Upsample and refine the video at higher resolution with distilled LORA.
+        spatial_upsampler = self.stage_2_model_ledger.spatial_upsampler()
         upscaled_video_latent = upsample_video(
             latent=video_state.latent[:1],
             video_encoder=video_encoder,
-            upsampler=self.stage_2_model_ledger.spatial_upsampler(),
+            upsampler=spatial_upsampler,
         )
+        self.stage_2_model_ledger.release(spatial_upsampler)
+        del spatial_upsampler
 
         torch.cuda.synchronize()
         cleanup_memory()
 
-        transformer = self.stage_2_model_ledger.transformer()
+        transformer = self.stage_2_model_ledger.switch_transformer(transformer)
         distilled_sigmas = torch.Tensor(STAGE_2_DISTILLED_SIGMA_VALUES).to(self.device)
 
         def second_stage_denoising_loop(
@@ -216,14 +223,19 @@ class KeyframeInterpolationPipeline:
         )
 
         torch.cuda.synchronize()
+        self.stage_2_model_ledger.release(transformer, video_encoder)
         del transformer
         del video_encoder
         cleanup_memory()
 
-        decoded_video = vae_decode_video(video_state.latent, self.stage_2_model_ledger.video_decoder(), tiling_config)
-        decoded_audio = vae_decode_audio(
-            audio_state.latent, self.stage_2_model_ledger.audio_decoder(), self.stage_2_model_ledger.vocoder()
+        video_decoder = self.stage_2_model_ledger.video_decoder()
+        audio_decoder = self.stage_2_model_ledger.audio_decoder()
+        vocoder = self.stage_2_model_ledger.vocoder()
+        decoded_video = self.stage_2_model_ledger.release_after(
+            vae_decode_video(video_state.latent, video_decoder, tiling_config), video_decoder
         )
+        decoded_audio = vae_decode_audio(audio_state.latent, audio_decoder, vocoder)
+        self.stage_2_model_ledger.release(audio_decoder, vocoder)
         return decoded_video, decoded_audio
 
 
@@ -232,38 +244,41 @@ def main() -> None:
     logging.getLogger().setLevel(logging.INFO)
     parser = default_2_stage_arg_parser()
     args = parser.parse_args()
-    pipeline = KeyframeInterpolationPipeline(
-        checkpoint_path=args.checkpoint_path,
-        distilled_lora=args.distilled_lora,
-        spatial_upsampler_path=args.spatial_upsampler_path,
-        gemma_root=args.gemma_root,
-        loras=args.lora,
-        fp8transformer=args.enable_fp8,
-    )
-    tiling_config = TilingConfig.default()
-    video_chunks_number = get_video_chunks_number(args.num_frames, tiling_config)
-    video, audio = pipeline(
-        prompt=args.prompt,
-        negative_prompt=args.negative_prompt,
-        seed=args.seed,
-        height=args.height,
-        width=args.width,
-        num_frames=args.num_frames,
-        frame_rate=args.frame_rate,
-        num_inference_steps=args.num_inference_steps,
-        cfg_guidance_scale=args.cfg_guidance_scale,
-        images=args.images,
-        tiling_config=tiling_config,
-    )
+    with record_metrics(args.metrics_path, args.output_path):
+        pipeline = KeyframeInterpolationPipeline(
+            checkpoint_path=args.checkpoint_path,
+            distilled_lora=args.distilled_lora,
+            spatial_upsampler_path=args.spatial_upsampler_path,
+            gemma_root=args.gemma_root,
+            loras=args.lora,
+            fp8transformer=args.enable_fp8,
+        )
+        tiling_config = TilingConfig.default()
+        video_chunks_number = get_video_chunks_number(args.num_frames, tiling_config)
+        video, audio = pipeline(
+            prompt=args.prompt,
+            negative_prompt=args.negative_prompt,
+            seed=args.seed,
+            height=args.height,
+            width=args.width,
+            num_frames=args.num_frames,
+            frame_rate=args.frame_rate,
+            num_inference_steps=args.num_inference_steps,
+            cfg_guidance_scale=args.cfg_guidance_scale,
+            images=args.images,
+            tiling_config=tiling_config,
+        )
 
-    encode_video(
-        video=video,
-        fps=args.frame_rate,
-        audio=audio,
-        audio_sample_rate=AUDIO_SAMPLE_RATE,
-        output_path=args.output_path,
-        video_chunks_number=video_chunks_number,
-    )
+        encode_video(
+            video=video,
+            fps=args.frame_rate,
+            audio=audio,
+            audio_sample_rate=AUDIO_SAMPLE_RATE,
+            output_path=args.output_path,
+            video_chunks_number=video_chunks_number,
+            preset=args.x264_preset,
+            threads=args.x264_threads,
+        )
 
 
 if __name__ == "__main__":
@@ -11,23 +11,25 @@ from ltx_core.components.schedulers import LTX2Scheduler
 from ltx_core.loader import LoraPathStrengthAndSDOps
 from ltx_core.model.audio_vae import decode_audio as vae_decode_audio
 from ltx_core.model.video_vae import decode_video as vae_decode_video
-from ltx_core.text_encoders.gemma import encode_text
 from ltx_core.types import LatentState, VideoPixelShape
-from ltx_pipelines.utils import ModelLedger
+from ltx_pipelines.utils import ModelCache, ModelLedger
 from ltx_pipelines.utils.args import default_1_stage_arg_parser
 from ltx_pipelines.utils.constants import AUDIO_SAMPLE_RATE
 from ltx_pipelines.utils.helpers import (
     assert_resolution,
     cleanup_memory,
-    denoise_audio_video,
+    denoise_audio_video_batch,
+    encode_prompts,
     euler_denoising_loop,
     generate_enhanced_prompt,
     get_device,
     guider_denoising_func,
     image_conditionings_by_replacing_latent,
+    micro_batches,
 )
 from ltx_pipelines.utils.media_io import encode_video
-from ltx_pipelines.utils.types import PipelineComponents
+from ltx_pipelines.utils.telemetry import record_metrics, stage
+from ltx_pipelines.utils.types import BatchItem, BatchOutput, DenoisingLoopFunc, PipelineComponents
 
 device = get_device()
 
@@ -37,7 +39,8 @@ class TI2VidOneStagePipeline:
     Single-stage text/image-to-video generation pipeline.
     Generates video at the target resolution in a single diffusion pass with
     classifier-free guidance (CFG). Supports optional image conditioning via
-    the images parameter.
+    the images parameter. Several generations (e.g. takes of a shot with different seeds) can share
+    one call and its model loads through :meth:`generate_batch`.
     """
 
     def __init__(
@@ -47,6 +50,7 @@ class TI2VidOneStagePipeline:
         loras: list[LoraPathStrengthAndSDOps],
         device: torch.device = device,
         fp8transformer: bool = False,
+        model_cache: ModelCache | None = None,
     ):
         self.dtype = torch.bfloat16
         self.device = device
@@ -57,6 +61,7 @@ class TI2VidOneStagePipeline:
             gemma_root_path=gemma_root,
             loras=loras,
             fp8transformer=fp8transformer,
+            cache=model_cache,
         )
         self.pipeline_components = PipelineComponents(
             dtype=self.dtype,
@@ -77,82 +82,149 @@ class TI2VidOneStagePipeline:
         images: list[tuple[str, int, float]],
         enhance_prompt: bool = False,
     ) -> tuple[Iterator[torch.Tensor], torch.Tensor]:
-        assert_resolution(height=height, width=width, is_two_stage=False)
+        item = BatchItem(prompt=prompt, seed=seed, height=height, width=width, num_frames=num_frames, images=images)
+        (output,) = self.generate_batch(
+            [item],
+            negative_prompt=negative_prompt,
+            frame_rate=frame_rate,
+            num_inference_steps=num_inference_steps,
+            cfg_guidance_scale=cfg_guidance_scale,
+            enhance_prompt=enhance_prompt,
+        )
+        return output.video, output.audio
 
-        generator = torch.Generator(device=self.device).manual_seed(seed)
-        noiser = GaussianNoiser(generator=generator)
+    @torch.inference_mode()
+    def generate_batch(
+        self,
+        items: list[BatchItem],
+        negative_prompt: str,
+        frame_rate: float,
+        num_inference_steps: int,
+        cfg_guidance_scale: float,
+        enhance_prompt: bool = False,
+        max_batch_size: int = 4,
+    ) -> Iterator[BatchOutput]:
+        """
+        Generate several items (prompt, seed, shape and image conditionings each) in one call.
+        Every model is loaded once and every distinct prompt encoded once. Items of the same shape are
+        denoised together, in micro-batches of up to ``max_batch_size``. Once all items are denoised,
+        their outputs are yielded one by one, in micro-batch order (see ``BatchOutput.index``).
+        """
+        for item in items:
+            assert_resolution(height=item.height, width=item.width, is_two_stage=False)
+        batches = micro_batches([item.shape for item in items], max_batch_size)
+        noisers = [
+            GaussianNoiser(generator=torch.Generator(device=self.device).manual_seed(item.seed)) for item in items
+        ]
         stepper = EulerDiffusionStep()
         cfg_guider = CFGGuider(cfg_guidance_scale)
         dtype = torch.bfloat16
 
-        text_encoder = self.model_ledger.text_encoder()
-        if enhance_prompt:
-            prompt = generate_enhanced_prompt(
-                text_encoder, prompt, images[0][0] if len(images) > 0 else None, seed=seed
-            )
-        context_p, context_n = encode_text(text_encoder, prompts=[prompt, negative_prompt])
-        v_context_p, a_context_p = context_p
-        v_context_n, a_context_n = context_n
+        with stage("model_load"):
+            text_encoder = self.model_ledger.text_encoder()
+        with stage("text_encode"):
+            prompts = [
+                generate_enhanced_prompt(
+                    text_encoder, item.prompt, item.images[0][0] if len(item.images) > 0 else None, seed=item.seed
+                )
+                if enhance_prompt
+                else item.prompt
+                for item in items
+            ]
+            contexts = encode_prompts(text_encoder, [*prompts, negative_prompt])
+        v_context_n, a_context_n = contexts[negative_prompt]
 
         torch.cuda.synchronize()
+        self.model_ledger.release(text_encoder)
         del text_encoder
         cleanup_memory()
 
         # Stage 1: Initial low resolution video generation.
-        video_encoder = self.model_ledger.video_encoder()
-        transformer = self.model_ledger.transformer()
+        with stage("model_load"):
+            video_encoder = self.model_ledger.video_encoder()
+            transformer = self.model_ledger.transformer()
         sigmas = LTX2Scheduler().execute(steps=num_inference_steps).to(dtype=torch.float32, device=self.device)
 
-        def first_stage_denoising_loop(
-            sigmas: torch.Tensor, video_state: LatentState, audio_state: LatentState, stepper: DiffusionStepProtocol
-        ) -> tuple[LatentState, LatentState]:
-            return euler_denoising_loop(
-                sigmas=sigmas,
-                video_state=video_state,
-                audio_state=audio_state,
-                stepper=stepper,
-                denoise_fn=guider_denoising_func(
-                    cfg_guider,
-                    v_context_p,
-                    v_context_n,
-                    a_context_p,
-                    a_context_n,
-                    transformer=transformer,  # noqa: F821
-                ),
-            )
+        def first_stage_denoising_loop_for(batch: list[int]) -> DenoisingLoopFunc:
+            v_context_p = torch.cat([contexts[prompts[i]][0] for i in batch])
+            a_context_p = torch.cat([contexts[prompts[i]][1] for i in batch])
 
-        stage_1_output_shape = VideoPixelShape(batch=1, frames=num_frames, width=width, height=height, fps=frame_rate)
-        stage_1_conditionings = image_conditionings_by_replacing_latent(
-            images=images,
-            height=stage_1_output_shape.height,
-            width=stage_1_output_shape.width,
-            video_encoder=video_encoder,
-            dtype=dtype,
-            device=self.device,
-        )
+            def first_stage_denoising_loop(
+                sigmas: torch.Tensor, video_state: LatentState, audio_state: LatentState, stepper: DiffusionStepProtocol
+            ) -> tuple[LatentState, LatentState]:
+                return euler_denoising_loop(
+                    sigmas=sigmas,
+                    video_state=video_state,
+                    audio_state=audio_state,
+                    stepper=stepper,
+                    denoise_fn=guider_denoising_func(
+                        cfg_guider,
+                        v_context_p,
+                        v_context_n.expand(len(batch), -1, -1),
+                        a_context_p,
+                        a_context_n.expand(len(batch), -1, -1),
+                        transformer=transformer,  # noqa: F821
+                    ),
+                )
 
-        video_state, audio_state = denoise_audio_video(
-            output_shape=stage_1_output_shape,
-            conditionings=stage_1_conditionings,
-            noiser=noiser,
-            sigmas=sigmas,
-            stepper=stepper,
-            denoising_loop_fn=first_stage_denoising_loop,
-            components=self.pipeline_components,
-            dtype=dtype,
-            device=self.device,
-        )
+            return first_stage_denoising_loop
+
+        latents = []
+        for batch in batches:
+            height, width, num_frames = items[batch[0]].shape
+            stage_1_output_shape = VideoPixelShape(
+                batch=len(batch), frames=num_frames, width=width, height=height, fps=frame_rate
+            )
+            with stage("stage_1_denoise", steps=len(sigmas) - 1):
+                stage_1_conditionings = [
+                    image_conditionings_by_replacing_latent(
+                        images=items[i].images,
+                        height=stage_1_output_shape.height,
+                        width=stage_1_output_shape.width,
+                        video_encoder=video_encoder,
+                        dtype=dtype,
+                        device=self.device,
+                    )
+                    for i in batch
+                ]
+                video_state, audio_state = denoise_audio_video_batch(
+                    output_shape=stage_1_output_shape,
+                    conditionings=stage_1_conditionings,
+                    noisers=[noisers[i] for i in batch],
+                    sigmas=sigmas,
+                    stepper=stepper,
+                    denoising_loop_fn=first_stage_denoising_loop_for(batch),
+                    components=self.pipeline_components,
+                    dtype=dtype,
+                    device=self.device,
+                )
+            latents.append((video_state.latent, audio_state.latent))
 
         torch.cuda.synchronize()
+        self.model_ledger.release(transformer, video_encoder)
         del transformer
+        del video_encoder
         cleanup_memory()
 
-        decoded_video = vae_decode_video(video_state.latent, self.model_ledger.video_decoder())
-        decoded_audio = vae_decode_audio(
-            audio_state.latent, self.model_ledger.audio_decoder(), self.model_ledger.vocoder()
-        )
-
-        return decoded_video, decoded_audio
+        with stage("model_load"):
+            video_decoder = self.model_ledger.video_decoder()
+            audio_decoder = self.model_ledger.audio_decoder()
+            vocoder = self.model_ledger.vocoder()
+        outputs = [
+            (index, video_latent[j : j + 1], audio_latent[j : j + 1])
+            for batch, (video_latent, audio_latent) in zip(batches, latents, strict=True)
+            for j, index in enumerate(batch)
+        ]
+        for n, (index, video_latent, audio_latent) in enumerate(outputs):
+            # Video is decoded lazily while encoding (see encode_video); audio is decoded here.
+            decoded_video = vae_decode_video(video_latent, video_decoder)
+            if n == len(outputs) - 1:
+                # The video decoder stays leased until the last video has been decoded
+                decoded_video = self.model_ledger.release_after(decoded_video, video_decoder)
+            with stage("vae_decode"):
+                decoded_audio = vae_decode_audio(audio_latent, audio_decoder, vocoder)
+            yield BatchOutput(index=index, video=decoded_video, audio=decoded_audio)
+        self.model_ledger.release(audio_decoder, vocoder)
 
 
 @torch.inference_mode()
@@ -160,33 +232,36 @@ def main() -> None:
     logging.getLogger().setLevel(logging.INFO)
     parser = default_1_stage_arg_parser()
     args = parser.parse_args()
-    pipeline = TI2VidOneStagePipeline(
-        checkpoint_path=args.checkpoint_path,
-        gemma_root=args.gemma_root,
-        loras=args.lora,
-        fp8transformer=args.enable_fp8,
-    )
-    video, audio = pipeline(
-        prompt=args.prompt,
-        negative_prompt=args.negative_prompt,
-        seed=args.seed,
-        height=args.height,
-        width=args.width,
-        num_frames=args.num_frames,
-        frame_rate=args.frame_rate,
-        num_inference_steps=args.num_inference_steps,
-        cfg_guidance_scale=args.cfg_guidance_scale,
-        images=args.images,
-    )
-
-    encode_video(
-        video=video,
-        fps=args.frame_rate,
-        audio=audio,
-        audio_sample_rate=AUDIO_SAMPLE_RATE,
-        output_path=args.output_path,
-        video_chunks_number=1,
-    )
+    with record_metrics(args.metrics_path, args.output_path):
+        pipeline = TI2VidOneStagePipeline(
+            checkpoint_path=args.checkpoint_path,
+            gemma_root=args.gemma_root,
+            loras=args.lora,
+            fp8transformer=args.enable_fp8,
+        )
+        video, audio = pipeline(
+            prompt=args.prompt,
+            negative_prompt=args.negative_prompt,
+            seed=args.seed,
+            height=args.height,
+            width=args.width,
+            num_frames=args.num_frames,
+            frame_rate=args.frame_rate,
+            num_inference_steps=args.num_inference_steps,
+            cfg_guidance_scale=args.cfg_guidance_scale,
+            images=args.images,
+        )
+
+        encode_video(
+            video=video,
+            fps=args.frame_rate,
+            audio=audio,
+            audio_sample_rate=AUDIO_SAMPLE_RATE,
+            output_path=args.output_path,
+            video_chunks_number=1,
+            preset=args.x264_preset,
+            threads=args.x264_threads,
+        )
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 import logging
 from collections.abc import Iterator
+from pathlib import Path
 
 import torch
 
@@ -10,30 +11,117 @@ from ltx_core.components.protocols import DiffusionStepProtocol
 from ltx_core.components.schedulers import LTX2Scheduler
 from ltx_core.loader import LoraPathStrengthAndSDOps
 from ltx_core.model.audio_vae import decode_audio as vae_decode_audio
+from ltx_core.model.transformer import X0Model
 from ltx_core.model.upsampler import upsample_video
-from ltx_core.model.video_vae import TilingConfig, get_video_chunks_number
+from ltx_core.model.video_vae import TilingConfig, VideoEncoder, get_video_chunks_number
 from ltx_core.model.video_vae import decode_video as vae_decode_video
 from ltx_core.text_encoders.gemma import encode_text
 from ltx_core.types import LatentState, VideoPixelShape
-from ltx_pipelines.utils import ModelLedger
-from ltx_pipelines.utils.args import default_2_stage_arg_parser
+from ltx_pipelines.utils import ModelCache, ModelLedger
+from ltx_pipelines.utils.args import ti2vid_2_stage_arg_parser
 from ltx_pipelines.utils.constants import AUDIO_SAMPLE_RATE, STAGE_2_DISTILLED_SIGMA_VALUES
 from ltx_pipelines.utils.helpers import (
     assert_resolution,
     cleanup_memory,
-    denoise_audio_video,
+    denoise_audio_video_batch,
+    encode_prompts,
     euler_denoising_loop,
     generate_enhanced_prompt,
     get_device,
     guider_denoising_func,
     image_conditionings_by_replacing_latent,
+    micro_batches,
     simple_denoising_func,
 )
 from ltx_pipelines.utils.media_io import encode_video
-from ltx_pipelines.utils.types import PipelineComponents
+from ltx_pipelines.utils.telemetry import record_metrics, stage
+from ltx_pipelines.utils.types import BatchItem, BatchOutput, DenoisingLoopFunc, PipelineComponents
 
 device = get_device()
 
+# Bump when the layout of the saved stage 1 state changes.
+STAGE_1_STATE_VERSION = 1
+
+
+def save_stage_1_state(path: str, params: dict, **tensors: torch.Tensor) -> None:
+    """
+    Persist stage 1 latents, text contexts and the noise generator state so a later run with the
+    same stage 1 parameters can resume straight into upsampling and stage 2.
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    torch.save(
+        {
+            "version": STAGE_1_STATE_VERSION,
+            "params": params,
+            "tensors": {name: tensor.detach().cpu() for name, tensor in tensors.items()},
+        },
+        tmp_path,
+    )
+    Path(tmp_path).replace(path)
+
+
+def load_stage_1_state(path: str, params: dict) -> dict[str, torch.Tensor] | None:
+    """
+    Load stage 1 state written by save_stage_1_state, or None when it is missing or was produced
+    with different stage 1 parameters (in which case stage 1 is rendered from scratch).
+    """
+    if not Path(path).is_file():
+        logging.warning(f"Stage 1 state {path} not found, rendering stage 1 from scratch")
+        return None
+    state = torch.load(path, map_location="cpu", weights_only=True)
+    if state.get("version") != STAGE_1_STATE_VERSION or state.get("params") != params:
+        logging.warning(f"Stage 1 state {path} does not match this render, rendering stage 1 from scratch")
+        return None
+    return state["tensors"]
+
+
+def _guided_denoising_loop(
+    cfg_guider: CFGGuider,
+    v_context_p: torch.Tensor,
+    v_context_n: torch.Tensor,
+    a_context_p: torch.Tensor,
+    a_context_n: torch.Tensor,
+    transformer: X0Model,
+) -> DenoisingLoopFunc:
+    """Stage 1 loop: CFG-guided denoising with the base transformer."""
+
+    def denoising_loop(
+        sigmas: torch.Tensor, video_state: LatentState, audio_state: LatentState, stepper: DiffusionStepProtocol
+    ) -> tuple[LatentState, LatentState]:
+        return euler_denoising_loop(
+            sigmas=sigmas,
+            video_state=video_state,
+            audio_state=audio_state,
+            stepper=stepper,
+            denoise_fn=guider_denoising_func(
+                cfg_guider, v_context_p, v_context_n, a_context_p, a_context_n, transformer=transformer
+            ),
+        )
+
+    return denoising_loop
+
+
+def _distilled_denoising_loop(
+    v_context_p: torch.Tensor, a_context_p: torch.Tensor, transformer: X0Model
+) -> DenoisingLoopFunc:
+    """Stage 2 loop: unguided refinement with the distilled LoRA."""
+
+    def denoising_loop(
+        sigmas: torch.Tensor, video_state: LatentState, audio_state: LatentState, stepper: DiffusionStepProtocol
+    ) -> tuple[LatentState, LatentState]:
+        return euler_denoising_loop(
+            sigmas=sigmas,
+            video_state=video_state,
+            audio_state=audio_state,
+            stepper=stepper,
+            denoise_fn=simple_denoising_func(
+                video_context=v_context_p, audio_context=a_context_p, transformer=transformer
+            ),
+        )
+
+    return denoising_loop
+
 
 class TI2VidTwoStagesPipeline:
     """
@@ -41,6 +129,18 @@ class TI2VidTwoStagesPipeline:
     Stage 1 generates video at the target resolution with CFG guidance, then
     Stage 2 upsamples by 2x and refines using a distilled LoRA for higher
     quality output. Supports optional image conditioning via the images parameter.
+    ### Draft/final reuse
+    A draft run can stop after stage 1 (``stage_1_only``, decoding the half resolution
+    latents directly) and persist its stage 1 state (``save_stage_1_path``). A later final
+    run with the same stage 1 parameters resumes from it (``resume_from_stage_1_path``),
+    skipping text encoding and the CFG-guided stage 1 denoising entirely.
+    ### Shared transformer
+    Stage 2 runs the stage 1 transformer with the distilled LoRA switched on as an unfused adapter
+    (:meth:`~ltx_pipelines.utils.ModelLedger.switch_transformer`), so the checkpoint is loaded once
+    per generation and the transformer stays resident while the latents are upsampled.
+    ### Batches
+    :meth:`generate_batch` runs several generations (e.g. takes of a shot with different seeds) in one
+    call, sharing the model loads and batching the denoising of items with the same shape.
     """
 
     def __init__(
@@ -52,9 +152,12 @@ class TI2VidTwoStagesPipeline:
         loras: list[LoraPathStrengthAndSDOps],
         device: str = device,
         fp8transformer: bool = False,
+        model_cache: ModelCache | None = None,
     ):
         self.device = device
         self.dtype = torch.bfloat16
+        self.checkpoint_path = checkpoint_path
+        self.loras = loras
         self.stage_1_model_ledger = ModelLedger(
             dtype=self.dtype,
             device=device,
@@ -63,9 +166,10 @@ class TI2VidTwoStagesPipeline:
             spatial_upsampler_path=spatial_upsampler_path,
             loras=loras,
             fp8transformer=fp8transformer,
+            cache=model_cache,
         )
 
-        self.stage_2_model_ledger = self.stage_1_model_ledger.with_loras(
+        self.stage_2_model_ledger = self.stage_1_model_ledger.with_lora_adapters(
             loras=distilled_lora,
         )
 
@@ -89,184 +193,454 @@ class TI2VidTwoStagesPipeline:
         images: list[tuple[str, int, float]],
         tiling_config: TilingConfig | None = None,
         enhance_prompt: bool = False,
+        stage_1_only: bool = False,
+        save_stage_1_path: str | None = None,
+        resume_from_stage_1_path: str | None = None,
+    ) -> tuple[Iterator[torch.Tensor], torch.Tensor]:
+        item = BatchItem(prompt=prompt, seed=seed, height=height, width=width, num_frames=num_frames, images=images)
+        if stage_1_only or save_stage_1_path or resume_from_stage_1_path:
+            return self._generate_with_stage_1_reuse(
+                item,
+                negative_prompt=negative_prompt,
+                frame_rate=frame_rate,
+                num_inference_steps=num_inference_steps,
+                cfg_guidance_scale=cfg_guidance_scale,
+                tiling_config=tiling_config,
+                enhance_prompt=enhance_prompt,
+                stage_1_only=stage_1_only,
+                save_stage_1_path=save_stage_1_path,
+                resume_from_stage_1_path=resume_from_stage_1_path,
+            )
+        (output,) = self.generate_batch(
+            [item],
+            negative_prompt=negative_prompt,
+            frame_rate=frame_rate,
+            num_inference_steps=num_inference_steps,
+            cfg_guidance_scale=cfg_guidance_scale,
+            tiling_config=tiling_config,
+            enhance_prompt=enhance_prompt,
+        )
+        return output.video, output.audio
+
+    def _generate_with_stage_1_reuse(  # noqa: PLR0915
+        self,
+        item: BatchItem,
+        negative_prompt: str,
+        frame_rate: float,
+        num_inference_steps: int,
+        cfg_guidance_scale: float,
+        tiling_config: TilingConfig | None,
+        enhance_prompt: bool,
+        stage_1_only: bool,
+        save_stage_1_path: str | None,
+        resume_from_stage_1_path: str | None,
     ) -> tuple[Iterator[torch.Tensor], torch.Tensor]:
-        assert_resolution(height=height, width=width, is_two_stage=True)
+        """Unbatched generation that saves, resumes from or stops after stage 1 (draft/final reuse)."""
+        assert_resolution(height=item.height, width=item.width, is_two_stage=True)
+        prompt, seed, images = item.prompt, item.seed, item.images
 
         generator = torch.Generator(device=self.device).manual_seed(seed)
-        noiser = GaussianNoiser(generator=generator)
-        stepper = EulerDiffusionStep()
-        cfg_guider = CFGGuider(cfg_guidance_scale)
-        dtype = torch.bfloat16
+        noisers = [GaussianNoiser(generator=generator)]
 
-        text_encoder = self.stage_1_model_ledger.text_encoder()
-        if enhance_prompt:
-            prompt = generate_enhanced_prompt(
-                text_encoder, prompt, images[0][0] if len(images) > 0 else None, seed=seed
-            )
-        context_p, context_n = encode_text(text_encoder, prompts=[prompt, negative_prompt])
-        v_context_p, a_context_p = context_p
-        v_context_n, a_context_n = context_n
+        # Everything that determines the stage 1 result; a saved state is only reused on an exact match.
+        stage_1_params = {
+            "checkpoint_path": self.checkpoint_path,
+            "loras": [[lora.path, lora.strength] for lora in self.loras],
+            "prompt": prompt,
+            "negative_prompt": negative_prompt,
+            "enhance_prompt": enhance_prompt,
+            "seed": seed,
+            "height": item.height,
+            "width": item.width,
+            "num_frames": item.num_frames,
+            "frame_rate": frame_rate,
+            "num_inference_steps": num_inference_steps,
+            "cfg_guidance_scale": cfg_guidance_scale,
+            "images": [list(image) for image in images],
+        }
+        stage_1_state = None
+        if resume_from_stage_1_path:
+            stage_1_state = load_stage_1_state(resume_from_stage_1_path, stage_1_params)
 
-        torch.cuda.synchronize()
-        del text_encoder
-        cleanup_memory()
+        with stage("model_load"):
+            video_encoder = self.stage_1_model_ledger.video_encoder()
 
-        # Stage 1: Initial low resolution video generation.
-        video_encoder = self.stage_1_model_ledger.video_encoder()
-        transformer = self.stage_1_model_ledger.transformer()
-        sigmas = LTX2Scheduler().execute(steps=num_inference_steps).to(dtype=torch.float32, device=self.device)
+        transformer = None
+        if stage_1_state is not None:
+            logging.info(f"Resuming from stage 1 state {resume_from_stage_1_path}")
+            v_context_p = stage_1_state["video_context"].to(self.device)
+            a_context_p = stage_1_state["audio_context"].to(self.device)
+            video_latent = stage_1_state["video_latent"].to(self.device)
+            audio_latent = stage_1_state["audio_latent"].to(self.device)
+            # Continue the noise sequence where stage 1 left it, so the result matches a full run.
+            generator.set_state(stage_1_state["generator_state"])
+        else:
+            with stage("model_load"):
+                text_encoder = self.stage_1_model_ledger.text_encoder()
+            with stage("text_encode"):
+                if enhance_prompt:
+                    prompt = generate_enhanced_prompt(
+                        text_encoder, prompt, images[0][0] if len(images) > 0 else None, seed=seed
+                    )
+                context_p, context_n = encode_text(text_encoder, prompts=[prompt, negative_prompt])
+            v_context_p, a_context_p = context_p
+            v_context_n, a_context_n = context_n
+
+            torch.cuda.synchronize()
+            self.stage_1_model_ledger.release(text_encoder)
+            del text_encoder
+            cleanup_memory()
 
-        def first_stage_denoising_loop(
-            sigmas: torch.Tensor, video_state: LatentState, audio_state: LatentState, stepper: DiffusionStepProtocol
-        ) -> tuple[LatentState, LatentState]:
-            return euler_denoising_loop(
+            # Stage 1: Initial low resolution video generation.
+            with stage("model_load"):
+                transformer = self.stage_1_model_ledger.transformer()
+            sigmas = LTX2Scheduler().execute(steps=num_inference_steps).to(dtype=torch.float32, device=self.device)
+            video_latent, audio_latent = self._denoise_micro_batch(
+                "stage_1_denoise",
+                [item],
+                [0],
+                noisers,
                 sigmas=sigmas,
-                video_state=video_state,
-                audio_state=audio_state,
-                stepper=stepper,
-                denoise_fn=guider_denoising_func(
-                    cfg_guider,
-                    v_context_p,
-                    v_context_n,
-                    a_context_p,
-                    a_context_n,
-                    transformer=transformer,  # noqa: F821
+                denoising_loop_fn=_guided_denoising_loop(
+                    CFGGuider(cfg_guidance_scale), v_context_p, v_context_n, a_context_p, a_context_n, transformer
                 ),
+                video_encoder=video_encoder,
+                frame_rate=frame_rate,
+                scale=2,
             )
 
-        stage_1_output_shape = VideoPixelShape(
-            batch=1,
-            frames=num_frames,
-            width=width // 2,
-            height=height // 2,
-            fps=frame_rate,
+            torch.cuda.synchronize()
+            if stage_1_only:
+                self.stage_1_model_ledger.release(transformer)
+                transformer = None
+            cleanup_memory()
+
+            if save_stage_1_path:
+                save_stage_1_state(
+                    save_stage_1_path,
+                    stage_1_params,
+                    video_latent=video_latent,
+                    audio_latent=audio_latent,
+                    video_context=v_context_p,
+                    audio_context=a_context_p,
+                    generator_state=generator.get_state(),
+                )
+
+        if stage_1_only:
+            # Draft output: decode the half resolution stage 1 latents as they are.
+            self.stage_1_model_ledger.release(video_encoder)
+            del video_encoder
+            cleanup_memory()
+            return self._decode(self.stage_1_model_ledger, video_latent, audio_latent, tiling_config)
+
+        # Stage 2: Upsample and refine the video at higher resolution with distilled LORA.
+        (upscaled_video_latent,), transformer = self._upsample(
+            [video_latent], video_encoder=video_encoder, transformer=transformer
         )
-        stage_1_conditionings = image_conditionings_by_replacing_latent(
-            images=images,
-            height=stage_1_output_shape.height,
-            width=stage_1_output_shape.width,
+        distilled_sigmas = self._distilled_sigmas()
+        video_latent, audio_latent = self._denoise_micro_batch(
+            "stage_2_denoise",
+            [item],
+            [0],
+            noisers,
+            sigmas=distilled_sigmas,
+            denoising_loop_fn=_distilled_denoising_loop(v_context_p, a_context_p, transformer),
             video_encoder=video_encoder,
-            dtype=dtype,
-            device=self.device,
-        )
-        video_state, audio_state = denoise_audio_video(
-            output_shape=stage_1_output_shape,
-            conditionings=stage_1_conditionings,
-            noiser=noiser,
-            sigmas=sigmas,
-            stepper=stepper,
-            denoising_loop_fn=first_stage_denoising_loop,
-            components=self.pipeline_components,
-            dtype=dtype,
-            device=self.device,
+            frame_rate=frame_rate,
+            noise_scale=distilled_sigmas[0],
+            initial_video_latent=upscaled_video_latent,
+            initial_audio_latent=audio_latent,
         )
 
         torch.cuda.synchronize()
+        self.stage_2_model_ledger.release(transformer, video_encoder)
         del transformer
+        del video_encoder
         cleanup_memory()
 
-        # Stage 2: Upsample and refine the video at higher resolution with distilled LORA.
-        upscaled_video_latent = upsample_video(
-            latent=video_state.latent[:1],
-            video_encoder=video_encoder,
-            upsampler=self.stage_2_model_ledger.spatial_upsampler(),
-        )
+        return self._decode(self.stage_2_model_ledger, video_latent, audio_latent, tiling_config)
+
+    @torch.inference_mode()
+    def generate_batch(
+        self,
+        items: list[BatchItem],
+        negative_prompt: str,
+        frame_rate: float,
+        num_inference_steps: int,
+        cfg_guidance_scale: float,
+        tiling_config: TilingConfig | None = None,
+        enhance_prompt: bool = False,
+        max_batch_size: int = 4,
+    ) -> Iterator[BatchOutput]:
+        """
+        Generate several items (prompt, seed, shape and image conditionings each) in one call.
+        Every model is loaded once and every distinct prompt encoded once. Items of the same shape are
+        denoised and upsampled together, in micro-batches of up to ``max_batch_size``. Once all items are
+        denoised, their outputs are yielded one by one, in micro-batch order (see ``BatchOutput.index``).
+        Each item matches an unbatched call with its seed; draft/final reuse is only available unbatched.
+        """
+        for item in items:
+            assert_resolution(height=item.height, width=item.width, is_two_stage=True)
+        batches = micro_batches([item.shape for item in items], max_batch_size)
+        noisers = [
+            GaussianNoiser(generator=torch.Generator(device=self.device).manual_seed(item.seed)) for item in items
+        ]
+        cfg_guider = CFGGuider(cfg_guidance_scale)
+
+        with stage("model_load"):
+            text_encoder = self.stage_1_model_ledger.text_encoder()
+        with stage("text_encode"):
+            prompts = [
+                generate_enhanced_prompt(
+                    text_encoder, item.prompt, item.images[0][0] if len(item.images) > 0 else None, seed=item.seed
+                )
+                if enhance_prompt
+                else item.prompt
+                for item in items
+            ]
+            contexts = encode_prompts(text_encoder, [*prompts, negative_prompt])
+        v_context_n, a_context_n = contexts[negative_prompt]
 
         torch.cuda.synchronize()
+        self.stage_1_model_ledger.release(text_encoder)
+        del text_encoder
         cleanup_memory()
 
-        transformer = self.stage_2_model_ledger.transformer()
-        distilled_sigmas = torch.Tensor(STAGE_2_DISTILLED_SIGMA_VALUES).to(self.device)
+        def positive_contexts(batch: list[int]) -> tuple[torch.Tensor, torch.Tensor]:
+            return (
+                torch.cat([contexts[prompts[i]][0] for i in batch]),
+                torch.cat([contexts[prompts[i]][1] for i in batch]),
+            )
 
-        def second_stage_denoising_loop(
-            sigmas: torch.Tensor, video_state: LatentState, audio_state: LatentState, stepper: DiffusionStepProtocol
-        ) -> tuple[LatentState, LatentState]:
-            return euler_denoising_loop(
-                sigmas=sigmas,
-                video_state=video_state,
-                audio_state=audio_state,
-                stepper=stepper,
-                denoise_fn=simple_denoising_func(
-                    video_context=v_context_p,
-                    audio_context=a_context_p,
-                    transformer=transformer,  # noqa: F821
-                ),
+        # Stage 1: Initial low resolution video generation.
+        with stage("model_load"):
+            video_encoder = self.stage_1_model_ledger.video_encoder()
+            transformer = self.stage_1_model_ledger.transformer()
+        sigmas = LTX2Scheduler().execute(steps=num_inference_steps).to(dtype=torch.float32, device=self.device)
+        latents = []
+        for batch in batches:
+            v_context_p, a_context_p = positive_contexts(batch)
+            denoising_loop_fn = _guided_denoising_loop(
+                cfg_guider,
+                v_context_p,
+                v_context_n.expand(len(batch), -1, -1),
+                a_context_p,
+                a_context_n.expand(len(batch), -1, -1),
+                transformer,
+            )
+            latents.append(
+                self._denoise_micro_batch(
+                    "stage_1_denoise",
+                    items,
+                    batch,
+                    noisers,
+                    sigmas=sigmas,
+                    denoising_loop_fn=denoising_loop_fn,
+                    video_encoder=video_encoder,
+                    frame_rate=frame_rate,
+                    scale=2,
+                )
             )
 
-        stage_2_output_shape = VideoPixelShape(batch=1, frames=num_frames, width=width, height=height, fps=frame_rate)
-        stage_2_conditionings = image_conditionings_by_replacing_latent(
-            images=images,
-            height=stage_2_output_shape.height,
-            width=stage_2_output_shape.width,
-            video_encoder=video_encoder,
-            dtype=dtype,
-            device=self.device,
-        )
-        video_state, audio_state = denoise_audio_video(
-            output_shape=stage_2_output_shape,
-            conditionings=stage_2_conditionings,
-            noiser=noiser,
-            sigmas=distilled_sigmas,
-            stepper=stepper,
-            denoising_loop_fn=second_stage_denoising_loop,
-            components=self.pipeline_components,
-            dtype=dtype,
-            device=self.device,
-            noise_scale=distilled_sigmas[0],
-            initial_video_latent=upscaled_video_latent,
-            initial_audio_latent=audio_state.latent,
+        torch.cuda.synchronize()
+        cleanup_memory()
+
+        # Stage 2: Upsample and refine the video at higher resolution with distilled LORA.
+        upscaled_video_latents, transformer = self._upsample(
+            [video_latent for video_latent, _ in latents], video_encoder=video_encoder, transformer=transformer
         )
+        distilled_sigmas = self._distilled_sigmas()
+        for n, batch in enumerate(batches):
+            v_context_p, a_context_p = positive_contexts(batch)
+            latents[n] = self._denoise_micro_batch(
+                "stage_2_denoise",
+                items,
+                batch,
+                noisers,
+                sigmas=distilled_sigmas,
+                denoising_loop_fn=_distilled_denoising_loop(v_context_p, a_context_p, transformer),
+                video_encoder=video_encoder,
+                frame_rate=frame_rate,
+                noise_scale=distilled_sigmas[0],
+                initial_video_latent=upscaled_video_latents[n],
+                initial_audio_latent=latents[n][1],
+            )
 
         torch.cuda.synchronize()
+        self.stage_2_model_ledger.release(transformer, video_encoder)
         del transformer
         del video_encoder
+        del upscaled_video_latents
         cleanup_memory()
 
-        decoded_video = vae_decode_video(video_state.latent, self.stage_2_model_ledger.video_decoder(), tiling_config)
-        decoded_audio = vae_decode_audio(
-            audio_state.latent, self.stage_2_model_ledger.audio_decoder(), self.stage_2_model_ledger.vocoder()
+        with stage("model_load"):
+            video_decoder = self.stage_2_model_ledger.video_decoder()
+            audio_decoder = self.stage_2_model_ledger.audio_decoder()
+            vocoder = self.stage_2_model_ledger.vocoder()
+        outputs = [
+            (index, video_latent[j : j + 1], audio_latent[j : j + 1])
+            for batch, (video_latent, audio_latent) in zip(batches, latents, strict=True)
+            for j, index in enumerate(batch)
+        ]
+        for n, (index, video_latent, audio_latent) in enumerate(outputs):
+            # Video tiles are decoded lazily while encoding (see encode_video); audio is decoded here.
+            decoded_video = vae_decode_video(video_latent, video_decoder, tiling_config)
+            if n == len(outputs) - 1:
+                # The video decoder stays leased until the last video has been decoded
+                decoded_video = self.stage_2_model_ledger.release_after(decoded_video, video_decoder)
+            with stage("vae_decode"):
+                decoded_audio = vae_decode_audio(audio_latent, audio_decoder, vocoder)
+            yield BatchOutput(index=index, video=decoded_video, audio=decoded_audio)
+        self.stage_2_model_ledger.release(audio_decoder, vocoder)
+
+    def _denoise_micro_batch(  # noqa: PLR0913
+        self,
+        stage_name: str,
+        items: list[BatchItem],
+        batch: list[int],
+        noisers: list[GaussianNoiser],
+        *,
+        sigmas: torch.Tensor,
+        denoising_loop_fn: DenoisingLoopFunc,
+        video_encoder: VideoEncoder,
+        frame_rate: float,
+        scale: int = 1,
+        noise_scale: float = 1.0,
+        initial_video_latent: torch.Tensor | None = None,
+        initial_audio_latent: torch.Tensor | None = None,
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """Denoise the items ``batch`` (indices into ``items``, all of one shape) at 1/``scale`` of their size."""
+        height, width, num_frames = items[batch[0]].shape
+        output_shape = VideoPixelShape(
+            batch=len(batch),
+            frames=num_frames,
+            width=width // scale,
+            height=height // scale,
+            fps=frame_rate,
         )
+        with stage(stage_name, steps=len(sigmas) - 1):
+            conditionings = [
+                image_conditionings_by_replacing_latent(
+                    images=items[i].images,
+                    height=output_shape.height,
+                    width=output_shape.width,
+                    video_encoder=video_encoder,
+                    dtype=self.dtype,
+                    device=self.device,
+                )
+                for i in batch
+            ]
+            video_state, audio_state = denoise_audio_video_batch(
+                output_shape=output_shape,
+                conditionings=conditionings,
+                noisers=[noisers[i] for i in batch],
+                sigmas=sigmas,
+                stepper=EulerDiffusionStep(),
+                denoising_loop_fn=denoising_loop_fn,
+                components=self.pipeline_components,
+                dtype=self.dtype,
+                device=self.device,
+                noise_scale=noise_scale,
+                initial_video_latent=initial_video_latent,
+                initial_audio_latent=initial_audio_latent,
+            )
+        return video_state.latent, audio_state.latent
+
+    def _upsample(
+        self, video_latents: list[torch.Tensor], *, video_encoder: VideoEncoder, transformer: X0Model | None
+    ) -> tuple[list[torch.Tensor], X0Model]:
+        """
+        Upsample stage 1 latents 2x and get the stage 2 transformer: the stage 1 one with the distilled LoRA
+        switched on, or a fresh load when stage 1 was not run in this call.
+        """
+        with stage("model_load"):
+            spatial_upsampler = self.stage_2_model_ledger.spatial_upsampler()
+        with stage("upsample"):
+            upscaled = [
+                upsample_video(latent=video_latent, video_encoder=video_encoder, upsampler=spatial_upsampler)
+                for video_latent in video_latents
+            ]
+        self.stage_2_model_ledger.release(spatial_upsampler)
+        del spatial_upsampler
 
+        torch.cuda.synchronize()
+        cleanup_memory()
+
+        with stage("model_load"):
+            if transformer is None:
+                transformer = self.stage_2_model_ledger.transformer()
+            else:
+                # Same base weights as stage 1: only the distilled LoRA adapters are switched on.
+                transformer = self.stage_2_model_ledger.switch_transformer(transformer)
+        return upscaled, transformer
+
+    def _distilled_sigmas(self) -> torch.Tensor:
+        return torch.Tensor(STAGE_2_DISTILLED_SIGMA_VALUES).to(self.device)
+
+    @staticmethod
+    def _decode(
+        model_ledger: ModelLedger,
+        video_latent: torch.Tensor,
+        audio_latent: torch.Tensor,
+        tiling_config: TilingConfig | None,
+    ) -> tuple[Iterator[torch.Tensor], torch.Tensor]:
+        with stage("model_load"):
+            video_decoder = model_ledger.video_decoder()
+            audio_decoder = model_ledger.audio_decoder()
+            vocoder = model_ledger.vocoder()
+        # Video tiles are decoded lazily while encoding (see encode_video); audio is decoded here.
+        decoded_video = model_ledger.release_after(
+            vae_decode_video(video_latent, video_decoder, tiling_config), video_decoder
+        )
+        with stage("vae_decode"):
+            decoded_audio = vae_decode_audio(audio_latent, audio_decoder, vocoder)
+        model_ledger.release(audio_decoder, vocoder)
         return decoded_video, decoded_audio
 
 
 @torch.inference_mode()
 def main() -> None:
     logging.getLogger().setLevel(logging.INFO)
-    parser = default_2_stage_arg_parser()
+    parser = ti2vid_2_stage_arg_parser()
     args = parser.parse_args()
-    pipeline = TI2VidTwoStagesPipeline(
-        checkpoint_path=args.checkpoint_path,
-        distilled_lora=args.distilled_lora,
-        spatial_upsampler_path=args.spatial_upsampler_path,
-        gemma_root=args.gemma_root,
-        loras=args.lora,
-        fp8transformer=args.enable_fp8,
-    )
-    tiling_config = TilingConfig.default()
-    video_chunks_number = get_video_chunks_number(args.num_frames, tiling_config)
-    video, audio = pipeline(
-        prompt=args.prompt,
-        negative_prompt=args.negative_prompt,
-        seed=args.seed,
-        height=args.height,
-        width=args.width,
-        num_frames=args.num_frames,
-        frame_rate=args.frame_rate,
-        num_inference_steps=args.num_inference_steps,
-        cfg_guidance_scale=args.cfg_guidance_scale,
-        images=args.images,
-        tiling_config=tiling_config,
-    )
+    with record_metrics(args.metrics_path, args.output_path):
+        pipeline = TI2VidTwoStagesPipeline(
+            checkpoint_path=args.checkpoint_path,
+            distilled_lora=args.distilled_lora,
+            spatial_upsampler_path=args.spatial_upsampler_path,
+            gemma_root=args.gemma_root,
+            loras=args.lora,
+            fp8transformer=args.enable_fp8,
+        )
+        tiling_config = TilingConfig.default()
+        video_chunks_number = get_video_chunks_number(args.num_frames, tiling_config)
+        video, audio = pipeline(
+            prompt=args.prompt,
+            negative_prompt=args.negative_prompt,
+            seed=args.seed,
+            height=args.height,
+            width=args.width,
+            num_frames=args.num_frames,
+            frame_rate=args.frame_rate,
+            num_inference_steps=args.num_inference_steps,
+            cfg_guidance_scale=args.cfg_guidance_scale,
+            images=args.images,
+            tiling_config=tiling_config,
+            stage_1_only=args.stage_1_only,
+            save_stage_1_path=args.save_stage_1,
+            resume_from_stage_1_path=args.resume_from_stage_1,
+        )
 
-    encode_video(
-        video=video,
-        fps=args.frame_rate,
-        audio=audio,
-        audio_sample_rate=AUDIO_SAMPLE_RATE,
-        output_path=args.output_path,
-        video_chunks_number=video_chunks_number,
-    )
+        encode_video(
+            video=video,
+            fps=args.frame_rate,
+            audio=audio,
+            audio_sample_rate=AUDIO_SAMPLE_RATE,
+            output_path=args.output_path,
+            video_chunks_number=video_chunks_number,
+            preset=args.x264_preset,
+            threads=args.x264_threads,
+        )
 
 
 if __name__ == "__main__":
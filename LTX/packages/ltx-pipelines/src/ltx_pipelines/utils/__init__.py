@@ -1,5 +1,7 @@
+from ltx_pipelines.utils.model_cache import ModelCache
 from ltx_pipelines.utils.model_ledger import ModelLedger
 
 __all__ = [
+    "ModelCache",
     "ModelLedger",
 ]
@@ -180,6 +180,24 @@ def basic_arg_parser() -> argparse.ArgumentParser:
         "Note that calculations are still performed in bfloat16 precision.",
     )
     parser.add_argument("--enhance-prompt", action="store_true")
+    parser.add_argument(
+        "--metrics-path",
+        type=resolve_path,
+        default=None,
+        help="Write render telemetry (wall time per stage, steps/sec, peak memory, output size) as JSON to this path.",
+    )
+    parser.add_argument(
+        "--x264-preset",
+        type=str,
+        default=None,
+        help="libx264 preset used to encode the output, e.g. veryfast or slow (default: libx264's medium).",
+    )
+    parser.add_argument(
+        "--x264-threads",
+        type=int,
+        default=None,
+        help="Number of libx264 encoder threads (default: automatic).",
+    )
     return parser
 
 
@@ -251,6 +269,31 @@ def default_2_stage_arg_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def ti2vid_2_stage_arg_parser() -> argparse.ArgumentParser:
+    parser = default_2_stage_arg_parser()
+    parser.add_argument(
+        "--stage-1-only",
+        action="store_true",
+        help="Stop after stage 1 and write the half resolution result (fast draft render).",
+    )
+    parser.add_argument(
+        "--save-stage-1",
+        type=resolve_path,
+        default=None,
+        help="Save stage 1 latents and text contexts to this path so a final render can resume from them.",
+    )
+    parser.add_argument(
+        "--resume-from-stage-1",
+        type=resolve_path,
+        default=None,
+        help=(
+            "Resume from stage 1 state saved by --save-stage-1, going straight to upsampling and stage 2. "
+            "Ignored (stage 1 is rendered) if the state was produced with different stage 1 parameters."
+        ),
+    )
+    return parser
+
+
 def default_2_stage_distilled_arg_parser() -> argparse.ArgumentParser:
     parser = basic_arg_parser()
     parser.set_defaults(height=DEFAULT_2_STAGE_HEIGHT, width=DEFAULT_2_STAGE_WIDTH)
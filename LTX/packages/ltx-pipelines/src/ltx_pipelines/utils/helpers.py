@@ -1,5 +1,6 @@
 import gc
 import logging
+from collections.abc import Hashable
 from dataclasses import replace
 
 import torch
@@ -10,7 +11,7 @@ from ltx_core.components.protocols import DiffusionStepProtocol, GuiderProtocol
 from ltx_core.conditioning import ConditioningItem, VideoConditionByKeyframeIndex, VideoConditionByLatentIndex
 from ltx_core.model.transformer import Modality, X0Model
 from ltx_core.model.video_vae import VideoEncoder
-from ltx_core.text_encoders.gemma import GemmaTextEncoderModelBase
+from ltx_core.text_encoders.gemma import GemmaTextEncoderModelBase, encode_text
 from ltx_core.tools import AudioLatentTools, LatentTools, VideoLatentTools
 from ltx_core.types import AudioLatentShape, LatentState, VideoLatentShape, VideoPixelShape
 from ltx_core.utils import to_denoised, to_velocity
@@ -338,6 +339,43 @@ def simple_denoising_func(
     return simple_denoising_step
 
 
+def stack_modalities(first: Modality, second: Modality) -> Modality:
+    """Stack two modalities along the batch dimension, so one transformer forward processes both.
+    Contexts of different lengths are zero-padded to the longer one and masked out through
+    ``context_mask``, so padding tokens receive no cross-attention.
+    """
+    context_len = max(first.context.shape[1], second.context.shape[1])
+    masked = (
+        first.context.shape[1] != second.context.shape[1]
+        or first.context_mask is not None
+        or second.context_mask is not None
+    )
+
+    def padded(modality: Modality) -> tuple[torch.Tensor, torch.Tensor | None]:
+        context = modality.context
+        pad = context_len - context.shape[1]
+        if not masked:
+            return context, None
+        mask = modality.context_mask
+        if mask is None:
+            mask = torch.ones(context.shape[:2], dtype=torch.long, device=context.device)
+        if pad:
+            context = torch.nn.functional.pad(context, (0, 0, 0, pad))
+            mask = torch.nn.functional.pad(mask, (0, pad))
+        return context, mask
+
+    first_context, first_mask = padded(first)
+    second_context, second_mask = padded(second)
+    return replace(
+        first,
+        latent=torch.cat([first.latent, second.latent]),
+        timesteps=torch.cat([first.timesteps, second.timesteps]),
+        positions=torch.cat([first.positions, second.positions]),
+        context=torch.cat([first_context, second_context]),
+        context_mask=torch.cat([first_mask, second_mask]) if masked else None,
+    )
+
+
 def guider_denoising_func(
     guider: GuiderProtocol,
     v_context_p: torch.Tensor,
@@ -345,24 +383,63 @@ def guider_denoising_func(
     a_context_p: torch.Tensor,
     a_context_n: torch.Tensor,
     transformer: X0Model,
+    batched: bool = True,
 ) -> DenoisingFunc:
+    """Denoising function applying the guider to a positive and a negative transformer pass.
+    With ``batched``, both passes run as one forward over the inputs stacked along the batch
+    dimension (see :func:`stack_modalities`), which reads the transformer weights once per step
+    instead of twice. If the batched forward runs out of device memory (or needs a context mask the
+    attention backend does not support), the function falls back to two sequential forwards for the
+    remaining steps.
+    """
+    use_batched = batched
+
+    def batched_forward(
+        pos_video: Modality, pos_audio: Modality, neg_video: Modality, neg_audio: Modality
+    ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+        video_batch = pos_video.latent.shape[0]
+        audio_batch = pos_audio.latent.shape[0]
+        denoised_video, denoised_audio = transformer(
+            video=stack_modalities(pos_video, neg_video),
+            audio=stack_modalities(pos_audio, neg_audio),
+            perturbations=None,
+        )
+        return (
+            denoised_video[:video_batch],
+            denoised_audio[:audio_batch],
+            denoised_video[video_batch:],
+            denoised_audio[audio_batch:],
+        )
+
     def guider_denoising_step(
         video_state: LatentState, audio_state: LatentState, sigmas: torch.Tensor, step_index: int
     ) -> tuple[torch.Tensor, torch.Tensor]:
+        nonlocal use_batched
         sigma = sigmas[step_index]
         pos_video = modality_from_latent_state(video_state, v_context_p, sigma)
         pos_audio = modality_from_latent_state(audio_state, a_context_p, sigma)
-
-        denoised_video, denoised_audio = transformer(video=pos_video, audio=pos_audio, perturbations=None)
-        if guider.enabled():
-            neg_video = modality_from_latent_state(video_state, v_context_n, sigma)
-            neg_audio = modality_from_latent_state(audio_state, a_context_n, sigma)
-
+        if not guider.enabled():
+            return transformer(video=pos_video, audio=pos_audio, perturbations=None)
+
+        neg_video = modality_from_latent_state(video_state, v_context_n, sigma)
+        neg_audio = modality_from_latent_state(audio_state, a_context_n, sigma)
+        outputs = None
+        if use_batched:
+            try:
+                outputs = batched_forward(pos_video, pos_audio, neg_video, neg_audio)
+            except (torch.cuda.OutOfMemoryError, NotImplementedError) as e:
+                # Out of memory, or a masked batch on an attention backend without mask support
+                logging.warning(f"Batched guidance forward failed ({e}), running the guidance passes sequentially")
+                use_batched = False
+                cleanup_memory()
+        if outputs is None:
+            denoised_video, denoised_audio = transformer(video=pos_video, audio=pos_audio, perturbations=None)
             neg_denoised_video, neg_denoised_audio = transformer(video=neg_video, audio=neg_audio, perturbations=None)
+        else:
+            denoised_video, denoised_audio, neg_denoised_video, neg_denoised_audio = outputs
 
-            denoised_video = denoised_video + guider.delta(denoised_video, neg_denoised_video)
-            denoised_audio = denoised_audio + guider.delta(denoised_audio, neg_denoised_audio)
-
+        denoised_video = denoised_video + guider.delta(denoised_video, neg_denoised_video)
+        denoised_audio = denoised_audio + guider.delta(denoised_audio, neg_denoised_audio)
         return denoised_video, denoised_audio
 
     return guider_denoising_step
@@ -418,6 +495,93 @@ def denoise_audio_video(  # noqa: PLR0913
     return video_state, audio_state
 
 
+def denoise_audio_video_batch(  # noqa: PLR0913
+    output_shape: VideoPixelShape,
+    conditionings: list[list[ConditioningItem]],
+    noisers: list[Noiser],
+    sigmas: torch.Tensor,
+    stepper: DiffusionStepProtocol,
+    denoising_loop_fn: DenoisingLoopFunc,
+    components: PipelineComponents,
+    dtype: torch.dtype,
+    device: torch.device,
+    noise_scale: float = 1.0,
+    initial_video_latent: torch.Tensor | None = None,
+    initial_audio_latent: torch.Tensor | None = None,
+) -> tuple[LatentState, LatentState]:
+    """Denoise a micro-batch of items sharing ``output_shape`` (whose ``batch`` is ignored).
+    Each item's states are created and noised on their own, with the item's conditionings and noiser,
+    so an item gets the same noise as in an unbatched :func:`denoise_audio_video` call. The states are
+    then stacked along the batch dimension and denoised together. The initial latents, if given, hold
+    one item per batch entry. The conditionings of all items must add the same number of tokens.
+    """
+    item_shape = output_shape._replace(batch=1)
+    video_states, audio_states = [], []
+    for i, (item_conditionings, noiser) in enumerate(zip(conditionings, noisers, strict=True)):
+        video_state, video_tools = noise_video_state(
+            output_shape=item_shape,
+            noiser=noiser,
+            conditionings=item_conditionings,
+            components=components,
+            dtype=dtype,
+            device=device,
+            noise_scale=noise_scale,
+            initial_latent=None if initial_video_latent is None else initial_video_latent[i : i + 1],
+        )
+        audio_state, audio_tools = noise_audio_state(
+            output_shape=item_shape,
+            noiser=noiser,
+            conditionings=[],
+            components=components,
+            dtype=dtype,
+            device=device,
+            noise_scale=noise_scale,
+            initial_latent=None if initial_audio_latent is None else initial_audio_latent[i : i + 1],
+        )
+        video_states.append(video_state)
+        audio_states.append(audio_state)
+
+    video_state, audio_state = denoising_loop_fn(
+        sigmas,
+        stack_latent_states(video_states),
+        stack_latent_states(audio_states),
+        stepper,
+    )
+
+    video_state = video_tools.clear_conditioning(video_state)
+    video_state = video_tools.unpatchify(video_state)
+    audio_state = audio_tools.clear_conditioning(audio_state)
+    audio_state = audio_tools.unpatchify(audio_state)
+
+    return video_state, audio_state
+
+
+def stack_latent_states(states: list[LatentState]) -> LatentState:
+    """Stack latent states with the same token count along the batch dimension."""
+    if len(states) == 1:
+        return states[0]
+    return LatentState(
+        latent=torch.cat([state.latent for state in states]),
+        denoise_mask=torch.cat([state.denoise_mask for state in states]),
+        positions=torch.cat([state.positions for state in states]),
+        clean_latent=torch.cat([state.clean_latent for state in states]),
+    )
+
+
+def micro_batches(keys: list[Hashable], max_batch_size: int) -> list[list[int]]:
+    """Group item indices by ``keys`` (in order of first appearance) into batches of at most ``max_batch_size``."""
+    if max_batch_size < 1:
+        raise ValueError(f"max_batch_size must be at least 1, got {max_batch_size}")
+    groups: dict[Hashable, list[int]] = {}
+    for index, key in enumerate(keys):
+        groups.setdefault(key, []).append(index)
+    return [
+        indices[start : start + max_batch_size]
+        for indices in groups.values()
+        for start in range(0, len(indices), max_batch_size)
+    ]
+
+
 _UNICODE_REPLACEMENTS = str.maketrans("\u2018\u2019\u201c\u201d\u2014\u2013\u00a0\u2032\u2212", "''\"\"-- '-")
 
 
@@ -432,6 +596,14 @@ def clean_response(text: str) -> str:
     return text
 
 
+def encode_prompts(
+    text_encoder: GemmaTextEncoderModelBase, prompts: list[str]
+) -> dict[str, tuple[torch.Tensor, torch.Tensor]]:
+    """Encode each distinct prompt once, mapping it to its (video context, audio context)."""
+    unique_prompts = list(dict.fromkeys(prompts))
+    return dict(zip(unique_prompts, encode_text(text_encoder, prompts=unique_prompts), strict=True))
+
+
 def generate_enhanced_prompt(
     text_encoder: GemmaTextEncoderModelBase,
     prompt: str,
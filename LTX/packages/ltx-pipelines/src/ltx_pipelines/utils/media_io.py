@@ -1,4 +1,8 @@
+import itertools
 import math
+import queue
+import threading
+import time
 from collections.abc import Generator, Iterator
 from fractions import Fraction
 from io import BytesIO
@@ -12,6 +16,7 @@ from torch._prims_common import DeviceLikeType
 from tqdm import tqdm
 
 from ltx_pipelines.utils.constants import DEFAULT_IMAGE_CRF
+from ltx_pipelines.utils.telemetry import current_metrics, timed_iter
 
 
 def resize_aspect_ratio_preserving(image: torch.Tensor, long_side: int) -> torch.Tensor:
@@ -179,6 +184,78 @@ def _resample_audio(
         container.mux(packet)
 
 
+class _PinnedStaging:
+    """Asynchronous device-to-host copies of video chunks into recycled pinned buffers."""
+
+    def __init__(self):
+        self._free: list[torch.Tensor] = []
+        self._lock = threading.Lock()
+
+    def stage(self, chunk: torch.Tensor) -> tuple[torch.Tensor, torch.cuda.Event | None]:
+        """Start copying ``chunk`` to the host; the copy is complete once the returned event is."""
+        if chunk.device.type != "cuda":
+            return chunk.cpu(), None
+        with self._lock:
+            index = next(
+                (i for i, b in enumerate(self._free) if b.shape == chunk.shape and b.dtype == chunk.dtype), None
+            )
+            buffer = self._free.pop(index) if index is not None else None
+        if buffer is None:
+            buffer = torch.empty(chunk.shape, dtype=chunk.dtype, pin_memory=True)
+        buffer.copy_(chunk, non_blocking=True)
+        ready = torch.cuda.Event()
+        ready.record()
+        return buffer, ready
+
+    def release(self, buffer: torch.Tensor) -> None:
+        if buffer.is_pinned():
+            with self._lock:
+                self._free.append(buffer)
+
+
+def _encode_chunks(
+    container: av.container.Container,
+    stream: av.video.VideoStream,
+    chunks: Iterator[torch.Tensor],
+    total: int,
+    queue_size: int,
+) -> None:
+    """Encode ``chunks`` on a worker thread while the next ones are produced on the calling thread."""
+    staging = _PinnedStaging()
+    staged: queue.Queue[tuple[torch.Tensor, torch.cuda.Event | None] | None] = queue.Queue(maxsize=queue_size)
+    errors: list[BaseException] = []
+
+    def encode_staged() -> None:
+        # Keeps draining after an error so the producer never blocks on a full queue.
+        while (item := staged.get()) is not None:
+            host_chunk, ready = item
+            try:
+                if not errors:
+                    if ready is not None:
+                        ready.synchronize()
+                    for frame_array in host_chunk.numpy():
+                        frame = av.VideoFrame.from_ndarray(frame_array, format="rgb24")
+                        for packet in stream.encode(frame):
+                            container.mux(packet)
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                staging.release(host_chunk)
+
+    encoder = threading.Thread(target=encode_staged, name="encode_video", daemon=True)
+    encoder.start()
+    try:
+        for chunk in tqdm(chunks, total=total):
+            if errors:
+                break
+            staged.put(staging.stage(chunk))
+    finally:
+        staged.put(None)
+        encoder.join()
+    if errors:
+        raise errors[0]
+
+
 def encode_video(
     video: torch.Tensor | Iterator[torch.Tensor],
     fps: int,
@@ -186,47 +263,61 @@ def encode_video(
     audio_sample_rate: int | None,
     output_path: str,
     video_chunks_number: int,
+    preset: str | None = None,
+    threads: int | None = None,
+    queue_size: int = 2,
 ) -> None:
+    """
+    Encode video chunks (and audio) to an H.264/AAC file.
+    ``video`` is typically the lazy iterator of the VAE decoder: chunks are pulled (decoded) on the
+    calling thread while a worker thread encodes the previous ones, so decoding and libx264 overlap.
+    At most ``queue_size`` chunks wait between the two; CUDA chunks are copied to recycled pinned host
+    buffers asynchronously, so the decoder does not wait for the transfer either.
+    ``preset`` and ``threads`` are passed to libx264 (by default its own: ``medium``, automatic threading).
+    """
     if isinstance(video, torch.Tensor):
         video = iter([video])
 
+    # Chunks are decoded lazily while encoding: charge their production to vae_decode, the rest
+    # (the part of encoding not hidden behind decoding) to mux.
+    metrics = current_metrics()
+    start = time.perf_counter()
+    decode_before = metrics.stages.get("vae_decode", 0.0) if metrics is not None else 0.0
+    video = timed_iter(video, "vae_decode")
+
     first_chunk = next(video)
 
     _, height, width, _ = first_chunk.shape
 
     container = av.open(output_path, mode="w")
-    stream = container.add_stream("libx264", rate=int(fps))
-    stream.width = width
-    stream.height = height
-    stream.pix_fmt = "yuv420p"
-
-    if audio is not None:
-        if audio_sample_rate is None:
-            raise ValueError("audio_sample_rate is required when audio is provided")
-
-        audio_stream = _prepare_audio_stream(container, audio_sample_rate)
-
-    def all_tiles(
-        first_chunk: torch.Tensor, tiles_generator: Generator[tuple[torch.Tensor, int], None, None]
-    ) -> Generator[tuple[torch.Tensor, int], None, None]:
-        yield first_chunk
-        yield from tiles_generator
-
-    for video_chunk in tqdm(all_tiles(first_chunk, video), total=video_chunks_number):
-        video_chunk_cpu = video_chunk.to("cpu").numpy()
-        for frame_array in video_chunk_cpu:
-            frame = av.VideoFrame.from_ndarray(frame_array, format="rgb24")
-            for packet in stream.encode(frame):
-                container.mux(packet)
-
-    # Flush encoder
-    for packet in stream.encode():
-        container.mux(packet)
+    try:
+        stream = container.add_stream("libx264", rate=int(fps), options={"preset": preset} if preset else None)
+        stream.width = width
+        stream.height = height
+        stream.pix_fmt = "yuv420p"
+        if threads:
+            stream.codec_context.thread_count = threads
+
+        if audio is not None:
+            if audio_sample_rate is None:
+                raise ValueError("audio_sample_rate is required when audio is provided")
+
+            audio_stream = _prepare_audio_stream(container, audio_sample_rate)
 
-    if audio is not None:
-        _write_audio(container, audio_stream, audio, audio_sample_rate)
+        _encode_chunks(container, stream, itertools.chain([first_chunk], video), video_chunks_number, queue_size)
+
+        # Flush encoder
+        for packet in stream.encode():
+            container.mux(packet)
+
+        if audio is not None:
+            _write_audio(container, audio_stream, audio, audio_sample_rate)
+    finally:
+        container.close()
 
-    container.close()
+    if metrics is not None:
+        decode_time = metrics.stages.get("vae_decode", 0.0) - decode_before
+        metrics.add("mux", time.perf_counter() - start - decode_time)
 
 
 def decode_audio_from_file(path: str, device: torch.device) -> torch.Tensor | None:
@@ -0,0 +1,197 @@
+import itertools
+import logging
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TypeVar
+
+import torch
+
+M = TypeVar("M", bound=torch.nn.Module)
+
+# Eviction order: lower priorities leave the device first, least recently used first within a priority.
+# The transformer (checkpoint load + LoRA fusing) is the most expensive component to rebuild, the text
+# encoder the largest one and only needed once per generation.
+COMPONENT_PRIORITIES = {
+    "transformer": 2,
+    "video_encoder": 1,
+    "video_decoder": 1,
+    "audio_decoder": 1,
+    "vocoder": 1,
+    "spatial_upsampler": 1,
+    "text_encoder": 0,
+}
+
+
+def module_nbytes(module: torch.nn.Module) -> int:
+    return sum(t.numel() * t.element_size() for t in itertools.chain(module.parameters(), module.buffers()))
+
+
+@dataclass
+class _Entry:
+    module: torch.nn.Module
+    nbytes: int
+    priority: int
+    on_device: bool
+    last_used: int
+    # Outstanding get() calls not yet matched by a release()
+    leases: int = 0
+
+
+class ModelCache:
+    """
+    Keeps built model components resident between generations, within a memory budget.
+    :class:`~ltx_pipelines.utils.ModelLedger` asks the cache for each component by a key covering
+    everything that determines its weights (builder kind and path, LoRA set, dtype, FP8 flag), so a
+    long-lived process calling a pipeline repeatedly builds every component once. Ledgers that share a
+    cache (e.g. the stage 1 and stage 2 ledgers of a pipeline, or pipelines of a worker) share the
+    components they have in common.
+    ### Eviction
+    When loading a component would exceed ``device_budget_bytes``, idle components are moved off the
+    device, lowest :data:`COMPONENT_PRIORITIES` first and least recently used first. They are kept in
+    pinned host memory (so moving them back is a fast asynchronous copy) up to ``host_budget_bytes``,
+    beyond which the least recently used host copies are dropped. Every :meth:`get` leases the component
+    until the matching :meth:`release` (or use :meth:`lease` as a context manager); components with an
+    outstanding lease are never moved, so the budget may be exceeded temporarily rather than breaking a
+    running stage. The size of a
+    component is only known once it was built, so before building one for the first time every idle
+    component is moved off the device (which matches the memory use of an uncached ledger).
+    ### Constructor parameters
+    device:
+        Device the components run on.
+    device_budget_bytes:
+        Bytes of resident components allowed on ``device``; ``None`` means no limit.
+    host_budget_bytes:
+        Bytes of components kept in host memory after leaving the device; ``None`` means no limit, ``0``
+        drops evicted components.
+    """
+
+    def __init__(
+        self,
+        device: torch.device,
+        device_budget_bytes: int | None = None,
+        host_budget_bytes: int | None = 0,
+    ):
+        self.device = torch.device(device)
+        self.device_budget_bytes = device_budget_bytes
+        self.host_budget_bytes = host_budget_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[Hashable, _Entry] = {}
+        # Sizes of components built before (also after they were dropped), used to make room up front.
+        self._sizes: dict[Hashable, int] = {}
+        self._clock = itertools.count()
+
+    def get(self, key: Hashable, build: Callable[[], M], priority: int = 0) -> M:
+        """
+        Return the cached component for ``key``, building it with ``build()`` on a miss. The component is
+        leased to the caller (kept on the device) until it is passed to :meth:`release`.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            if not entry.on_device:
+                self._make_room(entry.nbytes, exclude=key)
+                entry.module.to(self.device, non_blocking=True)
+                entry.on_device = True
+            entry.last_used = next(self._clock)
+            entry.leases += 1
+            return entry.module
+
+        self.misses += 1
+        self._make_room(self._sizes.get(key), exclude=key)
+        module = build()
+        nbytes = module_nbytes(module)
+        self._sizes[key] = nbytes
+        self._entries[key] = _Entry(
+            module=module, nbytes=nbytes, priority=priority, on_device=True, last_used=next(self._clock), leases=1
+        )
+        # Re-check now that the actual size is known (only matters on the first build of a component).
+        self._make_room(0, exclude=key)
+        return module
+
+    def release(self, *modules: torch.nn.Module | None) -> None:
+        """End one lease of each of ``modules`` (``None`` and modules the cache does not hold are ignored)."""
+        for module in modules:
+            for entry in self._entries.values():
+                if entry.module is module:
+                    entry.leases = max(0, entry.leases - 1)
+                    break
+
+    def resize(self, module: torch.nn.Module) -> None:
+        """Re-measure a cached component that grew or shrank in place (e.g. LoRA adapters were added to it)."""
+        for key, entry in self._entries.items():
+            if entry.module is module:
+                entry.nbytes = self._sizes[key] = module_nbytes(module)
+                break
+
+    @contextmanager
+    def lease(self, key: Hashable, build: Callable[[], M], priority: int = 0) -> Iterator[M]:
+        """:meth:`get` for the duration of a ``with`` block."""
+        module = self.get(key, build, priority)
+        try:
+            yield module
+        finally:
+            self.release(module)
+
+    def device_bytes(self) -> int:
+        return sum(e.nbytes for e in self._entries.values() if e.on_device)
+
+    def host_bytes(self) -> int:
+        return sum(e.nbytes for e in self._entries.values() if not e.on_device)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _in_use(self, entry: _Entry) -> bool:
+        return entry.leases > 0
+
+    def _make_room(self, nbytes: int | None, exclude: Hashable) -> None:
+        if self.device_budget_bytes is None:
+            return
+        used = self.device_bytes()
+        idle = sorted(
+            (
+                (key, entry)
+                for key, entry in self._entries.items()
+                if entry.on_device and key != exclude and not self._in_use(entry)
+            ),
+            key=lambda item: (item[1].priority, item[1].last_used),
+        )
+        for key, entry in idle:
+            if nbytes is not None and used + nbytes <= self.device_budget_bytes:
+                return
+            self._offload(key, entry, keep=exclude)
+            used -= entry.nbytes
+        if nbytes and used + nbytes > self.device_budget_bytes:
+            logging.info(
+                f"Model cache over budget: {(used + nbytes) / 1024**3:.1f} GiB of components in use on "
+                f"{self.device} (budget {self.device_budget_bytes / 1024**3:.1f} GiB)"
+            )
+
+    def _offload(self, key: Hashable, entry: _Entry, keep: Hashable) -> None:
+        """Move an idle component to (pinned) host memory, or drop it; ``keep`` is the one being loaded."""
+        host_budget = self.host_budget_bytes
+        if self.device.type == "cpu" or (host_budget is not None and entry.nbytes > host_budget):
+            del self._entries[key]
+            return
+        if host_budget is not None:
+            host_used = self.host_bytes() - (self._entries[keep].nbytes if keep in self._entries else 0)
+            stale = sorted(
+                ((k, e) for k, e in self._entries.items() if not e.on_device and k != keep and not self._in_use(e)),
+                key=lambda item: item[1].last_used,
+            )
+            for stale_key, stale_entry in stale:
+                if host_used + entry.nbytes <= host_budget:
+                    break
+                del self._entries[stale_key]
+                host_used -= stale_entry.nbytes
+            if host_used + entry.nbytes > host_budget:
+                del self._entries[key]
+                return
+
+        entry.module.to("cpu")
+        if torch.cuda.is_available():
+            for tensor in itertools.chain(entry.module.parameters(), entry.module.buffers()):
+                tensor.data = tensor.data.pin_memory()
+        entry.on_device = False
@@ -1,8 +1,11 @@
+from collections.abc import Callable, Hashable, Iterator
 from dataclasses import replace
+from typing import TypeVar
 
 import torch
 
-from ltx_core.loader.primitives import LoraPathStrengthAndSDOps
+from ltx_core.loader.lora_adapters import LoraAdapters
+from ltx_core.loader.primitives import LoraPathStrengthAndSDOps, LoraStateDictWithStrength
 from ltx_core.loader.registry import DummyRegistry, Registry
 from ltx_core.loader.single_gpu_model_builder import SingleGPUModelBuilder as Builder
 from ltx_core.model.audio_vae import (
@@ -35,6 +38,10 @@ from ltx_core.text_encoders.gemma import (
     AVGemmaTextEncoderModelConfigurator,
     module_ops_from_gemma_root,
 )
+from ltx_pipelines.utils.model_cache import COMPONENT_PRIORITIES, ModelCache
+
+M = TypeVar("M", bound=torch.nn.Module)
+T = TypeVar("T")
 
 
 class ModelLedger:
@@ -49,10 +56,12 @@ class ModelLedger:
     :class:`~ltx_core.loader.registry.Registry` to load weights from the checkpoint,
     instantiates the model with the configured ``dtype``, and moves it to ``self.device``.
     .. note::
-        Models are **not cached**. Each call to a model method creates a new instance.
-        Callers are responsible for storing references to models they wish to reuse
+        Without a ``cache``, models are **not cached**. Each call to a model method creates a new
+        instance. Callers are responsible for storing references to models they wish to reuse
         and for freeing GPU memory (e.g. by deleting references and calling
-        ``torch.cuda.empty_cache()``).
+        ``torch.cuda.empty_cache()``). With a :class:`~ltx_pipelines.utils.model_cache.ModelCache`,
+        repeated calls return the resident instance built for the same weights, LoRA set, dtype
+        and FP8 flag; callers :meth:`release` a model when done with it so the cache may evict it.
     ### Constructor parameters
     dtype:
         Torch dtype used when constructing all models (e.g. ``torch.bfloat16``).
@@ -78,9 +87,19 @@ class ModelLedger:
         Defaults to :class:`DummyRegistry` which performs no cross-builder caching.
     fp8transformer:
         If ``True``, builds the transformer with FP8 quantization and upcasting during inference.
+    cache:
+        Optional :class:`~ltx_pipelines.utils.model_cache.ModelCache` keeping built models
+        resident between calls, within its memory budget.
+    lora_adapters:
+        Optional LoRAs applied to the transformer as unfused, switchable adapters
+        (:class:`~ltx_core.loader.lora_adapters.LoraAdapters`) instead of being fused into its weights.
     ### Creating Variants
     Use :meth:`with_loras` to create a new ``ModelLedger`` instance that includes
-    additional LoRA configurations while sharing the same registry for weight caching.
+    additional LoRA configurations while sharing the same registry for weight caching
+    and the same model cache (components other than the transformer are shared).
+    Use :meth:`with_lora_adapters` for a variant whose extra LoRAs are adapters on the same base
+    transformer: :meth:`switch_transformer` moves a transformer built by one of the two ledgers to the
+    other's LoRA set in milliseconds, so e.g. stage 1 and stage 2 of a pipeline share one model.
     """
 
     def __init__(
@@ -93,6 +112,8 @@ class ModelLedger:
         loras: LoraPathStrengthAndSDOps | None = None,
         registry: Registry | None = None,
         fp8transformer: bool = False,
+        cache: ModelCache | None = None,
+        lora_adapters: LoraPathStrengthAndSDOps | None = None,
     ):
         self.dtype = dtype
         self.device = device
@@ -102,6 +123,8 @@ class ModelLedger:
         self.loras = loras or ()
         self.registry = registry or DummyRegistry()
         self.fp8transformer = fp8transformer
+        self.cache = cache
+        self.lora_adapters = lora_adapters or ()
         self.build_model_builders()
 
     def build_model_builders(self) -> None:
@@ -174,26 +197,112 @@ class ModelLedger:
             loras=(*self.loras, *loras),
             registry=self.registry,
             fp8transformer=self.fp8transformer,
+            cache=self.cache,
+            lora_adapters=self.lora_adapters,
+        )
+
+    def with_lora_adapters(self, loras: LoraPathStrengthAndSDOps) -> "ModelLedger":
+        return ModelLedger(
+            dtype=self.dtype,
+            device=self.device,
+            checkpoint_path=self.checkpoint_path,
+            gemma_root_path=self.gemma_root_path,
+            spatial_upsampler_path=self.spatial_upsampler_path,
+            loras=self.loras,
+            registry=self.registry,
+            fp8transformer=self.fp8transformer,
+            cache=self.cache,
+            lora_adapters=(*self.lora_adapters, *loras),
         )
 
+    def _cached(self, component: str, builder: Builder, build: Callable[[], M]) -> M:
+        if self.cache is None:
+            return build()
+        key: Hashable = (
+            component,
+            builder.model_path,
+            self.gemma_root_path if component == "text_encoder" else None,
+            tuple((lora.path, lora.strength) for lora in builder.loras),
+            str(self.dtype),
+            self.fp8transformer and component == "transformer",
+            str(self.device),
+        )
+        return self.cache.get(key, build, priority=COMPONENT_PRIORITIES.get(component, 0))
+
+    def release(self, *models: torch.nn.Module | None) -> None:
+        """Hand models back to the cache so it may move them off the device (a no-op without a cache)."""
+        if self.cache is not None:
+            self.cache.release(*models)
+
+    def release_after(self, frames: Iterator[T], *models: torch.nn.Module | None) -> Iterator[T]:
+        """Yield ``frames``, then :meth:`release` ``models`` (e.g. the decoder of a lazily decoded video)."""
+        try:
+            yield from frames
+        finally:
+            self.release(*models)
+
     def transformer(self) -> X0Model:
         if not hasattr(self, "transformer_builder"):
             raise ValueError(
                 "Transformer not initialized. Please provide a checkpoint path to the ModelLedger constructor."
             )
+        transformer = self._cached("transformer", self.transformer_builder, self._build_transformer)
+        # A cached transformer may come with another ledger's adapters active
+        self._activate_adapters(transformer)
+        return transformer
+
+    def switch_transformer(self, transformer: X0Model) -> X0Model:
+        """
+        Re-target a transformer built by a ledger with the same base weights (e.g. the other stage of
+        a pipeline, see :meth:`with_lora_adapters`) to this ledger's LoRA adapters, without rebuilding it.
+        """
+        adapters = LoraAdapters.of(transformer.velocity_model)
+        if adapters.base != self._transformer_base():
+            raise ValueError("Transformer was built with different base weights, LoRAs or precision")
+        self._activate_adapters(transformer)
+        return transformer
+
+    def _transformer_base(self) -> tuple:
+        return (
+            self.checkpoint_path,
+            tuple((lora.path, lora.strength) for lora in self.loras),
+            str(self.dtype),
+            self.fp8transformer,
+        )
+
+    def _activate_adapters(self, transformer: X0Model) -> None:
+        adapters = LoraAdapters.of(transformer.velocity_model)
+        names = []
+        for lora in self.lora_adapters:
+            name = f"{lora.path}@{lora.strength}"
+            if name not in adapters:
+                lora_sd = self.transformer_builder.load_sd(
+                    [lora.path], registry=self.registry, device=self.device, sd_ops=lora.sd_ops
+                )
+                adapters.add(name, [LoraStateDictWithStrength(lora_sd, lora.strength)], self.dtype, self.device)
+                if self.cache is not None:
+                    # The adapter factors are buffers of the transformer: they count towards its budget
+                    self.cache.resize(transformer)
+            names.append(name)
+        if tuple(names) != adapters.active:
+            adapters.activate(*names)
+
+    def _build_transformer(self) -> X0Model:
         if self.fp8transformer:
             fp8_builder = replace(
                 self.transformer_builder,
                 module_ops=(UPCAST_DURING_INFERENCE,),
                 model_sd_ops=LTXV_MODEL_COMFY_RENAMING_WITH_TRANSFORMER_LINEAR_DOWNCAST_MAP,
             )
-            return X0Model(fp8_builder.build(device=self._target_device())).to(self.device).eval()
+            transformer = X0Model(fp8_builder.build(device=self._target_device())).to(self.device).eval()
         else:
-            return (
+            transformer = (
                 X0Model(self.transformer_builder.build(device=self._target_device(), dtype=self.dtype))
                 .to(self.device)
                 .eval()
             )
+        LoraAdapters.of(transformer.velocity_model).base = self._transformer_base()
+        return transformer
 
     def video_decoder(self) -> VideoDecoder:
         if not hasattr(self, "vae_decoder_builder"):
@@ -201,7 +310,13 @@ class ModelLedger:
                 "Video decoder not initialized. Please provide a checkpoint path to the ModelLedger constructor."
             )
 
-        return self.vae_decoder_builder.build(device=self._target_device(), dtype=self.dtype).to(self.device).eval()
+        return self._cached(
+            "video_decoder",
+            self.vae_decoder_builder,
+            lambda: self.vae_decoder_builder.build(device=self._target_device(), dtype=self.dtype)
+            .to(self.device)
+            .eval(),
+        )
 
     def video_encoder(self) -> VideoEncoder:
         if not hasattr(self, "vae_encoder_builder"):
@@ -209,7 +324,13 @@ class ModelLedger:
                 "Video encoder not initialized. Please provide a checkpoint path to the ModelLedger constructor."
             )
 
-        return self.vae_encoder_builder.build(device=self._target_device(), dtype=self.dtype).to(self.device).eval()
+        return self._cached(
+            "video_encoder",
+            self.vae_encoder_builder,
+            lambda: self.vae_encoder_builder.build(device=self._target_device(), dtype=self.dtype)
+            .to(self.device)
+            .eval(),
+        )
 
     def text_encoder(self) -> AVGemmaTextEncoderModel:
         if not hasattr(self, "text_encoder_builder"):
@@ -218,7 +339,13 @@ class ModelLedger:
                 "ModelLedger constructor."
             )
 
-        return self.text_encoder_builder.build(device=self._target_device(), dtype=self.dtype).to(self.device).eval()
+        return self._cached(
+            "text_encoder",
+            self.text_encoder_builder,
+            lambda: self.text_encoder_builder.build(device=self._target_device(), dtype=self.dtype)
+            .to(self.device)
+            .eval(),
+        )
 
     def audio_decoder(self) -> AudioDecoder:
         if not hasattr(self, "audio_decoder_builder"):
@@ -226,7 +353,13 @@ class ModelLedger:
                 "Audio decoder not initialized. Please provide a checkpoint path to the ModelLedger constructor."
             )
 
-        return self.audio_decoder_builder.build(device=self._target_device(), dtype=self.dtype).to(self.device).eval()
+        return self._cached(
+            "audio_decoder",
+            self.audio_decoder_builder,
+            lambda: self.audio_decoder_builder.build(device=self._target_device(), dtype=self.dtype)
+            .to(self.device)
+            .eval(),
+        )
 
     def vocoder(self) -> Vocoder:
         if not hasattr(self, "vocoder_builder"):
@@ -234,10 +367,18 @@ class ModelLedger:
                 "Vocoder not initialized. Please provide a checkpoint path to the ModelLedger constructor."
             )
 
-        return self.vocoder_builder.build(device=self._target_device(), dtype=self.dtype).to(self.device).eval()
+        return self._cached(
+            "vocoder",
+            self.vocoder_builder,
+            lambda: self.vocoder_builder.build(device=self._target_device(), dtype=self.dtype).to(self.device).eval(),
+        )
 
     def spatial_upsampler(self) -> LatentUpsampler:
         if not hasattr(self, "upsampler_builder"):
             raise ValueError("Upsampler not initialized. Please provide upsampler path to the ModelLedger constructor.")
 
-        return self.upsampler_builder.build(device=self._target_device(), dtype=self.dtype).to(self.device).eval()
+        return self._cached(
+            "spatial_upsampler",
+            self.upsampler_builder,
+            lambda: self.upsampler_builder.build(device=self._target_device(), dtype=self.dtype).to(self.device).eval(),
+        )
@@ -0,0 +1,140 @@
+import json
+import logging
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import TypeVar
+
+import torch
+
+# Bump when the sidecar layout changes.
+METRICS_VERSION = 1
+
+T = TypeVar("T")
+
+
+class RenderMetrics:
+    """
+    Telemetry of one render: wall time per stage, denoising throughput, peak memory and output size.
+    Stages with the same name accumulate (e.g. every ``model_load`` of a run adds up). Timings
+    synchronize CUDA at the stage boundaries so asynchronous kernels are charged to the right stage.
+    ### Stages
+    ``model_load``, ``text_encode``, ``stage_1_denoise``, ``upsample``, ``stage_2_denoise``,
+    ``vae_decode`` and ``mux``. VAE decoding is lazy (tiles are decoded while the video is encoded),
+    so :func:`ltx_pipelines.utils.media_io.encode_video` splits that time between ``vae_decode`` and ``mux``
+    (the encoding time not overlapped with decoding).
+    """
+
+    def __init__(self):
+        self.stages: dict[str, float] = {}
+        self.steps: dict[str, int] = {}
+        self._start = time.perf_counter()
+        if torch.cuda.is_available():
+            torch.cuda.reset_peak_memory_stats()
+
+    def add(self, name: str, seconds: float, steps: int = 0) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+        if steps:
+            self.steps[name] = self.steps.get(name, 0) + steps
+
+    @contextmanager
+    def stage(self, name: str, steps: int = 0) -> Iterator[None]:
+        _synchronize()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            _synchronize()
+            self.add(name, time.perf_counter() - start, steps)
+
+    def to_dict(self, output_path: str | None = None) -> dict:
+        steps_per_sec = {
+            name: steps / self.stages[name] for name, steps in self.steps.items() if self.stages.get(name, 0.0) > 0
+        }
+        output_bytes = None
+        if output_path and Path(output_path).is_file():
+            output_bytes = Path(output_path).stat().st_size
+        return {
+            "version": METRICS_VERSION,
+            "wall_time": time.perf_counter() - self._start,
+            "stages": self.stages,
+            "steps": self.steps,
+            "steps_per_sec": steps_per_sec,
+            "peak_rss_bytes": _peak_rss_bytes(),
+            "peak_gpu_bytes": torch.cuda.max_memory_allocated() if torch.cuda.is_available() else None,
+            "output_bytes": output_bytes,
+        }
+
+
+_current: ContextVar[RenderMetrics | None] = ContextVar("ltx_render_metrics", default=None)
+
+
+def _synchronize() -> None:
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+
+
+def _peak_rss_bytes() -> int | None:
+    """Peak resident set size of this process (for a long-lived worker: since the worker started)."""
+    try:
+        import resource  # noqa: PLC0415
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def current_metrics() -> RenderMetrics | None:
+    return _current.get()
+
+
+@contextmanager
+def stage(name: str, steps: int = 0) -> Iterator[None]:
+    """Time a pipeline stage into the active :class:`RenderMetrics`; a no-op when none is recording."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    with metrics.stage(name, steps):
+        yield
+
+
+def timed_iter(iterator: Iterator[T], name: str) -> Iterator[T]:
+    """Charge the time spent producing each item of a lazy ``iterator`` to stage ``name``."""
+    metrics = _current.get()
+    if metrics is None:
+        yield from iterator
+        return
+    while True:
+        with metrics.stage(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+@contextmanager
+def record_metrics(metrics_path: str | None, output_path: str | None = None) -> Iterator[RenderMetrics | None]:
+    """
+    Collect :class:`RenderMetrics` for the enclosed render and write them as JSON to ``metrics_path``
+    once it succeeds. Does nothing when ``metrics_path`` is not set.
+    """
+    if not metrics_path:
+        yield None
+        return
+    metrics = RenderMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+    Path(metrics_path).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{metrics_path}.tmp"
+    Path(tmp_path).write_text(json.dumps(metrics.to_dict(output_path), indent=2))
+    Path(tmp_path).replace(metrics_path)
+    logging.info(f"Render metrics written to {metrics_path}")
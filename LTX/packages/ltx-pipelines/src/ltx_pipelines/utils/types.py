@@ -1,4 +1,6 @@
-from typing import Protocol
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import NamedTuple, Protocol
 
 import torch
 
@@ -71,3 +73,43 @@ class DenoisingLoopFunc(Protocol):
         audio_state: LatentState,
         stepper: DiffusionStepProtocol,
     ) -> tuple[torch.Tensor, torch.Tensor]: ...
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    """
+    One generation of a batched pipeline call (e.g. :meth:`ltx_pipelines.distilled.DistilledPipeline.generate_batch`).
+    Attributes:
+        prompt (str): Text prompt.
+        seed (int): Noise seed; the item gets the same noise as an unbatched call with this seed.
+        height (int): Output height in pixels.
+        width (int): Output width in pixels.
+        num_frames (int): Number of output frames.
+        images (list[tuple[str, int, float]]): Image conditionings as (path, frame index, strength).
+    """
+
+    prompt: str
+    seed: int
+    height: int
+    width: int
+    num_frames: int
+    images: list[tuple[str, int, float]] = field(default_factory=list)
+
+    @property
+    def shape(self) -> tuple[int, int, int]:
+        """Items with the same shape can share a micro-batch."""
+        return (self.height, self.width, self.num_frames)
+
+
+class BatchOutput(NamedTuple):
+    """
+    Output of one :class:`BatchItem`.
+    Attributes:
+        index (int): Position of the item in the batched call's ``items``.
+        video (Iterator[torch.Tensor]): Lazily decoded video chunks, as returned by the unbatched call.
+        audio (torch.Tensor): Decoded audio waveform.
+    """
+
+    index: int
+    video: Iterator[torch.Tensor]
+    audio: torch.Tensor
@@ -0,0 +1,300 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import traceback
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import IO, Any
+
+import torch
+
+from ltx_core.model.video_vae import TilingConfig, get_video_chunks_number
+from ltx_pipelines.distilled import DistilledPipeline
+from ltx_pipelines.ti2vid_one_stage import TI2VidOneStagePipeline
+from ltx_pipelines.ti2vid_two_stages import TI2VidTwoStagesPipeline
+from ltx_pipelines.utils import ModelCache
+from ltx_pipelines.utils.args import (
+    default_1_stage_arg_parser,
+    default_2_stage_distilled_arg_parser,
+    ti2vid_2_stage_arg_parser,
+)
+from ltx_pipelines.utils.constants import AUDIO_SAMPLE_RATE
+from ltx_pipelines.utils.helpers import get_device
+from ltx_pipelines.utils.media_io import encode_video
+from ltx_pipelines.utils.telemetry import record_metrics
+
+PROTOCOL_VERSION = 1
+
+
+@dataclass(frozen=True)
+class WorkerPipelineSpec:
+    """
+    Describes how the worker serves jobs for one pipeline module.
+    Attributes:
+        parser: Factory for the module's CLI argument parser; jobs carry the same argv as ``python -m <module>``.
+        pipeline_keys: Parsed argument names that select the pipeline instance (weights, LoRAs, precision).
+            Jobs that agree on these reuse the same warm pipeline object.
+        build: Constructs the pipeline from parsed arguments and the worker's model cache (if any).
+        generate: Runs one generation on a built pipeline and returns the decoded video iterator, the decoded
+            audio and the number of video chunks.
+    """
+
+    parser: Callable[[], argparse.ArgumentParser]
+    pipeline_keys: tuple[str, ...]
+    build: Callable[[argparse.Namespace, ModelCache | None], Any]
+    generate: Callable[[Any, argparse.Namespace], tuple[Iterator[torch.Tensor], torch.Tensor, int]]
+
+
+def _generate_two_stages(
+    pipeline: TI2VidTwoStagesPipeline, args: argparse.Namespace
+) -> tuple[Iterator[torch.Tensor], torch.Tensor, int]:
+    tiling_config = TilingConfig.default()
+    video, audio = pipeline(
+        prompt=args.prompt,
+        negative_prompt=args.negative_prompt,
+        seed=args.seed,
+        height=args.height,
+        width=args.width,
+        num_frames=args.num_frames,
+        frame_rate=args.frame_rate,
+        num_inference_steps=args.num_inference_steps,
+        cfg_guidance_scale=args.cfg_guidance_scale,
+        images=args.images,
+        tiling_config=tiling_config,
+        enhance_prompt=args.enhance_prompt,
+        stage_1_only=args.stage_1_only,
+        save_stage_1_path=args.save_stage_1,
+        resume_from_stage_1_path=args.resume_from_stage_1,
+    )
+    return video, audio, get_video_chunks_number(args.num_frames, tiling_config)
+
+
+def _generate_one_stage(
+    pipeline: TI2VidOneStagePipeline, args: argparse.Namespace
+) -> tuple[Iterator[torch.Tensor], torch.Tensor, int]:
+    video, audio = pipeline(
+        prompt=args.prompt,
+        negative_prompt=args.negative_prompt,
+        seed=args.seed,
+        height=args.height,
+        width=args.width,
+        num_frames=args.num_frames,
+        frame_rate=args.frame_rate,
+        num_inference_steps=args.num_inference_steps,
+        cfg_guidance_scale=args.cfg_guidance_scale,
+        images=args.images,
+        enhance_prompt=args.enhance_prompt,
+    )
+    return video, audio, 1
+
+
+def _generate_distilled(
+    pipeline: DistilledPipeline, args: argparse.Namespace
+) -> tuple[Iterator[torch.Tensor], torch.Tensor, int]:
+    tiling_config = TilingConfig.default()
+    video, audio = pipeline(
+        prompt=args.prompt,
+        seed=args.seed,
+        height=args.height,
+        width=args.width,
+        num_frames=args.num_frames,
+        frame_rate=args.frame_rate,
+        images=args.images,
+        tiling_config=tiling_config,
+        enhance_prompt=args.enhance_prompt,
+    )
+    return video, audio, get_video_chunks_number(args.num_frames, tiling_config)
+
+
+WORKER_PIPELINES: dict[str, WorkerPipelineSpec] = {
+    "ltx_pipelines.ti2vid_two_stages": WorkerPipelineSpec(
+        parser=ti2vid_2_stage_arg_parser,
+        pipeline_keys=(
+            "checkpoint_path",
+            "distilled_lora",
+            "spatial_upsampler_path",
+            "gemma_root",
+            "lora",
+            "enable_fp8",
+        ),
+        build=lambda args, model_cache: TI2VidTwoStagesPipeline(
+            checkpoint_path=args.checkpoint_path,
+            distilled_lora=args.distilled_lora,
+            spatial_upsampler_path=args.spatial_upsampler_path,
+            gemma_root=args.gemma_root,
+            loras=args.lora,
+            fp8transformer=args.enable_fp8,
+            model_cache=model_cache,
+        ),
+        generate=_generate_two_stages,
+    ),
+    "ltx_pipelines.ti2vid_one_stage": WorkerPipelineSpec(
+        parser=default_1_stage_arg_parser,
+        pipeline_keys=("checkpoint_path", "gemma_root", "lora", "enable_fp8"),
+        build=lambda args, model_cache: TI2VidOneStagePipeline(
+            checkpoint_path=args.checkpoint_path,
+            gemma_root=args.gemma_root,
+            loras=args.lora,
+            fp8transformer=args.enable_fp8,
+            model_cache=model_cache,
+        ),
+        generate=_generate_one_stage,
+    ),
+    "ltx_pipelines.distilled": WorkerPipelineSpec(
+        parser=default_2_stage_distilled_arg_parser,
+        pipeline_keys=("checkpoint_path", "spatial_upsampler_path", "gemma_root", "lora", "enable_fp8"),
+        build=lambda args, model_cache: DistilledPipeline(
+            checkpoint_path=args.checkpoint_path,
+            spatial_upsampler_path=args.spatial_upsampler_path,
+            gemma_root=args.gemma_root,
+            loras=args.lora,
+            fp8transformer=args.enable_fp8,
+            model_cache=model_cache,
+        ),
+        generate=_generate_distilled,
+    ),
+}
+
+
+class RenderWorker:
+    """
+    Long-lived render worker that keeps pipelines resident between jobs.
+    Each pipeline module listed in :data:`WORKER_PIPELINES` is instantiated once per distinct set of
+    ``pipeline_keys`` and reused for every subsequent job, so torch import, ledger construction and
+    model builder setup are paid once per process instead of once per clip. With a ``model_cache``, the
+    built models themselves stay resident too (shared by every pipeline of the worker), so back-to-back
+    jobs skip checkpoint loading and LoRA fusing within the cache's memory budget.
+    ### Protocol
+    The worker reads one JSON object per line from ``stdin``::
+        {"id": "...", "module": "ltx_pipelines.distilled", "args": ["--prompt", "...", ...]}
+    and answers with one JSON object per line on the protocol stream::
+        {"id": "...", "ok": true, "output_path": "/abs/out.mp4"}
+        {"id": "...", "ok": false, "error": "...", "unsupported": false}
+    ``unsupported`` is ``true`` when the module cannot be served by the worker (the caller should fall back
+    to ``python -m <module>``). A ``{"op": "ping"}`` request is answered with the protocol version and the
+    supported modules; ``{"op": "shutdown"}`` or EOF stops the worker.
+    """
+
+    def __init__(self, max_resident_pipelines: int = 1, model_cache: ModelCache | None = None):
+        self.max_resident_pipelines = max_resident_pipelines
+        self.model_cache = model_cache
+        self._pipelines: dict[tuple, Any] = {}
+
+    def _pipeline_for(self, module: str, spec: WorkerPipelineSpec, args: argparse.Namespace) -> Any:  # noqa: ANN401
+        key = (module, *(repr(getattr(args, name)) for name in spec.pipeline_keys))
+        pipeline = self._pipelines.pop(key, None)
+        if pipeline is None:
+            while len(self._pipelines) >= self.max_resident_pipelines:
+                # Drop the least recently used pipeline (dict preserves insertion order).
+                self._pipelines.pop(next(iter(self._pipelines)))
+            logging.info(f"Building pipeline for {module}")
+            pipeline = spec.build(args, self.model_cache)
+        self._pipelines[key] = pipeline
+        return pipeline
+
+    @torch.inference_mode()
+    def run_job(self, module: str, argv: list[str]) -> str:
+        spec = WORKER_PIPELINES[module]
+        args = spec.parser().parse_args(argv)
+        with record_metrics(args.metrics_path, args.output_path):
+            pipeline = self._pipeline_for(module, spec, args)
+            video, audio, video_chunks_number = spec.generate(pipeline, args)
+            encode_video(
+                video=video,
+                fps=args.frame_rate,
+                audio=audio,
+                audio_sample_rate=AUDIO_SAMPLE_RATE,
+                output_path=args.output_path,
+                video_chunks_number=video_chunks_number,
+                preset=args.x264_preset,
+                threads=args.x264_threads,
+            )
+        return args.output_path
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        job_id = request.get("id")
+        op = request.get("op", "render")
+        if op == "ping":
+            return {"id": job_id, "ok": True, "version": PROTOCOL_VERSION, "modules": sorted(WORKER_PIPELINES)}
+
+        module = request.get("module")
+        if module not in WORKER_PIPELINES:
+            return {"id": job_id, "ok": False, "unsupported": True, "error": f"Unsupported module: {module}"}
+
+        try:
+            output_path = self.run_job(module, list(request.get("args") or []))
+        except SystemExit as e:
+            # argparse exits on invalid arguments; report instead of terminating the worker.
+            return {"id": job_id, "ok": False, "unsupported": False, "error": f"Invalid arguments (exit {e.code})"}
+        except Exception as e:
+            logging.error(traceback.format_exc())
+            return {"id": job_id, "ok": False, "unsupported": False, "error": f"{type(e).__name__}: {e}"}
+        return {"id": job_id, "ok": True, "output_path": output_path}
+
+    def serve(self, requests: IO[str], responses: IO[str]) -> None:
+        for raw_line in requests:
+            line = raw_line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                response = {"id": None, "ok": False, "unsupported": False, "error": f"Malformed request: {e}"}
+            else:
+                if request.get("op") == "shutdown":
+                    break
+                response = self.handle(request)
+            responses.write(json.dumps(response) + "\n")
+            responses.flush()
+
+
+def _env_float(name: str) -> float | None:
+    value = os.environ.get(name, "").strip()
+    return float(value) if value else None
+
+
+def main() -> None:
+    logging.getLogger().setLevel(logging.INFO)
+    parser = argparse.ArgumentParser(description="Serve LTX-2 pipeline jobs over stdin/stdout (JSON lines).")
+    parser.add_argument(
+        "--max-resident-pipelines",
+        type=int,
+        default=1,
+        help="Number of distinct pipeline configurations kept alive at once (default: 1).",
+    )
+    parser.add_argument(
+        "--model-cache-gb",
+        type=float,
+        default=_env_float("LTX_MODEL_CACHE_GB"),
+        help="Keep built models resident between jobs within this many GiB of device memory "
+        "(default: $LTX_MODEL_CACHE_GB, unset = no model cache).",
+    )
+    parser.add_argument(
+        "--model-cache-host-gb",
+        type=float,
+        default=_env_float("LTX_MODEL_CACHE_HOST_GB") or 0.0,
+        help="GiB of pinned host memory for models evicted from the device "
+        "(default: $LTX_MODEL_CACHE_HOST_GB or 0, evicted models are dropped).",
+    )
+    args = parser.parse_args()
+
+    model_cache = None
+    if args.model_cache_gb is not None:
+        model_cache = ModelCache(
+            device=get_device(),
+            device_budget_bytes=int(args.model_cache_gb * 1024**3),
+            host_budget_bytes=int(args.model_cache_host_gb * 1024**3),
+        )
+
+    # Keep the protocol stream clean: anything the pipelines print goes to stderr.
+    protocol_stream = sys.stdout
+    sys.stdout = sys.stderr
+    RenderWorker(max_resident_pipelines=args.max_resident_pipelines, model_cache=model_cache).serve(
+        sys.stdin, protocol_stream
+    )
+
+
+if __name__ == "__main__":
+    main()
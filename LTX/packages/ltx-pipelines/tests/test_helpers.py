@@ -0,0 +1,181 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("av")
+
+from ltx_core.components.diffusion_steps import EulerDiffusionStep  # noqa: E402
+from ltx_core.components.guiders import CFGGuider  # noqa: E402
+from ltx_core.components.noisers import GaussianNoiser  # noqa: E402
+from ltx_core.components.protocols import DiffusionStepProtocol  # noqa: E402
+from ltx_core.model.transformer import Modality  # noqa: E402
+from ltx_core.types import LatentState, VideoPixelShape  # noqa: E402
+from ltx_pipelines.utils import helpers  # noqa: E402
+from ltx_pipelines.utils.helpers import (  # noqa: E402
+    denoise_audio_video,
+    denoise_audio_video_batch,
+    euler_denoising_loop,
+    guider_denoising_func,
+    micro_batches,
+    stack_latent_states,
+)
+from ltx_pipelines.utils.types import PipelineComponents  # noqa: E402
+
+DIM = 4
+
+
+class StubTransformer:
+    """
+    Per-sample stand-in for the X0 transformer: scales the latent by its timestep and adds the mean of the
+    unmasked context tokens, so outputs depend on the context mask but not on what else is in the batch.
+    """
+
+    def __init__(self, error: type[Exception] | None = None):
+        # Raised by batched (multi-sample) forwards, like an attention backend without mask support
+        self.error = error
+        self.batch_sizes: list[int] = []
+        self.masked: list[bool] = []
+
+    def __call__(self, video: Modality, audio: Modality, perturbations: None) -> tuple[torch.Tensor, torch.Tensor]:
+        assert perturbations is None
+        self.batch_sizes.append(video.latent.shape[0])
+        self.masked.append(video.context_mask is not None)
+        if self.error is not None and video.latent.shape[0] > 1:
+            raise self.error("batched forward unavailable")
+        return self._denoise(video), self._denoise(audio)
+
+    @staticmethod
+    def _denoise(modality: Modality) -> torch.Tensor:
+        context, mask = modality.context, modality.context_mask
+        if mask is None:
+            mask = torch.ones(context.shape[:2])
+        pooled = (context * mask[..., None]).sum(dim=1) / mask.sum(dim=1, keepdim=True)
+        timestep = modality.timesteps.reshape(modality.latent.shape[0], -1).mean(dim=1)
+        return modality.latent * (1 - timestep[:, None, None]) + pooled[:, None, :]
+
+
+def _state(tokens: int, seed: int) -> LatentState:
+    generator = torch.Generator().manual_seed(seed)
+    latent = torch.randn(1, tokens, DIM, generator=generator)
+    return LatentState(
+        latent=latent,
+        denoise_mask=torch.ones(1, tokens, 1),
+        positions=torch.arange(3 * tokens, dtype=torch.float32).reshape(1, 3, tokens),
+        clean_latent=torch.zeros_like(latent),
+    )
+
+
+def _contexts(positive_len: int, negative_len: int) -> tuple[torch.Tensor, ...]:
+    generator = torch.Generator().manual_seed(1)
+    return tuple(
+        torch.randn(1, length, DIM, generator=generator)
+        for length in (positive_len, negative_len, positive_len, negative_len)
+    )
+
+
+def _run(transformer: StubTransformer, contexts: tuple[torch.Tensor, ...], batched: bool, steps: int = 2) -> list:
+    denoise = guider_denoising_func(CFGGuider(3.0), *contexts, transformer=transformer, batched=batched)
+    sigmas = torch.linspace(1.0, 0.0, steps + 1)
+    video_state, audio_state = _state(6, seed=2), _state(3, seed=3)
+    return [denoise(video_state, audio_state, sigmas, step) for step in range(steps)]
+
+
+@pytest.mark.parametrize(("positive_len", "negative_len"), [(5, 5), (5, 3)])
+def test_batched_guidance_matches_sequential(positive_len: int, negative_len: int) -> None:
+    contexts = _contexts(positive_len, negative_len)
+    batched, sequential = StubTransformer(), StubTransformer()
+
+    for got, expected in zip(_run(batched, contexts, True), _run(sequential, contexts, False), strict=True):
+        torch.testing.assert_close(got, expected)
+    # One forward over both passes per step; contexts of different lengths go through the padded, masked path
+    assert batched.batch_sizes == [2, 2]
+    assert batched.masked == [positive_len != negative_len] * 2
+    assert sequential.batch_sizes == [1, 1, 1, 1]
+
+
+@pytest.mark.parametrize("error", [NotImplementedError, torch.cuda.OutOfMemoryError])
+def test_batched_guidance_falls_back_to_sequential(error: type[Exception], monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(helpers, "cleanup_memory", lambda: None)
+    contexts = _contexts(5, 3)
+    failing, sequential = StubTransformer(error=error), StubTransformer()
+
+    for got, expected in zip(_run(failing, contexts, True), _run(sequential, contexts, False), strict=True):
+        torch.testing.assert_close(got, expected)
+    # The failed batched forward is not retried on later steps
+    assert failing.batch_sizes == [2, 1, 1, 1, 1]
+
+
+def test_micro_batches_group_by_key_in_order_of_first_appearance() -> None:
+    keys = ["a", "b", "a", "a", "b", "a", "c"]
+
+    assert micro_batches(keys, max_batch_size=2) == [[0, 2], [3, 5], [1, 4], [6]]
+    assert micro_batches(keys, max_batch_size=4) == [[0, 2, 3, 5], [1, 4], [6]]
+    assert micro_batches(keys, max_batch_size=1) == [[i] for i in (0, 2, 3, 5, 1, 4, 6)]
+    assert micro_batches([], max_batch_size=2) == []
+    with pytest.raises(ValueError, match="max_batch_size"):
+        micro_batches(keys, max_batch_size=0)
+
+
+def test_stacked_latent_states_slice_back_into_the_originals() -> None:
+    states = [_state(6, seed=seed) for seed in (2, 3, 4)]
+    stacked = stack_latent_states(states)
+
+    assert stacked.latent.shape == (3, 6, DIM)
+    for i, state in enumerate(states):
+        torch.testing.assert_close(stacked.latent[i : i + 1], state.latent)
+        torch.testing.assert_close(stacked.denoise_mask[i : i + 1], state.denoise_mask)
+        torch.testing.assert_close(stacked.positions[i : i + 1], state.positions)
+        torch.testing.assert_close(stacked.clean_latent[i : i + 1], state.clean_latent)
+    assert stack_latent_states(states[:1]) is states[0]
+
+
+def _halving_loop(
+    sigmas: torch.Tensor, video_state: LatentState, audio_state: LatentState, stepper: DiffusionStepProtocol
+) -> tuple[LatentState, LatentState]:
+    return euler_denoising_loop(
+        sigmas=sigmas,
+        video_state=video_state,
+        audio_state=audio_state,
+        stepper=stepper,
+        denoise_fn=lambda video, audio, _sigmas, _step: (video.latent * 0.5, audio.latent * 0.5),
+    )
+
+
+def _denoise_kwargs() -> dict:
+    return {
+        "sigmas": torch.tensor([1.0, 0.5, 0.0]),
+        "stepper": EulerDiffusionStep(),
+        "denoising_loop_fn": _halving_loop,
+        "components": PipelineComponents(dtype=torch.float32, device=torch.device("cpu")),
+        "dtype": torch.float32,
+        "device": torch.device("cpu"),
+    }
+
+
+def _noiser(seed: int) -> GaussianNoiser:
+    return GaussianNoiser(generator=torch.Generator().manual_seed(seed))
+
+
+def test_batched_denoising_matches_single_runs_per_seed() -> None:
+    seeds = [7, 11, 7]
+    shape = VideoPixelShape(batch=len(seeds), frames=9, height=64, width=64, fps=24.0)
+    video, audio = denoise_audio_video_batch(
+        output_shape=shape,
+        conditionings=[[] for _ in seeds],
+        noisers=[_noiser(seed) for seed in seeds],
+        **_denoise_kwargs(),
+    )
+
+    assert video.latent.shape[0] == audio.latent.shape[0] == len(seeds)
+    for i, seed in enumerate(seeds):
+        expected_video, expected_audio = denoise_audio_video(
+            output_shape=shape._replace(batch=1),
+            conditionings=[],
+            noiser=_noiser(seed),
+            **_denoise_kwargs(),
+        )
+        assert video.latent[i : i + 1].shape == expected_video.latent.shape
+        torch.testing.assert_close(video.latent[i : i + 1], expected_video.latent)
+        torch.testing.assert_close(audio.latent[i : i + 1], expected_audio.latent)
+    # Items with the same seed get the same noise, items with different seeds do not
+    torch.testing.assert_close(video.latent[0], video.latent[2])
+    assert not torch.equal(video.latent[0], video.latent[1])
@@ -0,0 +1,41 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("av")
+
+from ltx_pipelines.utils.media_io import decode_video_from_file, encode_video  # noqa: E402
+
+HEIGHT, WIDTH = 64, 64
+
+
+def _chunks(levels: list[list[int]], dtype: torch.dtype = torch.uint8) -> Iterator[torch.Tensor]:
+    """Chunks of solid gray frames, one brightness level per frame."""
+    for chunk_levels in levels:
+        yield torch.tensor(chunk_levels, dtype=dtype)[:, None, None, None].expand(-1, HEIGHT, WIDTH, 3).contiguous()
+
+
+def test_encode_video_keeps_frame_count_and_order(tmp_path: Path) -> None:
+    levels = [[96, 32, 160, 64], [224, 128], [192]]
+    output_path = str(tmp_path / "out.mp4")
+
+    encode_video(_chunks(levels), 24, None, None, output_path, video_chunks_number=len(levels), queue_size=1)
+
+    frames = list(decode_video_from_file(output_path, frame_cap=-1, device="cpu"))
+    brightness = [frame.float().mean().item() for frame in frames]
+    expected = [level for chunk_levels in levels for level in chunk_levels]
+    assert len(frames) == len(expected)
+    assert brightness == pytest.approx(expected, abs=4)
+
+
+def test_encode_video_raises_worker_errors_in_the_caller(tmp_path: Path) -> None:
+    # Float frames are not valid rgb24 input: the second chunk fails on the encoder thread, while the caller
+    # may be blocked on the (single-slot) queue with more chunks to come.
+    chunks = [*_chunks([[96, 32]]), *_chunks([[80]] * 8, dtype=torch.float32)]
+
+    with pytest.raises(ValueError, match="uint8"):
+        encode_video(
+            iter(chunks), 24, None, None, str(tmp_path / "out.mp4"), video_chunks_number=len(chunks), queue_size=1
+        )
@@ -0,0 +1,102 @@
+from collections.abc import Callable
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from ltx_pipelines.utils.model_cache import ModelCache, module_nbytes  # noqa: E402
+
+# The offloading tests use a CUDA-typed cache without needing a GPU: components are built on the CPU, the
+# cache moves them "to the host" with a no-op .to("cpu"), and no test hits an offloaded entry (which would
+# move it back to the device).
+CUDA = torch.device("cuda")
+
+
+def _counting_builder(builds: list[str], name: str) -> Callable[[], torch.nn.Module]:
+    def build() -> torch.nn.Module:
+        builds.append(name)
+        return torch.nn.Linear(16, 16)
+
+    return build
+
+
+@pytest.fixture
+def nbytes() -> int:
+    return module_nbytes(torch.nn.Linear(16, 16))
+
+
+def test_components_within_budget_are_built_once() -> None:
+    cache = ModelCache(torch.device("cpu"), device_budget_bytes=None)
+    builds = []
+    first = cache.get("a", _counting_builder(builds, "a"))
+    cache.release(first)
+    again = cache.get("a", _counting_builder(builds, "a"))
+
+    assert again is first
+    assert builds == ["a"]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_leased_components_stay_and_released_ones_are_dropped_on_cpu(nbytes: int) -> None:
+    cache = ModelCache(torch.device("cpu"), device_budget_bytes=nbytes)
+    builds = []
+    a = cache.get("a", _counting_builder(builds, "a"))
+    b = cache.get("b", _counting_builder(builds, "b"))
+    # Over budget, but "a" is still leased: it is not moved
+    assert cache.device_bytes() == 2 * nbytes
+
+    cache.release(a)
+    cache.get("c", _counting_builder(builds, "c"))
+    # A CPU cache has no host tier: the idle component is dropped and rebuilt on the next request
+    assert cache.device_bytes() == 2 * nbytes
+    cache.get("a", _counting_builder(builds, "a"))
+    assert builds == ["a", "b", "c", "a"]
+    cache.release(b)
+
+
+def test_idle_components_are_offloaded_to_host(nbytes: int) -> None:
+    cache = ModelCache(CUDA, device_budget_bytes=nbytes, host_budget_bytes=None)
+    builds = []
+    cache.release(cache.get("a", _counting_builder(builds, "a")))
+    cache.get("b", _counting_builder(builds, "b"))
+
+    assert (cache.device_bytes(), cache.host_bytes()) == (nbytes, nbytes)
+    # "b" is leased: loading "c" goes over budget instead of moving it
+    cache.get("c", _counting_builder(builds, "c"))
+    assert (cache.device_bytes(), cache.host_bytes()) == (2 * nbytes, nbytes)
+
+
+def test_host_budget_drops_least_recently_used(nbytes: int) -> None:
+    cache = ModelCache(CUDA, device_budget_bytes=nbytes, host_budget_bytes=nbytes)
+    builds = []
+    for key in ("a", "b", "c"):
+        cache.release(cache.get(key, _counting_builder(builds, key)))
+
+    # "a" went to the host for "b", then made room there for "b" when "c" was loaded
+    assert (cache.device_bytes(), cache.host_bytes()) == (nbytes, nbytes)
+    cache.get("a", _counting_builder(builds, "a"))
+    assert builds == ["a", "b", "c", "a"]
+
+
+def test_lease_context_releases_on_exit(nbytes: int) -> None:
+    cache = ModelCache(torch.device("cpu"), device_budget_bytes=nbytes)
+    builds = []
+    with cache.lease("a", _counting_builder(builds, "a")) as a:
+        assert isinstance(a, torch.nn.Linear)
+    cache.release(cache.get("b", _counting_builder(builds, "b")))
+    # "a" was idle after the with block, so loading "b" dropped it
+    cache.get("a", _counting_builder(builds, "a"))
+    assert builds == ["a", "b", "a"]
+
+
+def test_release_ignores_unknown_modules() -> None:
+    cache = ModelCache(torch.device("cpu"))
+    cache.release(torch.nn.Linear(2, 2), None)
+
+
+def test_resize_remeasures_a_grown_component(nbytes: int) -> None:
+    cache = ModelCache(torch.device("cpu"))
+    module = cache.get("a", lambda: torch.nn.Linear(16, 16))
+    module.register_buffer("extra", torch.zeros(4), persistent=False)
+    cache.resize(module)
+    assert cache.device_bytes() == nbytes + 16
@@ -0,0 +1,105 @@
+import zlib
+from collections.abc import Iterator
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("av")
+
+from ltx_core.model.transformer import Modality  # noqa: E402
+from ltx_pipelines import ti2vid_one_stage  # noqa: E402
+from ltx_pipelines.ti2vid_one_stage import TI2VidOneStagePipeline  # noqa: E402
+from ltx_pipelines.utils.types import BatchItem, PipelineComponents  # noqa: E402
+
+CPU = torch.device("cpu")
+
+
+class StubTransformer:
+    """Per-sample stand-in for the X0 transformer: the output depends on each sample's latent and context only."""
+
+    def __init__(self):
+        self.batch_sizes: list[int] = []
+
+    def __call__(self, video: Modality, audio: Modality, perturbations: None) -> tuple[torch.Tensor, torch.Tensor]:
+        assert perturbations is None
+        self.batch_sizes.append(video.latent.shape[0])
+        return self._denoise(video), self._denoise(audio)
+
+    @staticmethod
+    def _denoise(modality: Modality) -> torch.Tensor:
+        return modality.latent * 0.5 + modality.context.mean(dim=(1, 2))[:, None, None]
+
+
+class StubLedger:
+    """Hands out the stub transformer; every other model is unused by the patched encode and decode functions."""
+
+    def __init__(self, transformer: StubTransformer):
+        self._transformer = transformer
+
+    def transformer(self) -> StubTransformer:
+        return self._transformer
+
+    def text_encoder(self) -> None:
+        return None
+
+    video_encoder = video_decoder = audio_decoder = vocoder = text_encoder
+
+    def release(self, *_models: object) -> None:
+        pass
+
+    def release_after(self, frames: Iterator[torch.Tensor], *_models: object) -> Iterator[torch.Tensor]:
+        yield from frames
+
+
+def _encode_prompts(_text_encoder: None, prompts: list[str]) -> dict[str, tuple[torch.Tensor, torch.Tensor]]:
+    """Same context for a prompt in any call, so batched and single runs can be compared."""
+    contexts = {}
+    for prompt in prompts:
+        generator = torch.Generator().manual_seed(zlib.crc32(prompt.encode()))
+        contexts[prompt] = (torch.randn(1, 4, 1, generator=generator), torch.randn(1, 4, 1, generator=generator))
+    return contexts
+
+
+@pytest.fixture
+def pipeline(monkeypatch: pytest.MonkeyPatch) -> TI2VidOneStagePipeline:
+    monkeypatch.setattr(torch.cuda, "synchronize", lambda _device=None: None)
+    monkeypatch.setattr(ti2vid_one_stage, "cleanup_memory", lambda: None)
+    monkeypatch.setattr(ti2vid_one_stage, "encode_prompts", _encode_prompts)
+    # "Decoding" returns the latent, so outputs can be compared before any VAE
+    monkeypatch.setattr(ti2vid_one_stage, "vae_decode_video", lambda latent, _decoder: iter([latent]))
+    monkeypatch.setattr(ti2vid_one_stage, "vae_decode_audio", lambda latent, _decoder, _vocoder: latent)
+
+    pipeline = TI2VidOneStagePipeline.__new__(TI2VidOneStagePipeline)
+    pipeline.dtype = torch.bfloat16
+    pipeline.device = CPU
+    pipeline.model_ledger = StubLedger(StubTransformer())
+    pipeline.pipeline_components = PipelineComponents(dtype=torch.bfloat16, device=CPU)
+    return pipeline
+
+
+def test_generate_batch_matches_single_runs(pipeline: TI2VidOneStagePipeline) -> None:
+    items = [
+        BatchItem(prompt="a cat", seed=1, height=64, width=64, num_frames=9),
+        BatchItem(prompt="a dog", seed=2, height=32, width=64, num_frames=9),
+        BatchItem(prompt="a dog", seed=3, height=64, width=64, num_frames=9),
+    ]
+    settings = {"negative_prompt": "blurry", "frame_rate": 24.0, "num_inference_steps": 2, "cfg_guidance_scale": 3.0}
+
+    outputs = list(pipeline.generate_batch(items, max_batch_size=2, **settings))
+
+    # The two 64x64 items share a micro-batch (with both guidance passes in one forward per step)
+    assert [output.index for output in outputs] == [0, 2, 1]
+    assert pipeline.model_ledger.transformer().batch_sizes == [4, 4, 2, 2]
+    for output in outputs:
+        item = items[output.index]
+        video, audio = pipeline(
+            prompt=item.prompt,
+            seed=item.seed,
+            height=item.height,
+            width=item.width,
+            num_frames=item.num_frames,
+            images=[],
+            **settings,
+        )
+        torch.testing.assert_close(next(output.video), next(video))
+        torch.testing.assert_close(output.audio, audio)
@@ -5,25 +5,49 @@ import shutil
 import subprocess
 import sys
 import tempfile
+import time
 from dataclasses import asdict
+from collections.abc import Callable
 from pathlib import Path
 from typing import Optional
 
 import typer
 import yaml
 from rich import print as rich_print
+from rich.live import Live
 from rich.table import Table
 from vtx_app.config.env_layers import load_env
 from vtx_app.config.log import configure_logging
 from vtx_app.config.settings import Settings
+from vtx_app.pipelines.base import device_env
+from vtx_app.pipelines.capabilities import clear_capability_cache
+from vtx_app.pipelines.runner_worker import RenderWorker
 from vtx_app.producer import Director
+from vtx_app.project.archive import ChunkStore, Snapshot, export_project, import_snapshot
+from vtx_app.project.layout import Project
 from vtx_app.project.loader import ProjectLoader
 from vtx_app.registry.db import Registry
 from vtx_app.render.assembler import Assembler
+from vtx_app.render.executor import PlanExecutor
+from vtx_app.render.farm import BrokerClient, FarmBroker, FarmWorker, serve_broker
+from vtx_app.render.planner import (
+    RenderPlan,
+    bucket_costs,
+    build_render_plan,
+    plan_path,
+    project_clip_ids,
+    project_shapes,
+)
 from vtx_app.render.renderer import RenderController
+from vtx_app.render.scheduler import RenderJob, RenderScheduler, resume_unfinished
+from vtx_app.render.review import SHEET_FRAMES, build_review_assets, review_dir
+from vtx_app.render.status import ClipStatus, collect_status
+from vtx_app.render.telemetry import STAGES, summarize
 from vtx_app.story.openai_builder import StoryBuilder
 from vtx_app.style_manager import StyleManager
 from vtx_app.tags_commands import tags_app
+from vtx_app.utils.model_downloader import SHARED_MODEL_ENVS, ModelDownloader, resolve_project_models
+from vtx_app.utils.timecode import now_iso
 from vtx_app.wizards.proposal import ProposalGenerator
 
 app = typer.Typer(no_args_is_help=True)
@@ -41,12 +65,16 @@ story_app = typer.Typer(no_args_is_help=True)
 render_app = typer.Typer(no_args_is_help=True)
 project_app = typer.Typer(no_args_is_help=True)
 config_app = typer.Typer(no_args_is_help=True)
+models_app = typer.Typer(no_args_is_help=True)
+farm_app = typer.Typer(no_args_is_help=True)
 
 app.add_typer(projects_app, name="projects")
 app.add_typer(story_app, name="story")
 app.add_typer(render_app, name="render")
 app.add_typer(project_app, name="project")
 app.add_typer(config_app, name="config")
+app.add_typer(models_app, name="models")
+app.add_typer(farm_app, name="farm")
 app.add_typer(tags_app, name="tags")
 
 
@@ -178,9 +206,87 @@ def update_style_desc(
         rich_print(f"[red]Style '{style_name}' not found.[/red]")
 
 
+_WORKER_OPTION = typer.Option(
+    None, "--worker/--no-worker", help="Serve clips from one warm pipeline worker (default: VTX_RENDER_WORKER)"
+)
+_DEVICES_OPTION = typer.Option(
+    None, "--devices", help='Render devices, e.g. "cuda:0,cuda:1" or "cpu" (default: VTX_RENDER_DEVICES)'
+)
+_SLOTS_OPTION = typer.Option(None, "--slots", help="Concurrent clips per device (default: VTX_RENDER_SLOTS_PER_DEVICE)")
+_TIMEOUT_OPTION = typer.Option(
+    None, "--timeout", help="Per-clip timeout in seconds, 0 = none (default: VTX_RENDER_JOB_TIMEOUT)"
+)
+
+
+def _render_scheduler(
+    proj: Project,
+    reg: Registry,
+    *,
+    worker: bool | None = None,
+    devices: str | None = None,
+    slots: int | None = None,
+    timeout: float | None = None,
+    on_done: Callable[[RenderJob], None] | None = None,
+) -> RenderScheduler:
+    """Batch render scheduler; CLI options override the VTX_RENDER_* settings."""
+    return RenderScheduler.from_settings(
+        proj,
+        reg,
+        worker=worker,
+        devices=devices,
+        slots=slots,
+        timeout=timeout,
+        controller_factory=RenderController,
+        on_done=on_done,
+    )
+
+
+def _print_bucket_costs(plan: RenderPlan, reg: Registry) -> None:
+    costs = bucket_costs(plan, reg.list_render_metrics())
+    if costs:
+        table = Table(title="Shape buckets (queue order)")
+        table.add_column("Bucket", style="cyan")
+        table.add_column("Clips", justify="right")
+        table.add_column("MPx-frames", justify="right")
+        table.add_column("Predicted", justify="right")
+        for c in costs:
+            table.add_row(c.bucket, str(c.clips), f"{c.volume:.0f}", _secs(c.predicted_seconds))
+        rich_print(table)
+
+
+def _clip_ids(
+    proj: Project,
+    reg: Registry,
+    clip_files: list[Path],
+    *,
+    preset: str | None = None,
+    resolution_scale: float | None = None,
+) -> list[str]:
+    """
+    Clip IDs of a batch in the planner's queue order: grouped by shape bucket, so consecutive
+    renders reuse the warm model. Prints each bucket's predicted cost.
+    """
+    # Clip files follow A01_S01__desc.yaml; the renderer resolves the ID part
+    clip_ids = [cf.stem.split("__")[0] for cf in clip_files]
+    plan = build_render_plan(
+        project_id=str(proj.load_metadata().get("project_id")),
+        created_at=now_iso(),
+        clip_ids=clip_ids,
+        preset=preset,
+        resolution_scale=resolution_scale,
+        shapes=project_shapes(proj, reg, clip_ids, preset=preset, resolution_scale=resolution_scale),
+    )
+    _print_bucket_costs(plan, reg)
+    return [job.clip_id for job in plan.jobs if job.kind == "render"]
+
+
 @app.command("render-reviews")
 def render_reviews(
     slug: str = typer.Argument(..., help="Project slug"),
+    worker: Optional[bool] = _WORKER_OPTION,
+    devices: Optional[str] = _DEVICES_OPTION,
+    slots: Optional[int] = _SLOTS_OPTION,
+    timeout: Optional[float] = _TIMEOUT_OPTION,
 ) -> None:
     """Renders all clips at half resolution to renders/low-res for review."""
     reg = Registry.load()
@@ -203,23 +309,12 @@ def render_reviews(
 
     rich_print(f"Rendering {len(clip_files)} clips for review (low-res)...")
 
-    controller = RenderController(project=proj, registry=reg)
     out_dir = proj.root / "renders" / "low-res"
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    for cf in clip_files:
-        cid = cf.stem
-        # Handle clip_id__desc format if necessary, though renderer handles fuzzy matching
-        # But for list iteration we have exact file stem
-        # Extract ID part if convention A01_S01__desc
-        if "__" in cid:
-            cid = cid.split("__")[0]
-
-        rich_print(f"Rendering {cid}...")
-        try:
-            controller.render_clip(clip_id=cid, resolution_scale=0.5, output_dir=out_dir)
-        except Exception as e:
-            rich_print(f"[red]Failed to render {cid}: {e}[/red]")
+    clip_ids = _clip_ids(proj, reg, clip_files, resolution_scale=0.5)
+    with _render_scheduler(proj, reg, worker=worker, devices=devices, slots=slots, timeout=timeout) as scheduler:
+        scheduler.run_all(clip_ids, resolution_scale=0.5, output_dir=out_dir)
 
 
 @app.command("render-review")
@@ -250,6 +345,13 @@ def render_review(
 @app.command("render-full")
 def render_full(
     slug: str = typer.Argument(..., help="Project slug"),
+    worker: Optional[bool] = _WORKER_OPTION,
+    devices: Optional[str] = _DEVICES_OPTION,
+    slots: Optional[int] = _SLOTS_OPTION,
+    timeout: Optional[float] = _TIMEOUT_OPTION,
+    assemble_cut: bool = typer.Option(
+        False, "--assemble", help="Append each finished clip to final_cut.mp4 incrementally while rendering"
+    ),
 ) -> None:
     """Renders all clips at full resolution to renders/high-res."""
     reg = Registry.load()
@@ -265,40 +367,47 @@ def render_full(
 
     rich_print(f"Rendering {len(clip_files)} clips at FULL resolution...")
 
-    controller = RenderController(project=proj, registry=reg)
     out_dir = proj.root / "renders" / "high-res"
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    for cf in clip_files:
-        cid = cf.stem
-        if "__" in cid:
-            cid = cid.split("__")[0]
+    asm = Assembler(project=proj, registry=reg) if assemble_cut else None
+    on_done = (lambda job: asm.append_clip(job.clip_id, clips_dir=out_dir)) if asm else None
 
-        rich_print(f"Rendering {cid}...")
-        try:
-            controller.render_clip(clip_id=cid, preset="final", resolution_scale=1.0, output_dir=out_dir)
-        except Exception as e:
-            print(f"[red]Failed to render {cid}: {e}[/red]")
+    clip_ids = _clip_ids(proj, reg, clip_files, preset="final", resolution_scale=1.0)
+    with _render_scheduler(
+        proj, reg, worker=worker, devices=devices, slots=slots, timeout=timeout, on_done=on_done
+    ) as scheduler:
+        scheduler.run_all(clip_ids, preset="final", resolution_scale=1.0, output_dir=out_dir)
+
+    if asm:
+        asm.assemble_incremental(clips_dir=out_dir)
+
+
+_INCREMENTAL_OPTION = typer.Option(
+    False, "--incremental", help="Reuse per-clip segments; only re-mux clips that changed since the last cut"
+)
 
 
 @app.command("assemble")
 def assemble(
     slug: str = typer.Argument(..., help="Project slug"),
+    incremental: bool = _INCREMENTAL_OPTION,
 ) -> None:
     """Assembles clips from renders/high-res into final_cut.mp4."""
     reg = Registry.load()
     loader = ProjectLoader(registry=reg)
     proj = loader.load(slug)
 
-    asm = Assembler(project=proj)
+    asm = Assembler(project=proj, registry=reg)
     high_res = proj.root / "renders" / "high-res"
+    assemble_fn = asm.assemble_incremental if incremental else asm.assemble
 
     if high_res.exists():
         rich_print(f"Assembling from {high_res}...")
-        asm.assemble(clips_dir=high_res)
+        assemble_fn(clips_dir=high_res)
     else:
         rich_print("[yellow]High-res folder not found, assembling available clips...[/yellow]")
-        asm.assemble()
+        assemble_fn()
 
 
 @app.command("create-movie")
@@ -517,24 +626,16 @@ def create_movie_all(
     # Filter hidden
     clip_files = [p for p in clip_files if not p.name.startswith(".")]
 
-    controller = RenderController(project=proj, registry=reg)
     out_dir = path / "renders" / "high-res"
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    for cf in clip_files:
-        cid = cf.stem
-        if "__" in cid:
-            cid = cid.split("__")[0]
-
-        rich_print(f"Rendering {cid} (Full Res)...")
-        try:
-            controller.render_clip(clip_id=cid, preset="final", resolution_scale=1.0, output_dir=out_dir)
-        except Exception as e:
-            rich_print(f"[red]Failed to render {cid}: {e}[/red]")
+    clip_ids = _clip_ids(proj, reg, clip_files, preset="final", resolution_scale=1.0)
+    with _render_scheduler(proj, reg) as scheduler:
+        scheduler.run_all(clip_ids, preset="final", resolution_scale=1.0, output_dir=out_dir)
 
     # 5. Assemble (Equivalent to assemble)
     rich_print("\n[bold blue]Step 5: Assembling Final Cut...[/bold blue]")
-    asm = Assembler(project=proj)
+    asm = Assembler(project=proj, registry=reg)
 
     if out_dir.exists():
         asm.assemble(clips_dir=out_dir)
@@ -692,13 +793,35 @@ def project_env_create(slug: str) -> None:
 def project_export(
     slug: str,
     output: str = typer.Option(None, "--output"),
+    store: Optional[Path] = typer.Option(
+        None, "--store", help="Export into a deduplicated chunk store (directory) instead of a zip"
+    ),
+    since: Optional[Path] = typer.Option(
+        None, "--since", help="With --store: snapshot already at the destination; only newer chunks are written"
+    ),
+    jobs: int = typer.Option(0, "--jobs", "-j", help="Compression processes (default: all CPUs)"),
 ) -> None:
-    """Export project to a zip file (excluding .venv)."""
+    """Export project to a zip file (excluding .venv), or incrementally into a chunk store."""
 
     reg = Registry.load()
     loader = ProjectLoader(registry=reg)
     proj = loader.load(slug)
 
+    if store is not None:
+        stats = export_project(
+            proj.root,
+            ChunkStore(root=store),
+            slug=slug,
+            project_id=str(proj.load_metadata().get("project_id")),
+            since=Snapshot.load(since) if since else None,
+            jobs=jobs or None,
+        )
+        rich_print(
+            f"[green]Exported[/green] {stats.files} files ({_gib(stats.bytes)}) to {stats.snapshot}: "
+            f"{stats.new_chunks} new chunks ({_gib(stats.written_bytes)} written), {stats.reused_chunks} reused"
+        )
+        return
+
     out_name = output or f"{slug}_export"
     if out_name.endswith(".zip"):
         out_name = out_name[:-4]
@@ -720,6 +843,28 @@ def project_export(
         rich_print(f"[green]Exported[/green] to {archive}")
 
 
+@project_app.command("import")
+def project_import(
+    snapshot: Path = typer.Argument(..., help="Snapshot JSON under <store>/snapshots/<slug>/"),
+    store: Optional[list[Path]] = typer.Option(
+        None, "--store", help="Additional stores to read chunks from (e.g. the base of a --since export)"
+    ),
+    dest: Optional[Path] = typer.Option(None, "--dest", help="Project directory (default: VTX_PROJECTS_ROOT/<slug>)"),
+    jobs: int = typer.Option(0, "--jobs", "-j", help="Parallel file restores"),
+) -> None:
+    """Restore (or update) a project from an export snapshot, then register it."""
+    snap = Snapshot.load(snapshot)
+    # <store>/snapshots/<slug>/<snapshot>.json
+    chunks = ChunkStore(root=snapshot.resolve().parents[2], fallbacks=list(store or []))
+
+    load_env(project_env_path=None)
+    target = dest or Settings.from_env().projects_root / snap.slug
+    written = import_snapshot(snap, chunks, target, jobs=jobs or None)
+    rich_print(f"[green]Imported[/green] {snap.slug} to {target}: {written} of {len(snap.files)} files written")
+
+    ProjectLoader(registry=Registry.load()).sync_all_projects()
+
+
 def _get_slug(slug: str | None) -> str:
     if slug:
         return slug
@@ -747,79 +892,97 @@ def _get_slug(slug: str | None) -> str:
 
 
 @story_app.command("outline")
-def story_outline(slug: Optional[str] = typer.Argument(None)) -> None:
+def story_outline(
+    slug: Optional[str] = typer.Argument(None),
+    refresh: bool = typer.Option(False, "--refresh", help="Ask the model again instead of replaying cached responses."),
+) -> None:
     """Generate outline (01_outline.yaml) using OpenAI (optional)."""
     slug = _get_slug(slug)
     reg = Registry.load()
     loader = ProjectLoader(registry=reg)
     proj = loader.load(slug)
 
-    builder = StoryBuilder(project=proj)
+    builder = StoryBuilder(project=proj, refresh=refresh)
     builder.generate_outline()
     rich_print("[green]Wrote[/green] story/01_outline.yaml")
 
 
 @story_app.command("treatment")
-def story_treatment(slug: Optional[str] = typer.Argument(None)) -> None:
+def story_treatment(
+    slug: Optional[str] = typer.Argument(None),
+    refresh: bool = typer.Option(False, "--refresh", help="Ask the model again instead of replaying cached responses."),
+) -> None:
     """Generate treatment (02_treatment.md) using OpenAI."""
     slug = _get_slug(slug)
     reg = Registry.load()
     loader = ProjectLoader(registry=reg)
     proj = loader.load(slug)
 
-    builder = StoryBuilder(project=proj)
+    builder = StoryBuilder(project=proj, refresh=refresh)
     builder.generate_treatment()
     rich_print("[green]Wrote[/green] story/02_treatment.md")
 
 
 @story_app.command("screenplay")
-def story_screenplay(slug: Optional[str] = typer.Argument(None)) -> None:
+def story_screenplay(
+    slug: Optional[str] = typer.Argument(None),
+    refresh: bool = typer.Option(False, "--refresh", help="Ask the model again instead of replaying cached responses."),
+) -> None:
     """Generate screenplay (03_screenplay.yaml) using OpenAI."""
     slug = _get_slug(slug)
     reg = Registry.load()
     loader = ProjectLoader(registry=reg)
     proj = loader.load(slug)
 
-    builder = StoryBuilder(project=proj)
+    builder = StoryBuilder(project=proj, refresh=refresh)
     builder.generate_screenplay()
     rich_print("[green]Wrote[/green] story/03_screenplay.yaml")
 
 
 @story_app.command("characters")
-def story_characters(slug: Optional[str] = typer.Argument(None)) -> None:
+def story_characters(
+    slug: Optional[str] = typer.Argument(None),
+    refresh: bool = typer.Option(False, "--refresh", help="Ask the model again instead of replaying cached responses."),
+) -> None:
     """Generate characters (prompts/characters.yaml) using OpenAI."""
     slug = _get_slug(slug)
     reg = Registry.load()
     loader = ProjectLoader(registry=reg)
     proj = loader.load(slug)
 
-    builder = StoryBuilder(project=proj)
+    builder = StoryBuilder(project=proj, refresh=refresh)
     builder.generate_characters()
     rich_print("[green]Wrote[/green] prompts/characters.yaml")
 
 
 @story_app.command("locations")
-def story_locations(slug: Optional[str] = typer.Argument(None)) -> None:
+def story_locations(
+    slug: Optional[str] = typer.Argument(None),
+    refresh: bool = typer.Option(False, "--refresh", help="Ask the model again instead of replaying cached responses."),
+) -> None:
     """Generate locations (prompts/locations.yaml) using OpenAI."""
     slug = _get_slug(slug)
     reg = Registry.load()
     loader = ProjectLoader(registry=reg)
     proj = loader.load(slug)
 
-    builder = StoryBuilder(project=proj)
+    builder = StoryBuilder(project=proj, refresh=refresh)
     builder.generate_locations()
     rich_print("[green]Wrote[/green] prompts/locations.yaml")
 
 
 @story_app.command("shotlist")
-def story_shotlist(slug: Optional[str] = typer.Argument(None)) -> None:
+def story_shotlist(
+    slug: Optional[str] = typer.Argument(None),
+    refresh: bool = typer.Option(False, "--refresh", help="Ask the model again instead of replaying cached responses."),
+) -> None:
     """Generate shotlist (04_shotlist.yaml) using OpenAI (optional)."""
     slug = _get_slug(slug)
     reg = Registry.load()
     loader = ProjectLoader(registry=reg)
     proj = loader.load(slug)
 
-    builder = StoryBuilder(project=proj)
+    builder = StoryBuilder(project=proj, refresh=refresh)
     builder.generate_shotlist()
     rich_print("[green]Wrote[/green] story/04_shotlist.yaml")
 
@@ -842,46 +1005,153 @@ def story_clips(
     rich_print("[green]Generated[/green] prompts/clips/*.yaml")
 
 
+_STATUS_STYLES = {
+    "done": "[green]Done[/green]",
+    "pending": "[yellow]Pending[/yellow]",
+    "queued": "[cyan]Queued[/cyan]",
+    "rendering": "[bold cyan]Rendering[/bold cyan]",
+    "failed": "[red]Failed[/red]",
+    "cancelled": "[yellow]Cancelled[/yellow]",
+    "missing": "[red]Missing[/red]",
+    "error": "[red]Error[/red]",
+}
+
+
+def _status_table(slug: str, clips: list[ClipStatus]) -> Table:
+    counts: dict[str, int] = {}
+    for c in clips:
+        counts[c.state] = counts.get(c.state, 0) + 1
+    caption = ", ".join(f"{n} {state}" for state, n in sorted(counts.items()))
+
+    table = Table(title=f"Render Status: {slug}", caption=caption)
+    table.add_column("Clip ID", style="cyan")
+    table.add_column("Status", justify="center")
+    table.add_column("Size", justify="right")
+    table.add_column("Render", justify="right")
+    table.add_column("Hash")
+    table.add_column("Output File", style="magenta")
+    for c in clips:
+        table.add_row(
+            c.clip_id,
+            _STATUS_STYLES.get(c.state, c.state),
+            f"{c.size / 1024**2:.1f} MiB" if c.size is not None else "---",
+            _secs(c.render_time),
+            (c.render_hash or "---")[:8],
+            c.error if c.state in ("failed", "error") and c.error else (c.output or "---"),
+        )
+    return table
+
+
 @render_app.command("status")
-def render_status(slug: str) -> None:
+def render_status(
+    slug: str,
+    watch: bool = typer.Option(False, "--watch", "-w", help="Keep refreshing until Ctrl+C"),
+    interval: float = typer.Option(2.0, "--interval", help="Seconds between refreshes with --watch"),
+) -> None:
     """Show render status for project clips."""
 
     reg = Registry.load()
     loader = ProjectLoader(registry=reg)
     proj = loader.load(slug)
 
-    table = Table(title=f"Render Status: {slug}")
-    table.add_column("Clip ID", style="cyan")
-    table.add_column("Output File", style="magenta")
-    table.add_column("Status", justify="center")
-
     clips_dir = proj.root / "prompts" / "clips"
     if not clips_dir.exists():
         rich_print(f"[yellow]No clips found in {clips_dir}[/yellow]")
         return
 
-    for p in sorted(clips_dir.glob("*.yaml")):
+    if not watch:
+        rich_print(_status_table(slug, collect_status(proj, reg)))
+        return
+
+    with Live(_status_table(slug, collect_status(proj, reg)), auto_refresh=False) as live:
         try:
-            data = yaml.safe_load(p.read_text()) or {}
-            out_rel = (data.get("outputs") or {}).get("mp4")
+            while True:
+                time.sleep(interval)
+                live.update(_status_table(slug, collect_status(proj, reg)), refresh=True)
+        except KeyboardInterrupt:
+            pass
+
+
+@render_app.command("review-assets")
+def render_review_assets(
+    slug: str,
+    jobs: int = typer.Option(0, "--jobs", "-j", help="Worker processes (default: half the CPUs)"),
+    frames: int = typer.Option(SHEET_FRAMES, "--frames", help="Frames on each contact sheet"),
+) -> None:
+    """Build a poster, contact sheet and proxy of every rendered clip (renders/review/)."""
+    reg = Registry.load()
+    loader = ProjectLoader(registry=reg)
+    proj = loader.load(slug)
+
+    assets = build_review_assets(proj, reg, jobs=jobs or None, frames=frames)
+    rich_print(f"{len(assets)} clips in {review_dir(proj.root) / 'index.json'}")
 
-            status = "[red]Missing output path[/red]"
-            out_display = "---"
 
-            if out_rel:
-                out_path = proj.root / out_rel
-                out_display = out_rel
-                if out_path.exists():
-                    status = "[green]Done[/green]"
-                else:
-                    status = "[yellow]Pending[/yellow]"
+def _gib(n: float | None) -> str:
+    return f"{n / 1024**3:.1f} GiB" if n is not None else "---"
 
-            table.add_row(p.stem, out_display, status)
-        except Exception as e:
-            table.add_row(p.stem, "Error", f"[red]{e}[/red]")
 
+def _secs(n: float | None) -> str:
+    return f"{n:.1f}s" if n is not None else "---"
+
+
+@render_app.command("stats")
+def render_stats(
+    slug: Optional[str] = typer.Argument(None, help="Project slug (default: all projects)"),
+    stages: bool = typer.Option(False, "--stages", help="Also show mean seconds per pipeline stage"),
+) -> None:
+    """Aggregate render telemetry per project, preset and pipeline."""
+    reg = Registry.load()
+    project_id = None
+    if slug:
+        project_id = str(ProjectLoader(registry=reg).load(slug).load_metadata().get("project_id"))
+
+    rows = reg.list_render_metrics(project_id)
+    if not rows:
+        rich_print("[yellow]No render metrics recorded yet.[/yellow]")
+        return
+
+    slugs = {p["project_id"]: p["slug"] for p in reg.list_projects()}
+    summary = summarize(rows)
+
+    table = Table(title="Render Stats")
+    for col in ("Project", "Preset", "Pipeline"):
+        table.add_column(col, style="cyan")
+    for col in ("Renders", "Wall mean", "Wall p95", "s/frame", "Steps/s", "Peak GPU", "Peak RSS", "Output"):
+        table.add_column(col, justify="right")
+    for g in summary:
+        table.add_row(
+            slugs.get(g["project_id"], g["project_id"]),
+            g["preset"],
+            g["pipeline"],
+            str(g["renders"]),
+            _secs(g["wall_mean"]),
+            _secs(g["wall_p95"]),
+            f"{g['sec_per_frame']:.2f}" if g["sec_per_frame"] is not None else "---",
+            f"{g['steps_per_sec']:.2f}" if g["steps_per_sec"] is not None else "---",
+            _gib(g["peak_gpu_bytes"]),
+            _gib(g["peak_rss_bytes"]),
+            f"{g['output_bytes_mean'] / 1024**2:.1f} MB" if g["output_bytes_mean"] is not None else "---",
+        )
     rich_print(table)
 
+    if stages:
+        names = [n for n in STAGES if any(n in g["stages"] for g in summary)]
+        names += sorted({n for g in summary for n in g["stages"]} - set(names))
+        stage_table = Table(title="Mean Seconds per Stage")
+        for col in ("Project", "Preset", "Pipeline"):
+            stage_table.add_column(col, style="cyan")
+        for n in names:
+            stage_table.add_column(n, justify="right")
+        for g in summary:
+            stage_table.add_row(
+                slugs.get(g["project_id"], g["project_id"]),
+                g["preset"],
+                g["pipeline"],
+                *(_secs(g["stages"].get(n)) for n in names),
+            )
+        rich_print(stage_table)
+
 
 @render_app.command("clip")
 def render_clip(
@@ -946,25 +1216,261 @@ def render_approve(
 
 
 @render_app.command("resume")
-def render_resume(max_jobs: int = typer.Option(1, "--max-jobs")) -> None:
-    """Resume unfinished clips across all projects."""
+def render_resume(
+    max_jobs: Optional[int] = typer.Option(None, "--max-jobs", help="Resume at most N clips (default: all)"),
+    worker: Optional[bool] = _WORKER_OPTION,
+    devices: Optional[str] = _DEVICES_OPTION,
+    slots: Optional[int] = _SLOTS_OPTION,
+    timeout: Optional[float] = _TIMEOUT_OPTION,
+) -> None:
+    """Resume unfinished clips across all projects, each project's clips concurrently."""
     reg = Registry.load()
     loader = ProjectLoader(registry=reg)
     loader.sync_all_projects()
 
-    controller = RenderController(project=None, registry=reg)
-    controller.resume(max_jobs=max_jobs)
+    resume_unfinished(
+        reg,
+        max_jobs=max_jobs,
+        worker=worker,
+        devices=devices,
+        slots=slots,
+        timeout=timeout,
+        controller_factory=RenderController,
+    )
+
+
+@render_app.command("plan")
+def render_plan(
+    slug: str,
+    preset: str = typer.Option(None, "--preset", help="Render profile for every clip (e.g. final)"),
+    scale: Optional[float] = typer.Option(None, "--scale", help="Resolution scale (e.g. 0.5 for review renders)"),
+    output_dir: Optional[str] = typer.Option(
+        None, "--output-dir", help="Render into this folder (relative to the project) instead of outputs.mp4"
+    ),
+    output: str = typer.Option("final_cut.mp4", "--output", help="Final cut file name under renders/"),
+) -> None:
+    """Write render_plan.json: every clip in prompts/clips, then the assembly."""
+    reg = Registry.load()
+    proj = ProjectLoader(registry=reg).load(slug)
+
+    clip_ids = project_clip_ids(proj.root)
+    plan = build_render_plan(
+        project_id=str(proj.load_metadata().get("project_id")),
+        created_at=now_iso(),
+        clip_ids=clip_ids,
+        preset=preset,
+        resolution_scale=scale,
+        output_dir=output_dir,
+        output_name=output,
+        shapes=project_shapes(proj, reg, clip_ids, preset=preset, resolution_scale=scale),
+    )
+    plan.save(plan_path(proj.root))
+    rich_print(f"[green]Wrote[/green] {plan_path(proj.root)} ({len(plan.jobs) - 1} clips -> {output})")
+
+    _print_bucket_costs(plan, reg)
+
+
+@render_app.command("run-plan")
+def render_run_plan(
+    slug: str,
+    slots: Optional[int] = typer.Option(
+        None,
+        "--slots",
+        "--jobs",
+        "-j",
+        help="Concurrent clips per device (default: VTX_RENDER_SLOTS_PER_DEVICE)",
+    ),
+    worker: Optional[bool] = _WORKER_OPTION,
+    devices: Optional[str] = _DEVICES_OPTION,
+    timeout: Optional[float] = _TIMEOUT_OPTION,
+) -> None:
+    """Run the project's render plan; re-running after an interruption resumes it."""
+    reg = Registry.load()
+    proj = ProjectLoader(registry=reg).load(slug)
+
+    path = plan_path(proj.root)
+    if not path.exists():
+        rich_print(f"[red]No render plan at {path}.[/red] Run: vtx render plan {slug}")
+        raise typer.Exit(1)
+
+    executor = PlanExecutor.from_settings(
+        project=proj,
+        registry=reg,
+        plan=RenderPlan.load(path),
+        settings=proj.settings(),
+        slots_per_device=slots,
+        devices=devices,
+        use_worker=worker,
+        timeout=timeout,
+    )
+    status = executor.run()
+
+    counts: dict[str, int] = {}
+    for state in status.values():
+        counts[state] = counts.get(state, 0) + 1
+    rich_print("Plan: " + ", ".join(f"{n} {state}" for state, n in sorted(counts.items())))
+    if any(state in ("failed", "blocked") for state in status.values()):
+        raise typer.Exit(1)
 
 
 @render_app.command("assemble")
-def render_assemble(slug: str, output: str = typer.Option("final_cut.mp4", "--output")) -> None:
+def render_assemble(
+    slug: str,
+    output: str = typer.Option("final_cut.mp4", "--output"),
+    incremental: bool = _INCREMENTAL_OPTION,
+) -> None:
     """Concatenate all rendered clips into a final movie."""
     reg = Registry.load()
     loader = ProjectLoader(registry=reg)
     proj = loader.load(slug)
 
-    asm = Assembler(project=proj)
-    asm.assemble(output_name=output)
+    asm = Assembler(project=proj, registry=reg)
+    if incremental:
+        asm.assemble_incremental(output_name=output)
+    else:
+        asm.assemble(output_name=output)
+
+
+@farm_app.command("broker")
+def farm_broker(
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to listen on (0.0.0.0 for remote workers)"),
+    port: int = typer.Option(8765, "--port"),
+    lease: Optional[float] = typer.Option(
+        None, "--lease", help="Lease length in seconds without a heartbeat (default: VTX_FARM_LEASE_SECONDS)"
+    ),
+) -> None:
+    """Serve the registry's farm queue to `vtx worker` processes until Ctrl+C."""
+    load_env()
+    s = Settings.from_env()
+    broker = FarmBroker(Registry.load(), lease_seconds=lease or s.farm_lease_seconds)
+    server = serve_broker(broker, host=host, port=port)
+    rich_print(
+        f"[green]Farm broker[/green] on http://{host}:{server.server_address[1]} (lease {broker.lease_seconds:g}s)"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+@farm_app.command("submit")
+def farm_submit(
+    slug: str,
+    clips: Optional[list[str]] = typer.Option(None, "--clip", "-c", help="Clip ID to queue (repeatable; default: all)"),
+    preset: str = typer.Option(None, "--preset", help="Render profile for every clip (e.g. final)"),
+    scale: Optional[float] = typer.Option(None, "--scale", help="Resolution scale (e.g. 0.5 for review renders)"),
+    output_dir: Optional[str] = typer.Option(
+        None, "--output-dir", help="Render into this folder (relative to the project) instead of outputs.mp4"
+    ),
+) -> None:
+    """Queue a project's clips for farm workers."""
+    reg = Registry.load()
+    proj = ProjectLoader(registry=reg).load(slug)
+    project_id = str(proj.load_metadata().get("project_id"))
+
+    clip_ids = clips or project_clip_ids(proj.root)
+    broker = FarmBroker(reg)
+    queued = broker.submit(
+        project_id=project_id, clip_ids=clip_ids, preset=preset, resolution_scale=scale, output_dir=output_dir
+    )
+    rich_print(f"[green]Queued[/green] {len(queued)} clips ({len(clip_ids) - len(queued)} already queued)")
+
+
+@farm_app.command("status")
+def farm_status(
+    broker_url: Optional[str] = typer.Option(None, "--broker", help="Broker URL (default: VTX_FARM_URL)"),
+) -> None:
+    """Show the farm queue as the broker sees it."""
+    load_env()
+    status = BrokerClient(broker_url or Settings.from_env().farm_url).status()
+
+    table = Table(title="Farm jobs")
+    table.add_column("Job", justify="right")
+    table.add_column("Clip", style="cyan")
+    table.add_column("State")
+    table.add_column("Worker")
+    table.add_column("Tries", justify="right")
+    table.add_column("Error")
+    for job in status["jobs"]:
+        if job["state"] == "done":
+            continue
+        table.add_row(
+            str(job["job_id"]),
+            job["clip_id"],
+            job["state"],
+            job["worker_id"] or "",
+            str(job["attempts"]),
+            job["last_error"] or "",
+        )
+    rich_print(table)
+    rich_print("Jobs: " + (", ".join(f"{n} {state}" for state, n in sorted(status["counts"].items())) or "none"))
+
+
+@app.command("worker")
+def worker(
+    broker_url: Optional[str] = typer.Option(None, "--broker", help="Broker URL (default: VTX_FARM_URL)"),
+    device: Optional[str] = typer.Option(None, "--device", help='Render device, e.g. "cuda:1" or "cpu"'),
+    warm: Optional[bool] = _WORKER_OPTION,
+    timeout: Optional[float] = _TIMEOUT_OPTION,
+    once: bool = typer.Option(False, "--once", help="Exit when the queue is empty instead of polling"),
+) -> None:
+    """Lease clips from a farm broker and render them until Ctrl+C."""
+    load_env()
+    s = Settings.from_env()
+    if warm is None:
+        warm = s.render_worker
+    render_worker = RenderWorker(env=device_env(device)) if warm else None
+    farm_worker = FarmWorker(
+        client=BrokerClient(broker_url or s.farm_url),
+        registry=Registry.load(),
+        device=device,
+        timeout=(s.render_job_timeout if timeout is None else timeout) or None,
+        worker=render_worker,
+    )
+    rich_print(f"[green]Worker {farm_worker.worker_id}[/green] pulling from {farm_worker.client.url}")
+    try:
+        done = farm_worker.run(stop_when_idle=once)
+    except KeyboardInterrupt:
+        done = None
+    finally:
+        if render_worker:
+            render_worker.close()
+    if done is not None:
+        rich_print(f"Rendered {done} farm jobs")
+
+
+@models_app.command("prefetch")
+def models_prefetch(
+    slug: Optional[str] = typer.Argument(None, help="Project slug (default: shared models only)"),
+    jobs: int = typer.Option(4, "--jobs", "-j", help="Concurrent downloads"),
+    verify: bool = typer.Option(False, "--verify", help="Hash existing models not yet in the digest manifest"),
+) -> None:
+    """Download and verify every model a render batch needs, before it starts."""
+    if slug:
+        reg = Registry.load()
+        proj = ProjectLoader(registry=reg).load(slug)
+        load_env(project_env_path=proj.project_env_path)
+        models = resolve_project_models(proj.root)
+    else:
+        load_env()
+        models = dict.fromkeys(SHARED_MODEL_ENVS)
+
+    results = ModelDownloader(Settings.from_env()).prefetch(models, jobs=jobs, verify=verify)
+
+    table = Table(title="Models")
+    table.add_column("Env", style="cyan")
+    table.add_column("Path", style="magenta")
+    table.add_column("Status")
+    colors = {"downloaded": "green", "verified": "green", "present": "white", "unset": "yellow"}
+    for env_name, status in results.items():
+        color = colors.get(status, "red")
+        table.add_row(env_name, os.getenv(env_name) or "---", f"[{color}]{status}[/{color}]")
+    rich_print(table)
+
+    if any(status.startswith("failed") for status in results.values()):
+        raise typer.Exit(1)
 
 
 @config_app.command("show")
@@ -991,5 +1497,15 @@ def config_show(slug: str = typer.Option(None, "--project", "-p")) -> None:
     rich_print(data)
 
 
+@config_app.command("clear-capabilities")
+def config_clear_capabilities(
+    module: str = typer.Option(None, "--module", "-m", help="Only this pipeline module (default: all)"),
+) -> None:
+    """Forget cached pipeline `--help` flag probes (re-detected on next render)."""
+    load_env()
+    clear_capability_cache(module)
+    rich_print(f"[green]Cleared capability cache[/green] ({module or 'all modules'})")
+
+
 if __name__ == "__main__":
     app()
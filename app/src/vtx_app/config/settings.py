@@ -14,13 +14,25 @@ class Settings:
     projects_root: Path
     default_pipeline: str
     produce_in_acts: bool
-    max_parallel_jobs: int
     fail_fast: bool
+    render_worker: bool
+    render_devices: str
+    render_slots_per_device: int
+    render_job_timeout: float
+    render_cache_max_gb: float
+    # Render farm (render/farm.py)
+    farm_url: str
+    farm_lease_seconds: float
 
     # OpenAI (optional story/prompt generation)
     openai_model: str
     openai_max_output_tokens: int
     openai_temperature: float
+    openai_concurrency: int
+    openai_max_retries: int
+    llm_cache_dir: str | None
+    llm_cache_max_mb: float
+    llm_cache_ttl_hours: float
 
     # Models (shared)
     checkpoint_path: str | None
@@ -31,6 +43,8 @@ class Settings:
 
     # Practical constraints / defaults
     ltx_max_frames: int
+    # Estimated clip lengths snap to 8k+1 frame counts this many frames apart (render/planner.py)
+    frame_bucket: int
     default_fps: int
     default_max_seconds: int
     default_width: int
@@ -47,12 +61,26 @@ class Settings:
             projects_root=projects_root,
             default_pipeline=os.getenv("VTX_DEFAULT_PIPELINE", "ti2vid_two_stages"),
             produce_in_acts=get_bool("VTX_PRODUCE_IN_ACTS", False),
-            max_parallel_jobs=int(os.getenv("VTX_MAX_PARALLEL_JOBS", "1")),
             fail_fast=get_bool("VTX_FAIL_FAST", False),
+            render_worker=get_bool("VTX_RENDER_WORKER", False),
+            render_devices=os.getenv("VTX_RENDER_DEVICES", ""),
+            # VTX_MAX_PARALLEL_JOBS is the older name of the same knob (run-plan read it)
+            render_slots_per_device=int(
+                os.getenv("VTX_RENDER_SLOTS_PER_DEVICE") or os.getenv("VTX_MAX_PARALLEL_JOBS") or "1"
+            ),
+            render_job_timeout=float(os.getenv("VTX_RENDER_JOB_TIMEOUT", "0")),
+            render_cache_max_gb=float(os.getenv("VTX_RENDER_CACHE_MAX_GB", "20")),
+            farm_url=os.getenv("VTX_FARM_URL", "http://127.0.0.1:8765"),
+            farm_lease_seconds=float(os.getenv("VTX_FARM_LEASE_SECONDS", "120")),
             # OpenAI
             openai_model=os.getenv("VTX_OPENAI_MODEL", "gpt-4o-2024-08-06"),
             openai_max_output_tokens=int(os.getenv("VTX_OPENAI_MAX_OUTPUT_TOKENS", "4096")),
             openai_temperature=float(os.getenv("VTX_OPENAI_TEMPERATURE", "0.4")),
+            openai_concurrency=int(os.getenv("VTX_OPENAI_CONCURRENCY", "4")),
+            openai_max_retries=int(os.getenv("VTX_OPENAI_MAX_RETRIES", "3")),
+            llm_cache_dir=os.getenv("VTX_LLM_CACHE_DIR") or None,
+            llm_cache_max_mb=float(os.getenv("VTX_LLM_CACHE_MAX_MB", "256")),
+            llm_cache_ttl_hours=float(os.getenv("VTX_LLM_CACHE_TTL_HOURS", "168")),
             # Shared model locations
             checkpoint_path=os.getenv("LTX_CHECKPOINT_PATH"),
             distilled_lora_path=os.getenv("LTX_DISTILLED_LORA_PATH"),
@@ -60,6 +88,7 @@ class Settings:
             gemma_root=os.getenv("LTX_GEMMA_ROOT"),
             ic_lora_path=os.getenv("LTX_IC_LORA_PATH"),
             ltx_max_frames=int(os.getenv("LTX_MAX_FRAMES", "257")),
+            frame_bucket=int(os.getenv("VTX_FRAME_BUCKET", "16")),
             default_fps=int(os.getenv("LTX_DEFAULT_FPS", "16")),
             default_max_seconds=int(os.getenv("LTX_DEFAULT_MAX_SECONDS", "15")),
             default_width=int(os.getenv("LTX_DEFAULT_WIDTH", "1536")),
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 
@@ -9,6 +9,22 @@ class PipelineCommand:
     module: str
     args: list[str]
     output_path: Path
+    # Extra environment for the pipeline process (e.g. CUDA_VISIBLE_DEVICES for a device slot)
+    env: dict[str, str] = field(default_factory=dict)
 
     def as_subprocess(self) -> list[str]:
         return ["python", "-m", self.module, *self.args]
+
+
+def device_env(device: str | None) -> dict[str, str]:
+    """
+    Environment that pins a pipeline process to one device.
+
+    "cuda:1" / "1" -> CUDA_VISIBLE_DEVICES=1, "cpu" -> hide all GPUs, None -> inherit.
+    """
+    if device is None:
+        return {}
+    if device == "cpu":
+        return {"CUDA_VISIBLE_DEVICES": ""}
+    index = device.split(":", 1)[1] if device.startswith("cuda:") else device
+    return {"CUDA_VISIBLE_DEVICES": index}
@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+import importlib.metadata
+import importlib.util
+import json
+import os
 import re
+import shutil
 import subprocess
 from dataclasses import dataclass
 from functools import lru_cache
+from pathlib import Path
+
+from vtx_app.config.settings import Settings
+from vtx_app.utils.hashing import stable_hash
 
 _FLAG_RE = re.compile(r"(--[a-zA-Z0-9][a-zA-Z0-9_-]*)")
 
@@ -14,20 +23,57 @@ class PipelineCapabilities:
     flags: set[str]
 
 
-@lru_cache(maxsize=64)
-def detect_capabilities(module: str) -> PipelineCapabilities:
+def _cache_path() -> Path:
+    return Settings.from_env().app_home / "cache" / "capabilities.json"
+
+
+def _fingerprint(module: str) -> str:
     """
-    Best-effort capability detection by calling:
-        python -m <module> --help
+    Identity of what `python -m <module> --help` would print, without importing the module:
+    the interpreter, the distribution version and the newest source mtime in its package.
+    """
+    parts: list[str] = []
+    python = shutil.which("python")
+    if python:
+        parts.append(f"{python}:{os.stat(python).st_mtime_ns}")
 
-    We then regex-scan for flags like --negative-prompt, --width, --num-frames, etc.
+    top = module.split(".")[0]
+    for dist in importlib.metadata.packages_distributions().get(top, []):
+        try:
+            parts.append(f"{dist}=={importlib.metadata.version(dist)}")
+        except importlib.metadata.PackageNotFoundError:
+            pass
+    try:
+        spec = importlib.util.find_spec(top)
+    except (ImportError, ValueError):
+        spec = None
+    if spec is not None:
+        # Package sources (args.py holds the parsers); editable installs change without a version bump
+        roots = [Path(p) for p in (spec.submodule_search_locations or [])]
+        files = [f for r in roots for f in r.rglob("*.py")] or ([Path(spec.origin)] if spec.origin else [])
+        parts.append(str(max((f.stat().st_mtime_ns for f in files), default=0)))
+    return stable_hash([module, *parts])
 
-    This keeps the app resilient against changes in LTX-2 pipeline CLI args
-    without hardcoding every option.
 
-    If detection fails, flags will be empty and the renderer will fall back to the
-    minimal required args.
-    """
+def _load_cache() -> dict[str, dict]:
+    try:
+        return json.loads(_cache_path().read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(data: dict[str, dict]) -> None:
+    path = _cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, indent=2, sort_keys=True))
+        os.replace(tmp, path)
+    except OSError:
+        pass  # cache is best-effort
+
+
+def _probe(module: str) -> PipelineCapabilities:
     try:
         out = subprocess.check_output(
             ["python", "-m", module, "--help"],
@@ -40,6 +86,49 @@ def detect_capabilities(module: str) -> PipelineCapabilities:
         return PipelineCapabilities(module=module, flags=set())
 
 
+@lru_cache(maxsize=64)
+def detect_capabilities(module: str) -> PipelineCapabilities:
+    """
+    Best-effort capability detection by calling:
+        python -m <module> --help
+
+    We then regex-scan for flags like --negative-prompt, --width, --num-frames, etc.
+
+    This keeps the app resilient against changes in LTX-2 pipeline CLI args
+    without hardcoding every option.
+
+    Results are persisted in <app_home>/cache/capabilities.json keyed on the module's
+    fingerprint (interpreter, package version, source mtimes), so repeated CLI invocations
+    skip the torch import `--help` pays. See clear_capability_cache().
+
+    If detection fails, flags will be empty and the renderer will fall back to the
+    minimal required args.
+    """
+    fingerprint = _fingerprint(module)
+    entry = _load_cache().get(module)
+    if entry and entry.get("fingerprint") == fingerprint:
+        return PipelineCapabilities(module=module, flags=set(entry.get("flags") or []))
+
+    cap = _probe(module)
+    if cap.flags:
+        # Failed probes are not persisted so a fixed environment is picked up next run
+        data = _load_cache()
+        data[module] = {"fingerprint": fingerprint, "flags": sorted(cap.flags)}
+        _save_cache(data)
+    return cap
+
+
+def clear_capability_cache(module: str | None = None) -> None:
+    """Drop persisted (and in-process) capability probes, for one module or all."""
+    detect_capabilities.cache_clear()
+    if module is None:
+        _cache_path().unlink(missing_ok=True)
+        return
+    data = _load_cache()
+    if data.pop(module, None) is not None:
+        _save_cache(data)
+
+
 def first_supported(cap: PipelineCapabilities, *candidates: str) -> str | None:
     """
     Return the first candidate flag supported by the module, else None.
@@ -1,12 +1,59 @@
 from __future__ import annotations
 
+import os
 import subprocess
+import threading
+import time
 
 from rich import print
 from vtx_app.pipelines.base import PipelineCommand
 
+_POLL_INTERVAL = 0.5
 
-def run(cmd: PipelineCommand) -> None:
+
+class JobCancelled(RuntimeError):
+    """A render job was cancelled while queued or running."""
+
+
+def _terminate(proc: subprocess.Popen) -> None:
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def run(
+    cmd: PipelineCommand,
+    *,
+    timeout: float | None = None,
+    cancel: threading.Event | None = None,
+) -> None:
+    """
+    Run a pipeline command as a subprocess.
+
+    The process is killed (and TimeoutExpired / JobCancelled raised) when `timeout`
+    seconds elapse or `cancel` is set.
+    """
     cmdline = cmd.as_subprocess()
     print("[cyan]RUN[/cyan] " + " ".join(cmdline))
-    subprocess.check_call(cmdline)
+    env = {**os.environ, **cmd.env} if cmd.env else None
+    proc = subprocess.Popen(cmdline, env=env)
+
+    deadline = time.monotonic() + timeout if timeout else None
+    while True:
+        try:
+            returncode = proc.wait(timeout=_POLL_INTERVAL)
+            break
+        except subprocess.TimeoutExpired:
+            pass
+        if cancel is not None and cancel.is_set():
+            _terminate(proc)
+            raise JobCancelled(f"Cancelled: {cmd.module} -> {cmd.output_path}")
+        if deadline is not None and time.monotonic() > deadline:
+            _terminate(proc)
+            raise subprocess.TimeoutExpired(cmdline, timeout)
+
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, cmdline)
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import threading
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+
+from rich import print
+from vtx_app.pipelines.base import PipelineCommand
+from vtx_app.pipelines.runner_subprocess import JobCancelled
+
+WORKER_MODULE = "ltx_pipelines.worker"
+
+
+class WorkerUnavailable(RuntimeError):
+    """The warm worker cannot serve this command; callers should fall back to a subprocess."""
+
+
+@dataclass
+class RenderWorker:
+    """
+    Client for a long-lived `python -m ltx_pipelines.worker` process.
+
+    The worker keeps pipelines (and their model builders) resident between clips, so a batch
+    pays interpreter + torch startup once. Jobs are exchanged as JSON lines over stdin/stdout.
+    """
+
+    command: list[str] = field(default_factory=lambda: ["python", "-m", WORKER_MODULE])
+    # Extra environment for the worker process (e.g. device pinning for a scheduler slot)
+    env: dict[str, str] = field(default_factory=dict)
+    _proc: subprocess.Popen | None = field(default=None, init=False, repr=False)
+    _modules: set[str] = field(default_factory=set, init=False, repr=False)
+    _failed: bool = field(default=False, init=False, repr=False)
+
+    def start(self) -> None:
+        if self._proc is not None and self._proc.poll() is None:
+            return
+        if self._failed:
+            raise WorkerUnavailable("Render worker failed to start earlier in this session")
+        try:
+            self._proc = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+                env={**os.environ, **self.env} if self.env else None,
+            )
+        except OSError as e:
+            self._failed = True
+            raise WorkerUnavailable(f"Failed to start render worker: {e}") from e
+
+        try:
+            resp = self._request({"op": "ping"})
+        except WorkerUnavailable:
+            self._failed = True
+            raise
+        self._modules = set(resp.get("modules") or [])
+        print(f"[cyan]WORKER[/cyan] started ({', '.join(sorted(self._modules)) or 'no modules'})")
+
+    def _request(self, payload: dict[str, Any]) -> dict[str, Any]:
+        proc = self._proc
+        if proc is None or proc.stdin is None or proc.stdout is None:
+            raise WorkerUnavailable("Render worker is not running")
+
+        payload.setdefault("id", uuid.uuid4().hex)
+        try:
+            proc.stdin.write(json.dumps(payload) + "\n")
+            proc.stdin.flush()
+            line = proc.stdout.readline()
+        except (BrokenPipeError, OSError) as e:
+            self.close()
+            raise WorkerUnavailable(f"Render worker connection lost: {e}") from e
+
+        if not line:
+            self.close()
+            raise WorkerUnavailable("Render worker exited unexpectedly")
+        try:
+            return json.loads(line)
+        except json.JSONDecodeError as e:
+            raise WorkerUnavailable(f"Malformed worker response: {line[:200]!r}") from e
+
+    def supports(self, module: str) -> bool:
+        return module in self._modules
+
+    def run(
+        self,
+        cmd: PipelineCommand,
+        *,
+        timeout: float | None = None,
+        cancel: threading.Event | None = None,
+    ) -> None:
+        """
+        Render one command in the warm worker.
+
+        Raises WorkerUnavailable when the worker cannot take the job (not running, unsupported module),
+        and RuntimeError when the pipeline itself failed. A timeout or cancellation kills the worker
+        (it is restarted for the next job) and raises TimeoutExpired / JobCancelled.
+        """
+        self.start()
+        if not self.supports(cmd.module):
+            raise WorkerUnavailable(f"Render worker does not serve {cmd.module}")
+
+        print(f"[cyan]WORKER[/cyan] {cmd.module} -> {cmd.output_path}")
+        done = threading.Event()
+        reason: list[str] = []
+
+        def watch() -> None:
+            # Wakes up periodically; kills the worker process when the job must stop.
+            waited = 0.0
+            while not done.wait(0.5):
+                waited += 0.5
+                if cancel is not None and cancel.is_set():
+                    reason.append("cancelled")
+                elif timeout is not None and waited >= timeout:
+                    reason.append("timeout")
+                else:
+                    continue
+                proc = self._proc
+                if proc is not None:
+                    proc.kill()
+                return
+
+        watcher = None
+        if timeout is not None or cancel is not None:
+            watcher = threading.Thread(target=watch, daemon=True)
+            watcher.start()
+        try:
+            resp = self._request({"module": cmd.module, "args": cmd.args})
+        except WorkerUnavailable:
+            if reason == ["cancelled"]:
+                raise JobCancelled(f"Cancelled: {cmd.module} -> {cmd.output_path}") from None
+            if reason == ["timeout"]:
+                raise subprocess.TimeoutExpired(cmd.as_subprocess(), timeout) from None
+            raise
+        finally:
+            done.set()
+            if watcher is not None:
+                watcher.join()
+
+        if resp.get("ok"):
+            return
+        if resp.get("unsupported"):
+            raise WorkerUnavailable(resp.get("error") or f"Render worker does not serve {cmd.module}")
+        raise RuntimeError(resp.get("error") or "Render worker job failed")
+
+    def close(self) -> None:
+        proc = self._proc
+        self._proc = None
+        if proc is None:
+            return
+        try:
+            if proc.poll() is None and proc.stdin is not None:
+                proc.stdin.write(json.dumps({"op": "shutdown"}) + "\n")
+                proc.stdin.flush()
+                proc.stdin.close()
+            proc.wait(timeout=30)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            proc.kill()
+
+    def __enter__(self) -> RenderWorker:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import os
 import stat
-import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable
@@ -11,8 +11,17 @@ from rich import print
 from vtx_app.project.layout import Project
 from vtx_app.project.loader import ProjectLoader
 from vtx_app.registry.db import Registry
-from vtx_app.render.assembler import Assembler
+from vtx_app.render.executor import PlanExecutor
+from vtx_app.render.planner import (
+    ASSEMBLE_JOB_ID,
+    RenderPlan,
+    build_render_plan,
+    plan_path,
+    project_clip_ids,
+    project_shapes,
+)
 from vtx_app.story.openai_builder import StoryBuilder
+from vtx_app.utils.timecode import now_iso
 
 
 @dataclass
@@ -60,16 +69,24 @@ class Director:
 
         builder = StoryBuilder(project=proj)
 
-        # 3. Generate Artifacts (Chain)
-        self._step("Outline", builder.generate_outline)
-        self._step("Treatment", builder.generate_treatment)
-        self._step("Screenplay", builder.generate_screenplay)
-        self._step("Characters", builder.generate_characters)
-        self._step("Locations", builder.generate_locations)
+        # 3. Generate Artifacts. Steps only wait on the artifacts they read:
+        #    characters/locations need just the brief, treatment/screenplay the outline,
+        #    the shotlist all of those, and clip specs the shotlist.
+        self._steps(
+            ("Outline", builder.generate_outline),
+            ("Characters", builder.generate_characters),
+            ("Locations", builder.generate_locations),
+        )
+        self._steps(
+            ("Treatment", builder.generate_treatment),
+            ("Screenplay", builder.generate_screenplay),
+        )
         self._step("Shotlist", builder.generate_shotlist)
         self._step("Clip Specs", builder.generate_clip_specs)
 
-        # 4. Generate Render Script
+        # 4. Generate Render Plan (clips -> assemble) and a script that runs it
+        plan = self._generate_render_plan(proj)
+        print(f"[green]Generated render plan:[/green] {plan_path(proj.root)} ({len(plan.jobs) - 1} clips)")
         script_path = proj.root / "render_all.sh"
         self._generate_render_script(proj, script_path)
         print(f"[green]Generated render script:[/green] {script_path}")
@@ -77,12 +94,13 @@ class Director:
         # 5. Auto Render?
         if auto_render:
             print("[bold red]🚀 Launching Render Sequence...[/bold red]")
-            subprocess.run(["bash", str(script_path)], check=True)
-
-            # Assemble
-            asm = Assembler(project=proj)
-            asm.assemble()
-            print("[bold green]✅ Production Complete![/bold green] (final_cut.mp4)")
+            executor = PlanExecutor.from_settings(
+                project=proj, registry=self.registry, plan=plan, settings=proj.settings()
+            )
+            if executor.run().get(ASSEMBLE_JOB_ID) == "done":
+                print("[bold green]✅ Production Complete![/bold green] (final_cut.mp4)")
+            else:
+                print(f"[yellow]Production incomplete.[/yellow] Fix failed clips, then: vtx render run-plan {slug}")
 
     def _step(self, name: str, func: Callable[[], None]) -> None:
         print(f"[cyan]Generating {name}...[/cyan]")
@@ -92,8 +110,33 @@ class Director:
         except Exception as e:
             print(f"[red]Failed {name}: {e}[/red]")
 
+    def _steps(self, *steps: tuple[str, Callable[[], None]]) -> None:
+        """Run independent steps concurrently; returns once all of them finished."""
+        with ThreadPoolExecutor(max_workers=len(steps), thread_name_prefix="story") as pool:
+            for future in [pool.submit(self._step, name, func) for name, func in steps]:
+                future.result()
+
+    def _generate_render_plan(self, proj: Project) -> RenderPlan:
+        """Writes render_plan.json: one render job per clip in prompts/clips, then the assembly."""
+        meta = (proj.load_metadata() if proj.metadata_path.exists() else None) or {}
+        clip_ids = project_clip_ids(proj.root)
+        try:
+            # Queue clips by shape bucket so consecutive renders reuse the warm model
+            shapes = project_shapes(proj, self.registry, clip_ids)
+        except Exception as e:
+            print(f"[yellow]Render plan without shape buckets: {e}[/yellow]")
+            shapes = {}
+        plan = build_render_plan(
+            project_id=str(meta.get("project_id")),
+            created_at=now_iso(),
+            clip_ids=clip_ids,
+            shapes=shapes,
+        )
+        plan.save(plan_path(proj.root))
+        return plan
+
     def _generate_render_script(self, proj: Project, script_path: Path) -> None:
-        """Writes a bash script to render all clips found in prompts/clips."""
+        """Writes a bash script that runs the project's render plan."""
         # Note: proj.slug doesn't exist on Project layout, assume metadata has it or pass it in.
         # But we assume calling code passed slug.
         # Actually proj is Project layout.
@@ -112,33 +155,11 @@ class Director:
             "",
         ]
 
-        # Find all clips
-        clips_dir = proj.root / "prompts" / "clips"
-        # We should check if clips exsit, BUT sometimes they are generated after
-        # this script is written? No, we just generated them in step 3.
-        # So we can search.
-        clips = sorted(clips_dir.glob("*.yaml"))
-
-        # If running in test, we might not have actual files unless mocked side effects created them.
-        # But we want the script to be valid even if empty? No, render_all usually implies clips.
-        # Let's trust glob.
-
-        if not clips:
+        if not project_clip_ids(proj.root):
             lines.append("echo 'No clips found to render!'")
-            # Fallback for test or empty run:
-            # We add assemble anyway so at least we can verify it's there?
-            # Or better: fix the test to create a dummy clip.
         else:
-            for clip_path in clips:
-                clip_id = clip_path.stem
-                lines.append(f"echo 'Rendering {clip_id}...'")
-                # We use the CLI command vtx render clip
-                # Assuming 'vtx' is in path or we call python module
-                lines.append(f"vtx render clip {slug} {clip_id}")
-
-            lines.append("")
-            lines.append("echo 'Assembling...'")
-            lines.append(f"vtx render assemble {slug}")
+            # Renders every clip on VTX_RENDER_SLOTS_PER_DEVICE slots per device, then assembles; re-running resumes
+            lines.append(f"vtx render run-plan {slug}")
             lines.append("echo 'Done.'")
 
         script_path.write_text("\n".join(lines))
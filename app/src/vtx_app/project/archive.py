@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import uuid
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path, PurePosixPath, PureWindowsPath
+from typing import Any
+
+from vtx_app.utils.timecode import now_iso
+
+# Bump when the snapshot or chunk layout changes
+ARCHIVE_VERSION = 1
+
+# Fixed-size chunks: identical files (drafts, latents, reference images) dedupe across projects,
+# and a file that only grew ships just its new tail
+CHUNK_SIZE = 4 * 1024**2
+# Chunks that shrink by less than this are stored raw (mp4/jpg/png are already compressed)
+MIN_SAVING = 0.05
+_RAW, _ZLIB = b"R", b"Z"
+
+EXCLUDE_DIRS = {".venv", "__pycache__", ".git"}
+EXCLUDE_FILES = {".DS_Store"}
+EXCLUDE_SUFFIXES = {".pyc"}
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    path: str
+    size: int
+    mode: int
+    mtime_ns: int
+    chunks: list[str]
+
+
+def _checked_entry(entry: FileEntry) -> FileEntry:
+    """Reject entry paths that would land outside the project on import (snapshots move between hosts)."""
+    # Checked with Windows rules too: "C:x", "\\server\\share" and "..\\x" are unsafe there
+    paths = (PurePosixPath(entry.path), PureWindowsPath(entry.path))
+    if not entry.path or any(p.anchor or ".." in p.parts for p in paths):
+        raise ValueError(f"Unsafe path in export snapshot: {entry.path!r}")
+    return entry
+
+
+@dataclass
+class Snapshot:
+    """One export of a project: its files, each as an ordered list of chunk hashes."""
+
+    slug: str
+    project_id: str
+    created_at: str
+    files: list[FileEntry]
+    # Snapshot the export was made against (its chunks were not shipped again)
+    base: str | None = None
+
+    def chunk_ids(self) -> set[str]:
+        return {h for f in self.files for h in f.chunks}
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": ARCHIVE_VERSION,
+            "slug": self.slug,
+            "project_id": self.project_id,
+            "created_at": self.created_at,
+            "base": self.base,
+            "files": [asdict(f) for f in self.files],
+        }
+
+    @staticmethod
+    def from_dict(data: dict[str, Any]) -> Snapshot:
+        if data.get("version") != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported export snapshot version: {data.get('version')}")
+        return Snapshot(
+            slug=str(data["slug"]),
+            project_id=str(data.get("project_id")),
+            created_at=str(data.get("created_at") or ""),
+            base=data.get("base"),
+            files=[_checked_entry(FileEntry(**f)) for f in data.get("files") or []],
+        )
+
+    @staticmethod
+    def load(path: Path) -> Snapshot:
+        return Snapshot.from_dict(json.loads(path.read_text()))
+
+
+@dataclass(frozen=True)
+class ExportStats:
+    snapshot: Path
+    files: int
+    bytes: int
+    # Chunks written by this export vs. already in the store (or the base snapshot)
+    new_chunks: int
+    reused_chunks: int
+    written_bytes: int
+
+
+@dataclass
+class ChunkStore:
+    """
+    Content-addressed export store: chunks/<hh>/<sha256> plus snapshots/<slug>/<time>.json.
+
+    Several projects can share one store, so identical files are kept once. The layout is
+    append-only, so syncing a store between hosts (rsync, object storage) only moves new files.
+    """
+
+    root: Path
+    # Extra stores chunks are also read from (e.g. the full export a delta was made against)
+    fallbacks: list[Path] = field(default_factory=list)
+
+    def chunk_path(self, chunk_id: str, root: Path | None = None) -> Path:
+        return (root or self.root) / "chunks" / chunk_id[:2] / chunk_id
+
+    def has(self, chunk_id: str) -> bool:
+        return self.chunk_path(chunk_id).is_file()
+
+    def snapshots(self, slug: str) -> list[Path]:
+        """Snapshots of `slug`, oldest first."""
+        return sorted((self.root / "snapshots" / slug).glob("*.json"))
+
+    def latest(self, slug: str) -> Snapshot | None:
+        snaps = self.snapshots(slug)
+        return Snapshot.load(snaps[-1]) if snaps else None
+
+    def read_chunk(self, chunk_id: str) -> bytes:
+        for root in (self.root, *self.fallbacks):
+            path = self.chunk_path(chunk_id, root)
+            if path.is_file():
+                return _decode_chunk(chunk_id, path.read_bytes())
+        raise FileNotFoundError(f"Chunk {chunk_id} not found in {self.root}")
+
+
+def _decode_chunk(chunk_id: str, payload: bytes) -> bytes:
+    data = zlib.decompress(payload[1:]) if payload[:1] == _ZLIB else payload[1:]
+    if hashlib.sha256(data).hexdigest() != chunk_id:
+        raise ValueError(f"Chunk {chunk_id} is corrupt")
+    return data
+
+
+# Chunk IDs the destination already has (set once per worker process)
+_known: frozenset[str] = frozenset()
+
+
+def _init_worker(known: frozenset[str]) -> None:
+    global _known
+    _known = known
+
+
+def _pack_chunk(src: str, offset: int, length: int, store_root: str, level: int) -> tuple[str, int]:
+    """Hash one chunk of `src` and, unless the store has it, compress and write it; returns (id, bytes written)."""
+    with open(src, "rb") as f:
+        f.seek(offset)
+        data = f.read(length)
+    chunk_id = hashlib.sha256(data).hexdigest()
+    dest = Path(store_root) / "chunks" / chunk_id[:2] / chunk_id
+    if chunk_id in _known or dest.exists():
+        return chunk_id, 0
+
+    packed = zlib.compress(data, level)
+    payload = _ZLIB + packed if len(packed) < len(data) * (1 - MIN_SAVING) else _RAW + data
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{chunk_id}.{uuid.uuid4().hex}")
+    tmp.write_bytes(payload)
+    os.replace(tmp, dest)
+    return chunk_id, len(payload)
+
+
+def project_files(root: Path) -> list[Path]:
+    """Files to export, sorted (virtualenvs, VCS and bytecode excluded)."""
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in EXCLUDE_DIRS)
+        for name in filenames:
+            path = Path(dirpath) / name
+            if name in EXCLUDE_FILES or path.suffix in EXCLUDE_SUFFIXES or not path.is_file():
+                continue
+            files.append(path)
+    return sorted(files)
+
+
+def export_project(
+    project_root: Path,
+    store: ChunkStore,
+    *,
+    slug: str,
+    project_id: str,
+    since: Snapshot | None = None,
+    jobs: int | None = None,
+    level: int = 6,
+) -> ExportStats:
+    """
+    Export a project into `store` as a new snapshot.
+
+    Incremental: files whose size and mtime match the previous snapshot of `slug` keep their
+    chunk lists without being read, and only chunks the store lacks are compressed (in a process
+    pool) and written. With `since`, the chunks of that snapshot are assumed to be at the
+    destination already, so `store` can be a fresh directory that receives just the delta.
+    """
+    previous = since or store.latest(slug)
+    prev_files = {f.path: f for f in previous.files} if previous else {}
+    known = frozenset(since.chunk_ids()) if since else frozenset()
+
+    entries: dict[str, FileEntry] = {}
+    tasks: list[tuple[str, Path, os.stat_result, list[tuple[int, int]]]] = []
+    reused = 0
+    for path in project_files(project_root):
+        rel = path.relative_to(project_root).as_posix()
+        st = path.stat()
+        prev = prev_files.get(rel)
+        if (
+            prev
+            and prev.size == st.st_size
+            and prev.mtime_ns == st.st_mtime_ns
+            and all(h in known or store.has(h) for h in prev.chunks)
+        ):
+            entries[rel] = prev
+            reused += len(prev.chunks)
+            continue
+        spans = [(off, min(CHUNK_SIZE, st.st_size - off)) for off in range(0, st.st_size, CHUNK_SIZE)]
+        tasks.append((rel, path, st, spans))
+
+    # Identical chunks of one export may be packed by two workers at once: count them once
+    new: dict[str, int] = {}
+    if tasks:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(known,)) as pool:
+            futures = {
+                rel: [pool.submit(_pack_chunk, str(path), off, n, str(store.root), level) for off, n in spans]
+                for rel, path, _st, spans in tasks
+            }
+            for rel, path, st, _spans in tasks:
+                chunk_ids = []
+                for future in futures[rel]:
+                    chunk_id, nbytes = future.result()
+                    chunk_ids.append(chunk_id)
+                    if nbytes:
+                        new[chunk_id] = nbytes
+                    elif chunk_id not in new:
+                        reused += 1
+                entries[rel] = FileEntry(
+                    path=rel, size=st.st_size, mode=st.st_mode & 0o777, mtime_ns=st.st_mtime_ns, chunks=chunk_ids
+                )
+
+    files = [entries[rel] for rel in sorted(entries)]
+    snapshot = Snapshot(
+        slug=slug,
+        project_id=project_id,
+        created_at=now_iso(),
+        files=files,
+        base=f"{previous.slug}@{previous.created_at}" if since else None,
+    )
+    snap_dir = store.root / "snapshots" / slug
+    snap_dir.mkdir(parents=True, exist_ok=True)
+    snap_path = snap_dir / f"{snapshot.created_at.replace(':', '')}-{uuid.uuid4().hex[:6]}.json"
+    tmp = snap_dir / f".{snap_path.name}.tmp"
+    tmp.write_text(json.dumps(snapshot.to_dict(), indent=1))
+    os.replace(tmp, snap_path)
+
+    return ExportStats(
+        snapshot=snap_path,
+        files=len(files),
+        bytes=sum(f.size for f in files),
+        new_chunks=len(new),
+        reused_chunks=reused,
+        written_bytes=sum(new.values()),
+    )
+
+
+def _restore_file(store: ChunkStore, entry: FileEntry, dest_root: Path) -> bool:
+    dest = dest_root / entry.path
+    # Also catches symlinks already under dest_root that point elsewhere
+    if not dest.resolve().is_relative_to(dest_root.resolve()):
+        raise ValueError(f"Snapshot entry {entry.path!r} resolves outside {dest_root}")
+    if dest.is_file():
+        st = dest.stat()
+        if st.st_size == entry.size and st.st_mtime_ns == entry.mtime_ns:
+            return False
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.import")
+    with open(tmp, "wb") as f:
+        for chunk_id in entry.chunks:
+            f.write(store.read_chunk(chunk_id))
+    os.chmod(tmp, entry.mode)
+    os.utime(tmp, ns=(entry.mtime_ns, entry.mtime_ns))
+    os.replace(tmp, dest)
+    return True
+
+
+def import_snapshot(snapshot: Snapshot, store: ChunkStore, dest_root: Path, jobs: int | None = None) -> int:
+    """
+    Materialize a snapshot under `dest_root`; returns the number of files written.
+
+    Files already there with the snapshot's size and mtime are skipped, so re-importing a newer
+    snapshot of the same project only rewrites what changed. Chunks are verified by hash.
+    """
+    dest_root.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="vtx-import") as pool:
+        return sum(pool.map(lambda entry: _restore_file(store, entry, dest_root), snapshot.files))
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+from rich import print
+from vtx_app.registry.db import Registry
+
+
+@dataclass(frozen=True)
+class ClipSpecEntry:
+    clip_id: str
+    # Filename prefix before "__" (what `render clip <id>` matches on)
+    file_id: str
+    spec_path: Path
+    spec: dict[str, Any]
+    output_path: str | None
+
+
+def _file_id(spec_path: Path) -> str:
+    return spec_path.stem.split("__")[0]
+
+
+def _parse(project_id: str, spec_path: Path, st: os.stat_result) -> dict[str, Any]:
+    spec = yaml.safe_load(spec_path.read_text()) or {}
+    # fall back to filename prefix before '__'
+    clip_id = str(spec.get("clip_id") or "").strip() or _file_id(spec_path)
+    out = (spec.get("outputs") or {}).get("mp4")
+    return {
+        "project_id": project_id,
+        "spec_path": str(spec_path),
+        "file_id": _file_id(spec_path),
+        "clip_id": clip_id,
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "spec_json": json.dumps(spec, default=str),
+        "output_path": str(out) if out else None,
+    }
+
+
+def _entry(row: dict[str, Any]) -> ClipSpecEntry:
+    return ClipSpecEntry(
+        clip_id=row["clip_id"],
+        file_id=row["file_id"],
+        spec_path=Path(row["spec_path"]),
+        spec=json.loads(row["spec_json"]),
+        output_path=row["output_path"],
+    )
+
+
+@dataclass
+class ProjectIndex:
+    """
+    Registry-backed index of a project's clip specs (prompts/clips/*.yaml).
+
+    Rows are validated against each file's mtime/size, so a refresh is one directory scan
+    plus parsing only the specs that changed; single-clip lookups stat just that file.
+    """
+
+    registry: Registry
+    project_id: str
+    root: Path
+    # Spec files the last refresh could not parse: path -> error
+    skipped: dict[str, str] = field(default_factory=dict, init=False, repr=False)
+
+    @property
+    def clips_dir(self) -> Path:
+        return self.root / "prompts" / "clips"
+
+    def refresh(self) -> list[ClipSpecEntry]:
+        """Bring the index up to date; returns the entries that were added or changed."""
+        known = {r["spec_path"]: r for r in self.registry.list_clip_specs(self.project_id)}
+        changed: list[dict[str, Any]] = []
+        seen: set[str] = set()
+        self.skipped = {}
+
+        if self.clips_dir.exists():
+            with os.scandir(self.clips_dir) as it:
+                for de in it:
+                    if not de.name.endswith(".yaml") or not de.is_file():
+                        continue
+                    seen.add(de.path)
+                    st = de.stat()
+                    row = known.get(de.path)
+                    if row and row["mtime_ns"] == st.st_mtime_ns and row["size"] == st.st_size:
+                        continue
+                    try:
+                        changed.append(_parse(self.project_id, Path(de.path), st))
+                    except (OSError, yaml.YAMLError) as e:
+                        # Not indexed, so it is retried on the next refresh
+                        self.skipped[de.path] = str(e)
+                        print(f"[yellow]Skip clip[/yellow] {de.path}: {e}")
+
+        self.registry.upsert_clip_specs(changed)
+        self.registry.delete_clip_specs(project_id=self.project_id, spec_paths=sorted(set(known) - seen))
+        return [_entry(r) for r in sorted(changed, key=lambda r: r["spec_path"])]
+
+    def entries(self) -> list[ClipSpecEntry]:
+        """All clip specs, ordered by file name."""
+        self.refresh()
+        return [_entry(r) for r in self.registry.list_clip_specs(self.project_id)]
+
+    def get(self, clip_id: str) -> ClipSpecEntry | None:
+        """
+        Spec for `clip_id` ({clip_id}.yaml first, else {clip_id}__*.yaml), without scanning the project.
+        """
+        rows = self.registry.find_clip_specs(project_id=self.project_id, file_id=clip_id)
+        # Exact file name wins over the fuzzy clip_id__desc match (same order as the glob lookup)
+        rows = sorted(rows, key=lambda r: Path(r["spec_path"]).stem != clip_id)
+        stale: list[str] = []
+        for row in rows:
+            path = Path(row["spec_path"])
+            try:
+                st = path.stat()
+            except OSError:
+                stale.append(row["spec_path"])
+                continue
+            if row["mtime_ns"] != st.st_mtime_ns or row["size"] != st.st_size:
+                row = _parse(self.project_id, path, st)
+                self.registry.upsert_clip_specs([row])
+            self.registry.delete_clip_specs(project_id=self.project_id, spec_paths=stale)
+            return _entry(row)
+        self.registry.delete_clip_specs(project_id=self.project_id, spec_paths=stale)
+
+        # Not indexed yet (new file): look it up directly and index it
+        candidates = [self.clips_dir / f"{clip_id}.yaml", *sorted(self.clips_dir.glob(f"{clip_id}__*.yaml"))]
+        for path in candidates:
+            if path.is_file():
+                row = _parse(self.project_id, path, path.stat())
+                self.registry.upsert_clip_specs([row])
+                return _entry(row)
+        return None
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import datetime
+import json
 import shutil
 import uuid
 from dataclasses import dataclass
@@ -9,6 +11,7 @@ import yaml
 from rich import print
 from vtx_app.config.env_layers import load_env
 from vtx_app.config.settings import Settings
+from vtx_app.project.index import ProjectIndex
 from vtx_app.project.layout import Project
 from vtx_app.registry.db import Registry
 from vtx_app.utils.timecode import now_iso
@@ -24,37 +27,51 @@ class ProjectLoader:
     def _template_root(self) -> Path:
         return self._app_root() / "_global" / "templates" / "project_template"
 
+    def _clip_newer_than_spec(self, project_id: str, row: dict) -> bool:
+        clip = self.registry.get_clip(project_id=project_id, clip_id=row["clip_id"])
+        if not clip or not clip["updated_at"]:
+            return False
+        spec_time = datetime.datetime.fromtimestamp(row["mtime_ns"] / 1e9, datetime.UTC)
+        return clip["updated_at"] >= spec_time.replace(microsecond=0).isoformat().replace("+00:00", "") + "Z"
+
     def _sync_project_clips(self, *, project_path: Path, project_id: str) -> None:
         """
-        Scan prompts/clips/*.yaml and ensure they exist in the global registry.
+        Ensure prompts/clips/*.yaml exist in the global registry.
         This is what makes 'render resume' work across multiple projects.
-        """
-        clips_dir = project_path / "prompts" / "clips"
-        if not clips_dir.exists():
-            return
 
-        for yml in sorted(clips_dir.glob("*.yaml")):
+        Each spec's mtime/size is compared with the version its clips row was last synced from,
+        so only specs added or edited since then are applied, whichever command refreshed the
+        project index in between.
+        """
+        index = ProjectIndex(registry=self.registry, project_id=project_id, root=project_path)
+        index.refresh()
+        synced = self.registry.list_clip_spec_syncs(project_id)
+        current: dict[str, tuple[int, int]] = {}
+        for row in self.registry.list_clip_specs(project_id):
+            version = (row["mtime_ns"], row["size"])
+            current[row["spec_path"]] = version
+            if synced.get(row["spec_path"]) == version:
+                continue
+            if row["spec_path"] not in synced and self._clip_newer_than_spec(project_id, row):
+                # Registry from before sync records: a clips row written after the spec already reflects it
+                continue
             try:
-                clip = yaml.safe_load(yml.read_text()) or {}
-                clip_id = str(clip.get("clip_id") or "").strip()
-                if not clip_id:
-                    # fall back to filename prefix before '__'
-                    clip_id = yml.stem.split("__")[0]
-                status = clip.get("status") or {}
+                status = json.loads(row["spec_json"]).get("status") or {}
                 state = str(status.get("state") or "planned")
-                outputs = clip.get("outputs") or {}
-                out_path = outputs.get("mp4")
                 self.registry.upsert_clip(
                     project_id=project_id,
-                    clip_id=clip_id,
+                    clip_id=row["clip_id"],
                     state=state,
-                    output_path=str(out_path) if out_path else None,
+                    output_path=row["output_path"],
                     render_hash=None,
                     updated_at=now_iso(),
                     last_error=status.get("last_error"),
                 )
             except Exception as e:
-                print(f"[yellow]Skip clip[/yellow] {yml}: {e}")
+                # Not recorded as synced, so it is retried on the next sync
+                del current[row["spec_path"]]
+                print(f"[yellow]Skip clip[/yellow] {row['spec_path']}: {e}")
+        self.registry.set_clip_spec_syncs(project_id=project_id, synced=current)
 
     def sync_all_projects(self) -> None:
         load_env(project_env_path=None)
@@ -73,15 +90,17 @@ class ProjectLoader:
             try:
                 data = yaml.safe_load(meta.read_text()) or {}
                 project_id = str(data.get("project_id"))
-                self.registry.upsert_project(
-                    project_id=project_id,
-                    slug=str(data.get("slug")),
-                    title=str(data.get("title")),
-                    path=str(p),
-                    updated_at=str(data.get("updated_at", "")),
-                )
-                if project_id:
-                    self._sync_project_clips(project_path=p, project_id=project_id)
+                # One commit per project rather than one per clip
+                with self.registry.transaction():
+                    self.registry.upsert_project(
+                        project_id=project_id,
+                        slug=str(data.get("slug")),
+                        title=str(data.get("title")),
+                        path=str(p),
+                        updated_at=str(data.get("updated_at", "")),
+                    )
+                    if project_id:
+                        self._sync_project_clips(project_path=p, project_id=project_id)
             except Exception as e:
                 print(f"[yellow]Skip[/yellow] {p}: {e}")
 
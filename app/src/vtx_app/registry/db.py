@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import queue
 import sqlite3
-from dataclasses import dataclass
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -27,13 +31,143 @@ CREATE TABLE IF NOT EXISTS clips (
   last_error TEXT,
   PRIMARY KEY(project_id, clip_id)
 );
+
+CREATE INDEX IF NOT EXISTS idx_clips_state_updated ON clips(state, updated_at);
+
+-- Parsed prompts/clips/*.yaml, validated by file mtime/size (see project/index.py)
+CREATE TABLE IF NOT EXISTS clip_specs (
+  project_id TEXT NOT NULL,
+  spec_path TEXT NOT NULL,
+  file_id TEXT NOT NULL,
+  clip_id TEXT NOT NULL,
+  mtime_ns INTEGER NOT NULL,
+  size INTEGER NOT NULL,
+  spec_json TEXT NOT NULL,
+  output_path TEXT,
+  PRIMARY KEY(project_id, spec_path)
+);
+
+CREATE INDEX IF NOT EXISTS idx_clip_specs_file_id ON clip_specs(project_id, file_id);
+
+-- Spec version (mtime/size) each clips row was last synced from (see project/loader.py)
+CREATE TABLE IF NOT EXISTS clip_spec_syncs (
+  project_id TEXT NOT NULL,
+  spec_path TEXT NOT NULL,
+  mtime_ns INTEGER NOT NULL,
+  size INTEGER NOT NULL,
+  PRIMARY KEY(project_id, spec_path)
+);
+
+-- One row per finished render: app-side wall time plus the pipeline's metrics sidecar (see render/telemetry.py)
+CREATE TABLE IF NOT EXISTS render_metrics (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  project_id TEXT NOT NULL,
+  clip_id TEXT NOT NULL,
+  preset TEXT NOT NULL,
+  pipeline TEXT NOT NULL,
+  render_hash TEXT,
+  created_at TEXT NOT NULL,
+  wall_time REAL NOT NULL,
+  num_frames INTEGER,
+  width INTEGER,
+  height INTEGER,
+  steps INTEGER,
+  denoise_time REAL,
+  peak_rss_bytes INTEGER,
+  peak_gpu_bytes INTEGER,
+  output_bytes INTEGER,
+  stages_json TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_render_metrics_project ON render_metrics(project_id, created_at);
+
+-- Render farm queue (render/farm.py): queued -> leased -> done | failed; expired leases requeue
+CREATE TABLE IF NOT EXISTS farm_jobs (
+  job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  project_id TEXT NOT NULL,
+  clip_id TEXT NOT NULL,
+  render_kwargs TEXT NOT NULL,
+  state TEXT NOT NULL,
+  worker_id TEXT,
+  lease_expires REAL,
+  attempts INTEGER NOT NULL DEFAULT 0,
+  created_at TEXT NOT NULL,
+  updated_at TEXT NOT NULL,
+  last_error TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_farm_jobs_state ON farm_jobs(state, job_id);
 """
 
+_CLIP_SPEC_COLUMNS = ("project_id", "spec_path", "file_id", "clip_id", "mtime_ns", "size", "spec_json", "output_path")
+
+_RENDER_METRICS_COLUMNS = (
+    "project_id",
+    "clip_id",
+    "preset",
+    "pipeline",
+    "render_hash",
+    "created_at",
+    "wall_time",
+    "num_frames",
+    "width",
+    "height",
+    "steps",
+    "denoise_time",
+    "peak_rss_bytes",
+    "peak_gpu_bytes",
+    "output_bytes",
+    "stages_json",
+)
+
+_FARM_JOB_COLUMNS = (
+    "job_id",
+    "project_id",
+    "clip_id",
+    "render_kwargs",
+    "state",
+    "worker_id",
+    "lease_expires",
+    "attempts",
+    "created_at",
+    "updated_at",
+    "last_error",
+)
+
+
+# Seconds a connection waits on another writer before raising "database is locked"
+BUSY_TIMEOUT = 30.0
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    """
+    Registry connection: waits out other writers, cheap NORMAL syncs.
+
+    The WAL journal is switched on once per database by `Registry.open` (it persists in the file);
+    switching it here would take an exclusive lock and race with transactions on other connections.
+    """
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+    conn.execute(f"PRAGMA busy_timeout={int(BUSY_TIMEOUT * 1000)}")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
 
 @dataclass
 class Registry:
+    """
+    Global project/clip registry (SQLite).
+
+    `conn` serves the thread that created the registry; other threads (render scheduler slots,
+    status watchers) borrow connections from a small pool. Writes run in `transaction()`, which
+    nests, so batch operations such as project sync commit once instead of once per row.
+    """
+
     path: Path
     conn: sqlite3.Connection
+    pool_size: int = 4
+    _owner: int = field(default_factory=threading.get_ident, init=False, repr=False, compare=False)
+    _pool: queue.LifoQueue = field(default_factory=queue.LifoQueue, init=False, repr=False, compare=False)
+    _local: threading.local = field(default_factory=threading.local, init=False, repr=False, compare=False)
 
     @staticmethod
     def load() -> "Registry":
@@ -41,24 +175,91 @@ class Registry:
         load_env(project_env_path=None)
         s = Settings.from_env()
         s.app_home.mkdir(parents=True, exist_ok=True)
-        db_path = s.app_home / "registry.sqlite"
-        conn = sqlite3.connect(db_path)
+        return Registry.open(s.app_home / "registry.sqlite")
+
+    @staticmethod
+    def open(db_path: Path) -> "Registry":
+        """Open the registry at `db_path`: create the schema and switch to WAL so readers never block the writer."""
+        conn = connect(db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
         conn.executescript(SCHEMA)
         conn.commit()
         return Registry(path=db_path, conn=conn)
 
+    def _acquire(self) -> sqlite3.Connection:
+        if threading.get_ident() == self._owner:
+            return self.conn
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return connect(self.path)
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        if conn is self.conn:
+            return
+        if self._pool.qsize() < self.pool_size:
+            self._pool.put(conn)
+        else:
+            conn.close()
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """The calling thread's connection (reused inside an open transaction)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Write transaction (BEGIN IMMEDIATE ... COMMIT). Nested calls join the outer transaction,
+        so `with registry.transaction(): ...many upserts...` commits once.
+        """
+        if getattr(self._local, "conn", None) is not None:
+            yield self._local.conn
+            return
+        conn = self._acquire()
+        self._local.conn = conn
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+        finally:
+            self._local.conn = None
+            self._release(conn)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+        self.conn.close()
+
     def upsert_project(self, *, project_id: str, slug: str, title: str, path: str, updated_at: str) -> None:
-        self.conn.execute(
-            "INSERT INTO projects(project_id, slug, title, path, updated_at) VALUES (?, ?, ?, ?, ?) "
-            "ON CONFLICT(project_id) DO UPDATE SET "
-            "slug=excluded.slug, title=excluded.title, path=excluded.path, updated_at=excluded.updated_at",
-            (project_id, slug, title, path, updated_at),
-        )
-        self.conn.commit()
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT INTO projects(project_id, slug, title, path, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(project_id) DO UPDATE SET "
+                "slug=excluded.slug, title=excluded.title, path=excluded.path, updated_at=excluded.updated_at",
+                (project_id, slug, title, path, updated_at),
+            )
 
     def list_projects(self) -> list[dict[str, Any]]:
-        cur = self.conn.execute("SELECT project_id, slug, title, path, updated_at FROM projects ORDER BY slug")
-        rows = cur.fetchall()
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT project_id, slug, title, path, updated_at FROM projects ORDER BY slug"
+            ).fetchall()
         return [
             {
                 "project_id": r[0],
@@ -71,11 +272,11 @@ class Registry:
         ]
 
     def get_project_by_slug(self, slug: str) -> dict[str, Any] | None:
-        cur = self.conn.execute(
-            "SELECT project_id, slug, title, path, updated_at FROM projects WHERE slug = ?",
-            (slug,),
-        )
-        row = cur.fetchone()
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT project_id, slug, title, path, updated_at FROM projects WHERE slug = ?",
+                (slug,),
+            ).fetchone()
         if not row:
             return None
         return {
@@ -97,29 +298,183 @@ class Registry:
         updated_at: str,
         last_error: str | None,
     ) -> None:
-        self.conn.execute(
-            "INSERT INTO clips(project_id, clip_id, state, output_path, render_hash, updated_at, last_error) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?) "
-            "ON CONFLICT(project_id, clip_id) DO UPDATE SET state=excluded.state, output_path=excluded.output_path, "
-            "render_hash=excluded.render_hash, updated_at=excluded.updated_at, last_error=excluded.last_error",
-            (
-                project_id,
-                clip_id,
-                state,
-                output_path,
-                render_hash,
-                updated_at,
-                last_error,
-            ),
-        )
-        self.conn.commit()
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT INTO clips(project_id, clip_id, state, output_path, render_hash, updated_at, last_error) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(project_id, clip_id) DO UPDATE SET state=excluded.state, "
+                "output_path=excluded.output_path, render_hash=excluded.render_hash, "
+                "updated_at=excluded.updated_at, last_error=excluded.last_error",
+                (
+                    project_id,
+                    clip_id,
+                    state,
+                    output_path,
+                    render_hash,
+                    updated_at,
+                    last_error,
+                ),
+            )
 
-    def list_unfinished_clips(self) -> list[dict[str, Any]]:
-        cur = self.conn.execute(
+    def set_clip_state(
+        self,
+        *,
+        project_id: str,
+        clip_id: str,
+        state: str,
+        updated_at: str,
+        last_error: str | None = None,
+        keep: tuple[str, ...] = (),
+    ) -> None:
+        """
+        Update only the state of a clip, keeping any known output path / render hash.
+
+        Rows already in one of the `keep` states are left untouched.
+        """
+        guard = f" WHERE clips.state NOT IN ({', '.join('?' for _ in keep)})" if keep else ""
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT INTO clips(project_id, clip_id, state, updated_at, last_error) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(project_id, clip_id) DO UPDATE SET state=excluded.state, "
+                "updated_at=excluded.updated_at, last_error=excluded.last_error" + guard,
+                (project_id, clip_id, state, updated_at, last_error, *keep),
+            )
+
+    def get_clip(self, *, project_id: str, clip_id: str) -> dict[str, Any] | None:
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT project_id, clip_id, state, output_path, render_hash, updated_at, last_error FROM clips "
+                "WHERE project_id = ? AND clip_id = ?",
+                (project_id, clip_id),
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            "project_id": row[0],
+            "clip_id": row[1],
+            "state": row[2],
+            "output_path": row[3],
+            "render_hash": row[4],
+            "updated_at": row[5],
+            "last_error": row[6],
+        }
+
+    def list_clip_specs(self, project_id: str) -> list[dict[str, Any]]:
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_CLIP_SPEC_COLUMNS)} FROM clip_specs WHERE project_id = ? ORDER BY spec_path",
+                (project_id,),
+            ).fetchall()
+        return [dict(zip(_CLIP_SPEC_COLUMNS, r)) for r in rows]
+
+    def find_clip_specs(self, *, project_id: str, file_id: str) -> list[dict[str, Any]]:
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_CLIP_SPEC_COLUMNS)} FROM clip_specs "
+                "WHERE project_id = ? AND file_id = ? ORDER BY spec_path",
+                (project_id, file_id),
+            ).fetchall()
+        return [dict(zip(_CLIP_SPEC_COLUMNS, r)) for r in rows]
+
+    def upsert_clip_specs(self, rows: list[dict[str, Any]]) -> None:
+        """Insert/replace many index rows in one transaction."""
+        if not rows:
+            return
+        with self.transaction() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO clip_specs({', '.join(_CLIP_SPEC_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in _CLIP_SPEC_COLUMNS)})",
+                [tuple(r[c] for c in _CLIP_SPEC_COLUMNS) for r in rows],
+            )
+
+    def delete_clip_specs(self, *, project_id: str, spec_paths: list[str]) -> None:
+        if not spec_paths:
+            return
+        with self.transaction() as conn:
+            conn.executemany(
+                "DELETE FROM clip_specs WHERE project_id = ? AND spec_path = ?",
+                [(project_id, p) for p in spec_paths],
+            )
+
+    def list_clip_spec_syncs(self, project_id: str) -> dict[str, tuple[int, int]]:
+        """spec_path -> (mtime_ns, size) of the spec version last applied to the clips table."""
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT spec_path, mtime_ns, size FROM clip_spec_syncs WHERE project_id = ?",
+                (project_id,),
+            ).fetchall()
+        return {r[0]: (r[1], r[2]) for r in rows}
+
+    def set_clip_spec_syncs(self, *, project_id: str, synced: dict[str, tuple[int, int]]) -> None:
+        """Replace the project's sync records with `synced` (spec_path -> (mtime_ns, size))."""
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM clip_spec_syncs WHERE project_id = ?", (project_id,))
+            conn.executemany(
+                "INSERT INTO clip_spec_syncs(project_id, spec_path, mtime_ns, size) VALUES (?, ?, ?, ?)",
+                [(project_id, path, mtime_ns, size) for path, (mtime_ns, size) in synced.items()],
+            )
+
+    def add_render_metrics(self, row: dict[str, Any]) -> None:
+        with self.transaction() as conn:
+            conn.execute(
+                f"INSERT INTO render_metrics({', '.join(_RENDER_METRICS_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in _RENDER_METRICS_COLUMNS)})",
+                tuple(row.get(c) for c in _RENDER_METRICS_COLUMNS),
+            )
+
+    def list_render_metrics(self, project_id: str | None = None) -> list[dict[str, Any]]:
+        sql = f"SELECT {', '.join(_RENDER_METRICS_COLUMNS)} FROM render_metrics"
+        params: tuple[Any, ...] = ()
+        if project_id is not None:
+            sql += " WHERE project_id = ?"
+            params = (project_id,)
+        with self._connection() as conn:
+            rows = conn.execute(sql + " ORDER BY created_at, id", params).fetchall()
+        return [dict(zip(_RENDER_METRICS_COLUMNS, r)) for r in rows]
+
+    def list_clips(self, project_id: str) -> list[dict[str, Any]]:
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT project_id, clip_id, state, output_path, render_hash, updated_at, last_error FROM clips "
+                "WHERE project_id = ? ORDER BY clip_id",
+                (project_id,),
+            ).fetchall()
+        keys = ("project_id", "clip_id", "state", "output_path", "render_hash", "updated_at", "last_error")
+        return [dict(zip(keys, r)) for r in rows]
+
+    def last_render_times(self, project_id: str) -> dict[str, float]:
+        """Wall time of each clip's most recent render."""
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT clip_id, wall_time FROM render_metrics WHERE id IN "
+                "(SELECT MAX(id) FROM render_metrics WHERE project_id = ? GROUP BY clip_id)",
+                (project_id,),
+            ).fetchall()
+        return {r[0]: r[1] for r in rows}
+
+    def list_unfinished_clips(
+        self, project_id: str | None = None, *, stale_before: str | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Clips still to render: planned, queued, rejected or cancelled.
+
+        With `stale_before` (an ISO timestamp), clips left "rendering" since before then count too:
+        a crashed or killed render never moves its clip out of that state.
+        """
+        sql = (
             "SELECT project_id, clip_id, state, output_path, updated_at FROM clips "
-            "WHERE state IN ('planned','queued','rejected') ORDER BY updated_at"
+            "WHERE (state IN ('planned','queued','rejected','cancelled')"
         )
-        rows = cur.fetchall()
+        params: tuple[Any, ...] = ()
+        if stale_before is not None:
+            sql += " OR (state = 'rendering' AND updated_at < ?)"
+            params += (stale_before,)
+        sql += ")"
+        if project_id is not None:
+            sql += " AND project_id = ?"
+            params += (project_id,)
+        with self._connection() as conn:
+            rows = conn.execute(sql + " ORDER BY updated_at", params).fetchall()
         return [
             {
                 "project_id": r[0],
@@ -130,3 +485,97 @@ class Registry:
             }
             for r in rows
         ]
+
+    def enqueue_farm_jobs(
+        self, *, project_id: str, clip_ids: list[str], render_kwargs: str, created_at: str
+    ) -> dict[str, int]:
+        """Queue clips for farm workers; returns the new job IDs (clips already queued or leased are skipped)."""
+        job_ids: dict[str, int] = {}
+        with self.transaction() as conn:
+            for clip_id in clip_ids:
+                active = conn.execute(
+                    "SELECT 1 FROM farm_jobs WHERE project_id = ? AND clip_id = ? AND state IN ('queued', 'leased')",
+                    (project_id, clip_id),
+                ).fetchone()
+                if active:
+                    continue
+                cur = conn.execute(
+                    "INSERT INTO farm_jobs(project_id, clip_id, render_kwargs, state, created_at, updated_at) "
+                    "VALUES (?, ?, ?, 'queued', ?, ?)",
+                    (project_id, clip_id, render_kwargs, created_at, created_at),
+                )
+                job_ids[clip_id] = int(cur.lastrowid)
+        return job_ids
+
+    def lease_farm_job(
+        self, *, worker_id: str, now: float, lease_seconds: float, updated_at: str
+    ) -> dict[str, Any] | None:
+        """Atomically hand the oldest queued job to `worker_id` until `now + lease_seconds`."""
+        with self.transaction() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(_FARM_JOB_COLUMNS)} FROM farm_jobs WHERE state = 'queued' ORDER BY job_id LIMIT 1"
+            ).fetchone()
+            if not row:
+                return None
+            job = dict(zip(_FARM_JOB_COLUMNS, row))
+            conn.execute(
+                "UPDATE farm_jobs SET state = 'leased', worker_id = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE job_id = ?",
+                (worker_id, now + lease_seconds, updated_at, job["job_id"]),
+            )
+        job.update(state="leased", worker_id=worker_id, lease_expires=now + lease_seconds, attempts=job["attempts"] + 1)
+        return job
+
+    def renew_farm_lease(self, *, job_id: int, worker_id: str, now: float, lease_seconds: float) -> bool:
+        """Extend a lease; False if `worker_id` no longer holds it (expired and requeued)."""
+        with self.transaction() as conn:
+            cur = conn.execute(
+                "UPDATE farm_jobs SET lease_expires = ? WHERE job_id = ? AND worker_id = ? AND state = 'leased'",
+                (now + lease_seconds, job_id, worker_id),
+            )
+        return cur.rowcount == 1
+
+    def finish_farm_job(
+        self, *, job_id: int, worker_id: str, state: str, updated_at: str, last_error: str | None = None
+    ) -> dict[str, Any] | None:
+        """Close a leased job as done/failed; None if `worker_id` no longer holds its lease."""
+        with self.transaction() as conn:
+            cur = conn.execute(
+                "UPDATE farm_jobs SET state = ?, lease_expires = NULL, updated_at = ?, last_error = ? "
+                "WHERE job_id = ? AND worker_id = ? AND state = 'leased'",
+                (state, updated_at, last_error, job_id, worker_id),
+            )
+            if cur.rowcount != 1:
+                return None
+            row = conn.execute(
+                f"SELECT {', '.join(_FARM_JOB_COLUMNS)} FROM farm_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return dict(zip(_FARM_JOB_COLUMNS, row))
+
+    def expire_farm_leases(self, *, now: float, max_attempts: int, updated_at: str) -> list[dict[str, Any]]:
+        """Requeue jobs whose lease ran out (or fail them after `max_attempts`); returns the affected jobs."""
+        with self.transaction() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_FARM_JOB_COLUMNS)} FROM farm_jobs WHERE state = 'leased' AND lease_expires < ?",
+                (now,),
+            ).fetchall()
+            jobs = [dict(zip(_FARM_JOB_COLUMNS, r)) for r in rows]
+            for job in jobs:
+                job["state"] = "failed" if job["attempts"] >= max_attempts else "queued"
+                job["last_error"] = f"Lease expired (worker {job['worker_id']})"
+                conn.execute(
+                    "UPDATE farm_jobs SET state = ?, worker_id = NULL, lease_expires = NULL, updated_at = ?, "
+                    "last_error = ? WHERE job_id = ?",
+                    (job["state"], updated_at, job["last_error"], job["job_id"]),
+                )
+        return jobs
+
+    def list_farm_jobs(self, state: str | None = None) -> list[dict[str, Any]]:
+        sql = f"SELECT {', '.join(_FARM_JOB_COLUMNS)} FROM farm_jobs"
+        params: tuple[Any, ...] = ()
+        if state is not None:
+            sql += " WHERE state = ?"
+            params = (state,)
+        with self._connection() as conn:
+            rows = conn.execute(sql + " ORDER BY job_id", params).fetchall()
+        return [dict(zip(_FARM_JOB_COLUMNS, r)) for r in rows]
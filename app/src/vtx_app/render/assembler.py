@@ -1,68 +1,120 @@
 from __future__ import annotations
 
+import json
+import math
+import os
+import threading
 from pathlib import Path
+from typing import Any
 
 import yaml
 from rich import print
+from vtx_app.project.index import ProjectIndex
 from vtx_app.project.layout import Project
-from vtx_app.render.ffmpeg import concat_videos
+from vtx_app.registry.db import Registry
+from vtx_app.render.ffmpeg import (
+    StreamInfo,
+    concat_videos,
+    conform_all,
+    pick_target,
+    probe_duration,
+    probe_streams,
+    remux_to_segment,
+    smart_concat,
+)
+
+INDEX_VERSION = 1
 
 
 class Assembler:
-    def __init__(self, project: Project):
+    def __init__(self, project: Project, registry: Registry | None = None, jobs: int | None = None):
         self.project = project
+        # Parallel ffmpeg workers for clips that must be re-encoded to match the cut
+        self.jobs = jobs
+        # With a registry, clip specs come from the project index instead of glob + YAML parsing
+        self.registry = registry
+        self._index: ProjectIndex | None = None
+        # Guards the segment index when clips are appended from render scheduler slots
+        self._lock = threading.Lock()
 
-    def assemble(self, output_name: str = "final_cut.mp4", clips_dir: Path | None = None) -> None:
-        """
-        Scans story/04_shotlist.yaml, finds rendered clips, and concatenates them.
-        """
+    def _shot_clip_ids(self) -> list[str]:
         shotlist_path = self.project.root / "story" / "04_shotlist.yaml"
         if not shotlist_path.exists():
             raise FileNotFoundError("Missing story/04_shotlist.yaml")
 
         data = yaml.safe_load(shotlist_path.read_text()) or {}
-        scenes = data.get("scenes", [])
+        return [sh["clip_id"] for sc in data.get("scenes", []) for sh in sc.get("shots", []) if sh.get("clip_id")]
 
-        clip_files = []
-        missing_clips = []
+    def _spec_output(self, cid: str, specs: dict[str, Any] | None = None) -> str | None:
+        """
+        outputs.mp4 of the clip spec, or raise FileNotFoundError if there is no spec.
 
-        for sc in scenes:
-            shots = sc.get("shots", [])
-            for sh in shots:
-                cid = sh.get("clip_id")
-                if not cid:
-                    continue
+        `specs` (from the segment index) memoizes the answer per spec file mtime, so incremental
+        runs do not re-parse every clip YAML.
+        """
+        if self.registry is not None:
+            if self._index is None:
+                project_id = str(self.project.load_metadata().get("project_id"))
+                self._index = ProjectIndex(registry=self.registry, project_id=project_id, root=self.project.root)
+            entry = self._index.get(cid)
+            if entry is None:
+                raise FileNotFoundError(cid)
+            return entry.output_path
 
-                # Check for rendered mp4
-                # We need to find the definition file first to know where the output goes?
-                # Or we can just look in renders/clips/*.mp4 if we follow convention.
-                # Convention: prompts/clips/{cid}__*.yaml -> renders/clips/{cid}__*.mp4
+        # Convention: prompts/clips/{cid}__*.yaml -> renders/clips/{cid}__*.mp4
+        matches = list((self.project.root / "prompts" / "clips").glob(f"{cid}__*.yaml"))
+        if not matches:
+            raise FileNotFoundError(cid)
+        spec_path = matches[0]
+        mtime = spec_path.stat().st_mtime_ns
+        if specs is not None:
+            cached = specs.get(cid)
+            if cached and cached.get("path") == str(spec_path) and cached.get("mtime_ns") == mtime:
+                return cached.get("mp4")
 
-                # Let's look up the clip spec to be sure
-                matches = list((self.project.root / "prompts" / "clips").glob(f"{cid}__*.yaml"))
-                if not matches:
-                    missing_clips.append(f"{cid} (spec missing)")
-                    continue
+        spec = yaml.safe_load(spec_path.read_text())
+        out_leaf = spec.get("outputs", {}).get("mp4")
+        if specs is not None:
+            specs[cid] = {"path": str(spec_path), "mtime_ns": mtime, "mp4": out_leaf}
+        return out_leaf
+
+    def _resolve_clip(
+        self, cid: str, clips_dir: Path | None, specs: dict[str, Any] | None = None
+    ) -> tuple[Path | None, str | None]:
+        """Rendered mp4 for a clip, or (None, reason it is missing)."""
+        try:
+            out_leaf = self._spec_output(cid, specs)
+        except FileNotFoundError:
+            return None, f"{cid} (spec missing)"
+        if not out_leaf:
+            return None, f"{cid} (no output path)"
+
+        mp4_path = self.project.root / out_leaf
+
+        # Override lookup if clips_dir is provided
+        if clips_dir:
+            # Try to find the file in clips_dir with the same name
+            override_path = clips_dir / mp4_path.name
+            if override_path.exists():
+                mp4_path = override_path
+
+        if mp4_path.exists():
+            return mp4_path, None
+        return None, f"{cid} (not rendered: {mp4_path})"
 
-                # Read spec to find output path logic, or just assume convention
-                spec = yaml.safe_load(matches[0].read_text())
-                out_leaf = spec.get("outputs", {}).get("mp4")
-                if out_leaf:
-                    mp4_path = self.project.root / out_leaf
-
-                    # Override lookup if clips_dir is provided
-                    if clips_dir:
-                        # Try to find the file in clips_dir with the same name
-                        override_path = clips_dir / mp4_path.name
-                        if override_path.exists():
-                            mp4_path = override_path
-
-                    if mp4_path.exists():
-                        clip_files.append(mp4_path)
-                    else:
-                        missing_clips.append(f"{cid} (not rendered: {mp4_path})")
-                else:
-                    missing_clips.append(f"{cid} (no output path)")
+    def assemble(self, output_name: str = "final_cut.mp4", clips_dir: Path | None = None) -> None:
+        """
+        Scans story/04_shotlist.yaml, finds rendered clips, and concatenates them.
+        """
+        clip_files = []
+        missing_clips = []
+
+        for cid in self._shot_clip_ids():
+            mp4_path, missing = self._resolve_clip(cid, clips_dir)
+            if mp4_path:
+                clip_files.append(mp4_path)
+            else:
+                missing_clips.append(missing)
 
         if missing_clips:
             print("[yellow]Warning: The following clips are missing and will be skipped:[/yellow]")
@@ -77,5 +129,209 @@ class Assembler:
         out_path.parent.mkdir(parents=True, exist_ok=True)
 
         print(f"[green]Assembling[/green] {len(clip_files)} clips to {out_path}...")
-        concat_videos(clip_files, out_path)
+        conformed = smart_concat(clip_files, out_path, jobs=self.jobs)
+        if conformed:
+            print(f"[cyan]Re-encoded[/cyan] {conformed} clips with mismatched streams")
+        print("[bold green]Done![/bold green]")
+
+    # --- Incremental assembly -------------------------------------------------
+    #
+    # Each rendered clip is stream-copied once into an MPEG-TS segment under
+    # renders/segments/<output stem>/, tracked by index.json (source size/mtime per clip).
+    # An HLS playlist of the segments is kept current as clips land, and the final cut is
+    # a stream-copy concat of the segments, so only changed clips are ever re-muxed.
+    # Segments whose streams differ from the rest of the cut (mixed presets) are re-encoded
+    # once into <clip>.conform.ts, keyed by the target stream parameters.
+
+    def segments_dir(self, output_name: str = "final_cut.mp4") -> Path:
+        return self.project.root / "renders" / "segments" / Path(output_name).stem
+
+    def _load_index(self, seg_dir: Path) -> dict[str, Any]:
+        try:
+            index = json.loads((seg_dir / "index.json").read_text())
+        except (OSError, ValueError):
+            index = {}
+        if index.get("version") != INDEX_VERSION:
+            index = {"version": INDEX_VERSION, "segments": {}, "specs": {}}
+        return index
+
+    def _save_index(self, seg_dir: Path, index: dict[str, Any]) -> None:
+        seg_dir.mkdir(parents=True, exist_ok=True)
+        tmp = seg_dir / ".index.json.tmp"
+        tmp.write_text(json.dumps(index, indent=2, sort_keys=True))
+        os.replace(tmp, seg_dir / "index.json")
+
+    def _update_segment(self, seg_dir: Path, index: dict[str, Any], cid: str, source: Path) -> bool:
+        """Re-mux `source` into the clip's segment if it changed; returns True when it did."""
+        st = source.stat()
+        source_id = f"{source.resolve()}:{st.st_size}:{st.st_mtime_ns}"
+        entry = index["segments"].get(cid)
+        segment = seg_dir / f"{cid}.ts"
+        if entry and entry.get("source_id") == source_id and segment.exists():
+            if "streams" not in entry:
+                # Indexed before stream probing: probe once
+                info = probe_streams(source)
+                entry["streams"] = info.to_dict() if info else None
+            return False
+
+        remux_to_segment(source, segment)
+        # Final cut needs re-concatenation
+        index["dirty"] = True
+        index["segments"][cid] = {
+            "source": str(source),
+            "source_id": source_id,
+            "segment": segment.name,
+            "duration": probe_duration(source),
+        }
+        info = probe_streams(source)
+        index["segments"][cid]["streams"] = info.to_dict() if info else None
+        return True
+
+    def _conform_segments(
+        self, seg_dir: Path, index: dict[str, Any], present: list[str]
+    ) -> tuple[list[Path], dict[str, str]]:
+        """
+        Segments to concatenate, with the ones whose streams do not match the cut re-encoded.
+
+        Returns the concat inputs and, per re-encoded clip, the source_id it was conformed from.
+        """
+        segments = index["segments"]
+        infos = {cid: StreamInfo.from_dict(segments[cid].get("streams")) for cid in present}
+        target = pick_target(list(infos.values()))
+        target_key = json.dumps(target.to_dict(), sort_keys=True) if target else None
+
+        parts: list[Path] = []
+        todo: list[tuple[Path, Path, StreamInfo | None]] = []
+        conformed: dict[str, str] = {}
+        for cid in present:
+            entry = segments[cid]
+            segment = seg_dir / entry["segment"]
+            info = infos[cid]
+            if target is None or info is None or info == target:
+                (seg_dir / f"{cid}.conform.ts").unlink(missing_ok=True)
+                parts.append(segment)
+                continue
+            out = seg_dir / f"{cid}.conform.ts"
+            parts.append(out)
+            if entry.get("conformed") != target_key or not out.exists():
+                todo.append((segment, out, info))
+                conformed[cid] = entry["source_id"]
+
+        if todo:
+            print(f"[cyan]Re-encoding[/cyan] {len(todo)} segments with mismatched streams...")
+            conform_all(todo, target, self.jobs)
+        index["target"] = target_key
+        return parts, conformed
+
+    def _write_playlist(self, seg_dir: Path, index: dict[str, Any], order: list[str], *, complete: bool) -> Path:
+        # EVENT playlists are append-only: list the contiguous run of finished shots
+        entries = []
+        for cid in order:
+            if cid not in index["segments"]:
+                break
+            entries.append(index["segments"][cid])
+        target = max((math.ceil(e.get("duration") or 0) for e in entries), default=1)
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:3",
+            f"#EXT-X-TARGETDURATION:{max(target, 1)}",
+            "#EXT-X-PLAYLIST-TYPE:EVENT",
+        ]
+        for e in entries:
+            lines += [f"#EXTINF:{(e.get('duration') or 0):.3f},", e["segment"]]
+        if complete:
+            lines.append("#EXT-X-ENDLIST")
+        playlist = seg_dir / "index.m3u8"
+        playlist.write_text("\n".join(lines) + "\n")
+        return playlist
+
+    def append_clip(self, clip_id: str, clips_dir: Path | None = None, output_name: str = "final_cut.mp4") -> bool:
+        """
+        Add (or refresh) one clip's segment as soon as it is rendered.
+
+        Returns True if the segment was (re)written. The playlist at
+        renders/segments/<stem>/index.m3u8 is updated in shot order.
+        """
+        seg_dir = self.segments_dir(output_name)
+        with self._lock:
+            index = self._load_index(seg_dir)
+            mp4_path, missing = self._resolve_clip(clip_id, clips_dir, index["specs"])
+            if mp4_path is None:
+                print(f"[yellow]Not appending {missing}[/yellow]")
+                return False
+            changed = self._update_segment(seg_dir, index, clip_id, mp4_path)
+            self._write_playlist(seg_dir, index, self._shot_clip_ids(), complete=False)
+            self._save_index(seg_dir, index)
+        if changed:
+            print(f"[cyan]Segment[/cyan] {clip_id} -> {seg_dir.name}/{clip_id}.ts")
+        return changed
+
+    def assemble_incremental(self, output_name: str = "final_cut.mp4", clips_dir: Path | None = None) -> Path | None:
+        """
+        Like assemble(), but reuses per-clip segments: only clips whose render changed since
+        the last run are re-muxed, and the final cut is a stream-copy concat of the segments.
+        """
+        seg_dir = self.segments_dir(output_name)
+        out_path = self.project.root / "renders" / output_name
+        order = self._shot_clip_ids()
+
+        with self._lock:
+            index = self._load_index(seg_dir)
+            present: list[str] = []
+            missing_clips: list[str] = []
+            for cid in order:
+                mp4_path, missing = self._resolve_clip(cid, clips_dir, index["specs"])
+                if mp4_path is None:
+                    missing_clips.append(missing)
+                    continue
+                self._update_segment(seg_dir, index, cid, mp4_path)
+                present.append(cid)
+
+            # Drop segments of clips that are no longer in the cut
+            for cid in set(index["segments"]) - set(present):
+                (seg_dir / index["segments"].pop(cid)["segment"]).unlink(missing_ok=True)
+                (seg_dir / f"{cid}.conform.ts").unlink(missing_ok=True)
+
+            if present:
+                self._write_playlist(seg_dir, index, present, complete=not missing_clips)
+            up_to_date = not index.get("dirty") and index.get("cut") == present and out_path.exists()
+            # What this run concatenates; append_clip may replace segments while it does
+            concatenated = {cid: index["segments"][cid]["source_id"] for cid in present}
+            self._save_index(seg_dir, index)
+
+        if missing_clips:
+            print("[yellow]Warning: The following clips are missing and will be skipped:[/yellow]")
+            for m in missing_clips:
+                print(f"  - {m}")
+
+        if not present:
+            print("[red]No clips found to assemble.[/red]")
+            return None
+
+        if up_to_date:
+            print(f"[green]Up to date[/green] {out_path}")
+            return out_path
+
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        print(f"[green]Assembling[/green] {len(present)} segments to {out_path}...")
+        parts, conformed = self._conform_segments(seg_dir, index, present)
+        concat_videos(parts, out_path)
+
+        with self._lock:
+            target_key = index["target"]
+            index = self._load_index(seg_dir)
+            for cid, source_id in conformed.items():
+                entry = index["segments"].get(cid)
+                # Unless the clip was re-rendered meanwhile
+                if entry and entry.get("source_id") == source_id:
+                    entry["conformed"] = target_key
+            index["cut"] = present
+            # A segment re-muxed during the concat is not in the cut yet: leave it dirty for the next run
+            if all(
+                (index["segments"].get(cid) or {}).get("source_id") == source_id
+                for cid, source_id in concatenated.items()
+            ):
+                index["dirty"] = False
+            self._save_index(seg_dir, index)
         print("[bold green]Done![/bold green]")
+        return out_path
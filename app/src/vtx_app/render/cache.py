@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from vtx_app.config.settings import Settings
+from vtx_app.registry.db import connect
+from vtx_app.story.prompt_compiler import PromptPack
+from vtx_app.utils.hashing import file_identity, sha256_file, stable_hash
+
+# Bump when the meaning of the key changes (e.g. new inputs are folded in)
+RENDER_HASH_VERSION = 1
+
+# Where results are written, not what is rendered. Resuming from draft stage 1 latents
+# reproduces the full render, so it does not change the key either.
+_UNKEYED_FLAGS = {"--output-path", "--output_path", "--save-stage-1", "--resume-from-stage-1", "--metrics-path"}
+
+# LRU side index of the cache. Entries share their inode with the user's outputs, so their
+# mtimes are not ours to touch (file_identity keys on them).
+INDEX_NAME = "index.sqlite"
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+  name TEXT PRIMARY KEY,
+  size INTEGER NOT NULL,
+  last_used REAL NOT NULL
+);
+"""
+
+# Each render builds its own RenderCache (one per scheduler slot), so eviction is serialized
+# per process here rather than per instance.
+_EVICT_LOCK = threading.Lock()
+
+
+def compute_render_hash(
+    *,
+    module: str,
+    args: list[str],
+    pack: PromptPack,
+    seed: int | None,
+    model_files: Iterable[str | Path],
+    input_files: Iterable[str | Path],
+) -> str:
+    """
+    Content-addressed key for one clip render.
+
+    Covers the compiled prompt, the pipeline module and its resolved args (minus output
+    locations, so the same render can be reused across output folders), the seed, model file
+    identities (path/size/mtime) and input media digests.
+    """
+    key_args: list[str] = []
+    skip = False
+    for a in args:
+        if skip:
+            skip = False
+            continue
+        if a in _UNKEYED_FLAGS:
+            skip = True
+            continue
+        key_args.append(a)
+
+    inputs = {}
+    for p in input_files:
+        path = Path(p)
+        inputs[str(p)] = sha256_file(path) if path.is_file() else "missing"
+
+    return stable_hash(
+        {
+            "v": RENDER_HASH_VERSION,
+            "module": module,
+            "args": key_args,
+            "prompt": {"positive": pack.positive, "negative": pack.negative},
+            "seed": seed,
+            "models": {str(p): file_identity(Path(p)) for p in model_files},
+            "inputs": inputs,
+        }
+    )
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        # Cross-device or unsupported filesystem
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+
+@dataclass
+class RenderCache:
+    """
+    Size-capped, content-addressed store of rendered clips under `<app_home>/cache/renders`.
+
+    Entries are hard-linked in and out (copied across filesystems). Sizes and access times live
+    in a side index (`index.sqlite`); once the reclaimable total exceeds `max_bytes`, the least
+    recently used entries are evicted. An entry still hard-linked to an output is not reclaimable:
+    deleting it would free no disk space, so it neither counts towards the cap nor gets evicted.
+    """
+
+    root: Path
+    max_bytes: int
+    clock: Callable[[], float] = field(default=time.time, repr=False)
+
+    @staticmethod
+    def from_settings(s: Settings) -> RenderCache:
+        return RenderCache(root=s.app_home / "cache" / "renders", max_bytes=int(s.render_cache_max_gb * 1024**3))
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def entry_path(self, render_hash: str, suffix: str = ".mp4") -> Path:
+        return self.root / render_hash[:2] / f"{render_hash}{suffix}"
+
+    @contextmanager
+    def _index(self) -> Iterator[sqlite3.Connection]:
+        """One transaction on the side index, created on first use."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / INDEX_NAME
+        fresh = not path.exists()
+        conn = connect(path)
+        try:
+            conn.executescript(_INDEX_SCHEMA)
+            with conn:
+                if fresh:
+                    # Entries cached before the index existed: seed their access times from the file mtimes
+                    for p in self.root.glob("*/*"):
+                        if p.is_file() and not p.name.startswith("."):
+                            st = p.stat()
+                            conn.execute(
+                                "INSERT OR IGNORE INTO entries (name, size, last_used) VALUES (?, ?, ?)",
+                                (p.relative_to(self.root).as_posix(), st.st_size, st.st_mtime),
+                            )
+                yield conn
+        finally:
+            conn.close()
+
+    def _touch(self, conn: sqlite3.Connection, entry: Path) -> None:
+        conn.execute(
+            "INSERT INTO entries (name, size, last_used) VALUES (?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET size = excluded.size, last_used = excluded.last_used",
+            (entry.relative_to(self.root).as_posix(), entry.stat().st_size, self.clock()),
+        )
+
+    def restore(self, render_hash: str, dest: Path) -> bool:
+        """Materialize a cached render at `dest`; returns False on a miss."""
+        if not self.enabled:
+            return False
+        entry = self.entry_path(render_hash, dest.suffix)
+        if not entry.is_file():
+            return False
+        with self._index() as conn:
+            self._touch(conn, entry)  # mark as recently used
+        if dest.exists() and os.path.samefile(entry, dest):
+            return True
+        _link_or_copy(entry, dest)
+        return True
+
+    def store(self, render_hash: str, output: Path) -> None:
+        if not self.enabled or not output.is_file():
+            return
+        entry = self.entry_path(render_hash, output.suffix)
+        if not entry.exists():
+            _link_or_copy(output, entry)
+        with self._index() as conn:
+            self._touch(conn, entry)
+            total = sum(size for _, size in self._reclaimable(conn))
+        if total > self.max_bytes:
+            self.evict()
+
+    def _reclaimable(self, conn: sqlite3.Connection) -> list[tuple[str, int]]:
+        """Indexed entries (least recently used first) whose removal frees disk space."""
+        rows = []
+        for name, size in conn.execute("SELECT name, size FROM entries ORDER BY last_used").fetchall():
+            try:
+                st = (self.root / name).stat()
+            except FileNotFoundError:
+                conn.execute("DELETE FROM entries WHERE name = ?", (name,))
+                continue
+            if st.st_nlink == 1:
+                rows.append((name, size))
+        return rows
+
+    def evict(self) -> list[Path]:
+        """Drop least recently used entries until the reclaimable part of the cache fits in `max_bytes`."""
+        with _EVICT_LOCK, self._index() as conn:
+            rows = self._reclaimable(conn)
+            total = sum(size for _, size in rows)
+            removed = []
+            for name, size in rows:
+                if total <= self.max_bytes:
+                    break
+                p = self.root / name
+                p.unlink(missing_ok=True)
+                conn.execute("DELETE FROM entries WHERE name = ?", (name,))
+                total -= size
+                removed.append(p)
+            return removed
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+
+from rich import print
+from vtx_app.config.settings import Settings
+from vtx_app.project.layout import Project
+from vtx_app.registry.db import Registry
+from vtx_app.render.assembler import Assembler
+from vtx_app.render.planner import PlanJob, RenderPlan
+from vtx_app.render.renderer import RenderController
+from vtx_app.render.scheduler import RenderScheduler, parse_devices
+
+# Job outcomes; "resumed" = already rendered by an earlier (interrupted) run of the same plan
+DONE_STATES = ("done", "resumed")
+
+
+class PlanExecutor:
+    """
+    Runs a RenderPlan on `slots_per_device` concurrent render slots per device.
+
+    Jobs run level by level: a job starts only once all of its dependencies succeeded, and
+    dependents of a failed job are reported as "blocked" (so the cut is assembled exactly once,
+    after every clip rendered). Clips the registry records as rendered since the plan was
+    created are skipped, so re-running an interrupted plan resumes where it stopped.
+    """
+
+    def __init__(
+        self,
+        *,
+        project: Project,
+        registry: Registry,
+        plan: RenderPlan,
+        slots_per_device: int = 1,
+        devices: list[str | None] | None = None,
+        timeout: float | None = None,
+        use_worker: bool = False,
+        fail_fast: bool = False,
+        controller_factory: Callable[..., RenderController] = RenderController,
+    ) -> None:
+        self.project = project
+        self.registry = registry
+        self.plan = plan
+        self.devices = devices or [None]
+        self.slots_per_device = slots_per_device
+        self.timeout = timeout
+        self.use_worker = use_worker
+        self.fail_fast = fail_fast
+        self.controller_factory = controller_factory
+
+    @staticmethod
+    def from_settings(
+        *,
+        project: Project,
+        registry: Registry,
+        plan: RenderPlan,
+        settings: Settings,
+        slots_per_device: int | None = None,
+        devices: str | None = None,
+        use_worker: bool | None = None,
+        timeout: float | None = None,
+    ) -> PlanExecutor:
+        """Executor configured from the VTX_RENDER_* settings (like batch renders); arguments override them."""
+        s = settings
+        return PlanExecutor(
+            project=project,
+            registry=registry,
+            plan=plan,
+            slots_per_device=s.render_slots_per_device if slots_per_device is None else slots_per_device,
+            devices=parse_devices(s.render_devices if devices is None else devices),
+            timeout=(s.render_job_timeout if timeout is None else timeout) or None,
+            use_worker=s.render_worker if use_worker is None else use_worker,
+            fail_fast=s.fail_fast,
+        )
+
+    def _rendered(self, job: PlanJob, since: str = "") -> bool:
+        """The registry has this job's clip rendered (on disk, where the job puts it), at or after `since`."""
+        row = self.registry.get_clip(project_id=self.plan.project_id, clip_id=job.clip_id) or {}
+        if row.get("state") != "rendered" or not row.get("output_path"):
+            return False
+        if (row.get("updated_at") or "") < since:
+            return False
+        out = Path(row["output_path"])
+        if not out.is_file():
+            return False
+        return not job.output_dir or out.parent.resolve() == (self.project.root / job.output_dir).resolve()
+
+    def _run_renders(self, jobs: list[PlanJob]) -> dict[str, str]:
+        with RenderScheduler(
+            project=self.project,
+            registry=self.registry,
+            devices=self.devices,
+            slots_per_device=self.slots_per_device,
+            timeout=self.timeout,
+            use_worker=self.use_worker,
+            fail_fast=self.fail_fast,
+            controller_factory=self.controller_factory,
+        ) as scheduler:
+            for job in jobs:
+                scheduler.submit(job.clip_id, **job.render_kwargs(self.project.root))
+            scheduler.join()
+        # The renderer records failures in the registry instead of raising, so it is the source of truth
+        # (an up-to-date clip keeps its earlier timestamp)
+        return {job.id: "done" if self._rendered(job) else "failed" for job in jobs}
+
+    def _run_assemble(self, job: PlanJob) -> str:
+        asm = Assembler(project=self.project, registry=self.registry)
+        clips_dir = self.project.root / job.output_dir if job.output_dir else None
+        try:
+            out = asm.assemble_incremental(output_name=job.output_name or "final_cut.mp4", clips_dir=clips_dir)
+        except Exception as e:
+            print(f"[red]Failed to assemble: {e}[/red]")
+            return "failed"
+        return "done" if out else "failed"
+
+    def run(self) -> dict[str, str]:
+        """Execute the plan; returns each job's outcome: done, resumed, failed or blocked."""
+        status: dict[str, str] = {}
+        for level in self.plan.levels():
+            runnable: list[PlanJob] = []
+            for job in level:
+                if any(status.get(d) not in DONE_STATES for d in job.deps):
+                    status[job.id] = "blocked"
+                elif job.kind == "render" and self._rendered(job, since=self.plan.created_at):
+                    status[job.id] = "resumed"
+                else:
+                    runnable.append(job)
+
+            resumed = sum(1 for job in level if status.get(job.id) == "resumed")
+            if resumed:
+                print(f"[green]Resuming[/green]: {resumed} clips already rendered")
+
+            renders = [job for job in runnable if job.kind == "render"]
+            if renders:
+                print(f"Rendering {len(renders)} clips on {len(self.devices) * self.slots_per_device} slots...")
+                status.update(self._run_renders(renders))
+            for job in runnable:
+                if job.kind == "assemble":
+                    status[job.id] = self._run_assemble(job)
+                elif job.kind != "render":
+                    print(f"[yellow]Skipping plan job {job.id}: unknown kind {job.kind!r}[/yellow]")
+                    status[job.id] = "failed"
+
+        blocked = [job_id for job_id, state in status.items() if state == "blocked"]
+        if blocked:
+            print(f"[yellow]Not run (failed dependencies):[/yellow] {', '.join(blocked)}")
+        return status
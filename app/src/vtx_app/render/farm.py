@@ -0,0 +1,485 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import IO, Any
+
+from rich import print
+from vtx_app.pipelines.runner_worker import RenderWorker
+from vtx_app.project.layout import Project
+from vtx_app.project.loader import ProjectLoader
+from vtx_app.registry.db import Registry
+from vtx_app.render.renderer import RenderController
+from vtx_app.utils.timecode import now_iso
+
+# A job whose lease expired this many times (worker lost mid-render) is failed instead of requeued
+MAX_ATTEMPTS = 3
+# Render options a job may carry; output_dir is relative to the project root
+RENDER_KWARGS = ("preset", "output_dir", "resolution_scale")
+# Uploaded outputs are streamed to disk in chunks of this size
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class FarmBroker:
+    """
+    Hands the registry's farm queue to remote workers.
+
+    Each leased job must be renewed by heartbeats within `lease_seconds`; leases that run out
+    (a worker crashed or lost its network) are swept lazily on the next broker call, requeued and
+    leased to another worker, up to `max_attempts` times. Clip states in the `clips` table follow
+    the farm job (queued -> rendering -> rendered | rejected), so `vtx render status` works
+    unchanged. Results reported for a lease the worker no longer holds are dropped.
+
+    Workers without the broker's project storage upload each output (`store_output`) before
+    reporting it; outputs always end up under the project as the broker sees it.
+    """
+
+    def __init__(
+        self,
+        registry: Registry,
+        *,
+        lease_seconds: float = 120.0,
+        max_attempts: int = MAX_ATTEMPTS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.registry = registry
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.clock = clock
+
+    def _set_state(self, job: dict[str, Any], state: str, error: str | None = None) -> None:
+        self.registry.set_clip_state(
+            project_id=job["project_id"], clip_id=job["clip_id"], state=state, updated_at=now_iso(), last_error=error
+        )
+
+    def submit(self, *, project_id: str, clip_ids: list[str], **render_kwargs: Any) -> dict[str, int]:
+        """Queue clips for the farm; clips already queued or leased are left alone."""
+        unknown = set(render_kwargs) - set(RENDER_KWARGS)
+        if unknown:
+            raise ValueError(f"Unsupported render options for farm jobs: {sorted(unknown)}")
+        kwargs = {k: v for k, v in render_kwargs.items() if v is not None}
+        job_ids = self.registry.enqueue_farm_jobs(
+            project_id=project_id, clip_ids=clip_ids, render_kwargs=json.dumps(kwargs), created_at=now_iso()
+        )
+        for clip_id in job_ids:
+            self._set_state({"project_id": project_id, "clip_id": clip_id}, "queued")
+        return job_ids
+
+    def sweep(self) -> int:
+        """Requeue (or fail) jobs whose lease expired; returns how many were affected."""
+        expired = self.registry.expire_farm_leases(
+            now=self.clock(), max_attempts=self.max_attempts, updated_at=now_iso()
+        )
+        for job in expired:
+            if job["state"] == "failed":
+                self._set_state(job, "rejected", job["last_error"])
+                print(f"[red]Farm job {job['job_id']} ({job['clip_id']}) failed[/red]: {job['last_error']}")
+            else:
+                self._set_state(job, "queued")
+                print(f"[yellow]Requeued[/yellow] {job['clip_id']}: {job['last_error']}")
+        return len(expired)
+
+    def lease(self, worker_id: str) -> dict[str, Any] | None:
+        """Lease the oldest queued job to `worker_id`, with what the worker needs to find the project."""
+        self.sweep()
+        job = self.registry.lease_farm_job(
+            worker_id=worker_id, now=self.clock(), lease_seconds=self.lease_seconds, updated_at=now_iso()
+        )
+        if job is None:
+            return None
+        self._set_state(job, "rendering")
+        project = next((p for p in self.registry.list_projects() if p["project_id"] == job["project_id"]), {})
+        return {
+            "job_id": job["job_id"],
+            "project_id": job["project_id"],
+            "clip_id": job["clip_id"],
+            "slug": project.get("slug"),
+            "project_path": project.get("path"),
+            "render_kwargs": json.loads(job["render_kwargs"]),
+            "attempt": job["attempts"],
+            "lease_seconds": self.lease_seconds,
+        }
+
+    def heartbeat(self, job_id: int, worker_id: str) -> bool:
+        """Extend a lease; False means the worker lost it and should stop rendering."""
+        self.sweep()
+        return self.registry.renew_farm_lease(
+            job_id=job_id, worker_id=worker_id, now=self.clock(), lease_seconds=self.lease_seconds
+        )
+
+    def complete(
+        self,
+        job_id: int,
+        worker_id: str,
+        *,
+        state: str,
+        output_path: str | None = None,
+        render_hash: str | None = None,
+        error: str | None = None,
+        metrics: dict[str, Any] | None = None,
+    ) -> bool:
+        """Record a worker's result; False if its lease had already been lost."""
+        self.sweep()
+        done = state == "rendered"
+        job = self.registry.finish_farm_job(
+            job_id=job_id,
+            worker_id=worker_id,
+            state="done" if done else "failed",
+            updated_at=now_iso(),
+            last_error=None if done else error or f"Worker reported {state}",
+        )
+        if job is None:
+            return False
+
+        project_id, clip_id = job["project_id"], job["clip_id"]
+        if not done:
+            self._set_state(job, "rejected", job["last_error"])
+            return True
+
+        # Workers report outputs relative to the project so the broker resolves them on its own storage
+        project = next((p for p in self.registry.list_projects() if p["project_id"] == project_id), None)
+        if output_path and project and not Path(output_path).is_absolute():
+            output_path = str(Path(project["path"]) / output_path)
+        if metrics and not self._has_metrics(project_id, clip_id, metrics.get("created_at")):
+            self.registry.add_render_metrics({**metrics, "project_id": project_id, "clip_id": clip_id})
+        self.registry.upsert_clip(
+            project_id=project_id,
+            clip_id=clip_id,
+            state="rendered",
+            output_path=output_path,
+            render_hash=render_hash,
+            updated_at=now_iso(),
+            last_error=None,
+        )
+        return True
+
+    def store_output(self, job_id: int, worker_id: str, output_path: str, data: IO[bytes], length: int) -> bool:
+        """
+        Write an uploaded output to `output_path` (relative to the job's project) on the broker's
+        storage; False if `worker_id` no longer holds the job's lease.
+        """
+        self.sweep()
+        job = next((j for j in self.registry.list_farm_jobs("leased") if j["job_id"] == job_id), None)
+        if job is None or job["worker_id"] != worker_id:
+            return False
+        project = next((p for p in self.registry.list_projects() if p["project_id"] == job["project_id"]), None)
+        if project is None:
+            raise ValueError(f"Project {job['project_id']} is not registered on the broker")
+        root = Path(project["path"]).resolve()
+        dest = (root / output_path).resolve()
+        if Path(output_path).is_absolute() or not dest.is_relative_to(root):
+            raise ValueError(f"Output path escapes the project: {output_path}")
+
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".{dest.name}.{job_id}.upload")
+        try:
+            with open(tmp, "wb") as f:
+                remaining = length
+                while remaining > 0:
+                    chunk = data.read(min(UPLOAD_CHUNK_BYTES, remaining))
+                    if not chunk:
+                        raise ValueError(f"Upload of {output_path} ended {remaining} bytes short")
+                    f.write(chunk)
+                    remaining -= len(chunk)
+            os.replace(tmp, dest)
+        finally:
+            tmp.unlink(missing_ok=True)
+        return True
+
+    def _has_metrics(self, project_id: str, clip_id: str, created_at: str | None) -> bool:
+        # A worker on the broker host shares its registry and has recorded the row already
+        return any(
+            m["clip_id"] == clip_id and m["created_at"] == created_at
+            for m in self.registry.list_render_metrics(project_id)
+        )
+
+    def status(self) -> dict[str, Any]:
+        self.sweep()
+        jobs = self.registry.list_farm_jobs()
+        counts: dict[str, int] = {}
+        for job in jobs:
+            counts[job["state"]] = counts.get(job["state"], 0) + 1
+        return {"counts": counts, "jobs": jobs}
+
+
+class _BrokerHandler(BaseHTTPRequestHandler):
+    server: _BrokerServer
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+    def _reply(self, code: int, payload: Any = None) -> None:
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path != "/status":
+            self._reply(404, {"error": f"Unknown endpoint {self.path}"})
+            return
+        self._reply(200, self.server.broker.status())
+
+    def do_PUT(self) -> None:
+        url = urllib.parse.urlsplit(self.path)
+        if url.path != "/output":
+            self._reply(404, {"error": f"Unknown endpoint {url.path}"})
+            return
+        try:
+            query = urllib.parse.parse_qs(url.query)
+            ok = self.server.broker.store_output(
+                int(query["job_id"][0]),
+                query["worker_id"][0],
+                query["path"][0],
+                self.rfile,
+                int(self.headers["Content-Length"]),
+            )
+            self._reply(200 if ok else 409, {"ok": ok})
+        except (KeyError, TypeError, ValueError) as e:
+            self._reply(400, {"error": str(e)})
+
+    def do_POST(self) -> None:
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            broker = self.server.broker
+            if self.path == "/lease":
+                job = broker.lease(str(body["worker_id"]))
+                if job:
+                    self._reply(200, job)
+                else:
+                    self._reply(204)
+            elif self.path == "/heartbeat":
+                ok = broker.heartbeat(int(body["job_id"]), str(body["worker_id"]))
+                self._reply(200 if ok else 409, {"ok": ok})
+            elif self.path == "/complete":
+                ok = broker.complete(
+                    int(body.pop("job_id")),
+                    str(body.pop("worker_id")),
+                    **{k: body.get(k) for k in ("state", "output_path", "render_hash", "error", "metrics")},
+                )
+                self._reply(200 if ok else 409, {"ok": ok})
+            else:
+                self._reply(404, {"error": f"Unknown endpoint {self.path}"})
+        except (KeyError, TypeError, ValueError) as e:
+            self._reply(400, {"error": str(e)})
+
+
+class _BrokerServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], broker: FarmBroker) -> None:
+        super().__init__(address, _BrokerHandler)
+        self.broker = broker
+
+
+def serve_broker(broker: FarmBroker, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """Bind the broker's JSON API (port 0 picks a free port); call serve_forever() on the result."""
+    return _BrokerServer((host, port), broker)
+
+
+@dataclass
+class BrokerClient:
+    """JSON client of a farm broker (`vtx farm broker`)."""
+
+    url: str
+    timeout: float = 30.0
+
+    def _request(self, path: str, payload: dict[str, Any] | None = None) -> tuple[int, Any]:
+        data = json.dumps(payload).encode() if payload is not None else None
+        req = urllib.request.Request(
+            self.url.rstrip("/") + path, data=data, headers={"Content-Type": "application/json"}
+        )
+        return self._send(path, req)
+
+    def _send(self, path: str, req: urllib.request.Request) -> tuple[int, Any]:
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                body = resp.read()
+                return resp.status, json.loads(body) if body else None
+        except urllib.error.HTTPError as e:
+            if e.code == 409:
+                return e.code, None
+            raise RuntimeError(f"Farm broker {path} failed ({e.code}): {e.read().decode(errors='replace')}") from e
+
+    def lease(self, worker_id: str) -> dict[str, Any] | None:
+        status, job = self._request("/lease", {"worker_id": worker_id})
+        return job if status == 200 else None
+
+    def heartbeat(self, job_id: int, worker_id: str) -> bool:
+        return self._request("/heartbeat", {"job_id": job_id, "worker_id": worker_id})[0] == 200
+
+    def complete(self, job_id: int, worker_id: str, **result: Any) -> bool:
+        return self._request("/complete", {"job_id": job_id, "worker_id": worker_id, **result})[0] == 200
+
+    def upload(self, job_id: int, worker_id: str, output_path: str, source: Path) -> bool:
+        """Send a rendered file to the broker's project storage; False if the lease was lost."""
+        query = urllib.parse.urlencode({"job_id": job_id, "worker_id": worker_id, "path": output_path})
+        with open(source, "rb") as f:
+            req = urllib.request.Request(
+                f"{self.url.rstrip('/')}/output?{query}",
+                data=f,
+                method="PUT",
+                headers={"Content-Type": "application/octet-stream", "Content-Length": str(source.stat().st_size)},
+            )
+            return self._send("/output", req)[0] == 200
+
+    def status(self) -> dict[str, Any]:
+        return self._request("/status")[1]
+
+
+@dataclass
+class FarmWorker:
+    """
+    Stateless render worker: leases clips from a broker, renders them with RenderController and
+    reports the output, render hash and metrics back.
+
+    Renders write to the worker's own `registry` (its host's registry), which is only read back
+    to build the report. A heartbeat thread renews the lease while the clip renders; if the
+    broker says the lease is gone the render is cancelled.
+
+    A worker that finds the project at the broker's path shares its storage and reports the
+    output in place. Otherwise (project loaded by slug from the worker's own projects root) the
+    output is uploaded to the broker before it is reported.
+    """
+
+    client: BrokerClient
+    registry: Registry
+    worker_id: str = field(default_factory=default_worker_id)
+    device: str | None = None
+    timeout: float | None = None
+    worker: RenderWorker | None = None
+    # Seconds between heartbeats (default: a quarter of the broker's lease)
+    heartbeat_interval: float | None = None
+    poll_interval: float = 5.0
+    controller_factory: Callable[..., RenderController] = RenderController
+
+    def _project(self, job: dict[str, Any]) -> Project:
+        path = job.get("project_path")
+        if path and (Path(path) / "metadata.yaml").exists():
+            return Project(root=Path(path))
+        if not job.get("slug"):
+            raise FileNotFoundError(f"Project {job['project_id']} is not available on this worker")
+        return ProjectLoader(registry=self.registry).load(job["slug"])
+
+    def _heartbeat(self, job_id: int, interval: float, finished: threading.Event, cancel: threading.Event) -> None:
+        while not finished.wait(interval):
+            try:
+                if not self.client.heartbeat(job_id, self.worker_id):
+                    print(f"[yellow]Lease on job {job_id} lost; cancelling[/yellow]")
+                    cancel.set()
+                    return
+            except (OSError, RuntimeError) as e:
+                # Keep rendering: the lease only expires if the broker stays unreachable
+                print(f"[yellow]Heartbeat for job {job_id} failed[/yellow]: {e}")
+
+    def _upload(self, job: dict[str, Any], project: Project, output_path: str | None) -> None:
+        if output_path is None or Path(output_path).is_absolute():
+            raise ValueError(f"Cannot upload an output outside the project: {output_path}")
+        if not self.client.upload(int(job["job_id"]), self.worker_id, output_path, project.root / output_path):
+            raise RuntimeError("Lease lost while uploading the output")
+        print(f"Uploaded {output_path} to the broker")
+
+    def _result(self, job: dict[str, Any], project: Project) -> dict[str, Any]:
+        clip = self.registry.get_clip(project_id=job["project_id"], clip_id=job["clip_id"]) or {}
+        state = clip.get("state") or "rejected"
+        if state != "rendered":
+            return {"state": state, "error": clip.get("last_error") or f"Render ended in state {state}"}
+
+        output_path = clip.get("output_path")
+        if output_path and Path(output_path).is_relative_to(project.root):
+            output_path = Path(output_path).relative_to(project.root).as_posix()
+        metrics = next(
+            (
+                m
+                for m in reversed(self.registry.list_render_metrics(job["project_id"]))
+                if m["clip_id"] == job["clip_id"] and m["render_hash"] == clip.get("render_hash")
+            ),
+            None,
+        )
+        return {"state": state, "output_path": output_path, "render_hash": clip.get("render_hash"), "metrics": metrics}
+
+    def run_job(self, job: dict[str, Any]) -> bool:
+        """Render one leased job and report it; returns whether the broker accepted the result."""
+        job_id, clip_id = int(job["job_id"]), job["clip_id"]
+        print(f"Rendering {clip_id} (farm job {job_id}, attempt {job.get('attempt')}) on {self.worker_id}...")
+        cancel, finished = threading.Event(), threading.Event()
+        interval = self.heartbeat_interval or float(job.get("lease_seconds") or 120) / 4
+        beat = threading.Thread(
+            target=self._heartbeat,
+            args=(job_id, interval, finished, cancel),
+            name=f"farm-heartbeat-{job_id}",
+            daemon=True,
+        )
+        beat.start()
+        try:
+            project = self._project(job)
+            kwargs = dict(job.get("render_kwargs") or {})
+            if kwargs.get("output_dir"):
+                kwargs["output_dir"] = project.root / kwargs["output_dir"]
+            controller = self.controller_factory(
+                project=project,
+                registry=self.registry,
+                worker=self.worker,
+                device=self.device,
+                timeout=self.timeout,
+                cancel_event=cancel,
+            )
+            controller.render_clip(clip_id=clip_id, **kwargs)
+            result = self._result(job, project)
+            if result["state"] == "rendered" and project.root != Path(job.get("project_path") or ""):
+                # No shared storage: the broker only sees what it is sent
+                self._upload(job, project, result["output_path"])
+        except Exception as e:
+            result = {"state": "rejected", "error": str(e)}
+        finally:
+            finished.set()
+            beat.join()
+
+        if cancel.is_set():
+            # The clip was requeued to another worker; whatever this render produced is not reported
+            return False
+        accepted = self.client.complete(job_id, self.worker_id, **result)
+        if not accepted:
+            print(f"[yellow]Broker dropped the result of job {job_id} (lease expired)[/yellow]")
+        elif result["state"] == "rendered":
+            print(f"[green]Reported[/green] {clip_id}")
+        else:
+            print(f"[red]Reported failure[/red] {clip_id}: {result.get('error')}")
+        return accepted
+
+    def run(
+        self, *, max_jobs: int | None = None, stop_when_idle: bool = False, stop: threading.Event | None = None
+    ) -> int:
+        """Lease and render jobs until `max_jobs` are done, the queue is empty (`stop_when_idle`) or `stop` is set."""
+        stop = stop or threading.Event()
+        done = 0
+        while not stop.is_set() and (max_jobs is None or done < max_jobs):
+            try:
+                job = self.client.lease(self.worker_id)
+            except (OSError, RuntimeError) as e:
+                print(f"[yellow]Farm broker unreachable[/yellow]: {e}")
+                job = None
+            if job is None:
+                if stop_when_idle:
+                    break
+                stop.wait(self.poll_interval)
+                continue
+            self.run_job(job)
+            done += 1
+        return done
@@ -1,7 +1,24 @@
 from __future__ import annotations
 
+import json
+import os
 import subprocess
+import tempfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
 from pathlib import Path
+from typing import Any
+
+# Parallel ffmpeg workers for probing and conforming clips
+CONFORM_JOBS = min(4, os.cpu_count() or 1)
+# x264 settings of conformed (re-encoded) clips; visually lossless at draft/final sizes
+CONFORM_PRESET = "veryfast"
+CONFORM_CRF = 18
+
+# Encoders that produce streams copy-compatible with the probed codec
+_VIDEO_ENCODERS = {"h264": "libx264", "hevc": "libx265", "vp9": "libvpx-vp9", "av1": "libaom-av1"}
+_AUDIO_ENCODERS = {"aac": "aac", "opus": "libopus", "mp3": "libmp3lame", "flac": "flac"}
 
 
 def concat_videos(inputs: list[Path], output: Path, force: bool = True) -> None:
@@ -52,3 +69,212 @@ def extract_frame(video_path: Path, output_image: Path, time: float = 0.0) -> No
         str(output_image),
     ]
     subprocess.check_call(cmd)
+
+
+def remux_to_segment(video_path: Path, segment_path: Path) -> None:
+    """Stream-copies a clip into an MPEG-TS segment (no re-encode) for incremental assembly."""
+    segment_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = segment_path.with_name(f".{segment_path.name}")
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-i",
+        str(video_path),
+        "-map",
+        "0",
+        "-c",
+        "copy",
+        "-f",
+        "mpegts",
+        str(tmp),
+    ]
+    subprocess.check_call(cmd)
+    tmp.replace(segment_path)
+
+
+def probe_duration(video_path: Path) -> float | None:
+    """Container duration in seconds via ffprobe, or None if it cannot be read."""
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-show_entries",
+        "format=duration",
+        "-of",
+        "default=noprint_wrappers=1:nokey=1",
+        str(video_path),
+    ]
+    try:
+        out = subprocess.check_output(cmd, text=True)
+        return float(out.strip())
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class StreamInfo:
+    """Stream parameters that must match for a stream-copy concat of two clips."""
+
+    video_codec: str
+    width: int
+    height: int
+    # ffprobe r_frame_rate, e.g. "24/1" or "24000/1001"
+    fps: str
+    pix_fmt: str
+    # None when the clip has no audio
+    audio_codec: str | None = None
+    sample_rate: int | None = None
+    channels: int | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @staticmethod
+    def from_dict(data: dict[str, Any] | None) -> StreamInfo | None:
+        return StreamInfo(**data) if data else None
+
+
+def probe_streams(video_path: Path) -> StreamInfo | None:
+    """First video/audio stream parameters via ffprobe, or None if the file cannot be read."""
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-show_entries",
+        "stream=codec_type,codec_name,width,height,pix_fmt,r_frame_rate,sample_rate,channels",
+        "-of",
+        "json",
+        str(video_path),
+    ]
+    try:
+        streams = json.loads(subprocess.check_output(cmd, text=True)).get("streams") or []
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        return None
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+    if video is None:
+        return None
+    return StreamInfo(
+        video_codec=str(video.get("codec_name")),
+        width=int(video.get("width") or 0),
+        height=int(video.get("height") or 0),
+        fps=str(video.get("r_frame_rate")),
+        pix_fmt=str(video.get("pix_fmt")),
+        audio_codec=str(audio.get("codec_name")) if audio else None,
+        sample_rate=int(audio.get("sample_rate") or 0) if audio else None,
+        channels=int(audio.get("channels") or 0) if audio else None,
+    )
+
+
+def pick_target(infos: list[StreamInfo | None]) -> StreamInfo | None:
+    """
+    Stream parameters the cut is conformed to: those of the most clips (ties go to the earliest
+    clip), so the fewest clips are re-encoded. Codecs without a known encoder fall back to H.264/AAC.
+    """
+    counts = Counter(info for info in infos if info is not None)
+    if not counts:
+        return None
+    target = counts.most_common(1)[0][0]
+    if target.video_codec not in _VIDEO_ENCODERS:
+        target = replace(target, video_codec="h264")
+    if target.audio_codec is not None and target.audio_codec not in _AUDIO_ENCODERS:
+        target = replace(target, audio_codec="aac")
+    return target
+
+
+def conform_video(
+    video_path: Path,
+    output: Path,
+    target: StreamInfo,
+    source: StreamInfo | None = None,
+    threads: int = 0,
+) -> None:
+    """
+    Re-encodes a clip to `target`'s stream parameters: scaled (letterboxed to keep the aspect
+    ratio), resampled to its frame rate and pixel format, with silent audio added or audio dropped
+    to match its layout. The output container follows the suffix (.ts -> MPEG-TS).
+    """
+    source = source or probe_streams(video_path)
+    w, h = target.width, target.height
+    vf = (
+        f"scale={w}:{h}:force_original_aspect_ratio=decrease,"
+        f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={target.fps},format={target.pix_fmt}"
+    )
+    cmd = ["ffmpeg", "-y", "-i", str(video_path)]
+    if target.audio_codec is not None and (source is None or source.audio_codec is None):
+        # Silent track so the clip's audio layout matches the rest of the cut
+        cmd += ["-f", "lavfi", "-i", f"anullsrc=r={target.sample_rate}:cl={target.channels}c"]
+        cmd += ["-map", "0:v:0", "-map", "1:a:0", "-shortest"]
+    elif target.audio_codec is not None:
+        cmd += ["-map", "0:v:0", "-map", "0:a:0"]
+    else:
+        cmd += ["-map", "0:v:0", "-an"]
+    cmd += ["-vf", vf, "-c:v", _VIDEO_ENCODERS[target.video_codec]]
+    if target.video_codec in ("h264", "hevc"):
+        cmd += ["-preset", CONFORM_PRESET, "-crf", str(CONFORM_CRF)]
+    cmd += ["-threads", str(threads)]
+    if target.audio_codec is not None:
+        cmd += [
+            "-c:a",
+            _AUDIO_ENCODERS[target.audio_codec],
+            "-ar",
+            str(target.sample_rate),
+            "-ac",
+            str(target.channels),
+        ]
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_name(f".{output.name}")
+    if output.suffix == ".ts":
+        cmd += ["-f", "mpegts"]
+    cmd.append(str(tmp))
+    subprocess.check_call(cmd)
+    tmp.replace(output)
+
+
+def conform_all(
+    jobs_list: list[tuple[Path, Path, StreamInfo | None]], target: StreamInfo, jobs: int | None = None
+) -> None:
+    """Runs conform_video() for (source, output, source info) tuples in parallel ffmpeg workers."""
+    if not jobs_list:
+        return
+    workers = max(1, min(jobs or CONFORM_JOBS, len(jobs_list)))
+    # Split the cores between workers instead of letting every x264 instance claim all of them
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vtx-conform") as pool:
+        futures = [pool.submit(conform_video, src, out, target, info, threads) for src, out, info in jobs_list]
+        for future in futures:
+            future.result()
+
+
+def smart_concat(
+    inputs: list[Path], output: Path, jobs: int | None = None, work_dir: Path | None = None, force: bool = True
+) -> int:
+    """
+    Concatenates clips whose streams may differ (mixed presets: fps, resolution, audio layout).
+
+    Every input is probed once. Clips matching the majority stream parameters are stream-copied
+    as-is; only the mismatched ones are re-encoded (in parallel) before the final copy-concat,
+    so assembly time tracks the number of non-conforming clips, not the length of the film.
+    Inputs ffprobe cannot read are passed through unchanged. Returns the number of clips re-encoded.
+    """
+    if not inputs:
+        raise ValueError("No input files provided for concatenation")
+
+    with ThreadPoolExecutor(max_workers=jobs or CONFORM_JOBS, thread_name_prefix="vtx-probe") as pool:
+        infos = list(pool.map(probe_streams, inputs))
+    target = pick_target(infos)
+    mismatched = [i for i, info in enumerate(infos) if target is not None and info is not None and info != target]
+    if not mismatched:
+        concat_videos(inputs, output, force=force)
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix=".conform-", dir=work_dir or output.parent) as tmp:
+        parts = list(inputs)
+        todo = []
+        for i in mismatched:
+            parts[i] = Path(tmp) / f"{i:05d}{inputs[i].suffix}"
+            todo.append((inputs[i], parts[i], infos[i]))
+        conform_all(todo, target, jobs)
+        concat_videos(parts, output, force=force)
+    return len(mismatched)
@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any
+
+from vtx_app.config.settings import Settings
+from vtx_app.project.index import ProjectIndex
+from vtx_app.project.layout import Project
+from vtx_app.registry.db import Registry
+from vtx_app.render.presets import get_preset
+from vtx_app.story.duration_estimator import estimate_seconds
+
+# Bump when the plan file layout changes
+PLAN_VERSION = 1
+
+PLAN_FILENAME = "render_plan.json"
+ASSEMBLE_JOB_ID = "assemble"
+
+# Pipeline-valid shapes: num_frames = 8k + 1, width/height multiples of 64 (two-stage pipelines)
+# or 32 (one-stage pipelines)
+FRAME_STEP = 8
+SIZE_STEP = 64
+ONE_STAGE_SIZE_STEP = 32
+ONE_STAGE_PIPELINES = frozenset({"ti2vid_one_stage"})
+# Pipelines that render a half resolution draft as a stage 1 pass (--stage-1-only) at the full size
+STAGE_1_DRAFT_PIPELINES = frozenset({"ti2vid_two_stages"})
+
+
+def snap_frames(num_frames: int, max_frames: int, bucket: int = FRAME_STEP) -> int:
+    """
+    Nearest 8k+1 frame count on a ladder `bucket` frames apart (rounded down to a multiple of 8),
+    capped at the largest 8k+1 count within `max_frames`.
+    """
+    step = max(FRAME_STEP, bucket // FRAME_STEP * FRAME_STEP)
+    top = max(1, (max_frames - 1) // FRAME_STEP * FRAME_STEP + 1)
+    k = max(1, int((num_frames - 1) / step + 0.5))
+    return min(k * step + 1, top)
+
+
+def snap_size(value: float, step: int = SIZE_STEP) -> int:
+    """Nearest multiple of `step` (ties round up), at least `step`."""
+    return max(step, int(value / step + 0.5) * step)
+
+
+def size_step(pipeline: str) -> int:
+    """Width/height multiple `pipeline` accepts (its `assert_resolution` divisor)."""
+    return ONE_STAGE_SIZE_STEP if pipeline in ONE_STAGE_PIPELINES else SIZE_STEP
+
+
+@dataclass(frozen=True)
+class ClipShape:
+    pipeline: str
+    num_frames: int
+    width: int
+    height: int
+    fps: int
+    # Estimated duration before snapping, and the (snapped) project size the clip is scaled from
+    seconds: float
+    base_width: int
+    base_height: int
+
+    @property
+    def bucket(self) -> str:
+        return f"{self.pipeline}/{self.num_frames}x{self.height}x{self.width}"
+
+    @property
+    def volume(self) -> float:
+        """Megapixel-frames, what denoising cost scales with."""
+        return self.num_frames * self.width * self.height / 1e6
+
+
+def clip_shape(
+    clip: dict[str, Any], settings: Settings, *, preset: str | None = None, resolution_scale: float = 1.0
+) -> ClipShape:
+    """
+    Pipeline, frame count, size and fps a clip renders at, snapped to a shape bucket.
+
+    Sizes snap to the pipeline's size step, 64 (two-stage) or 32 (one-stage). The one exception is a
+    half resolution draft on a pipeline that renders it as stage 1 at full size: it stays exactly
+    half of the project size, whatever its divisibility. Estimated durations snap to
+    8k+1 frames on a VTX_FRAME_BUCKET ladder, explicit `render.num_frames` only to 8k+1, so a batch
+    renders a handful of shapes instead of one per clip.
+    """
+    s = settings
+    render = clip.get("render") or {}
+    preset_cfg = get_preset(preset) if preset else {}
+
+    pipeline = render.get("pipeline") or s.default_pipeline
+    if preset == "final" and render.get("final_strategy") == "v2v":
+        # V2V refinement of the approved draft needs a video-conditioned pipeline
+        pipeline = "ic_lora"
+
+    fps = int(preset_cfg.get("fps") or render.get("fps") or os.getenv("PROJECT_FPS") or s.default_fps)
+    base_width = snap_size(int(render.get("width") or os.getenv("PROJECT_WIDTH") or s.default_width))
+    base_height = snap_size(int(render.get("height") or os.getenv("PROJECT_HEIGHT") or s.default_height))
+
+    if preset == "draft" and resolution_scale == 1.0:
+        # Legacy draft preset: half the target resolution
+        width, height = base_width // 2, base_height // 2
+    else:
+        width, height = int(base_width * resolution_scale), int(base_height * resolution_scale)
+    if pipeline not in STAGE_1_DRAFT_PIPELINES or (2 * width, 2 * height) != (base_width, base_height):
+        step = size_step(pipeline)
+        width, height = snap_size(width, step), snap_size(height, step)
+
+    # Duration -> frames (content-driven via story beats + prompt)
+    seconds = estimate_seconds(clip)
+    explicit_frames = render.get("num_frames")
+    if isinstance(explicit_frames, int) and explicit_frames > 0:
+        num_frames = snap_frames(explicit_frames, s.ltx_max_frames)
+    else:
+        num_frames = snap_frames(int(round(seconds * fps)), s.ltx_max_frames, s.frame_bucket)
+
+    return ClipShape(
+        pipeline=pipeline,
+        num_frames=num_frames,
+        width=width,
+        height=height,
+        fps=fps,
+        seconds=seconds,
+        base_width=base_width,
+        base_height=base_height,
+    )
+
+
+@dataclass
+class PlanJob:
+    id: str
+    # "render" (one clip) or "assemble" (final cut)
+    kind: str
+    deps: list[str] = field(default_factory=list)
+    clip_id: str | None = None
+    preset: str | None = None
+    resolution_scale: float | None = None
+    # Relative to the project root; None = the clip spec's outputs.mp4
+    output_dir: str | None = None
+    # Assemble: file name of the cut under renders/
+    output_name: str | None = None
+    # Render: predicted shape bucket (see clip_shape) and its megapixel-frames
+    bucket: str | None = None
+    volume: float | None = None
+
+    def render_kwargs(self, project_root: Path) -> dict[str, Any]:
+        """RenderController.render_clip options of a render job."""
+        kwargs: dict[str, Any] = {}
+        if self.preset:
+            kwargs["preset"] = self.preset
+        if self.resolution_scale is not None:
+            kwargs["resolution_scale"] = self.resolution_scale
+        if self.output_dir:
+            kwargs["output_dir"] = project_root / self.output_dir
+        return kwargs
+
+
+@dataclass
+class RenderPlan:
+    """
+    Machine-readable render plan of a project: a DAG of clip renders feeding the final assembly.
+
+    Written to <project>/render_plan.json by the producer (or `vtx render plan`) and run by
+    `render.executor.PlanExecutor`.
+    """
+
+    project_id: str
+    created_at: str
+    jobs: list[PlanJob]
+
+    def levels(self) -> list[list[PlanJob]]:
+        """Jobs grouped so that every job's dependencies are in an earlier group (Kahn's algorithm)."""
+        by_id = {job.id: job for job in self.jobs}
+        for job in self.jobs:
+            unknown = [d for d in job.deps if d not in by_id]
+            if unknown:
+                raise ValueError(f"Plan job {job.id} depends on unknown jobs: {', '.join(unknown)}")
+
+        done: set[str] = set()
+        remaining = list(self.jobs)
+        levels: list[list[PlanJob]] = []
+        while remaining:
+            ready = [job for job in remaining if all(d in done for d in job.deps)]
+            if not ready:
+                raise ValueError(f"Plan has a dependency cycle: {', '.join(job.id for job in remaining)}")
+            levels.append(ready)
+            done.update(job.id for job in ready)
+            remaining = [job for job in remaining if job.id not in done]
+        return levels
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": PLAN_VERSION,
+            "project_id": self.project_id,
+            "created_at": self.created_at,
+            "jobs": [asdict(job) for job in self.jobs],
+        }
+
+    @staticmethod
+    def from_dict(data: dict[str, Any]) -> RenderPlan:
+        if data.get("version") != PLAN_VERSION:
+            raise ValueError(f"Unsupported render plan version: {data.get('version')}")
+        known = {f.name for f in fields(PlanJob)}
+        return RenderPlan(
+            project_id=str(data.get("project_id")),
+            created_at=str(data.get("created_at") or ""),
+            jobs=[PlanJob(**{k: v for k, v in job.items() if k in known}) for job in data.get("jobs") or []],
+        )
+
+    def save(self, path: Path) -> None:
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_text(json.dumps(self.to_dict(), indent=2))
+        os.replace(tmp, path)
+
+    @staticmethod
+    def load(path: Path) -> RenderPlan:
+        return RenderPlan.from_dict(json.loads(path.read_text()))
+
+
+def plan_path(project_root: Path) -> Path:
+    return project_root / PLAN_FILENAME
+
+
+def project_clip_ids(project_root: Path) -> list[str]:
+    """Clip IDs of prompts/clips/*.yaml in file order (A01_S01__desc.yaml -> A01_S01)."""
+    clips_dir = project_root / "prompts" / "clips"
+    if not clips_dir.exists():
+        return []
+    return [p.stem.split("__")[0] for p in sorted(clips_dir.glob("*.yaml")) if not p.name.startswith(".")]
+
+
+def project_shapes(
+    project: Project,
+    registry: Registry,
+    clip_ids: list[str],
+    *,
+    preset: str | None = None,
+    resolution_scale: float | None = None,
+) -> dict[str, ClipShape]:
+    """Shape of each clip (by file ID) from the project index; clips without a readable spec are left out."""
+    index = ProjectIndex(
+        registry=registry, project_id=str(project.load_metadata().get("project_id")), root=project.root
+    )
+    specs = {}
+    for entry in index.entries():
+        specs.setdefault(entry.file_id, entry.spec)
+    settings = project.settings()
+    return {
+        cid: clip_shape(
+            specs[cid],
+            settings,
+            preset=preset,
+            resolution_scale=1.0 if resolution_scale is None else resolution_scale,
+        )
+        for cid in clip_ids
+        if cid in specs
+    }
+
+
+def build_render_plan(
+    *,
+    project_id: str,
+    created_at: str,
+    clip_ids: list[str],
+    preset: str | None = None,
+    resolution_scale: float | None = None,
+    output_dir: str | None = None,
+    output_name: str = "final_cut.mp4",
+    shapes: dict[str, ClipShape] | None = None,
+) -> RenderPlan:
+    """
+    One render job per clip, all feeding a single assemble job.
+
+    With `shapes`, render jobs are queued bucket by bucket (largest first, shot order within a
+    bucket), so consecutive clips reuse the warm model, allocator pools and tuned kernels.
+    """
+    shapes = shapes or {}
+    renders = [
+        PlanJob(
+            id=f"render:{cid}",
+            kind="render",
+            clip_id=cid,
+            preset=preset,
+            resolution_scale=resolution_scale,
+            output_dir=output_dir,
+            bucket=shapes[cid].bucket if cid in shapes else None,
+            volume=shapes[cid].volume if cid in shapes else None,
+        )
+        for cid in dict.fromkeys(clip_ids)
+    ]
+    if shapes:
+        sizes = {job.bucket: job.volume or 0.0 for job in renders}
+        rank = {b: i for i, b in enumerate(sorted(sizes, key=lambda b: -sizes[b]))}
+        renders.sort(key=lambda job: rank[job.bucket])
+    assemble = PlanJob(
+        id=ASSEMBLE_JOB_ID,
+        kind="assemble",
+        deps=[job.id for job in renders],
+        output_dir=output_dir,
+        output_name=output_name,
+    )
+    return RenderPlan(project_id=project_id, created_at=created_at, jobs=[*renders, assemble])
+
+
+@dataclass(frozen=True)
+class BucketCost:
+    bucket: str
+    clips: int
+    # Megapixel-frames of the bucket's clips
+    volume: float
+    # From past renders of the pipeline (seconds per megapixel-frame); None without history
+    predicted_seconds: float | None
+
+
+def seconds_per_volume(history: Iterable[dict[str, Any]]) -> dict[str, float]:
+    """Mean wall seconds per megapixel-frame of past renders, per pipeline ("" = all pipelines)."""
+    totals: dict[str, list[float]] = {}
+    for row in history:
+        frames, width, height, wall = row.get("num_frames"), row.get("width"), row.get("height"), row.get("wall_time")
+        if not (frames and width and height and wall):
+            continue
+        volume = frames * width * height / 1e6
+        for key in (str(row.get("pipeline") or ""), ""):
+            t = totals.setdefault(key, [0.0, 0.0])
+            t[0] += wall
+            t[1] += volume
+    return {key: wall / volume for key, (wall, volume) in totals.items() if volume}
+
+
+def bucket_costs(plan: RenderPlan, history: Iterable[dict[str, Any]] = ()) -> list[BucketCost]:
+    """Predicted cost of each shape bucket of the plan, in queue order."""
+    rates = seconds_per_volume(history)
+    grouped: dict[str, list[PlanJob]] = {}
+    for job in plan.jobs:
+        if job.kind == "render" and job.bucket:
+            grouped.setdefault(job.bucket, []).append(job)
+
+    costs = []
+    for bucket, jobs in grouped.items():
+        volume = sum(job.volume or 0.0 for job in jobs)
+        rate = rates.get(bucket.split("/")[0], rates.get(""))
+        costs.append(
+            BucketCost(
+                bucket=bucket,
+                clips=len(jobs),
+                volume=volume,
+                predicted_seconds=volume * rate if rate is not None else None,
+            )
+        )
+    return costs
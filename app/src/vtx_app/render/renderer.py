@@ -1,18 +1,22 @@
 from __future__ import annotations
 
 import os
+import threading
+import time
 from dataclasses import dataclass
 from pathlib import Path
 
-import yaml
 from rich import print
-from vtx_app.pipelines.base import PipelineCommand
+from vtx_app.pipelines.base import PipelineCommand, device_env
 from vtx_app.pipelines.capabilities import detect_capabilities, first_supported
-from vtx_app.pipelines.runner_subprocess import run
+from vtx_app.pipelines.runner_subprocess import JobCancelled, run
+from vtx_app.pipelines.runner_worker import RenderWorker, WorkerUnavailable
+from vtx_app.project.index import ProjectIndex
 from vtx_app.project.layout import Project
 from vtx_app.registry.db import Registry
-from vtx_app.render.presets import get_preset
-from vtx_app.story.duration_estimator import estimate_seconds
+from vtx_app.render.cache import RenderCache, compute_render_hash
+from vtx_app.render.planner import clip_shape
+from vtx_app.render.telemetry import metrics_path, metrics_row, read_sidecar
 from vtx_app.story.prompt_compiler import compile_prompt
 from vtx_app.utils.model_downloader import ModelDownloader
 from vtx_app.utils.timecode import now_iso
@@ -27,10 +31,41 @@ PIPELINE_MODULES = {
 }
 
 
+def stage_1_state_path(mp4_path: Path) -> Path:
+    """Where a two-stage draft keeps its stage 1 latents, next to the draft mp4."""
+    return mp4_path.with_suffix(".stage1.pt")
+
+
+def _draft_stage_1_state(project_root: Path, out_rel: str) -> Path | None:
+    # Drafts land in renders/low-res (render-reviews) or beside the output as *_draft.mp4 (--preset draft)
+    out_path = project_root / out_rel
+    candidates = [
+        stage_1_state_path(project_root / "renders" / "low-res" / out_path.name),
+        stage_1_state_path(out_path.with_name(f"{out_path.stem}_draft{out_path.suffix}")),
+    ]
+    existing = [p for p in candidates if p.is_file()]
+    return max(existing, key=lambda p: p.stat().st_mtime_ns) if existing else None
+
+
 @dataclass
 class RenderController:
     project: Project | None
     registry: Registry
+    worker: RenderWorker | None = None
+    # Scheduler slot controls: device pin ("cuda:N" / "cpu"), per-job timeout (seconds) and cancellation
+    device: str | None = None
+    timeout: float | None = None
+    cancel_event: threading.Event | None = None
+
+    def _run(self, cmd: PipelineCommand) -> None:
+        """Run in the warm worker when one is attached, else (or on worker failure) spawn a subprocess."""
+        if self.worker is not None:
+            try:
+                self.worker.run(cmd, timeout=self.timeout, cancel=self.cancel_event)
+                return
+            except WorkerUnavailable as e:
+                print(f"[yellow]Worker unavailable ({e}); falling back to subprocess[/yellow]")
+        run(cmd, timeout=self.timeout, cancel=self.cancel_event)
 
     def render_clip(
         self,
@@ -46,18 +81,15 @@ class RenderController:
         proj = self.project
         s = proj.settings()
 
-        preset_cfg = get_preset(preset) if preset else {}
-
-        clip_path = proj.root / "prompts" / "clips" / f"{clip_id}.yaml"
-        if not clip_path.exists():
-            # Try fuzzy match: clip_id prefix
-            matches = list((proj.root / "prompts" / "clips").glob(f"{clip_id}__*.yaml"))
-            if matches:
-                clip_path = matches[0]
-            else:
-                raise FileNotFoundError(f"No clip spec found for {clip_id}")
+        meta = proj.load_metadata()
+        project_id = str(meta.get("project_id"))
 
-        clip = yaml.safe_load(clip_path.read_text()) or {}
+        # {clip_id}.yaml or fuzzy {clip_id}__*.yaml, served from the registry's project index
+        entry = ProjectIndex(registry=self.registry, project_id=project_id, root=proj.root).get(clip_id)
+        if entry is None:
+            raise FileNotFoundError(f"No clip spec found for {clip_id}")
+        clip_path = entry.spec_path
+        clip = entry.spec
 
         # Validation
         validate_clip_spec(clip)
@@ -75,90 +107,45 @@ class RenderController:
 
         out_path.parent.mkdir(parents=True, exist_ok=True)
 
-        pipeline_key = (clip.get("render") or {}).get("pipeline") or s.default_pipeline
-
-        # Strategy override handling (V2V)
-        # If finalizing with V2V, we need a V2V-capable pipeline (e.g. ic_lora)
-        # unless current pipeline supports input video.
+        # Pipeline, size, fps and frame count, snapped to a pipeline-valid shape bucket
+        shape = clip_shape(clip, s, preset=preset, resolution_scale=resolution_scale)
+        pipeline_key = shape.pipeline
         final_strategy = (clip.get("render") or {}).get("final_strategy")
-        if preset == "final" and final_strategy == "v2v":
-            # Switch specific to V2V pipeline if not already
-            # For LTX, ic_lora is a good candidate for v2v style transfer/refinement
-            pipeline_key = "ic_lora"
-
         if pipeline_key not in PIPELINE_MODULES:
             raise KeyError(f"Unknown pipeline key: {pipeline_key}")
         module = PIPELINE_MODULES[pipeline_key]
         cap = detect_capabilities(module)
 
-        # Resolution / fps defaults
-        fps = int(
-            preset_cfg.get("fps") or (clip.get("render") or {}).get("fps") or os.getenv("PROJECT_FPS") or s.default_fps
-        )
-        base_width = int((clip.get("render") or {}).get("width") or os.getenv("PROJECT_WIDTH") or s.default_width)
-        base_height = int((clip.get("render") or {}).get("height") or os.getenv("PROJECT_HEIGHT") or s.default_height)
-
-        # Scaling logic
-        width = int(base_width * resolution_scale)
-        height = int(base_height * resolution_scale)
-
-        if preset == "draft":
-            # "Exactly half of the target resolution" if not scaled by resolution_scale
-            # If resolution_scale is passed, we respect it.
-            # If resolution_scale is 1.0 (default), but preset is draft, we apply preset logic?
-            # actually let's respect resolution_scale multiply.
-            # But earlier logic was:
-            # width = base_width // 2
-            # Let's keep existing behavior if resolution_scale is 1.0, otherwise combine?
-            # The prompt requested "half the target resolution" for render-reviews.
-            # I will pass resolution_scale=0.5 from CLI.
-
-            # Legacy preset handling:
-            if resolution_scale == 1.0:
-                width = base_width // 2
-                height = base_height // 2
-
-            # Draft writes to separate file to preserve as input for final
-            # If output_dir is set, we don't necessarily need the suffix, but
-            # let's keep it if output_dir is NOT set.
-            if not output_dir:
-                out_path = out_path.with_name(f"{out_path.stem}_draft{out_path.suffix}")
-
-        elif preset == "final":
-            # Use full res
-            pass  # width/height are already set * scale
-
-        # Force even dimensions (ffmpeg requirement often)
-        width = (width // 2) * 2
-        height = (height // 2) * 2
-
-        # Duration -> frames (content-driven via story beats + prompt)
-        seconds = estimate_seconds(clip)
-        num_frames = int(round(seconds * fps))
-
-        # Optional explicit override
-        explicit_frames = (clip.get("render") or {}).get("num_frames")
-        if isinstance(explicit_frames, int) and explicit_frames > 0:
-            num_frames = explicit_frames
-
-        num_frames = max(1, min(num_frames, s.ltx_max_frames))
+        fps, width, height = shape.fps, shape.width, shape.height
+        base_width, base_height = shape.base_width, shape.base_height
+        seconds, num_frames = shape.seconds, shape.num_frames
+
+        # Draft writes to separate file to preserve as input for final
+        if preset == "draft" and not output_dir:
+            out_path = out_path.with_name(f"{out_path.stem}_draft{out_path.suffix}")
 
         seed = (clip.get("render") or {}).get("seed")
 
         # Build args from env + clip + detected capabilities
         args: list[str] = []
         downloader = ModelDownloader(s)
+        # Files that feed the render cache key (models by identity, inputs by content)
+        model_files: list[str] = []
+        input_files: list[Path] = []
 
         # Shared model paths
         if s.checkpoint_path:
             downloader.ensure_model("LTX_CHECKPOINT_PATH")
             args += ["--checkpoint-path", s.checkpoint_path]
+            model_files.append(s.checkpoint_path)
         if s.spatial_upsampler_path:
             downloader.ensure_model("LTX_SPATIAL_UPSAMPLER_PATH")
             args += ["--spatial-upsampler-path", s.spatial_upsampler_path]
+            model_files.append(s.spatial_upsampler_path)
         if s.gemma_root:
             downloader.ensure_model("LTX_GEMMA_ROOT")
             args += ["--gemma-root", s.gemma_root]
+            model_files.append(s.gemma_root)
 
         # V2V Input
         if preset == "final" and final_strategy == "v2v":
@@ -172,6 +159,7 @@ class RenderController:
             iv_flag = first_supported(cap, "--input-video-path", "--input_video_path", "--input-video")
             if iv_flag and draft_input.exists():
                 args += [iv_flag, str(draft_input)]
+                input_files.append(draft_input)
                 # Also likely need conditioning strength?
                 args += ["--conditioning-strength", "0.6"]  # sane default
 
@@ -196,8 +184,33 @@ class RenderController:
                     path = os.getenv(env_name) or ""
                     if path:
                         args += [distilled_flag, path, str(weight)]
+                        model_files.append(path)
             elif s.distilled_lora_path:
                 args += [distilled_flag, s.distilled_lora_path, "0.8"]
+                model_files.append(s.distilled_lora_path)
+
+        # Draft -> final latent reuse (two-stage pipelines). A half resolution draft is rendered as
+        # stage 1 only at the target size, whose output is exactly half resolution, and its latents are
+        # kept; the approved final then resumes from them straight into upsampling + stage 2.
+        stage_1_state: Path | None = None
+        stage_1_only_flag = first_supported(cap, "--stage-1-only")
+        save_stage_1_flag = first_supported(cap, "--save-stage-1")
+        resume_flag = first_supported(cap, "--resume-from-stage-1")
+        if (
+            preset != "final"
+            and stage_1_only_flag
+            and save_stage_1_flag
+            and (2 * width, 2 * height) == (base_width, base_height)
+        ):
+            width, height = base_width, base_height
+            stage_1_state = stage_1_state_path(out_path)
+            args += [stage_1_only_flag, save_stage_1_flag, str(stage_1_state)]
+        elif preset == "final" and resume_flag and (clip.get("render") or {}).get("approved"):
+            draft_state = _draft_stage_1_state(proj.root, out_rel)
+            if draft_state:
+                # The pipeline checks the saved stage 1 parameters and renders from scratch on a mismatch
+                args += [resume_flag, str(draft_state)]
+                print(f"[cyan]Resuming[/cyan] {clip_id} from draft latents {draft_state.name}")
 
         # Optional controls (only if pipeline supports them)
         wflag = first_supported(cap, "--width")
@@ -240,6 +253,7 @@ class RenderController:
             if img_flag:
                 # Default: frame 0, strength 1.0
                 args += [img_flag, str(fpath), "0", "1.0"]
+                input_files.append(fpath)
 
         # Input video (video-to-video / ICLora)
         inp_vid = inputs.get("input_video")
@@ -255,6 +269,7 @@ class RenderController:
             if vid_flag:
                 # Default strength 1.0
                 args += [vid_flag, str(fpath), "1.0"]
+                input_files.append(fpath)
 
         # Prompt + output
         pflag = first_supported(cap, "--prompt")
@@ -272,33 +287,114 @@ class RenderController:
         else:
             args += ["--output-path", str(out_path)]
 
-        cmd = PipelineCommand(module=module, args=args, output_path=out_path)
+        # Per-stage telemetry sidecar (pipelines that support it)
+        metrics_file: Path | None = None
+        mflag = first_supported(cap, "--metrics-path")
+        if mflag:
+            metrics_file = metrics_path(out_path)
+            args += [mflag, str(metrics_file)]
+
+        cmd = PipelineCommand(module=module, args=args, output_path=out_path, env=device_env(self.device))
+
+        render_hash = compute_render_hash(
+            module=module,
+            args=args,
+            pack=pack,
+            seed=seed if isinstance(seed, int) else None,
+            model_files=model_files,
+            input_files=input_files,
+        )
+        cache = RenderCache.from_settings(s)
 
         # Registry state update
-        meta = proj.load_metadata()
-        project_id = str(meta.get("project_id"))
+        # Unchanged inputs: keep the existing output, or materialize it from the render cache
+        prev = self.registry.get_clip(project_id=project_id, clip_id=clip_id) or {}
+        # A draft whose latents went missing is re-rendered so the final can still resume from them
+        missing_state = stage_1_state is not None and not stage_1_state.exists()
+        if (
+            not missing_state
+            and prev.get("state") == "rendered"
+            and prev.get("render_hash") == render_hash
+            and prev.get("output_path") == str(out_path)
+            and out_path.exists()
+        ):
+            print(f"[green]Up to date[/green] {clip_id} -> {out_rel}")
+            return
+        if not missing_state and cache.restore(render_hash, out_path):
+            self.registry.upsert_clip(
+                project_id=project_id,
+                clip_id=clip_id,
+                state="rendered",
+                output_path=str(out_path),
+                render_hash=render_hash,
+                updated_at=now_iso(),
+                last_error=None,
+            )
+            print(f"[green]Cached[/green] {clip_id} -> {out_rel}")
+            return
+
+        # Outputs may be hard links into the cache; never let the pipeline overwrite a cache entry in place
+        if out_path.exists() and out_path.stat().st_nlink > 1:
+            out_path.unlink()
+
         self.registry.upsert_clip(
             project_id=project_id,
             clip_id=clip_id,
             state="rendering",
             output_path=str(out_path),
-            render_hash=None,
+            render_hash=render_hash,
             updated_at=now_iso(),
             last_error=None,
         )
 
         try:
-            run(cmd)
+            if metrics_file is not None:
+                # Never attribute a previous run's sidecar to this one
+                metrics_file.unlink(missing_ok=True)
+            started = time.perf_counter()
+            self._run(cmd)
+            wall_time = time.perf_counter() - started
+            cache.store(render_hash, out_path)
+            self.registry.add_render_metrics(
+                metrics_row(
+                    project_id=project_id,
+                    clip_id=clip_id,
+                    preset=preset or ("default" if resolution_scale == 1.0 else f"scale {resolution_scale:g}"),
+                    pipeline=pipeline_key,
+                    render_hash=render_hash,
+                    created_at=now_iso(),
+                    wall_time=wall_time,
+                    num_frames=num_frames,
+                    width=width,
+                    height=height,
+                    output_path=out_path,
+                    sidecar=read_sidecar(metrics_file) if metrics_file is not None else {},
+                )
+            )
             self.registry.upsert_clip(
                 project_id=project_id,
                 clip_id=clip_id,
                 state="rendered",
                 output_path=str(out_path),
-                render_hash=None,
+                render_hash=render_hash,
                 updated_at=now_iso(),
                 last_error=None,
             )
-            print(f"[green]Rendered[/green] {clip_id} -> {out_rel}  ({seconds:.1f}s @ {fps}fps = {num_frames} frames)")
+            print(
+                f"[green]Rendered[/green] {clip_id} -> {out_rel}  "
+                f"({seconds:.1f}s @ {fps}fps = {num_frames} frames, {wall_time:.1f}s wall)"
+            )
+        except JobCancelled as e:
+            self.registry.upsert_clip(
+                project_id=project_id,
+                clip_id=clip_id,
+                state="cancelled",
+                output_path=str(out_path),
+                render_hash=None,
+                updated_at=now_iso(),
+                last_error=str(e),
+            )
+            print(f"[yellow]Cancelled[/yellow] {clip_id}")
         except Exception as e:
             self.registry.upsert_clip(
                 project_id=project_id,
@@ -312,29 +408,3 @@ class RenderController:
             print(f"[red]Failed[/red] {clip_id}: {e}")
             if s.fail_fast:
                 raise
-
-    def resume(self, *, max_jobs: int = 1) -> None:
-        """
-        Naive resume: iterate registry unfinished clips and render them.
-        This assumes projects + clips have been synced into the registry.
-        """
-        unfinished = self.registry.list_unfinished_clips()
-        if not unfinished:
-            print("[green]No unfinished clips.[/green]")
-            return
-
-        proj_map = {p["project_id"]: Path(p["path"]) for p in self.registry.list_projects()}
-
-        count = 0
-        for item in unfinished:
-            if count >= max_jobs:
-                break
-            pid = item["project_id"]
-            clip_id = item["clip_id"]
-            proj_path = proj_map.get(pid)
-            if not proj_path:
-                continue
-            proj = Project(root=proj_path)
-            controller = RenderController(project=proj, registry=self.registry)
-            controller.render_clip(clip_id=clip_id)
-            count += 1
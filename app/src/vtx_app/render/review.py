@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from rich import print
+from vtx_app.project.layout import Project
+from vtx_app.registry.db import Registry
+from vtx_app.render.status import collect_status
+from vtx_app.utils.hashing import file_identity, stable_hash
+
+# Frames on the contact sheet, laid out SHEET_COLUMNS wide
+SHEET_FRAMES = 12
+SHEET_COLUMNS = 4
+THUMB_WIDTH = 320
+PROXY_HEIGHT = 360
+PROXY_BITRATE = 600_000
+
+POSTER_NAME = "poster.jpg"
+SHEET_NAME = "sheet.jpg"
+PROXY_NAME = "proxy.mp4"
+
+
+@dataclass(frozen=True)
+class ReviewAssets:
+    clip_id: str
+    # Render hash of the clip (or its file identity when it was rendered outside the registry)
+    key: str
+    poster: str
+    sheet: str
+    proxy: str
+
+
+def review_dir(project_root: Path) -> Path:
+    return project_root / "renders" / "review"
+
+
+def sample_indices(total_frames: int, count: int) -> list[int]:
+    """`count` frame indices spread evenly over the clip, centred in equal slices."""
+    if total_frames <= 0 or count <= 0:
+        return []
+    count = min(count, total_frames)
+    return [int((i + 0.5) * total_frames / count) for i in range(count)]
+
+
+def _even(n: float) -> int:
+    return max(2, int(n) // 2 * 2)
+
+
+def render_review_assets(
+    video_path: str,
+    out_dir: str,
+    frames: int = SHEET_FRAMES,
+    columns: int = SHEET_COLUMNS,
+) -> None:
+    """
+    Poster frame, contact sheet and low-bitrate proxy of one clip from a single decode pass.
+
+    Every decoded frame is scaled into the proxy encoder; the sampled frames are kept as
+    thumbnails (and the middle one as the poster) on the way. Runs in a worker process.
+    """
+    try:
+        import av  # noqa: PLC0415
+        from PIL import Image  # noqa: PLC0415
+    except ImportError as e:
+        raise RuntimeError("Review assets need PyAV and Pillow (installed with ltx-pipelines)") from e
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    tmp_proxy = out / f".{PROXY_NAME}"
+
+    with av.open(video_path) as src:
+        vstream = src.streams.video[0]
+        vstream.thread_type = "AUTO"
+        rate = vstream.average_rate or 24
+        total = vstream.frames
+        if not total and vstream.duration is not None:
+            total = int(float(vstream.duration * vstream.time_base) * float(rate))
+        picks = set(sample_indices(total, frames))
+        poster_index = total // 2
+
+        width, height = vstream.codec_context.width, vstream.codec_context.height
+        proxy_h = _even(min(PROXY_HEIGHT, height))
+        proxy_w = _even(width * proxy_h / height)
+
+        thumbs: list[Image.Image] = []
+        poster: Image.Image | None = None
+        with av.open(str(tmp_proxy), mode="w") as dst:
+            ostream = dst.add_stream("libx264", rate=rate, options={"preset": "veryfast"})
+            ostream.width = proxy_w
+            ostream.height = proxy_h
+            ostream.pix_fmt = "yuv420p"
+            ostream.bit_rate = PROXY_BITRATE
+
+            for i, frame in enumerate(src.decode(vstream)):
+                scaled = frame.reformat(width=proxy_w, height=proxy_h, format="yuv420p")
+                scaled.pts = None
+                for packet in ostream.encode(scaled):
+                    dst.mux(packet)
+                if i in picks or (not picks and i == 0):
+                    image = frame.to_image()
+                    image.thumbnail((THUMB_WIDTH, THUMB_WIDTH * height // width))
+                    thumbs.append(image)
+                if i == poster_index or poster is None:
+                    poster = frame.to_image()
+            for packet in ostream.encode():
+                dst.mux(packet)
+
+    if poster is None:
+        raise ValueError(f"No video frames in {video_path}")
+
+    tw, th = thumbs[0].size
+    rows = -(-len(thumbs) // columns)
+    sheet = Image.new("RGB", (tw * min(columns, len(thumbs)), th * rows))
+    for n, image in enumerate(thumbs):
+        sheet.paste(image, ((n % columns) * tw, (n // columns) * th))
+
+    # Proxy last: its presence marks the set as complete
+    poster.save(out / POSTER_NAME, quality=90)
+    sheet.save(out / SHEET_NAME, quality=85)
+    tmp_proxy.replace(out / PROXY_NAME)
+
+
+def _complete(out_dir: Path) -> bool:
+    return all((out_dir / name).is_file() for name in (POSTER_NAME, SHEET_NAME, PROXY_NAME))
+
+
+def build_review_assets(
+    project: Project,
+    registry: Registry,
+    jobs: int | None = None,
+    frames: int = SHEET_FRAMES,
+) -> list[ReviewAssets]:
+    """
+    Review assets of every rendered clip, under renders/review/<render hash>/.
+
+    Sets are keyed by the clip's render hash, so only clips re-rendered since the last run are
+    decoded again; the rest are rendered in a process pool. renders/review/index.json maps clip
+    IDs to their current assets.
+    """
+    root = review_dir(project.root)
+    clips = [c for c in collect_status(project, registry) if c.state == "done" and c.output]
+
+    assets: list[ReviewAssets] = []
+    todo: dict[str, tuple[Path, Path]] = {}
+    for c in clips:
+        video = project.root / c.output
+        key = c.render_hash or stable_hash(file_identity(video))
+        out_dir = root / key
+        rel = out_dir.relative_to(project.root)
+        assets.append(
+            ReviewAssets(
+                clip_id=c.clip_id,
+                key=key,
+                poster=str(rel / POSTER_NAME),
+                sheet=str(rel / SHEET_NAME),
+                proxy=str(rel / PROXY_NAME),
+            )
+        )
+        if not _complete(out_dir):
+            todo[c.clip_id] = (video, out_dir)
+
+    if todo:
+        print(f"[green]Building review assets[/green] for {len(todo)} clips ({len(clips) - len(todo)} cached)...")
+        with ProcessPoolExecutor(max_workers=jobs or max(1, (os.cpu_count() or 2) // 2)) as pool:
+            futures = {
+                cid: pool.submit(render_review_assets, str(video), str(out_dir), frames)
+                for cid, (video, out_dir) in todo.items()
+            }
+            for cid, future in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"[red]Review assets failed for {cid}[/red]: {e}")
+        assets = [a for a in assets if _complete((project.root / a.proxy).parent)]
+    elif clips:
+        print(f"[green]Review assets up to date[/green] ({len(clips)} clips)")
+
+    root.mkdir(parents=True, exist_ok=True)
+    index = root / "index.json"
+    tmp = root / ".index.json.tmp"
+    tmp.write_text(json.dumps({a.clip_id: asdict(a) for a in assets}, indent=2, sort_keys=True))
+    os.replace(tmp, index)
+    return assets
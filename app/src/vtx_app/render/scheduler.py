@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import queue
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from rich import print
+from vtx_app.config.settings import Settings
+from vtx_app.pipelines.base import device_env
+from vtx_app.pipelines.runner_worker import RenderWorker
+from vtx_app.project.layout import Project
+from vtx_app.registry.db import Registry
+from vtx_app.render.renderer import RenderController
+from vtx_app.utils.timecode import iso_ago, now_iso
+
+# A clip still "rendering" after this long is a crash leftover (no live render holds it) and resume retries it
+STALE_RENDERING_SECONDS = 6 * 3600.0
+
+
+def parse_devices(spec: str | None) -> list[str | None]:
+    """
+    Parse a device list such as "cuda:0,cuda:1", "0,1" or "cpu".
+
+    An empty spec means one slot group on the inherited (default) device.
+    """
+    devices: list[str | None] = []
+    for item in (spec or "").split(","):
+        name = item.strip()
+        if name:
+            devices.append(f"cuda:{name}" if name.isdigit() else name)
+    return devices or [None]
+
+
+@dataclass
+class RenderJob:
+    clip_id: str
+    render_kwargs: dict[str, Any] = field(default_factory=dict)
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+    # queued -> running -> done | failed | cancelled
+    state: str = "queued"
+    error: str | None = None
+
+    def cancel(self) -> None:
+        self.cancel_event.set()
+
+
+@dataclass
+class _Slot:
+    device: str | None
+    worker: RenderWorker | None = None
+    thread: threading.Thread | None = None
+
+    @property
+    def label(self) -> str:
+        return self.device or "default"
+
+
+class RenderScheduler:
+    """
+    Runs clip renders concurrently on a fixed set of device slots.
+
+    Each device gets `slots_per_device` threads pulling from one bounded queue, so `submit()`
+    blocks once `queue_size` jobs are waiting. A slot pins its pipeline processes to its device
+    (and owns a warm worker when `use_worker` is set). Jobs honour a per-job timeout and can be
+    cancelled while queued or running; their state is written to the registry `clips` table.
+    """
+
+    def __init__(
+        self,
+        *,
+        project: Project,
+        registry: Registry,
+        devices: list[str | None] | None = None,
+        slots_per_device: int = 1,
+        queue_size: int | None = None,
+        timeout: float | None = None,
+        use_worker: bool = False,
+        fail_fast: bool = False,
+        controller_factory: Callable[..., RenderController] = RenderController,
+        on_done: Callable[[RenderJob], None] | None = None,
+    ) -> None:
+        self.project = project
+        self.registry = registry
+        self.timeout = timeout
+        self.fail_fast = fail_fast
+        self.controller_factory = controller_factory
+        # Called from the slot thread after each successful job (e.g. incremental assembly)
+        self.on_done = on_done
+        self.slots = [
+            _Slot(device=device, worker=RenderWorker(env=device_env(device)) if use_worker else None)
+            for device in (devices or [None])
+            for _ in range(max(1, int(slots_per_device)))
+        ]
+        self.jobs: dict[str, RenderJob] = {}
+        self._queue: queue.Queue[RenderJob | None] = queue.Queue(maxsize=queue_size or 2 * len(self.slots))
+        self._lock = threading.Lock()
+        self._started = False
+        self._project_id: str | None = None
+
+    @staticmethod
+    def from_settings(
+        project: Project,
+        registry: Registry,
+        settings: Settings | None = None,
+        *,
+        worker: bool | None = None,
+        devices: str | None = None,
+        slots: int | None = None,
+        timeout: float | None = None,
+        controller_factory: Callable[..., RenderController] = RenderController,
+        on_done: Callable[[RenderJob], None] | None = None,
+    ) -> RenderScheduler:
+        """Scheduler configured from the project's VTX_RENDER_* settings; arguments override them."""
+        s = settings or project.settings()
+        return RenderScheduler(
+            project=project,
+            registry=registry,
+            devices=parse_devices(s.render_devices if devices is None else devices),
+            slots_per_device=s.render_slots_per_device if slots is None else slots,
+            timeout=(s.render_job_timeout if timeout is None else timeout) or None,
+            use_worker=s.render_worker if worker is None else worker,
+            fail_fast=s.fail_fast,
+            controller_factory=controller_factory,
+            on_done=on_done,
+        )
+
+    @property
+    def project_id(self) -> str:
+        if self._project_id is None:
+            meta = self.project.load_metadata()
+            self._project_id = str(meta.get("project_id"))
+        return self._project_id
+
+    def _record(self, job: RenderJob, state: str, error: str | None = None, *, keep_rendered: bool = False) -> None:
+        self.registry.set_clip_state(
+            project_id=self.project_id,
+            clip_id=job.clip_id,
+            state=state,
+            updated_at=now_iso(),
+            last_error=error,
+            keep=("rendered",) if keep_rendered else (),
+        )
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            for i, slot in enumerate(self.slots):
+                slot.thread = threading.Thread(
+                    target=self._slot_loop, args=(slot,), name=f"render-slot-{slot.label}-{i}", daemon=True
+                )
+                slot.thread.start()
+
+    def submit(self, clip_id: str, **render_kwargs: Any) -> RenderJob:
+        """Queue a clip render; blocks while the queue is full."""
+        job = RenderJob(clip_id=clip_id, render_kwargs=render_kwargs)
+        with self._lock:
+            self.jobs[clip_id] = job
+        # A rendered clip keeps its state until it actually re-renders: render_clip only skips
+        # an unchanged clip whose row is "rendered", and resume must not pick it up either.
+        self._record(job, "queued", keep_rendered=True)
+        self.start()
+        self._queue.put(job)
+        return job
+
+    def cancel(self, clip_id: str) -> bool:
+        job = self.jobs.get(clip_id)
+        if job is None or job.state not in ("queued", "running"):
+            return False
+        job.cancel()
+        return True
+
+    def cancel_all(self) -> None:
+        for clip_id in list(self.jobs):
+            self.cancel(clip_id)
+
+    def _slot_loop(self, slot: _Slot) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                self._run_job(slot, job)
+            finally:
+                self._queue.task_done()
+
+    def _run_job(self, slot: _Slot, job: RenderJob) -> None:
+        if job.cancel_event.is_set():
+            job.state = "cancelled"
+            self._record(job, "cancelled", "Cancelled before start", keep_rendered=True)
+            print(f"[yellow]Cancelled[/yellow] {job.clip_id} (queued)")
+            return
+
+        job.state = "running"
+        print(f"Rendering {job.clip_id} on {slot.label}...")
+        controller = self.controller_factory(
+            project=self.project,
+            registry=self.registry,
+            worker=slot.worker,
+            device=slot.device,
+            timeout=self.timeout,
+            cancel_event=job.cancel_event,
+        )
+        try:
+            controller.render_clip(clip_id=job.clip_id, **job.render_kwargs)
+        except Exception as e:
+            job.state = "failed"
+            job.error = str(e)
+            self._record(job, "rejected", str(e))
+            print(f"[red]Failed to render {job.clip_id}: {e}[/red]")
+            if self.fail_fast:
+                self.cancel_all()
+            return
+        # Without fail_fast the controller records a failed render as "rejected" instead of raising,
+        # so the clip's registry row (not the absence of an exception) decides how the job ended.
+        row = self.registry.get_clip(project_id=self.project_id, clip_id=job.clip_id) or {}
+        if row.get("state") == "rejected":
+            job.state = "failed"
+            job.error = row.get("last_error")
+            if self.fail_fast:
+                self.cancel_all()
+            return
+        job.state = "cancelled" if job.cancel_event.is_set() or row.get("state") == "cancelled" else "done"
+        if job.state == "done" and self.on_done is not None:
+            try:
+                self.on_done(job)
+            except Exception as e:
+                print(f"[yellow]Post-render hook failed for {job.clip_id}: {e}[/yellow]")
+
+    def join(self) -> None:
+        """Wait until every submitted job has finished."""
+        self._queue.join()
+
+    def close(self, *, cancel: bool = False) -> None:
+        """Stop the slot threads (after draining the queue) and shut down slot workers."""
+        if cancel:
+            self.cancel_all()
+        if self._started:
+            for _ in self.slots:
+                self._queue.put(None)
+            for slot in self.slots:
+                if slot.thread is not None:
+                    slot.thread.join()
+        for slot in self.slots:
+            if slot.worker is not None:
+                slot.worker.close()
+
+    def run_all(self, clip_ids: list[str], **render_kwargs: Any) -> dict[str, RenderJob]:
+        """Render `clip_ids` with the same options and wait for all of them."""
+        for clip_id in clip_ids:
+            self.submit(clip_id, **render_kwargs)
+        self.join()
+        return {cid: self.jobs[cid] for cid in clip_ids}
+
+    def __enter__(self) -> RenderScheduler:
+        return self
+
+    def __exit__(self, exc_type: object, *exc_info: object) -> None:
+        # Interrupted (e.g. Ctrl+C): cancel whatever is still queued or running.
+        self.close(cancel=exc_type is not None)
+
+
+def resume_unfinished(
+    registry: Registry,
+    *,
+    max_jobs: int | None = None,
+    stale_after: float = STALE_RENDERING_SECONDS,
+    scheduler_factory: Callable[..., RenderScheduler] = RenderScheduler.from_settings,
+    **scheduler_options: Any,
+) -> list[RenderJob]:
+    """
+    Render the registry's unfinished clips across all projects.
+
+    Each project's clips go through one RenderScheduler configured from that project's settings
+    (devices, slots per device, timeout), so they render concurrently; `max_jobs` only caps how
+    many clips are resumed in total. Clips stuck in "rendering" for more than `stale_after`
+    seconds are picked up as well. Assumes projects and clips have been synced into the registry.
+    """
+    unfinished = registry.list_unfinished_clips(stale_before=iso_ago(stale_after))
+    if max_jobs is not None:
+        unfinished = unfinished[: max(0, max_jobs)]
+    if not unfinished:
+        print("[green]No unfinished clips.[/green]")
+        return []
+
+    proj_map = {p["project_id"]: Path(p["path"]) for p in registry.list_projects()}
+    by_project: dict[str, list[str]] = {}
+    for item in unfinished:
+        if item["project_id"] in proj_map:
+            by_project.setdefault(item["project_id"], []).append(item["clip_id"])
+
+    jobs: list[RenderJob] = []
+    for project_id, clip_ids in by_project.items():
+        print(f"Resuming {len(clip_ids)} clips of {proj_map[project_id]}...")
+        with scheduler_factory(Project(root=proj_map[project_id]), registry, **scheduler_options) as scheduler:
+            jobs.extend(scheduler.run_all(clip_ids).values())
+    return jobs
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from vtx_app.project.index import ProjectIndex
+from vtx_app.project.layout import Project
+from vtx_app.registry.db import Registry
+
+# Registry clip states that mean "in progress / not rendered"
+_ACTIVE_STATES = {"queued": "queued", "rendering": "rendering", "rejected": "failed", "cancelled": "cancelled"}
+
+
+@dataclass(frozen=True)
+class ClipStatus:
+    clip_id: str
+    # done | pending | queued | rendering | failed | cancelled | missing (registry says rendered,
+    # file is gone) | error (unreadable spec)
+    state: str
+    output: str | None = None
+    size: int | None = None
+    mtime: float | None = None
+    render_time: float | None = None
+    render_hash: str | None = None
+    error: str | None = None
+
+
+class _DirStats:
+    """(size, mtime) of the files in each output directory, from a single os.scandir() per directory."""
+
+    def __init__(self) -> None:
+        self._dirs: dict[Path, dict[str, tuple[int, float]]] = {}
+
+    def get(self, path: Path) -> tuple[int, float] | None:
+        entries = self._dirs.get(path.parent)
+        if entries is None:
+            entries = {}
+            try:
+                with os.scandir(path.parent) as it:
+                    for de in it:
+                        if de.is_file():
+                            st = de.stat()
+                            entries[de.name] = (st.st_size, st.st_mtime)
+            except OSError:
+                pass
+            self._dirs[path.parent] = entries
+        return entries.get(path.name)
+
+
+def _display(root: Path, path: Path) -> str:
+    try:
+        return str(path.relative_to(root))
+    except ValueError:
+        return str(path)
+
+
+def collect_status(project: Project, registry: Registry) -> list[ClipStatus]:
+    """
+    Status of every clip spec, in file order, from the registry: the project index (clip specs,
+    re-parsed only when changed), the clips table (state, output, render hash) and the latest
+    render_metrics wall time. Outputs are reconciled with the filesystem by scanning each output
+    directory once instead of stat()-ing every clip.
+    """
+    project_id = str(project.load_metadata().get("project_id"))
+    index = ProjectIndex(registry=registry, project_id=project_id, root=project.root)
+    entries = [e for e in index.entries() if str(e.spec_path) not in index.skipped]
+    rows = {r["clip_id"]: r for r in registry.list_clips(project_id)}
+    render_times = registry.last_render_times(project_id)
+    stats = _DirStats()
+
+    result: list[ClipStatus] = []
+    for entry in entries:
+        # Renders are recorded under the ID they were requested with (usually the file prefix)
+        row = rows.get(entry.file_id) or rows.get(entry.clip_id) or {}
+        spec_out = project.root / entry.output_path if entry.output_path else None
+        reg_out = Path(row["output_path"]) if row.get("output_path") else None
+        state = row.get("state")
+
+        out = reg_out if state == "rendered" else spec_out
+        stat = stats.get(out) if out else None
+        if state == "rendered":
+            status = "done" if stat else "missing"
+        elif state in _ACTIVE_STATES:
+            status = _ACTIVE_STATES[state]
+        elif stat:
+            # Rendered outside the registry (or before it existed)
+            status = "done"
+        else:
+            status = "pending"
+
+        result.append(
+            ClipStatus(
+                clip_id=entry.file_id,
+                state=status,
+                output=_display(project.root, out) if out else None,
+                size=stat[0] if stat else None,
+                mtime=stat[1] if stat else None,
+                render_time=render_times.get(row.get("clip_id") or entry.file_id),
+                render_hash=row.get("render_hash"),
+                error=row.get("last_error") if status == "failed" else None,
+            )
+        )
+
+    for path, error in index.skipped.items():
+        result.append(ClipStatus(clip_id=Path(path).stem, state="error", error=error))
+    return sorted(result, key=lambda c: c.clip_id)
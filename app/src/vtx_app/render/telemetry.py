@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+import math
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+# Stages reported by ltx_pipelines.utils.telemetry, in pipeline order
+STAGES = (
+    "model_load",
+    "text_encode",
+    "stage_1_denoise",
+    "upsample",
+    "stage_2_denoise",
+    "vae_decode",
+    "mux",
+)
+
+GROUP_KEYS = ("project_id", "preset", "pipeline")
+
+
+def metrics_path(output_path: Path) -> Path:
+    """Sidecar the pipeline writes its telemetry to, next to the rendered mp4."""
+    return output_path.with_suffix(".metrics.json")
+
+
+def read_sidecar(path: Path) -> dict[str, Any]:
+    """Pipeline telemetry, or {} when the pipeline did not write any (older pipelines, failed runs)."""
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def metrics_row(
+    *,
+    project_id: str,
+    clip_id: str,
+    preset: str,
+    pipeline: str,
+    render_hash: str | None,
+    created_at: str,
+    wall_time: float,
+    num_frames: int,
+    width: int,
+    height: int,
+    output_path: Path,
+    sidecar: dict[str, Any],
+) -> dict[str, Any]:
+    """Registry row for one render; app-side values fill in whatever the sidecar lacks."""
+    stages = sidecar.get("stages") or {}
+    steps = sidecar.get("steps") or {}
+    output_bytes = sidecar.get("output_bytes")
+    if output_bytes is None and output_path.is_file():
+        output_bytes = output_path.stat().st_size
+    return {
+        "project_id": project_id,
+        "clip_id": clip_id,
+        "preset": preset,
+        "pipeline": pipeline,
+        "render_hash": render_hash,
+        "created_at": created_at,
+        "wall_time": wall_time,
+        "num_frames": num_frames,
+        "width": width,
+        "height": height,
+        "steps": sum(steps.values()) if steps else None,
+        "denoise_time": sum(stages.get(name, 0.0) for name in steps) if steps else None,
+        "peak_rss_bytes": sidecar.get("peak_rss_bytes"),
+        "peak_gpu_bytes": sidecar.get("peak_gpu_bytes"),
+        "output_bytes": output_bytes,
+        "stages_json": json.dumps(stages) if stages else None,
+    }
+
+
+def _mean(values: list[float]) -> float | None:
+    return sum(values) / len(values) if values else None
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def summarize(rows: Iterable[dict[str, Any]], group_by: tuple[str, ...] = GROUP_KEYS) -> list[dict[str, Any]]:
+    """
+    Aggregate render_metrics rows per group: render count, mean/p95 wall time, seconds per
+    frame, denoising steps/sec, peak memory, mean output size and mean seconds per stage.
+    """
+    groups: dict[tuple, list[dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(tuple(row.get(k) for k in group_by), []).append(row)
+
+    summary = []
+    for key, items in sorted(groups.items(), key=lambda kv: tuple(str(k) for k in kv[0])):
+        walls = [r["wall_time"] for r in items if r.get("wall_time") is not None]
+        frames = sum(r.get("num_frames") or 0 for r in items)
+        steps = sum(r.get("steps") or 0 for r in items)
+        denoise = sum(r.get("denoise_time") or 0.0 for r in items)
+        stage_times: dict[str, list[float]] = {}
+        for r in items:
+            for name, seconds in json.loads(r.get("stages_json") or "{}").items():
+                stage_times.setdefault(name, []).append(seconds)
+        rss = [r["peak_rss_bytes"] for r in items if r.get("peak_rss_bytes") is not None]
+        gpu = [r["peak_gpu_bytes"] for r in items if r.get("peak_gpu_bytes") is not None]
+        out = [r["output_bytes"] for r in items if r.get("output_bytes") is not None]
+        summary.append(
+            {
+                **dict(zip(group_by, key)),
+                "renders": len(items),
+                "wall_mean": _mean(walls),
+                "wall_p95": _percentile(walls, 95),
+                "sec_per_frame": sum(walls) / frames if frames else None,
+                "steps_per_sec": steps / denoise if denoise > 0 else None,
+                "peak_rss_bytes": max(rss, default=None),
+                "peak_gpu_bytes": max(gpu, default=None),
+                "output_bytes_mean": _mean(out),
+                # Known stages in pipeline order, then anything newer pipelines report
+                "stages": {
+                    name: _mean(stage_times[name])
+                    for name in [*STAGES, *sorted(set(stage_times) - set(STAGES))]
+                    if name in stage_times
+                },
+            }
+        )
+    return summary
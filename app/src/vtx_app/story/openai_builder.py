@@ -2,15 +2,21 @@ from __future__ import annotations
 
 import json
 import os
+import random
 import re
-from dataclasses import dataclass
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+import openai
 import yaml
 from openai import OpenAI
 from rich import print as rich_print
 from vtx_app.project.layout import Project
+from vtx_app.utils.llm_cache import LLMCache
 
 
 def _load_yaml(path: Path) -> dict[str, Any]:
@@ -29,36 +35,94 @@ def _slugify(text: str) -> str:
     return s or "untitled"
 
 
+# First retry waits this long, doubling per attempt (plus jitter); Retry-After wins when sent
+RETRY_BACKOFF_SECONDS = 1.0
+RETRY_BACKOFF_MAX_SECONDS = 30.0
+
+# Transient failures worth retrying; other API errors (bad request, auth) fail immediately
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.InternalServerError,
+)
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after is not None:
+        try:
+            return min(float(retry_after), RETRY_BACKOFF_MAX_SECONDS)
+        except ValueError:
+            pass  # HTTP-date form; fall back to exponential backoff
+    delay = RETRY_BACKOFF_SECONDS * 2**attempt
+    return min(delay + random.uniform(0, delay / 2), RETRY_BACKOFF_MAX_SECONDS)
+
+
 @dataclass
 class StoryBuilder:
     project: Project
+    # Explicit regenerate: skip cached LLM responses (fresh ones are still stored for later replays)
+    refresh: bool = False
+    # One HTTP client (connection pool) shared by every request, including concurrent ones
+    _openai: OpenAI | None = field(default=None, init=False, repr=False)
+    _client_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
 
     def _client(self):
         # OPENAI_API_KEY is read automatically by the official SDK when present.
         # If missing, OpenAI() will raise.
-        return OpenAI()
-
-    def _call_structured(self, *, schema: dict[str, Any], messages: list[dict[str, str]]) -> dict[str, Any]:
+        with self._client_lock:
+            if self._openai is None:
+                # Retries are handled by _call_structured (with backoff + jitter)
+                self._openai = OpenAI(max_retries=0)
+            return self._openai
+
+    def _call_structured(
+        self, *, schema: dict[str, Any], messages: list[dict[str, str]], refresh: bool = False
+    ) -> dict[str, Any]:
         s = self.project.settings()
+        # Re-runs and resumed runs replay identical requests from disk, unless a fresh answer was asked for
+        cache = LLMCache.from_settings(s)
+        cache_key = cache.key(model=s.openai_model, temperature=s.openai_temperature, schema=schema, messages=messages)
+        if not (refresh or self.refresh):
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         client = self._client()
-        completion = client.chat.completions.create(
-            model=s.openai_model,
-            messages=messages,
-            temperature=s.openai_temperature,
-            max_tokens=s.openai_max_output_tokens,
-            response_format={
-                "type": "json_schema",
-                "json_schema": {
-                    "name": "response",
-                    "strict": True,
-                    "schema": schema,
-                },
-            },
-        )
+        attempt = 0
+        while True:
+            try:
+                completion = client.chat.completions.create(
+                    model=s.openai_model,
+                    messages=messages,
+                    temperature=s.openai_temperature,
+                    max_tokens=s.openai_max_output_tokens,
+                    response_format={
+                        "type": "json_schema",
+                        "json_schema": {
+                            "name": "response",
+                            "strict": True,
+                            "schema": schema,
+                        },
+                    },
+                )
+                break
+            except _RETRYABLE_ERRORS as e:
+                if attempt >= s.openai_max_retries:
+                    raise
+                delay = _retry_delay(e, attempt)
+                attempt += 1
+                rich_print(
+                    f"[yellow]OpenAI request failed ({type(e).__name__}), retry {attempt} in {delay:.1f}s[/yellow]"
+                )
+                time.sleep(delay)
         content = completion.choices[0].message.content
         if not content:
             return {}
-        return json.loads(content)
+        data = json.loads(content)
+        cache.put(cache_key, data)
+        return data
 
     def generate_outline(self) -> None:
         """
@@ -414,6 +478,8 @@ For each shot:
         clips_dir = self.project.root / "prompts" / "clips"
         clips_dir.mkdir(parents=True, exist_ok=True)
 
+        # Scenes to generate, in shotlist order
+        pending: list[tuple[int, int, dict[str, Any]]] = []
         for sc in scenes:
             try:
                 a = int(sc.get("act"))
@@ -441,6 +507,9 @@ For each shot:
                 if all_exist:
                     continue
 
+            pending.append((a, sidx, scene_obj))
+
+        def request_scene(scene_obj: dict[str, Any]) -> dict[str, Any]:
             system = (
                 "You are a VTX-2 video diffusion prompt engineer for a longform feature. "
                 "Generate shot-specific clip specs that stay consistent with the project's continuity. "
@@ -481,112 +550,124 @@ Clip spec requirements:
 """
 
             try:
-                batch = self._call_structured(
+                return self._call_structured(
                     schema=batch_schema,
                     messages=[
                         {"role": "system", "content": system},
                         {"role": "user", "content": user},
                     ],
+                    # Overwriting existing specs means asking the model again
+                    refresh=overwrite,
                 )
             except Exception:
                 # If the API isn't available, create minimal stubs for this scene
-                batch = {"version": 1, "clips": []}
-
-            clips = batch.get("clips") or []
-            if not isinstance(clips, list):
-                clips = []
-
-            # Post-process + write
-            shot_map = {(sh.get("clip_id") or ""): sh for sh in scene_obj.get("shots") or [] if isinstance(sh, dict)}
-
-            for clip in clips:
-                if not isinstance(clip, dict):
-                    continue
-                cid = clip.get("clip_id")
-                if not cid or cid not in shot_map:
-                    continue
-
-                sh = shot_map[cid]
-
-                # Enforce required structure / defaults
-                clip["version"] = 1
-                clip.setdefault("title", sh.get("title") or cid)
-                clip.setdefault("act", a)
-                clip.setdefault("scene", sidx)
-                clip.setdefault("shot", int(sh.get("shot", 1)))
+                return {"version": 1, "clips": []}
 
-                continuity = clip.setdefault("continuity", {})
-                continuity["shared_prompt_profile"] = style_profile
-                continuity["shared_loras_profile"] = loras_profile
-                continuity.setdefault("characters", sh.get("characters") or [])
-                continuity.setdefault("locations", sh.get("locations") or [])
+        # Scenes are independent: fan the requests out, but write results in shotlist order
+        # (map() yields in submission order) so the output does not depend on timing.
+        workers = max(1, min(self.project.settings().openai_concurrency, len(pending)))
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="clip-specs")
+        try:
+            for (a, sidx, scene_obj), batch in zip(pending, pool.map(request_scene, [p[2] for p in pending])):
+                clips = batch.get("clips") or []
+                if not isinstance(clips, list):
+                    clips = []
+
+                # Post-process + write
+                shot_map = {
+                    (sh.get("clip_id") or ""): sh for sh in scene_obj.get("shots") or [] if isinstance(sh, dict)
+                }
 
-                clip.setdefault(
-                    "story_beats",
-                    sh.get("action_beats") or scene_obj.get("beats") or [],
-                )
+                for clip in clips:
+                    if not isinstance(clip, dict):
+                        continue
+                    cid = clip.get("clip_id")
+                    if not cid or cid not in shot_map:
+                        continue
 
-                prompt = clip.setdefault("prompt", {})
-                prompt.setdefault("positive", sh.get("description") or "")
-                prompt.setdefault("negative", "")
-
-                render = clip.setdefault("render", {})
-                render.setdefault("pipeline", pipeline_key)
-                render.setdefault("fps", fps)
-                render.setdefault("width", width)
-                render.setdefault("height", height)
-                render.setdefault("seed", 0)
-
-                # Duration policy
-                render.setdefault("duration", {})
-                dur = render["duration"] or {}
-                if not isinstance(dur, dict):
-                    dur = {}
-                hint = float(sh.get("duration_hint_seconds") or 0)
-                if hint > 0:
-                    dur["mode"] = "fixed"
-                    dur["seconds"] = min(hint, max_seconds)
-                    dur["max_seconds"] = max_seconds
-                    dur.setdefault("min_seconds", 0)
-                else:
-                    dur.setdefault("mode", "auto")
-                    dur.setdefault("min_seconds", 2)
-                    dur.setdefault("max_seconds", max_seconds)
-                render["duration"] = dur
-
-                inputs = clip.setdefault("inputs", {})
-                inputs.setdefault("type", "t2v")
-                inputs.setdefault("reference_image", None)
-                inputs.setdefault("input_video", None)
-                inputs.setdefault("keyframes", [])
-
-                # Optional: embed resolved lora bundle for determinism
-                if bundle_items and "loras" not in clip:
-                    loras_list = []
-                    for item in bundle_items:
-                        if not isinstance(item, dict):
-                            continue
-                        env_name = item.get("env")
-                        weight = item.get("weight", 0.8)
-                        if env_name:
-                            loras_list.append({"env": env_name, "weight": float(weight)})
-                    if loras_list:
-                        clip["loras"] = loras_list
-
-                outputs = clip.setdefault("outputs", {})
-                fname = f"{cid}__{_slugify(clip.get('title', ''))}"
-                outputs.setdefault("mp4", f"renders/clips/{fname}.mp4")
-                outputs.setdefault("json", f"renders/clips/{fname}.render.json")
-
-                status = clip.setdefault("status", {})
-                status.setdefault("state", "planned")
-                status.setdefault("last_error", None)
-
-                # Write file
-                out_file = clips_dir / f"{fname}.yaml"
-                if out_file.exists() and not overwrite:
-                    continue
-                out_file.write_text(yaml.safe_dump(clip, sort_keys=False))
+                    sh = shot_map[cid]
+
+                    # Enforce required structure / defaults
+                    clip["version"] = 1
+                    clip.setdefault("title", sh.get("title") or cid)
+                    clip.setdefault("act", a)
+                    clip.setdefault("scene", sidx)
+                    clip.setdefault("shot", int(sh.get("shot", 1)))
+
+                    continuity = clip.setdefault("continuity", {})
+                    continuity["shared_prompt_profile"] = style_profile
+                    continuity["shared_loras_profile"] = loras_profile
+                    continuity.setdefault("characters", sh.get("characters") or [])
+                    continuity.setdefault("locations", sh.get("locations") or [])
+
+                    clip.setdefault(
+                        "story_beats",
+                        sh.get("action_beats") or scene_obj.get("beats") or [],
+                    )
+
+                    prompt = clip.setdefault("prompt", {})
+                    prompt.setdefault("positive", sh.get("description") or "")
+                    prompt.setdefault("negative", "")
+
+                    render = clip.setdefault("render", {})
+                    render.setdefault("pipeline", pipeline_key)
+                    render.setdefault("fps", fps)
+                    render.setdefault("width", width)
+                    render.setdefault("height", height)
+                    render.setdefault("seed", 0)
+
+                    # Duration policy
+                    render.setdefault("duration", {})
+                    dur = render["duration"] or {}
+                    if not isinstance(dur, dict):
+                        dur = {}
+                    hint = float(sh.get("duration_hint_seconds") or 0)
+                    if hint > 0:
+                        dur["mode"] = "fixed"
+                        dur["seconds"] = min(hint, max_seconds)
+                        dur["max_seconds"] = max_seconds
+                        dur.setdefault("min_seconds", 0)
+                    else:
+                        dur.setdefault("mode", "auto")
+                        dur.setdefault("min_seconds", 2)
+                        dur.setdefault("max_seconds", max_seconds)
+                    render["duration"] = dur
+
+                    inputs = clip.setdefault("inputs", {})
+                    inputs.setdefault("type", "t2v")
+                    inputs.setdefault("reference_image", None)
+                    inputs.setdefault("input_video", None)
+                    inputs.setdefault("keyframes", [])
+
+                    # Optional: embed resolved lora bundle for determinism
+                    if bundle_items and "loras" not in clip:
+                        loras_list = []
+                        for item in bundle_items:
+                            if not isinstance(item, dict):
+                                continue
+                            env_name = item.get("env")
+                            weight = item.get("weight", 0.8)
+                            if env_name:
+                                loras_list.append({"env": env_name, "weight": float(weight)})
+                        if loras_list:
+                            clip["loras"] = loras_list
+
+                    outputs = clip.setdefault("outputs", {})
+                    fname = f"{cid}__{_slugify(clip.get('title', ''))}"
+                    outputs.setdefault("mp4", f"renders/clips/{fname}.mp4")
+                    outputs.setdefault("json", f"renders/clips/{fname}.render.json")
+
+                    status = clip.setdefault("status", {})
+                    status.setdefault("state", "planned")
+                    status.setdefault("last_error", None)
+
+                    # Write file
+                    out_file = clips_dir / f"{fname}.yaml"
+                    if out_file.exists() and not overwrite:
+                        continue
+                    out_file.write_text(yaml.safe_dump(clip, sort_keys=False))
+        finally:
+            pool.shutdown(cancel_futures=True)
 
         # If nothing was generated, ensure the folder exists
         clips_dir.mkdir(parents=True, exist_ok=True)
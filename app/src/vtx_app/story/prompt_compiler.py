@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-import yaml
+from vtx_app.utils.yaml_cache import load_yaml_cached
 
 
 @dataclass
@@ -14,9 +14,8 @@ class PromptPack:
 
 
 def _load_yaml(path: Path) -> dict[str, Any]:
-    if not path.exists():
-        return {}
-    data = yaml.safe_load(path.read_text()) or {}
+    # Parsed once per file version and shared across clips; only read from here
+    data = load_yaml_cached(path) or {}
     if not isinstance(data, dict):
         return {}
     return data
@@ -8,6 +8,7 @@ from typing import Any, Optional
 import yaml
 from rich import print
 from vtx_app.config.settings import Settings
+from vtx_app.utils.yaml_cache import load_yaml_cached
 
 
 @dataclass
@@ -86,12 +87,20 @@ class TagManager:
         # But group names can have dashes: 'movie-duration'.
 
         pattern = re.compile(r"\[([\w\-]+)_([\w\-]+)\]")
+        # Expanded text per tag, so repeated tags resolve once per prompt
+        expanded: dict[str, str] = {}
 
         def replace(match):
+            if match.group(0) not in expanded:
+                expanded[match.group(0)] = expand(match)
+            return expanded[match.group(0)]
+
+        def expand(match):
             group = match.group(1)
             tag = match.group(2)
 
-            data = self.load_tag(group, tag)
+            # Tag files are parsed once per version (mtime) across prompts; not mutated here
+            data = load_yaml_cached(self.get_tag_path(group, tag))
             if not data:
                 # If not found, check if it's a legacy style (style-name) -> style_name
                 # If user typed [style_pixar], group=style, tag=pixar.
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+_CHUNK = 1 << 20
+
+# (path, size, mtime_ns) -> sha256; avoids re-reading unchanged inputs within one process
+_digest_memo: dict[tuple[str, int, int], str] = {}
+
+
+def stable_hash(obj: Any) -> str:
+    """sha256 of a JSON-serializable structure (keys sorted, non-JSON values stringified)."""
+    payload = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def sha256_file(path: Path) -> str:
+    """Content digest of a file, memoized on (path, size, mtime)."""
+    st = path.stat()
+    key = (str(path.resolve()), st.st_size, st.st_mtime_ns)
+    digest = _digest_memo.get(key)
+    if digest is None:
+        h = hashlib.sha256()
+        with path.open("rb") as f:
+            while chunk := f.read(_CHUNK):
+                h.update(chunk)
+        digest = h.hexdigest()
+        _digest_memo[key] = digest
+    return digest
+
+
+def file_identity(path: Path) -> str:
+    """
+    Cheap identity for large model files/directories: resolved path + size + mtime.
+
+    Checkpoints are tens of GB, so they are not content-hashed per render; replacing or
+    touching a file changes its identity. Directories (e.g. a Gemma root) combine their files.
+    """
+    if not path.exists():
+        return f"missing:{path}"
+    if path.is_dir():
+        entries = [
+            (str(p.relative_to(path)), p.stat().st_size, p.stat().st_mtime_ns)
+            for p in sorted(path.rglob("*"))
+            if p.is_file()
+        ]
+        return stable_hash({"dir": str(path.resolve()), "files": entries})
+    st = path.stat()
+    return f"{path.resolve()}:{st.st_size}:{st.st_mtime_ns}"
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from vtx_app.config.settings import Settings
+from vtx_app.utils.hashing import stable_hash
+
+# Bump when the meaning of the key or the entry layout changes
+LLM_CACHE_VERSION = 1
+
+
+@dataclass
+class LLMCache:
+    """
+    On-disk cache of structured LLM responses under `<app_home>/cache/llm`.
+
+    Keyed by model, temperature, response schema and messages, so re-running a story step
+    (or resuming after a crash) replays identical requests without calling the API. Entries
+    older than `ttl_seconds` are ignored (0 = never expire); the least recently used entries
+    are evicted once the total size exceeds `max_bytes` (0 = cache off). Pointing `root` at a
+    directory of recorded entries replays them offline.
+    """
+
+    root: Path
+    max_bytes: int
+    ttl_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    @staticmethod
+    def from_settings(s: Settings) -> LLMCache:
+        return LLMCache(
+            root=Path(s.llm_cache_dir) if s.llm_cache_dir else s.app_home / "cache" / "llm",
+            max_bytes=int(s.llm_cache_max_mb * 1024**2),
+            ttl_seconds=s.llm_cache_ttl_hours * 3600,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def key(
+        *,
+        model: str,
+        temperature: float | None,
+        schema: dict[str, Any],
+        messages: list[dict[str, str]],
+    ) -> str:
+        return stable_hash(
+            {
+                "v": LLM_CACHE_VERSION,
+                "model": model,
+                "temperature": temperature,
+                "schema": stable_hash(schema),
+                "messages": stable_hash(messages),
+            }
+        )
+
+    def entry_path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Cached response, or None on a miss (or an expired/corrupt entry, which is dropped)."""
+        if not self.enabled:
+            return None
+        path = self.entry_path(key)
+        try:
+            entry = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        created = entry.get("created_at", 0) if isinstance(entry, dict) else 0
+        if not isinstance(entry, dict) or (self.ttl_seconds > 0 and time.time() - created > self.ttl_seconds):
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path)  # mark as recently used
+        return entry.get("response")
+
+    def put(self, key: str, response: dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        path = self.entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp name: concurrent requests may store at the same time
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps({"created_at": time.time(), "response": response}))
+        os.replace(tmp, path)
+        self.evict()
+
+    def evict(self) -> list[Path]:
+        """Drop least recently used entries until the cache fits in `max_bytes`."""
+        with self._lock:
+            entries = []
+            for p in self.root.glob("*/*.json"):
+                if not p.name.startswith("."):
+                    try:
+                        st = p.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, p))
+            total = sum(size for _, size, _ in entries)
+            removed = []
+            for _, size, p in sorted(entries, key=lambda e: e[0]):
+                if total <= self.max_bytes:
+                    break
+                p.unlink(missing_ok=True)
+                total -= size
+                removed.append(p)
+            return removed
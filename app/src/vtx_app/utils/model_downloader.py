@@ -1,14 +1,35 @@
 from __future__ import annotations
 
 import hashlib
+import json
 import os
-import shutil
-from dataclasses import dataclass
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
 
 import requests
+import yaml
+from rich import print
 from rich.progress import BarColumn, DownloadColumn, Progress, TextColumn, TimeRemainingColumn, TransferSpeedColumn
 from vtx_app.config.settings import Settings
+from vtx_app.utils.hashing import sha256_file
+
+# Streamed in 1 MiB chunks and hashed as they arrive
+CHUNK_SIZE = 1 << 20
+# (connect, read) seconds; a stalled transfer fails and can be resumed from the .part file
+REQUEST_TIMEOUT = (30, 300)
+
+# Models every render needs (see RenderController); clip/bundle LoRAs are added per project
+SHARED_MODEL_ENVS = (
+    "LTX_CHECKPOINT_PATH",
+    "LTX_SPATIAL_UPSAMPLER_PATH",
+    "LTX_GEMMA_ROOT",
+    "LTX_DISTILLED_LORA_PATH",
+)
 
 
 @dataclass
@@ -39,9 +60,149 @@ KNOWN_MODELS: list[ModelSpec] = [
 ]
 
 
+@dataclass
+class ModelManifest:
+    """
+    Verified model digests, keyed by absolute path (`<app_home>/models/manifest.json`).
+
+    An entry stays valid while the file's size and mtime are unchanged, so re-checking a
+    downloaded or verified model is a single stat() instead of re-hashing tens of GB.
+    """
+
+    path: Path
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def lookup(self, model_path: Path) -> str | None:
+        """sha256 recorded for `model_path`, or None if unknown or the file changed since."""
+        entry = self._load().get(str(model_path.resolve()))
+        if not entry:
+            return None
+        try:
+            st = model_path.stat()
+        except OSError:
+            return None
+        if entry.get("size") != st.st_size or entry.get("mtime_ns") != st.st_mtime_ns:
+            return None
+        return entry.get("sha256")
+
+    def record(self, model_path: Path, sha256: str, url: str | None = None) -> None:
+        st = model_path.stat()
+        with self._lock:
+            data = self._load()
+            data[str(model_path.resolve())] = {
+                "sha256": sha256,
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "url": url,
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f".{self.path.name}.tmp")
+            tmp.write_text(json.dumps(data, indent=2, sort_keys=True))
+            os.replace(tmp, self.path)
+
+
+# One download per destination, even when several render slots ask for the same model
+_dest_locks: dict[str, threading.Lock] = {}
+_dest_locks_guard = threading.Lock()
+
+
+@contextmanager
+def _dest_lock(dest: Path) -> Iterator[None]:
+    with _dest_locks_guard:
+        lock = _dest_locks.setdefault(str(dest.resolve()), threading.Lock())
+    with lock:
+        yield
+
+
+def _auth_headers(url: str) -> dict[str, str]:
+    # Prepare headers (e.g. for CivitAI or HF Auth)
+    headers = {}
+    if "civitai" in url:
+        api_key = os.getenv("CIVITAI_API_KEY")
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+    elif "huggingface" in url:
+        hf_token = os.getenv("HF_TOKEN")
+        if hf_token:
+            headers["Authorization"] = f"Bearer {hf_token}"
+    return headers
+
+
+def _new_progress() -> Progress:
+    return Progress(
+        TextColumn("[bold blue]{task.fields[filename]}", justify="right"),
+        BarColumn(bar_width=None),
+        "[progress.percentage]{task.percentage:>3.1f}%",
+        "•",
+        DownloadColumn(),
+        "•",
+        TransferSpeedColumn(),
+        "•",
+        TimeRemainingColumn(),
+    )
+
+
+def _bundle_items(loras_doc: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    bundles = loras_doc.get("bundles")
+    if not isinstance(bundles, dict):
+        return
+    for items in bundles.values():
+        for item in items if isinstance(items, list) else []:
+            if isinstance(item, dict):
+                yield item
+
+
+def resolve_project_models(project_root: Path) -> dict[str, ModelSpec | None]:
+    """
+    Every model a project's renders can load, by env var: the shared models, clip `loras`
+    entries and LoRA bundle items in prompts/loras.yaml.
+
+    A bundle item with both `env` and `download_url` carries its own download spec (None means
+    KNOWN_MODELS is used).
+    """
+    models: dict[str, ModelSpec | None] = dict.fromkeys(SHARED_MODEL_ENVS)
+
+    for clip_path in sorted((project_root / "prompts" / "clips").glob("*.yaml")):
+        try:
+            clip = yaml.safe_load(clip_path.read_text()) or {}
+        except (OSError, yaml.YAMLError) as e:
+            print(f"[yellow]Skip clip[/yellow] {clip_path}: {e}")
+            continue
+        for item in clip.get("loras") or []:
+            if isinstance(item, dict) and item.get("env"):
+                models.setdefault(item["env"], None)
+        if (clip.get("render") or {}).get("final_strategy") == "v2v":
+            models.setdefault("LTX_IC_LORA_PATH", None)
+
+    loras_path = project_root / "prompts" / "loras.yaml"
+    loras_doc = (yaml.safe_load(loras_path.read_text()) or {}) if loras_path.exists() else {}
+    for item in _bundle_items(loras_doc):
+        env_name = item.get("env")
+        if not env_name:
+            continue
+        if item.get("download_url") and models.get(env_name) is None:
+            models[env_name] = ModelSpec(
+                env_var_name=env_name,
+                url=item["download_url"],
+                sha256=item.get("sha256") or "SKIP",
+                filename=Path(os.getenv(env_name) or f"{env_name.lower()}.safetensors").name,
+            )
+        else:
+            models.setdefault(env_name, None)
+    return models
+
+
 class ModelDownloader:
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, manifest: ModelManifest | None = None):
         self.settings = settings
+        self.manifest = manifest or ModelManifest(settings.app_home / "models" / "manifest.json")
 
     def ensure_model(self, env_var_name: str) -> Path | None:
         """
@@ -74,66 +235,110 @@ class ModelDownloader:
         # 3. Download
         return self._download_and_verify(spec, path)
 
-    def _download_and_verify(self, spec: ModelSpec, dest: Path) -> Path:
-        print(f"[bold cyan]Downloading missing model for {spec.env_var_name}...[/bold cyan]")
-        dest.parent.mkdir(parents=True, exist_ok=True)
-
-        # Prepare headers (e.g. for CivitAI or HF Auth)
-        headers = {}
-        if "civitai" in spec.url:
-            api_key = os.getenv("CIVITAI_API_KEY")
-            if api_key:
-                headers["Authorization"] = f"Bearer {api_key}"
-        elif "huggingface" in spec.url:
-            hf_token = os.getenv("HF_TOKEN")
-            if hf_token:
-                headers["Authorization"] = f"Bearer {hf_token}"
-
-        # Download with stream
-        temp_dest = dest.with_suffix(".tmp")
-        try:
-            with requests.get(spec.url, headers=headers, stream=True) as r:
-                r.raise_for_status()
-                total_size = int(r.headers.get("content-length", 0))
-
-                with Progress(
-                    TextColumn("[bold blue]{task.fields[filename]}", justify="right"),
-                    BarColumn(bar_width=None),
-                    "[progress.percentage]{task.percentage:>3.1f}%",
-                    "•",
-                    DownloadColumn(),
-                    "•",
-                    TransferSpeedColumn(),
-                    "•",
-                    TimeRemainingColumn(),
-                ) as progress:
-                    task = progress.add_task("download", filename=spec.filename, total=total_size)
-                    with open(temp_dest, "wb") as f:
-                        for chunk in r.iter_content(chunk_size=8192):
-                            f.write(chunk)
-                            progress.update(task, advance=len(chunk))
-
-            # Verify
-            print("Verifying SHA256...")
-            file_hash = self._calculate_sha256(temp_dest)
-            if spec.sha256 != "SKIP" and file_hash != spec.sha256:
-                print(f"[red]Hash mismatch! Expected {spec.sha256}, got {file_hash}[/red]")
-                # In strict mode we might delete. specific use case might want to keep it.
-                # raising error to trigger retry or stop.
+    def prefetch(self, models: dict[str, ModelSpec | None], *, jobs: int = 4, verify: bool = False) -> dict[str, str]:
+        """
+        Make every model in `models` available before a render batch, downloading missing
+        ones concurrently. With `verify`, existing files not yet in the manifest are hashed
+        once and recorded.
+
+        Returns env var -> status: unset, present, verified, downloaded, or "failed: <reason>".
+        """
+        results: dict[str, str] = {}
+        with _new_progress() as progress, ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            futures = {
+                env_name: pool.submit(self._prefetch_one, env_name, spec, verify, progress)
+                for env_name, spec in models.items()
+            }
+            for env_name, future in futures.items():
+                try:
+                    results[env_name] = future.result()
+                except Exception as e:
+                    results[env_name] = f"failed: {e}"
+        return results
+
+    def _prefetch_one(self, env_name: str, spec: ModelSpec | None, verify: bool, progress: Progress) -> str:
+        path_str = os.getenv(env_name)
+        if not path_str:
+            return "unset"
+        path = Path(path_str)
+        spec = spec or next((m for m in KNOWN_MODELS if m.env_var_name == env_name), None)
+
+        if path.exists():
+            if path.is_dir():
+                return "present"
+            if self.manifest.lookup(path):
+                return "verified"
+            if not verify:
+                return "present"
+            digest = sha256_file(path)
+            if spec and spec.sha256 != "SKIP" and digest != spec.sha256:
+                raise ValueError(f"hash mismatch (expected {spec.sha256}, got {digest})")
+            self.manifest.record(path, digest, spec.url if spec else None)
+            return "verified"
+
+        if not spec:
+            raise FileNotFoundError(f"missing at {path} and no download spec")
+        self._download_and_verify(spec, path, progress)
+        return "downloaded"
+
+    def _download_and_verify(self, spec: ModelSpec, dest: Path, progress: Progress | None = None) -> Path:
+        """
+        Stream `spec.url` to `dest`, hashing as it downloads.
+
+        Bytes land in `<dest>.part`; an interrupted download resumes from there with an HTTP
+        Range request. The verified digest is recorded in the manifest.
+        """
+        with _dest_lock(dest):
+            if dest.exists():
+                # Another slot finished it while we waited
+                return dest
+            print(f"[bold cyan]Downloading missing model for {spec.env_var_name}...[/bold cyan]")
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            part = dest.with_name(f"{dest.name}.part")
+
+            if progress is None:
+                with _new_progress() as own_progress:
+                    digest = self._fetch(spec, part, own_progress)
+            else:
+                digest = self._fetch(spec, part, progress)
+
+            if spec.sha256 != "SKIP" and digest != spec.sha256:
+                print(f"[red]Hash mismatch! Expected {spec.sha256}, got {digest}[/red]")
+                # Corrupt: do not resume from it next time
+                part.unlink(missing_ok=True)
                 raise ValueError(f"Hash mismatch for {spec.filename}")
 
-            shutil.move(str(temp_dest), str(dest))
+            os.replace(part, dest)
+            self.manifest.record(dest, digest, spec.url)
             print(f"[green]Successfully installed {spec.filename}[/green]")
             return dest
 
-        except Exception as e:
-            if temp_dest.exists():
-                temp_dest.unlink()
-            raise e
-
-    def _calculate_sha256(self, path: Path) -> str:
-        sha256_hash = hashlib.sha256()
-        with open(path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+    def _fetch(self, spec: ModelSpec, part: Path, progress: Progress) -> str:
+        hasher = hashlib.sha256()
+        offset = part.stat().st_size if part.exists() else 0
+        headers = _auth_headers(spec.url)
+        if offset:
+            # Resuming: the bytes already on disk are hashed once, the rest while streaming
+            with part.open("rb") as f:
+                while chunk := f.read(CHUNK_SIZE):
+                    hasher.update(chunk)
+            headers["Range"] = f"bytes={offset}-"
+
+        with requests.get(spec.url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as r:
+            if offset and r.status_code == 416:
+                # Range not satisfiable: the partial file is already complete
+                return hasher.hexdigest()
+            r.raise_for_status()
+            if offset and r.status_code != 206:
+                # Server ignored the range; start over
+                offset = 0
+                hasher = hashlib.sha256()
+
+            total = offset + int(r.headers.get("content-length", 0))
+            task = progress.add_task("download", filename=spec.filename, total=total or None, completed=offset)
+            with part.open("ab" if offset else "wb") as f:
+                for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                    f.write(chunk)
+                    hasher.update(chunk)
+                    progress.update(task, advance=len(chunk))
+        return hasher.hexdigest()
@@ -4,4 +4,10 @@ import datetime
 
 
 def now_iso() -> str:
-    return datetime.datetime.now(datetime.UTC).replace(microsecond=0).isoformat().replace("+00:00", "") + "Z"
+    return iso_ago(0)
+
+
+def iso_ago(seconds: float) -> str:
+    """`now_iso()` as it read `seconds` ago (registry timestamps compare as strings)."""
+    moment = datetime.datetime.now(datetime.UTC) - datetime.timedelta(seconds=seconds)
+    return moment.replace(microsecond=0).isoformat().replace("+00:00", "") + "Z"
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+# resolved path -> ((mtime_ns, size), parsed document)
+_memo: dict[str, tuple[tuple[int, int], Any]] = {}
+_lock = threading.Lock()
+
+
+def load_yaml_cached(path: Path) -> Any:
+    """
+    Parsed YAML document at `path` (None if it does not exist), memoized per process on the
+    file's mtime/size: a batch that compiles hundreds of prompts parses each file once and
+    still sees edits made in between. The result is shared, so callers must not mutate it.
+    """
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    key = str(path.resolve())
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _lock:
+        cached = _memo.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    data = yaml.safe_load(path.read_text())
+    with _lock:
+        _memo[key] = (stamp, data)
+    return data
@@ -11,6 +11,7 @@ from vtx_app.config.settings import Settings
 from vtx_app.integrations.civitai import CivitAIClient
 from vtx_app.style_manager import StyleManager
 from vtx_app.tags_manager import TagManager
+from vtx_app.utils.llm_cache import LLMCache
 
 
 @dataclass
@@ -24,8 +25,6 @@ class ProposalGenerator:
         """
         Analyze concept text to extract metadata and keywords.
         """
-        client = self._client()
-
         schema = {
             "type": "object",
             "properties": {
@@ -49,22 +48,35 @@ class ProposalGenerator:
             "additionalProperties": False,
         }
 
+        messages = [
+            {
+                "role": "system",
+                "content": (
+                    "You are a movie producer. Analyze the user's movie idea. "
+                    "Return JSON that matches the provided JSON Schema exactly."
+                ),
+            },
+            {
+                "role": "user",
+                "content": (f"Idea: {text}\n\nExtract title, slug, visual style keywords, and synopsis."),
+            },
+        ]
+        temperature = 0.7
+
         try:
+            # Re-running create-movie with the same idea replays the analysis from disk
+            cache = LLMCache.from_settings(self.settings)
+            cache_key = cache.key(
+                model=self.settings.openai_model, temperature=temperature, schema=schema, messages=messages
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            client = self._client()
             resp = client.chat.completions.create(
                 model=self.settings.openai_model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are a movie producer. Analyze the user's movie idea. "
-                            "Return JSON that matches the provided JSON Schema exactly."
-                        ),
-                    },
-                    {
-                        "role": "user",
-                        "content": (f"Idea: {text}\n\nExtract title, slug, visual style keywords, and synopsis."),
-                    },
-                ],
+                messages=messages,
                 response_format={
                     "type": "json_schema",
                     "json_schema": {
@@ -73,13 +85,14 @@ class ProposalGenerator:
                         "schema": schema,
                     },
                 },
-                temperature=0.7,
+                temperature=temperature,
             )
 
             content = resp.choices[0].message.content
             if not content:
                 raise ValueError("Empty response from OpenAI")
             args = json.loads(content)
+            cache.put(cache_key, args)
             return args
         except Exception as e:
             rich_print(f"[red]OpenAI analysis failed:[/red] {e}")
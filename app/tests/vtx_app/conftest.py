@@ -0,0 +1,22 @@
+import pytest
+from vtx_app.registry.db import Registry
+
+
+@pytest.fixture
+def make_registry():
+    """Open registries the way the app does (WAL, busy timeout) and close them after the test."""
+    opened = []
+
+    def make(db_path):
+        reg = Registry.open(db_path)
+        opened.append(reg)
+        return reg
+
+    yield make
+    for reg in opened:
+        reg.close()
+
+
+@pytest.fixture
+def registry(tmp_path, make_registry):
+    return make_registry(tmp_path / "test.db")
@@ -0,0 +1,56 @@
+from unittest.mock import patch
+
+import pytest
+from vtx_app.pipelines import capabilities
+from vtx_app.pipelines.capabilities import clear_capability_cache, detect_capabilities
+
+HELP = "usage: x [--prompt PROMPT] [--num-frames N] [--output-path PATH]"
+
+
+@pytest.fixture(autouse=True)
+def app_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("VTX_APP_HOME", str(tmp_path))
+    detect_capabilities.cache_clear()
+    yield tmp_path
+    detect_capabilities.cache_clear()
+
+
+@patch("vtx_app.pipelines.capabilities.subprocess.check_output", return_value=HELP)
+def test_probe_persists_across_processes(mock_out, app_home):
+    cap = detect_capabilities("ltx_pipelines.distilled")
+    assert cap.flags == {"--prompt", "--num-frames", "--output-path"}
+    assert (app_home / "cache" / "capabilities.json").exists()
+
+    # A new CLI invocation starts with an empty lru_cache but reads the disk cache
+    detect_capabilities.cache_clear()
+    assert detect_capabilities("ltx_pipelines.distilled").flags == cap.flags
+    assert mock_out.call_count == 1
+
+
+@patch("vtx_app.pipelines.capabilities.subprocess.check_output", return_value=HELP)
+def test_fingerprint_change_reprobes(mock_out):
+    with patch.object(capabilities, "_fingerprint", return_value="v1"):
+        detect_capabilities("m")
+        detect_capabilities.cache_clear()
+    with patch.object(capabilities, "_fingerprint", return_value="v2"):
+        detect_capabilities("m")
+    assert mock_out.call_count == 2
+
+
+@patch("vtx_app.pipelines.capabilities.subprocess.check_output", return_value=HELP)
+def test_clear_capability_cache(mock_out, app_home):
+    detect_capabilities("a")
+    detect_capabilities("b")
+    clear_capability_cache("a")
+    detect_capabilities("a")
+    detect_capabilities("b")
+    assert [c.args[0][2] for c in mock_out.call_args_list] == ["a", "b", "a"]
+
+    clear_capability_cache()
+    assert not (app_home / "cache" / "capabilities.json").exists()
+
+
+@patch("vtx_app.pipelines.capabilities.subprocess.check_output", side_effect=OSError("no python"))
+def test_failed_probe_not_persisted(mock_out, app_home):
+    assert detect_capabilities("m").flags == set()
+    assert not (app_home / "cache" / "capabilities.json").exists()
@@ -0,0 +1,77 @@
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from vtx_app.pipelines.base import PipelineCommand
+from vtx_app.pipelines.runner_worker import RenderWorker, WorkerUnavailable
+from vtx_app.render.renderer import RenderController
+
+# Minimal stand-in for `python -m ltx_pipelines.worker`: serves one module and fails on "--boom".
+FAKE_WORKER = """
+import json, sys
+for line in sys.stdin:
+    req = json.loads(line)
+    if req.get("op") == "shutdown":
+        break
+    if req.get("op") == "ping":
+        resp = {"id": req["id"], "ok": True, "version": 1, "modules": ["ltx_pipelines.distilled"]}
+    elif "--boom" in req.get("args", []):
+        resp = {"id": req["id"], "ok": False, "unsupported": False, "error": "boom"}
+    else:
+        out = req["args"][req["args"].index("--output-path") + 1]
+        open(out, "w").write("video")
+        resp = {"id": req["id"], "ok": True, "output_path": out}
+    print(json.dumps(resp), flush=True)
+"""
+
+
+@pytest.fixture
+def worker():
+    w = RenderWorker(command=[sys.executable, "-c", FAKE_WORKER])
+    yield w
+    w.close()
+
+
+def test_worker_serves_many_jobs(worker, tmp_path):
+    for i in range(3):
+        out = tmp_path / f"c{i}.mp4"
+        worker.run(PipelineCommand(module="ltx_pipelines.distilled", args=["--output-path", str(out)], output_path=out))
+        assert out.read_text() == "video"
+
+    # Same process served every job
+    assert worker._proc is not None
+    assert worker._proc.poll() is None
+
+
+def test_worker_unsupported_module(worker, tmp_path):
+    cmd = PipelineCommand(module="ltx_pipelines.ic_lora", args=[], output_path=tmp_path / "x.mp4")
+    with pytest.raises(WorkerUnavailable):
+        worker.run(cmd)
+
+
+def test_worker_job_failure(worker, tmp_path):
+    cmd = PipelineCommand(module="ltx_pipelines.distilled", args=["--boom"], output_path=tmp_path / "x.mp4")
+    with pytest.raises(RuntimeError, match="boom"):
+        worker.run(cmd)
+
+
+def test_worker_start_failure_is_sticky():
+    w = RenderWorker(command=[sys.executable, "-c", "import sys; sys.exit(1)"])
+    with pytest.raises(WorkerUnavailable):
+        w.start()
+    with pytest.raises(WorkerUnavailable, match="earlier"):
+        w.start()
+
+
+@patch("vtx_app.render.renderer.run")
+def test_controller_falls_back_to_subprocess(mock_run):
+    worker = MagicMock()
+    worker.run.side_effect = WorkerUnavailable("down")
+    controller = RenderController(project=None, registry=MagicMock(), worker=worker)
+
+    cmd = PipelineCommand(module="ltx_pipelines.distilled", args=[], output_path=Path("x.mp4"))
+    controller._run(cmd)
+
+    worker.run.assert_called_once_with(cmd, timeout=None, cancel=None)
+    mock_run.assert_called_once_with(cmd, timeout=None, cancel=None)
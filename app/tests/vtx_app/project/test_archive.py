@@ -0,0 +1,122 @@
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+from vtx_app.project import archive
+from vtx_app.project.archive import ChunkStore, Snapshot, export_project, import_snapshot
+
+CHUNK = 64 * 1024
+
+
+@pytest.fixture(autouse=True)
+def small_chunks():
+    with patch.object(archive, "CHUNK_SIZE", CHUNK):
+        yield
+
+
+def _project(root, reference):
+    (root / "prompts" / "clips").mkdir(parents=True)
+    (root / "renders").mkdir()
+    (root / ".venv").mkdir()
+    (root / "metadata.yaml").write_text("project_id: p1\n")
+    (root / "prompts" / "clips" / "c1.yaml").write_text("outputs: {mp4: renders/c1.mp4}\n" * 200)
+    (root / "renders" / "c1.mp4").write_bytes(os.urandom(3 * CHUNK + 100))
+    (root / "renders" / "ref.png").write_bytes(reference)
+    (root / "renders" / "ref_copy.png").write_bytes(reference)
+    (root / ".venv" / "python").write_bytes(b"skip me")
+    return root
+
+
+def _tree(root):
+    return {p.relative_to(root).as_posix(): p.read_bytes() for p in root.rglob("*") if p.is_file()}
+
+
+def test_export_dedupes_and_round_trips(tmp_path):
+    reference = os.urandom(2 * CHUNK)
+    a = _project(tmp_path / "a", reference)
+    b = _project(tmp_path / "b", reference)
+    store = ChunkStore(root=tmp_path / "store")
+
+    stats = export_project(a, store, slug="a", project_id="p1", jobs=2)
+    # mp4: 4 chunks, the reference (stored once for both copies): 2, metadata + spec: 1 each
+    assert stats.new_chunks == 8
+    assert stats.files == 5
+    snap = Snapshot.load(stats.snapshot)
+    assert ".venv/python" not in {f.path for f in snap.files}
+    assert stats.written_bytes < stats.bytes  # text compressed, duplicates skipped
+
+    # A second project sharing the reference image only adds its own render
+    stats_b = export_project(b, store, slug="b", project_id="p2", jobs=2)
+    assert stats_b.new_chunks == 4
+
+    out = tmp_path / "restored"
+    assert import_snapshot(snap, store, out) == 5
+    expected = _tree(a)
+    del expected[".venv/python"]
+    assert _tree(out) == expected
+    assert (out / "renders" / "c1.mp4").stat().st_mtime_ns == (a / "renders" / "c1.mp4").stat().st_mtime_ns
+    # Up to date: nothing rewritten
+    assert import_snapshot(snap, store, out) == 0
+
+
+def test_incremental_and_delta_exports(tmp_path):
+    proj = _project(tmp_path / "proj", os.urandom(CHUNK))
+    full = ChunkStore(root=tmp_path / "full")
+    first = export_project(proj, full, slug="proj", project_id="p1", jobs=2)
+
+    # Unchanged: no file is read again, nothing written
+    with patch.object(archive, "_pack_chunk", side_effect=AssertionError("read")):
+        again = export_project(proj, full, slug="proj", project_id="p1")
+    assert (again.new_chunks, again.written_bytes) == (0, 0)
+
+    # Re-render one clip; ship only its chunks to a fresh directory
+    (proj / "renders" / "c1.mp4").write_bytes(os.urandom(CHUNK + 10))
+    delta = ChunkStore(root=tmp_path / "delta")
+    stats = export_project(proj, delta, slug="proj", project_id="p1", since=Snapshot.load(first.snapshot), jobs=2)
+    assert stats.new_chunks == 2
+    assert sum(p.is_file() for p in (delta.root / "chunks").rglob("*")) == 2
+
+    # The delta restores on a host that has the full export
+    out = tmp_path / "restored"
+    import_snapshot(Snapshot.load(stats.snapshot), ChunkStore(root=delta.root, fallbacks=[full.root]), out)
+    assert (out / "renders" / "c1.mp4").read_bytes() == (proj / "renders" / "c1.mp4").read_bytes()
+    assert (out / "metadata.yaml").read_text() == "project_id: p1\n"
+
+
+def test_corrupt_chunk_is_rejected(tmp_path):
+    proj = _project(tmp_path / "proj", b"ref")
+    store = ChunkStore(root=tmp_path / "store")
+    snap = Snapshot.load(export_project(proj, store, slug="proj", project_id="p1").snapshot)
+    chunk_id = next(f for f in snap.files if f.path == "renders/ref.png").chunks[0]
+    store.chunk_path(chunk_id).write_bytes(b"Rtampered")
+
+    with pytest.raises(ValueError, match="corrupt"):
+        import_snapshot(snap, store, tmp_path / "out")
+
+
+@pytest.mark.parametrize("path", ["../escaped.txt", "renders/../../escaped.txt", "/etc/escaped.txt", "C:/escaped.txt"])
+def test_snapshot_paths_outside_the_project_are_rejected(tmp_path, path):
+    proj = _project(tmp_path / "proj", b"ref")
+    store = ChunkStore(root=tmp_path / "store")
+    data = Snapshot.load(export_project(proj, store, slug="proj", project_id="p1").snapshot).to_dict()
+    data["files"][0]["path"] = path
+
+    with pytest.raises(ValueError, match="Unsafe path"):
+        Snapshot.from_dict(data)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="symlinks need privileges")
+def test_import_does_not_write_through_symlinks(tmp_path):
+    proj = _project(tmp_path / "proj", b"ref")
+    store = ChunkStore(root=tmp_path / "store")
+    snap = Snapshot.load(export_project(proj, store, slug="proj", project_id="p1").snapshot)
+    out = tmp_path / "out"
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    out.mkdir()
+    (out / "renders").symlink_to(outside, target_is_directory=True)
+
+    with pytest.raises(ValueError, match="outside"):
+        import_snapshot(snap, store, out)
+    assert not any(outside.iterdir())
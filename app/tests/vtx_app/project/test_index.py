@@ -0,0 +1,65 @@
+import os
+from unittest.mock import patch
+
+import pytest
+import yaml
+from vtx_app.project import index as index_mod
+from vtx_app.project.index import ProjectIndex
+
+
+@pytest.fixture
+def index(tmp_path, registry):
+    (tmp_path / "proj" / "prompts" / "clips").mkdir(parents=True)
+    return ProjectIndex(registry=registry, project_id="p1", root=tmp_path / "proj")
+
+
+def _write(index, name, **spec):
+    path = index.clips_dir / name
+    path.write_text(yaml.safe_dump(spec))
+    return path
+
+
+def test_refresh_parses_only_changed_specs(index):
+    _write(index, "A01__intro.yaml", clip_id="A01", outputs={"mp4": "renders/A01.mp4"})
+    b = _write(index, "A02__walk.yaml", clip_id="A02")
+
+    with patch.object(index_mod.yaml, "safe_load", wraps=yaml.safe_load) as spy:
+        assert [e.clip_id for e in index.refresh()] == ["A01", "A02"]
+        assert spy.call_count == 2
+
+        assert index.refresh() == []
+        assert spy.call_count == 2
+
+        b.write_text(yaml.safe_dump({"clip_id": "A02", "outputs": {"mp4": "renders/A02.mp4"}}))
+        changed = index.refresh()
+        assert spy.call_count == 3
+    assert [(e.clip_id, e.output_path) for e in changed] == [("A02", "renders/A02.mp4")]
+
+
+def test_refresh_drops_deleted_specs(index, registry):
+    path = _write(index, "A01.yaml", clip_id="A01")
+    index.refresh()
+    path.unlink()
+    index.refresh()
+    assert registry.list_clip_specs("p1") == []
+
+
+def test_get_prefers_exact_name_and_tracks_edits(index):
+    _write(index, "A01__alt.yaml", clip_id="A01", prompt={"positive": "alt"})
+    _write(index, "A01.yaml", clip_id="A01", prompt={"positive": "main"})
+    index.refresh()
+    assert index.get("A01").spec["prompt"]["positive"] == "main"
+
+    path = index.clips_dir / "A01.yaml"
+    path.write_text(yaml.safe_dump({"clip_id": "A01", "prompt": {"positive": "edited"}}))
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert index.get("A01").spec["prompt"]["positive"] == "edited"
+
+
+def test_get_indexes_new_files_without_refresh(index, registry):
+    _write(index, "B07__late.yaml", clip_id="B07")
+    entry = index.get("B07")
+    assert entry.spec_path.name == "B07__late.yaml"
+    assert [r["clip_id"] for r in registry.find_clip_specs(project_id="p1", file_id="B07")] == ["B07"]
+    assert index.get("missing") is None
@@ -0,0 +1,39 @@
+import os
+
+import yaml
+from vtx_app.project.index import ProjectIndex
+from vtx_app.project.loader import ProjectLoader
+
+
+def _write(root, name, **spec):
+    path = root / "prompts" / "clips" / name
+    path.write_text(yaml.safe_dump(spec))
+    st = path.stat()
+    # Make every rewrite visible to the mtime check, however coarse the filesystem clock
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    return path
+
+
+def test_sync_resets_edited_clips_after_another_refresh(tmp_path, registry):
+    root = tmp_path / "proj"
+    (root / "prompts" / "clips").mkdir(parents=True)
+    _write(root, "A01.yaml", clip_id="A01")
+    _write(root, "A02.yaml", clip_id="A02")
+    loader = ProjectLoader(registry=registry)
+
+    loader._sync_project_clips(project_path=root, project_id="p1")
+    for cid in ("A01", "A02"):
+        registry.set_clip_state(project_id="p1", clip_id=cid, state="rendered", updated_at="2000-01-01T00:00:00Z")
+
+    # `render status` / `render plan` refresh the index before the next sync does
+    _write(root, "A02.yaml", clip_id="A02", prompt={"positive": "edited"})
+    ProjectIndex(registry=registry, project_id="p1", root=root).entries()
+    loader._sync_project_clips(project_path=root, project_id="p1")
+
+    assert registry.get_clip(project_id="p1", clip_id="A01")["state"] == "rendered"
+    assert registry.get_clip(project_id="p1", clip_id="A02")["state"] == "planned"
+
+    # Nothing changed since: the rendered state sticks
+    registry.set_clip_state(project_id="p1", clip_id="A02", state="rendered", updated_at="2000-01-01T00:00:00Z")
+    loader._sync_project_clips(project_path=root, project_id="p1")
+    assert registry.get_clip(project_id="p1", clip_id="A02")["state"] == "rendered"
@@ -1,16 +1,7 @@
-import sqlite3
+import threading
 
 import pytest
-from vtx_app.registry.db import SCHEMA, Registry
-
-
-@pytest.fixture
-def registry(tmp_path):
-    db_path = tmp_path / "test.db"
-    conn = sqlite3.connect(db_path)
-    conn.executescript(SCHEMA)
-    conn.commit()
-    return Registry(path=db_path, conn=conn)
+from vtx_app.registry.db import BUSY_TIMEOUT, Registry, connect
 
 
 def test_upsert_project(registry):
@@ -94,3 +85,89 @@ def test_list_unfinished(registry):
     unfinished = registry.list_unfinished_clips()
     assert len(unfinished) == 1
     assert unfinished[0]["clip_id"] == "c1"
+
+
+def test_list_unfinished_includes_cancelled_and_stale_rendering(registry):
+    for clip_id, state, updated_at in [
+        ("cancelled", "cancelled", "2024-01-01T00:00:00Z"),
+        ("crashed", "rendering", "2024-01-01T00:00:00Z"),
+        ("live", "rendering", "2024-01-02T12:00:00Z"),
+        ("done", "rendered", "2024-01-01T00:00:00Z"),
+    ]:
+        registry.upsert_clip(
+            project_id="p1",
+            clip_id=clip_id,
+            state=state,
+            output_path=None,
+            render_hash=None,
+            updated_at=updated_at,
+            last_error=None,
+        )
+
+    assert [c["clip_id"] for c in registry.list_unfinished_clips()] == ["cancelled"]
+    stale = registry.list_unfinished_clips(stale_before="2024-01-02T00:00:00Z")
+    assert sorted(c["clip_id"] for c in stale) == ["cancelled", "crashed"]
+    assert registry.list_unfinished_clips("p2", stale_before="2024-01-02T00:00:00Z") == []
+
+
+def _clip(registry, clip_id, state="planned"):
+    registry.upsert_clip(
+        project_id="p1",
+        clip_id=clip_id,
+        state=state,
+        output_path=None,
+        render_hash=None,
+        updated_at="2024-01-01",
+        last_error=None,
+    )
+
+
+def test_load_uses_wal(tmp_path, monkeypatch):
+    monkeypatch.setenv("VTX_APP_HOME", str(tmp_path))
+    reg = Registry.load()
+    assert reg.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    indexes = {r[1] for r in reg.conn.execute("PRAGMA index_list(clips)")}
+    assert "idx_clips_state_updated" in indexes
+    reg.close()
+
+
+def test_pooled_connections_do_not_switch_journal_mode(tmp_path):
+    reg = Registry.open(tmp_path / "test.db")
+    conn = connect(reg.path)
+    # WAL persists in the file from open(); the connection only sets per-connection pragmas
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == int(BUSY_TIMEOUT * 1000)
+    conn.close()
+    reg.close()
+
+
+def test_transaction_batches_and_rolls_back(registry):
+    with registry.transaction():
+        _clip(registry, "c1")
+        _clip(registry, "c2")
+        # Still uncommitted: a second connection does not see the rows yet
+        other = connect(registry.path)
+        assert other.execute("SELECT COUNT(*) FROM clips").fetchone()[0] == 0
+    assert other.execute("SELECT COUNT(*) FROM clips").fetchone()[0] == 2
+
+    with pytest.raises(RuntimeError), registry.transaction():
+        _clip(registry, "c3")
+        raise RuntimeError("abort")
+    assert registry.get_clip(project_id="p1", clip_id="c3") is None
+    other.close()
+
+
+def test_concurrent_writers_from_threads(registry):
+    def work(n):
+        for i in range(20):
+            _clip(registry, f"t{n}_{i}", state="queued")
+            registry.list_unfinished_clips()
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(registry.list_unfinished_clips()) == 80
+    assert registry._pool.qsize() <= registry.pool_size
@@ -4,6 +4,7 @@ import pytest
 import yaml
 from vtx_app.project.layout import Project
 from vtx_app.render.assembler import Assembler
+from vtx_app.render.ffmpeg import StreamInfo
 
 
 @pytest.fixture
@@ -36,7 +37,7 @@ def test_assemble(project):
 
     asm = Assembler(project)
 
-    with patch("vtx_app.render.assembler.concat_videos") as mock_concat:
+    with patch("vtx_app.render.assembler.smart_concat", return_value=0) as mock_concat:
         asm.assemble("out.mp4")
 
         # Should have called concat with only c1
@@ -45,3 +46,139 @@ def test_assemble(project):
         files = args[0]
         assert len(files) == 1
         assert files[0].name == "c1.mp4"
+
+
+def _setup_clips(project, clip_ids):
+    shotlist = {"scenes": [{"shots": [{"clip_id": cid} for cid in clip_ids]}]}
+    (project.root / "story" / "04_shotlist.yaml").write_text(yaml.safe_dump(shotlist))
+    for cid in clip_ids:
+        (project.root / "prompts" / "clips" / f"{cid}__shot.yaml").write_text(
+            yaml.safe_dump({"outputs": {"mp4": f"renders/clips/{cid}.mp4"}})
+        )
+
+
+@pytest.fixture
+def fake_ffmpeg():
+    def remux(src, dst):
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        dst.write_bytes(src.read_bytes())
+
+    with (
+        patch("vtx_app.render.assembler.remux_to_segment", side_effect=remux) as mock_remux,
+        patch("vtx_app.render.assembler.probe_duration", return_value=2.0),
+        patch("vtx_app.render.assembler.probe_streams", return_value=None),
+        patch("vtx_app.render.assembler.concat_videos", side_effect=lambda inputs, out: out.touch()) as mock_concat,
+    ):
+        yield mock_remux, mock_concat
+
+
+def test_incremental_remuxes_only_changed_clips(project, fake_ffmpeg):
+    mock_remux, mock_concat = fake_ffmpeg
+    _setup_clips(project, ["c1", "c2", "c3"])
+    for cid in ("c1", "c2", "c3"):
+        (project.root / "renders" / "clips" / f"{cid}.mp4").write_bytes(cid.encode())
+
+    asm = Assembler(project)
+    out = asm.assemble_incremental()
+    assert out == project.root / "renders" / "final_cut.mp4"
+    assert mock_remux.call_count == 3
+    assert [p.name for p in mock_concat.call_args[0][0]] == ["c1.ts", "c2.ts", "c3.ts"]
+
+    # Nothing changed: no remux, no concat
+    asm.assemble_incremental()
+    assert mock_remux.call_count == 3
+    assert mock_concat.call_count == 1
+
+    # Re-render one shot: only its segment is rebuilt
+    (project.root / "renders" / "clips" / "c2.mp4").write_bytes(b"c2 take 2")
+    asm.assemble_incremental()
+    assert mock_remux.call_count == 4
+    assert mock_remux.call_args[0][0].name == "c2.mp4"
+    assert mock_concat.call_count == 2
+
+
+def test_clip_appended_during_concat_is_not_marked_assembled(project, fake_ffmpeg):
+    mock_remux, mock_concat = fake_ffmpeg
+    _setup_clips(project, ["c1", "c2"])
+    for cid in ("c1", "c2"):
+        (project.root / "renders" / "clips" / f"{cid}.mp4").write_bytes(cid.encode())
+    asm = Assembler(project)
+
+    def concat_while_rerendering(inputs, out):
+        # A scheduler slot finishes a new take of c2 while the cut is being written
+        (project.root / "renders" / "clips" / "c2.mp4").write_bytes(b"c2 take 2")
+        asm.append_clip("c2")
+        out.touch()
+
+    mock_concat.side_effect = concat_while_rerendering
+    asm.assemble_incremental()
+    mock_concat.side_effect = lambda inputs, out: out.touch()
+
+    # The new take is not in the cut yet: the next run concatenates again
+    asm.assemble_incremental()
+    assert mock_concat.call_count == 2
+    assert mock_remux.call_count == 3
+
+
+def test_append_clip_updates_playlist_in_shot_order(project, fake_ffmpeg):
+    mock_remux, mock_concat = fake_ffmpeg
+    _setup_clips(project, ["c1", "c2"])
+    asm = Assembler(project)
+    seg_dir = asm.segments_dir()
+
+    # c2 finishes first: not playable yet because c1 is missing
+    (project.root / "renders" / "clips" / "c2.mp4").write_bytes(b"c2")
+    assert asm.append_clip("c2")
+    assert "c2.ts" not in (seg_dir / "index.m3u8").read_text()
+
+    (project.root / "renders" / "clips" / "c1.mp4").write_bytes(b"c1")
+    assert asm.append_clip("c1")
+    playlist = (seg_dir / "index.m3u8").read_text()
+    assert playlist.index("c1.ts") < playlist.index("c2.ts")
+    assert "#EXT-X-ENDLIST" not in playlist
+
+    # The final cut only concatenates the already-built segments
+    asm.assemble_incremental()
+    assert mock_remux.call_count == 2
+    assert mock_concat.call_count == 1
+    assert "#EXT-X-ENDLIST" in (seg_dir / "index.m3u8").read_text()
+
+
+def test_incremental_conforms_only_mismatched_segments(project, fake_ffmpeg):
+    mock_remux, mock_concat = fake_ffmpeg
+    _setup_clips(project, ["c1", "c2", "c3"])
+    final = StreamInfo("h264", 1280, 720, "24/1", "yuv420p", "aac", 48000, 2)
+    draft = StreamInfo("h264", 768, 432, "12/1", "yuv420p")
+    for cid, take in (("c1", b"final"), ("c2", b"draft"), ("c3", b"final")):
+        (project.root / "renders" / "clips" / f"{cid}.mp4").write_bytes(take)
+
+    def probe(path):
+        return draft if path.read_bytes().startswith(b"draft") else final
+
+    def conform(todo, target, jobs=None):
+        for _src, out, _info in todo:
+            out.write_bytes(b"conformed")
+
+    asm = Assembler(project)
+    with (
+        patch("vtx_app.render.assembler.probe_streams", side_effect=probe),
+        patch("vtx_app.render.assembler.conform_all", side_effect=conform) as mock_conform,
+    ):
+        asm.assemble_incremental()
+        todo, target = mock_conform.call_args[0][:2]
+        assert target == final
+        assert [(src.name, out.name) for src, out, _ in todo] == [("c2.ts", "c2.conform.ts")]
+        assert [p.name for p in mock_concat.call_args[0][0]] == ["c1.ts", "c2.conform.ts", "c3.ts"]
+
+        # Re-rendering a conforming clip does not re-encode the draft again
+        (project.root / "renders" / "clips" / "c3.mp4").write_bytes(b"final take 2")
+        asm.assemble_incremental()
+        assert mock_conform.call_count == 1
+        assert mock_concat.call_count == 2
+
+        # Once the shot is rendered final, its conformed segment is dropped
+        (project.root / "renders" / "clips" / "c2.mp4").write_bytes(b"final take 2")
+        asm.assemble_incremental()
+        assert mock_conform.call_count == 1
+        assert [p.name for p in mock_concat.call_args[0][0]] == ["c1.ts", "c2.ts", "c3.ts"]
+        assert not (asm.segments_dir() / "c2.conform.ts").exists()
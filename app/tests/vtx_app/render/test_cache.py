@@ -0,0 +1,168 @@
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+import yaml
+from vtx_app.project.layout import Project
+from vtx_app.render.cache import RenderCache, compute_render_hash
+from vtx_app.render.renderer import RenderController
+from vtx_app.story.prompt_compiler import PromptPack
+
+
+def _hash(args, pack=None, seed=1, inputs=()):
+    return compute_render_hash(
+        module="ltx_pipelines.distilled",
+        args=args,
+        pack=pack or PromptPack(positive="a cat", negative=""),
+        seed=seed,
+        model_files=[],
+        input_files=inputs,
+    )
+
+
+def test_render_hash_ignores_output_path():
+    h1 = _hash(["--prompt", "a cat", "--output-path", "/a/out.mp4"])
+    h2 = _hash(["--prompt", "a cat", "--output-path", "/b/out.mp4"])
+    assert h1 == h2
+    assert h1 != _hash(["--prompt", "a cat", "--output-path", "/a/out.mp4"], seed=2)
+    assert h1 != _hash(["--prompt", "a cat"], pack=PromptPack(positive="a dog", negative=""))
+
+
+def test_render_hash_tracks_input_content(tmp_path):
+    img = tmp_path / "ref.png"
+    img.write_bytes(b"one")
+    h1 = _hash([], inputs=[img])
+    img.write_bytes(b"two!")
+    assert _hash([], inputs=[img]) != h1
+
+
+def test_cache_restore_hard_links(tmp_path):
+    cache = RenderCache(root=tmp_path / "cache", max_bytes=1024)
+    out = tmp_path / "renders" / "c1.mp4"
+    out.parent.mkdir()
+    out.write_bytes(b"video")
+    cache.store("ab" * 32, out)
+
+    dest = tmp_path / "other" / "c1.mp4"
+    assert cache.restore("ab" * 32, dest)
+    assert dest.read_bytes() == b"video"
+    assert os.path.samefile(dest, cache.entry_path("ab" * 32))
+    assert not cache.restore("cd" * 32, tmp_path / "missing.mp4")
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    now = [1000.0]
+    cache = RenderCache(root=tmp_path / "cache", max_bytes=9, clock=lambda: now[0])
+
+    def put(name, when):
+        now[0] = when
+        src = tmp_path / f"{name}.mp4"
+        src.write_bytes(b"12345")
+        cache.store(name * 32, src)
+        src.unlink()  # the output was deleted: only the cache holds the render now
+
+    put("aa", 1000)
+    put("bb", 1001)
+    # Reading "aa" makes it the most recently used entry
+    now[0] = 1500
+    assert cache.restore("aa" * 32, tmp_path / "restored.mp4")
+    (tmp_path / "restored.mp4").unlink()
+    put("cc", 2000)
+
+    assert cache.entry_path("aa" * 32).exists()
+    assert not cache.entry_path("bb" * 32).exists()
+    assert cache.entry_path("cc" * 32).exists()
+
+
+def test_cache_leaves_output_mtimes_alone(tmp_path):
+    cache = RenderCache(root=tmp_path / "cache", max_bytes=1024)
+    out = tmp_path / "c1.mp4"
+    out.write_bytes(b"video")
+    os.utime(out, (1000, 1000))
+    cache.store("ab" * 32, out)
+    assert cache.restore("ab" * 32, tmp_path / "copy" / "c1.mp4")
+    # The entry shares the output's inode; LRU bookkeeping must not change what file_identity sees
+    assert out.stat().st_mtime == 1000
+
+
+def test_cache_only_evicts_past_its_cap(tmp_path):
+    cache = RenderCache(root=tmp_path / "cache", max_bytes=8)
+    with patch.object(RenderCache, "evict") as evict:
+        for name in ("aa", "bb", "cc"):
+            src = tmp_path / f"{name}.mp4"
+            src.write_bytes(b"12345")
+            cache.store(name * 32, src)
+            src.unlink()
+            if name == "bb":
+                evict.assert_not_called()
+        evict.assert_called_once()
+
+
+def test_cache_does_not_count_entries_linked_to_outputs(tmp_path):
+    cache = RenderCache(root=tmp_path / "cache", max_bytes=6)
+    outputs = []
+    for name in ("aa", "bb", "cc"):
+        out = tmp_path / f"{name}.mp4"
+        out.write_bytes(b"12345")
+        cache.store(name * 32, out)
+        outputs.append(out)
+
+    # Evicting entries that share their inode with a live output would free nothing
+    assert all(cache.entry_path(name * 32).exists() for name in ("aa", "bb", "cc"))
+    outputs[0].unlink()
+    outputs[1].unlink()
+    assert cache.evict() == [cache.entry_path("aa" * 32)]
+    assert cache.entry_path("bb" * 32).exists()
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.setenv("VTX_APP_HOME", str(tmp_path / "home"))
+    root = tmp_path / "proj"
+    (root / "prompts" / "clips").mkdir(parents=True)
+    (root / "metadata.yaml").write_text("project_id: p1")
+    return Project(root=root)
+
+
+def _write_clip(project, clip_id, prompt):
+    spec = {"clip_id": clip_id, "prompt": {"positive": prompt}, "outputs": {"mp4": f"renders/{clip_id}.mp4"}}
+    (project.root / "prompts" / "clips" / f"{clip_id}.yaml").write_text(yaml.safe_dump(spec))
+
+
+@patch("vtx_app.render.renderer.ModelDownloader")
+@patch("vtx_app.render.renderer.validate_clip_spec")
+@patch("vtx_app.render.renderer.detect_capabilities")
+@patch("vtx_app.render.renderer.compile_prompt")
+@patch("vtx_app.render.renderer.run")
+def test_rerender_only_changed_clips(mock_run, mock_compile, mock_cap, mock_val, mock_dl, project, registry):
+    mock_cap.return_value = MagicMock(flags={"--prompt", "--output-path"})
+    mock_compile.side_effect = lambda project_root, clip_spec: PromptPack(
+        positive=clip_spec["prompt"]["positive"], negative=""
+    )
+    mock_run.side_effect = lambda cmd, **kwargs: cmd.output_path.write_bytes(b"video")
+
+    _write_clip(project, "c1", "a cat")
+    _write_clip(project, "c2", "a dog")
+    controller = RenderController(project=project, registry=registry)
+
+    for cid in ("c1", "c2"):
+        controller.render_clip(clip_id=cid)
+    assert mock_run.call_count == 2
+    assert registry.get_clip(project_id="p1", clip_id="c1")["render_hash"]
+
+    # Nothing changed: both skipped
+    for cid in ("c1", "c2"):
+        controller.render_clip(clip_id=cid)
+    assert mock_run.call_count == 2
+
+    # Edit one shot: only it re-renders
+    _write_clip(project, "c2", "a wet dog")
+    for cid in ("c1", "c2"):
+        controller.render_clip(clip_id=cid)
+    assert mock_run.call_count == 3
+
+    # Reverting the edit restores the earlier render from the cache
+    _write_clip(project, "c2", "a dog")
+    controller.render_clip(clip_id="c2")
+    assert mock_run.call_count == 3
+    assert registry.get_clip(project_id="p1", clip_id="c2")["state"] == "rendered"
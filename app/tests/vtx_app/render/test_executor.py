@@ -0,0 +1,135 @@
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from vtx_app.project.layout import Project
+from vtx_app.render.executor import PlanExecutor
+from vtx_app.render.planner import PlanJob, RenderPlan, build_render_plan, plan_path
+from vtx_app.utils.timecode import now_iso
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "proj"
+    root.mkdir()
+    (root / "metadata.yaml").write_text("project_id: p1")
+    return Project(root=root)
+
+
+class FakeController:
+    """Renders by writing the output and recording it like RenderController does."""
+
+    calls: list = []
+    failing: set = set()
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    def __init__(self, *, project, registry, **kwargs):
+        self.project = project
+        self.registry = registry
+
+    def render_clip(self, *, clip_id, output_dir, **kwargs):
+        cls = FakeController
+        with cls.lock:
+            cls.calls.append(clip_id)
+            cls.running += 1
+            cls.max_running = max(cls.max_running, cls.running)
+        time.sleep(0.05)
+        out = Path(output_dir) / f"{clip_id}.mp4"
+        failed = clip_id in cls.failing
+        if not failed:
+            out.parent.mkdir(parents=True, exist_ok=True)
+            out.write_bytes(b"video")
+        self.registry.upsert_clip(
+            project_id="p1",
+            clip_id=clip_id,
+            state="rejected" if failed else "rendered",
+            output_path=str(out),
+            render_hash=None,
+            updated_at=now_iso(),
+            last_error="boom" if failed else None,
+        )
+        with cls.lock:
+            cls.running -= 1
+
+
+@pytest.fixture(autouse=True)
+def reset_fake():
+    FakeController.calls = []
+    FakeController.failing = set()
+    FakeController.max_running = 0
+
+
+@pytest.fixture
+def assembler():
+    with patch("vtx_app.render.executor.Assembler") as MockAssembler:
+        MockAssembler.return_value.assemble_incremental.return_value = Path("final_cut.mp4")
+        yield MockAssembler.return_value
+
+
+def _plan(clip_ids):
+    return build_render_plan(project_id="p1", created_at=now_iso(), clip_ids=clip_ids, output_dir="renders/high-res")
+
+
+def test_plan_levels_and_roundtrip(project):
+    plan = _plan(["c1", "c2", "c1"])
+    assert [[job.id for job in level] for level in plan.levels()] == [["render:c1", "render:c2"], ["assemble"]]
+
+    plan.save(plan_path(project.root))
+    loaded = RenderPlan.load(plan_path(project.root))
+    assert loaded == plan
+    assert loaded.jobs[0].render_kwargs(project.root) == {"output_dir": project.root / "renders/high-res"}
+
+    cyclic = RenderPlan(
+        project_id="p1",
+        created_at="",
+        jobs=[PlanJob(id="a", kind="render", deps=["b"]), PlanJob(id="b", kind="render", deps=["a"])],
+    )
+    with pytest.raises(ValueError, match="cycle"):
+        cyclic.levels()
+
+
+def test_runs_clips_in_parallel_then_assembles(project, registry, assembler):
+    plan = _plan(["c1", "c2", "c3", "c4"])
+    executor = PlanExecutor(
+        project=project, registry=registry, plan=plan, slots_per_device=4, controller_factory=FakeController
+    )
+
+    status = executor.run()
+
+    assert status == {
+        "render:c1": "done",
+        "render:c2": "done",
+        "render:c3": "done",
+        "render:c4": "done",
+        "assemble": "done",
+    }
+    assert FakeController.max_running > 1
+    assembler.assemble_incremental.assert_called_once_with(
+        output_name="final_cut.mp4", clips_dir=project.root / "renders/high-res"
+    )
+
+
+def test_failed_clip_blocks_assembly_and_rerun_resumes(project, registry, assembler):
+    plan = _plan(["c1", "c2", "c3"])
+    FakeController.failing = {"c2"}
+
+    status = PlanExecutor(
+        project=project, registry=registry, plan=plan, slots_per_device=2, controller_factory=FakeController
+    ).run()
+    assert status["render:c2"] == "failed"
+    assert status["assemble"] == "blocked"
+    assembler.assemble_incremental.assert_not_called()
+
+    # Interrupted/failed run: only the unfinished clip renders again, then the cut is assembled once
+    FakeController.failing = set()
+    FakeController.calls = []
+    status = PlanExecutor(
+        project=project, registry=registry, plan=plan, slots_per_device=2, controller_factory=FakeController
+    ).run()
+    assert FakeController.calls == ["c2"]
+    assert status == {"render:c1": "resumed", "render:c3": "resumed", "render:c2": "done", "assemble": "done"}
+    assembler.assemble_incremental.assert_called_once()
@@ -0,0 +1,245 @@
+import threading
+import time
+from dataclasses import dataclass
+
+import pytest
+from vtx_app.project.layout import Project
+from vtx_app.registry.db import Registry
+from vtx_app.render.farm import BrokerClient, FarmBroker, FarmWorker, serve_broker
+from vtx_app.render.telemetry import metrics_row
+from vtx_app.utils.timecode import now_iso
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "proj"
+    (root / "renders").mkdir(parents=True)
+    (root / "metadata.yaml").write_text("project_id: p1")
+    return Project(root=root)
+
+
+@pytest.fixture
+def broker_registry(tmp_path, project, make_registry):
+    reg = make_registry(tmp_path / "broker.db")
+    reg.upsert_project(project_id="p1", slug="proj", title="Proj", path=str(project.root), updated_at=now_iso())
+    return reg
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def _serve(broker):
+        server = serve_broker(broker, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return BrokerClient(f"http://127.0.0.1:{server.server_address[1]}", timeout=5)
+
+    yield _serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _fake_controller(seconds=0.0, rendered=None):
+    """Stands in for RenderController: writes the clip and records it in the worker's registry."""
+
+    @dataclass
+    class FakeController:
+        project: Project
+        registry: Registry
+        worker: object = None
+        device: str | None = None
+        timeout: float | None = None
+        cancel_event: threading.Event | None = None
+
+        def render_clip(self, *, clip_id, preset=None, output_dir=None, resolution_scale=1.0):
+            if self.cancel_event is not None:
+                self.cancel_event.wait(seconds)
+            out = (output_dir or self.project.root / "renders") / f"{clip_id}.mp4"
+            out.parent.mkdir(parents=True, exist_ok=True)
+            out.write_bytes(f"{clip_id}@{resolution_scale}".encode())
+            self.registry.add_render_metrics(
+                metrics_row(
+                    project_id="p1",
+                    clip_id=clip_id,
+                    preset=preset or "default",
+                    pipeline="distilled",
+                    render_hash=f"h-{clip_id}",
+                    created_at=now_iso(),
+                    wall_time=1.5,
+                    num_frames=49,
+                    width=512,
+                    height=320,
+                    output_path=out,
+                    sidecar={},
+                )
+            )
+            self.registry.upsert_clip(
+                project_id="p1",
+                clip_id=clip_id,
+                state="rendered",
+                output_path=str(out),
+                render_hash=f"h-{clip_id}",
+                updated_at=now_iso(),
+                last_error=None,
+            )
+            if rendered is not None:
+                rendered.append(clip_id)
+
+    return FakeController
+
+
+def test_workers_drain_queue_and_report_back(tmp_path, project, broker_registry, serve, make_registry):
+    broker = FarmBroker(broker_registry, lease_seconds=30)
+    assert broker.submit(project_id="p1", clip_ids=["c1", "c2", "c3"], output_dir="renders/farm", preset="final")
+    # Already queued: not queued twice
+    assert broker.submit(project_id="p1", clip_ids=["c1"]) == {}
+    assert broker_registry.get_clip(project_id="p1", clip_id="c2")["state"] == "queued"
+    client = serve(broker)
+
+    rendered: list[str] = []
+    workers = [
+        FarmWorker(
+            client=client,
+            registry=make_registry(tmp_path / f"worker{i}.db"),
+            worker_id=f"w{i}",
+            controller_factory=_fake_controller(0.05, rendered),
+        )
+        for i in range(2)
+    ]
+    threads = [threading.Thread(target=w.run, kwargs={"stop_when_idle": True}) for w in workers]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+
+    assert sorted(rendered) == ["c1", "c2", "c3"]
+    assert client.status()["counts"] == {"done": 3}
+    for cid in ("c1", "c2", "c3"):
+        clip = broker_registry.get_clip(project_id="p1", clip_id=cid)
+        assert clip["state"] == "rendered"
+        assert clip["render_hash"] == f"h-{cid}"
+        assert clip["output_path"] == str(project.root / "renders" / "farm" / f"{cid}.mp4")
+    metrics = broker_registry.list_render_metrics("p1")
+    assert sorted(m["clip_id"] for m in metrics) == ["c1", "c2", "c3"]
+    assert {m["preset"] for m in metrics} == {"final"}
+
+
+def test_expired_lease_is_requeued(tmp_path, project, broker_registry, serve, make_registry):
+    now = [1000.0]
+    broker = FarmBroker(broker_registry, lease_seconds=10, max_attempts=3, clock=lambda: now[0])
+    broker.submit(project_id="p1", clip_ids=["c1"])
+    client = serve(broker)
+
+    # A worker leases the clip and disappears
+    ghost = client.lease("ghost")
+    assert ghost["clip_id"] == "c1"
+    assert broker_registry.get_clip(project_id="p1", clip_id="c1")["state"] == "rendering"
+    assert client.lease("w1") is None
+
+    now[0] += 11
+    worker = FarmWorker(
+        client=client,
+        registry=make_registry(tmp_path / "worker.db"),
+        worker_id="w1",
+        controller_factory=_fake_controller(),
+    )
+    assert worker.run(stop_when_idle=True) == 1
+
+    (job,) = broker_registry.list_farm_jobs()
+    assert (job["state"], job["worker_id"], job["attempts"]) == ("done", "w1", 2)
+    assert broker_registry.get_clip(project_id="p1", clip_id="c1")["state"] == "rendered"
+    # The ghost's late report is dropped
+    assert not client.heartbeat(ghost["job_id"], "ghost")
+    assert not client.complete(ghost["job_id"], "ghost", state="rejected", error="late")
+    assert broker_registry.get_clip(project_id="p1", clip_id="c1")["state"] == "rendered"
+
+
+def test_heartbeats_keep_slow_render_leased(tmp_path, project, broker_registry, serve, make_registry):
+    broker = FarmBroker(broker_registry, lease_seconds=0.3)
+    broker.submit(project_id="p1", clip_ids=["c1"])
+    client = serve(broker)
+
+    worker = FarmWorker(
+        client=client,
+        registry=make_registry(tmp_path / "worker.db"),
+        worker_id="w1",
+        heartbeat_interval=0.05,
+        controller_factory=_fake_controller(1.0),
+    )
+    started = time.monotonic()
+    assert worker.run(max_jobs=1) == 1
+    assert time.monotonic() - started >= 1.0
+
+    (job,) = broker_registry.list_farm_jobs()
+    assert (job["state"], job["attempts"]) == ("done", 1)
+
+
+def test_lost_lease_cancels_render(tmp_path, project, broker_registry, serve, make_registry):
+    now = [1000.0]
+    broker = FarmBroker(broker_registry, lease_seconds=10, max_attempts=1, clock=lambda: now[0])
+    broker.submit(project_id="p1", clip_ids=["c1"])
+    client = serve(broker)
+
+    worker = FarmWorker(
+        client=client,
+        registry=make_registry(tmp_path / "worker.db"),
+        worker_id="w1",
+        heartbeat_interval=0.05,
+        controller_factory=_fake_controller(5.0),
+    )
+    job = client.lease("w1")
+    now[0] += 11
+    started = time.monotonic()
+    assert not worker.run_job(job)
+    assert time.monotonic() - started < 5.0
+
+    (row,) = broker_registry.list_farm_jobs()
+    assert row["state"] == "failed"
+    assert broker_registry.get_clip(project_id="p1", clip_id="c1")["state"] == "rejected"
+
+
+def test_worker_without_shared_storage_uploads_output(tmp_path, monkeypatch, serve, make_registry):
+    # The broker's project folder is not visible to the worker, which has its own copy by slug
+    broker_root = tmp_path / "broker" / "proj"
+    broker_root.mkdir(parents=True)
+    worker_root = tmp_path / "worker-projects" / "proj"
+    worker_root.mkdir(parents=True)
+    (worker_root / "metadata.yaml").write_text("project_id: p1")
+    monkeypatch.setenv("VTX_PROJECTS_ROOT", str(worker_root.parent))
+
+    broker_registry = make_registry(tmp_path / "broker.db")
+    broker_registry.upsert_project(project_id="p1", slug="proj", title="Proj", path=str(broker_root), updated_at="")
+    broker = FarmBroker(broker_registry, lease_seconds=30)
+    broker.submit(project_id="p1", clip_ids=["c1"], output_dir="renders/farm")
+    client = serve(broker)
+
+    worker = FarmWorker(
+        client=client,
+        registry=make_registry(tmp_path / "worker.db"),
+        worker_id="w1",
+        controller_factory=_fake_controller(),
+    )
+    assert worker.run(stop_when_idle=True) == 1
+
+    uploaded = broker_root / "renders" / "farm" / "c1.mp4"
+    assert uploaded.read_bytes() == (worker_root / "renders" / "farm" / "c1.mp4").read_bytes()
+    clip = broker_registry.get_clip(project_id="p1", clip_id="c1")
+    assert (clip["state"], clip["output_path"]) == ("rendered", str(uploaded))
+
+
+def test_upload_rejects_paths_outside_project_and_lost_leases(tmp_path, project, broker_registry, serve):
+    broker = FarmBroker(broker_registry, lease_seconds=30)
+    broker.submit(project_id="p1", clip_ids=["c1"])
+    client = serve(broker)
+    job = client.lease("w1")
+    src = tmp_path / "out.mp4"
+    src.write_bytes(b"video")
+
+    with pytest.raises(RuntimeError, match="escapes the project"):
+        client.upload(job["job_id"], "w1", "../outside.mp4", src)
+    assert not (tmp_path / "outside.mp4").exists()
+    assert not client.upload(job["job_id"], "someone-else", "renders/c1.mp4", src)
+    assert client.upload(job["job_id"], "w1", "renders/c1.mp4", src)
+    assert (project.root / "renders" / "c1.mp4").read_bytes() == b"video"
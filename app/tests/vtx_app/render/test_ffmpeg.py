@@ -1,6 +1,11 @@
+from pathlib import Path
 from unittest.mock import patch
 
 from vtx_app.render import ffmpeg
+from vtx_app.render.ffmpeg import StreamInfo
+
+FINAL = StreamInfo("h264", 1280, 720, "24/1", "yuv420p", "aac", 48000, 2)
+DRAFT = StreamInfo("h264", 768, 432, "12/1", "yuv420p")
 
 
 def test_concat_videos(tmp_path):
@@ -48,3 +53,60 @@ def test_extract_frame(tmp_path):
         assert "-ss" in cmd
         assert "5.0" in cmd
         assert str(img) in cmd
+
+
+def test_pick_target_prefers_majority_and_known_encoders():
+    assert ffmpeg.pick_target([DRAFT, FINAL, FINAL, None]) == FINAL
+    # Tie: earliest clip wins
+    assert ffmpeg.pick_target([DRAFT, FINAL]) == DRAFT
+    assert ffmpeg.pick_target([None]) is None
+    odd = StreamInfo("prores", 1280, 720, "24/1", "yuv422p10le", "pcm_s16le", 48000, 2)
+    target = ffmpeg.pick_target([odd])
+    assert (target.video_codec, target.audio_codec) == ("h264", "aac")
+
+
+def test_conform_video_matches_target_and_adds_silence(tmp_path):
+    with patch("subprocess.check_call", side_effect=lambda cmd: Path(cmd[-1]).touch()) as mock_run:
+        ffmpeg.conform_video(tmp_path / "draft.mp4", tmp_path / "c.ts", FINAL, source=DRAFT, threads=2)
+
+    cmd = mock_run.call_args[0][0]
+    vf = cmd[cmd.index("-vf") + 1]
+    assert "scale=1280:720" in vf and "fps=24/1" in vf and "format=yuv420p" in vf
+    assert "anullsrc=r=48000:cl=2c" in cmd
+    assert cmd[cmd.index("-c:v") + 1] == "libx264"
+    assert cmd[cmd.index("-c:a") + 1] == "aac"
+    assert cmd[cmd.index("-f", cmd.index("-c:v")) + 1] == "mpegts"
+
+
+def test_smart_concat_reencodes_only_mismatched(tmp_path):
+    inputs = [tmp_path / f"{i}.mp4" for i in range(4)]
+    infos = {inputs[0]: FINAL, inputs[1]: DRAFT, inputs[2]: FINAL, inputs[3]: FINAL}
+    out = tmp_path / "out.mp4"
+
+    def fake_ffmpeg(cmd):
+        if "-vf" in cmd:
+            Path(cmd[-1]).write_bytes(b"conformed")
+        else:
+            # The concat list: conforming clips as-is, the draft from the conform dir
+            listed = Path(cmd[cmd.index("-i") + 1]).read_text().splitlines()
+            assert listed[0].endswith("0.mp4'") and listed[2].endswith("2.mp4'")
+            assert ".conform-" in listed[1]
+
+    with (
+        patch("vtx_app.render.ffmpeg.probe_streams", side_effect=infos.get) as mock_probe,
+        patch("subprocess.check_call", side_effect=fake_ffmpeg) as mock_run,
+    ):
+        assert ffmpeg.smart_concat(inputs, out, jobs=2) == 1
+
+    assert mock_probe.call_count == 4
+    assert [("-vf" in c.args[0]) for c in mock_run.call_args_list] == [True, False]
+    assert mock_run.call_args_list[0].args[0][3] == str(inputs[1])
+    assert not list(tmp_path.glob(".conform-*"))
+
+    # All streams match: plain stream-copy concat
+    with (
+        patch("vtx_app.render.ffmpeg.probe_streams", return_value=FINAL),
+        patch("subprocess.check_call") as mock_run,
+    ):
+        assert ffmpeg.smart_concat(inputs, out) == 0
+    mock_run.assert_called_once()
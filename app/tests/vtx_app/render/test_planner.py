@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+
+from vtx_app.render.planner import (
+    ClipShape,
+    bucket_costs,
+    build_render_plan,
+    clip_shape,
+    snap_frames,
+    snap_size,
+)
+from vtx_app.utils.timecode import now_iso
+
+SETTINGS = SimpleNamespace(
+    default_pipeline="ti2vid_two_stages",
+    default_fps=24,
+    default_width=1536,
+    default_height=864,
+    ltx_max_frames=257,
+    frame_bucket=24,
+)
+
+
+def _clip(seconds=None, **render):
+    if seconds is not None:
+        render["duration"] = {"mode": "fixed", "seconds": seconds}
+    return {"render": render}
+
+
+def test_snapping_produces_pipeline_valid_shapes():
+    assert [snap_frames(n, 257) for n in (1, 5, 13, 60, 121)] == [9, 9, 17, 57, 121]
+    assert [snap_frames(n, 257, bucket=24) for n in (40, 60, 80, 1000)] == [49, 49, 73, 257]
+    assert snap_frames(400, 250) == 249
+    assert [snap_size(v) for v in (864, 830, 20, 1280)] == [896, 832, 64, 1280]
+
+
+def test_clip_shape_snaps_to_buckets():
+    shapes = [clip_shape(_clip(s), SETTINGS) for s in (2.1, 1.9, 2.4, 5.0)]
+    assert {(sh.num_frames, sh.height, sh.width) for sh in shapes} == {(49, 896, 1536), (121, 896, 1536)}
+    assert shapes[0].bucket == "ti2vid_two_stages/49x896x1536"
+
+    # Explicit frame counts are only made 8k+1
+    assert clip_shape(_clip(num_frames=100), SETTINGS).num_frames == 97
+    # Half resolution drafts stay exactly half of the (snapped) project size
+    draft = clip_shape(_clip(2.0), SETTINGS, resolution_scale=0.5)
+    assert (draft.width, draft.height) == (768, 448)
+    assert clip_shape(_clip(2.0), SETTINGS, preset="draft").width == 768
+    odd = clip_shape(_clip(2.0, width=1000, height=600), SETTINGS, resolution_scale=0.75)
+    assert (odd.width % 64, odd.height % 64) == (0, 0)
+    v2v = clip_shape(_clip(2.0, final_strategy="v2v"), SETTINGS, preset="final")
+    assert v2v.pipeline == "ic_lora"
+
+
+def test_half_size_draft_snaps_unless_rendered_as_stage_1():
+    hd = {"width": 1920, "height": 1080}
+    # ti2vid_two_stages renders the draft as stage 1 at 1920x1088, so it stays exactly half
+    staged = clip_shape(_clip(2.0, **hd), SETTINGS, resolution_scale=0.5)
+    assert (staged.width, staged.height) == (960, 544)
+    # Two-stage pipelines without --stage-1-only render the draft directly and need multiples of 64
+    distilled = clip_shape(_clip(2.0, pipeline="distilled", **hd), SETTINGS, resolution_scale=0.5)
+    assert (distilled.width, distilled.height) == (960, 576)
+    assert clip_shape(_clip(2.0, pipeline="distilled", **hd), SETTINGS, preset="draft").height == 576
+    # One-stage pipelines only need multiples of 32
+    one_stage = clip_shape(_clip(2.0, pipeline="ti2vid_one_stage", **hd), SETTINGS, resolution_scale=0.5)
+    assert (one_stage.width, one_stage.height) == (960, 544)
+
+
+def _shape(frames, height=704, width=1280, pipeline="distilled"):
+    return ClipShape(pipeline, frames, width, height, 24, frames / 24, width, height)
+
+
+def test_plan_queues_by_bucket_and_predicts_cost():
+    shapes = {"c1": _shape(49), "c2": _shape(121), "c3": _shape(49), "c4": _shape(121)}
+    plan = build_render_plan(project_id="p1", created_at=now_iso(), clip_ids=["c1", "c2", "c3", "c4"], shapes=shapes)
+
+    # Largest bucket first, shot order within a bucket; assembly still depends on every clip
+    assert [job.clip_id for job in plan.jobs[:-1]] == ["c2", "c4", "c1", "c3"]
+    assert sorted(plan.jobs[-1].deps) == ["render:c1", "render:c2", "render:c3", "render:c4"]
+
+    history = [
+        {
+            "pipeline": "distilled",
+            "num_frames": 121,
+            "width": 1280,
+            "height": 704,
+            "wall_time": 2 * 121 * 1280 * 704 / 1e6,
+        },
+        {"pipeline": "other", "num_frames": 9, "width": 64, "height": 64, "wall_time": 1000.0},
+        {"pipeline": "distilled", "num_frames": None, "width": None, "height": None, "wall_time": 5.0},
+    ]
+    costs = bucket_costs(plan, history)
+    assert [(c.bucket, c.clips) for c in costs] == [("distilled/121x704x1280", 2), ("distilled/49x704x1280", 2)]
+    assert costs[0].volume == 2 * shapes["c2"].volume
+    assert abs(costs[0].predicted_seconds - 2 * costs[0].volume) < 1e-6
+    assert bucket_costs(plan)[0].predicted_seconds is None
@@ -0,0 +1,98 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import yaml
+from vtx_app.project.layout import Project
+from vtx_app.render import review
+from vtx_app.utils.timecode import now_iso
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "proj"
+    (root / "prompts" / "clips").mkdir(parents=True)
+    (root / "renders" / "clips").mkdir(parents=True)
+    (root / "metadata.yaml").write_text("project_id: p1")
+    return Project(root=root)
+
+
+def _render(project, registry, cid, render_hash):
+    (project.root / "prompts" / "clips" / f"{cid}__shot.yaml").write_text(
+        yaml.safe_dump({"outputs": {"mp4": f"renders/clips/{cid}.mp4"}})
+    )
+    out = project.root / "renders" / "clips" / f"{cid}.mp4"
+    out.write_bytes(render_hash.encode())
+    registry.upsert_clip(
+        project_id="p1",
+        clip_id=cid,
+        state="rendered",
+        output_path=str(out),
+        render_hash=render_hash,
+        updated_at=now_iso(),
+        last_error=None,
+    )
+
+
+def _fake_assets(video_path, out_dir, frames):
+    for name in (review.POSTER_NAME, review.SHEET_NAME, review.PROXY_NAME):
+        (Path(out_dir) / name).parent.mkdir(parents=True, exist_ok=True)
+        (Path(out_dir) / name).write_bytes(b"asset")
+
+
+def test_sample_indices():
+    assert review.sample_indices(120, 4) == [15, 45, 75, 105]
+    assert review.sample_indices(3, 12) == [0, 1, 2]
+    assert review.sample_indices(0, 12) == []
+
+
+def test_build_review_assets_cached_by_render_hash(project, registry):
+    _render(project, registry, "c1", "aaa")
+    _render(project, registry, "c2", "bbb")
+
+    with (
+        patch("vtx_app.render.review.ProcessPoolExecutor", ThreadPoolExecutor),
+        patch("vtx_app.render.review.render_review_assets", side_effect=_fake_assets) as mock_render,
+    ):
+        assets = review.build_review_assets(project, registry, jobs=2)
+        assert mock_render.call_count == 2
+        assert [(a.clip_id, a.key) for a in assets] == [("c1", "aaa"), ("c2", "bbb")]
+        assert assets[0].poster == "renders/review/aaa/poster.jpg"
+
+        # Nothing re-rendered: nothing decoded
+        review.build_review_assets(project, registry)
+        assert mock_render.call_count == 2
+
+        _render(project, registry, "c2", "ccc")
+        review.build_review_assets(project, registry)
+        assert mock_render.call_count == 3
+        assert mock_render.call_args[0][1].endswith("ccc")
+
+    index = json.loads((review.review_dir(project.root) / "index.json").read_text())
+    assert index["c2"]["proxy"] == "renders/review/ccc/proxy.mp4"
+
+
+def test_render_review_assets_single_pass(tmp_path):
+    av = pytest.importorskip("av")
+    image = pytest.importorskip("PIL.Image")
+    np = pytest.importorskip("numpy")
+
+    video = tmp_path / "clip.mp4"
+    with av.open(str(video), mode="w") as container:
+        stream = container.add_stream("libx264", rate=24)
+        stream.width, stream.height, stream.pix_fmt = 128, 96, "yuv420p"
+        for i in range(24):
+            frame = av.VideoFrame.from_ndarray(np.full((96, 128, 3), i * 10, dtype=np.uint8), format="rgb24")
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode():
+            container.mux(packet)
+
+    out = tmp_path / "review"
+    review.render_review_assets(str(video), str(out), frames=6, columns=3)
+    assert image.open(out / review.POSTER_NAME).size == (128, 96)
+    assert image.open(out / review.SHEET_NAME).size == (3 * 128, 2 * 96)
+    with av.open(str(out / review.PROXY_NAME)) as proxy:
+        assert proxy.streams.video[0].codec_context.height == 96
@@ -0,0 +1,307 @@
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+import yaml
+from vtx_app.pipelines import runner_subprocess
+from vtx_app.pipelines.base import PipelineCommand, device_env
+from vtx_app.pipelines.runner_subprocess import JobCancelled, run
+from vtx_app.project.layout import Project
+from vtx_app.render.scheduler import RenderScheduler, parse_devices, resume_unfinished
+from vtx_app.story.prompt_compiler import PromptPack
+
+
+@pytest.fixture
+def project():
+    proj = MagicMock()
+    proj.load_metadata.return_value = {"project_id": "p1"}
+    return proj
+
+
+def _states(registry):
+    rows = registry.conn.execute("SELECT clip_id, state FROM clips").fetchall()
+    return dict(rows)
+
+
+class FakeController:
+    """Stands in for RenderController; records calls and runs a per-test hook."""
+
+    calls: list = []
+    hook = None
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+    def render_clip(self, *, clip_id, **render_kwargs):
+        FakeController.calls.append((clip_id, self.kwargs["device"], render_kwargs))
+        if FakeController.hook:
+            FakeController.hook(clip_id, self.kwargs)
+
+
+@pytest.fixture(autouse=True)
+def reset_fake():
+    FakeController.calls = []
+    FakeController.hook = None
+
+
+def test_parse_devices():
+    assert parse_devices("") == [None]
+    assert parse_devices(None) == [None]
+    assert parse_devices("0, cuda:1,cpu") == ["cuda:0", "cuda:1", "cpu"]
+
+
+def test_device_env():
+    assert device_env(None) == {}
+    assert device_env("cpu") == {"CUDA_VISIBLE_DEVICES": ""}
+    assert device_env("cuda:2") == {"CUDA_VISIBLE_DEVICES": "2"}
+
+
+def test_runs_clips_concurrently_across_slots(registry, project):
+    # Both clips must be inside render_clip at the same time to pass the barrier.
+    barrier = threading.Barrier(2, timeout=5)
+    FakeController.hook = lambda clip_id, kwargs: barrier.wait()
+
+    with RenderScheduler(
+        project=project,
+        registry=registry,
+        devices=["cpu"],
+        slots_per_device=2,
+        controller_factory=FakeController,
+    ) as scheduler:
+        jobs = scheduler.run_all(["c1", "c2"], preset="final")
+
+    assert {j.state for j in jobs.values()} == {"done"}
+    assert sorted(FakeController.calls) == [("c1", "cpu", {"preset": "final"}), ("c2", "cpu", {"preset": "final"})]
+
+
+def test_slots_per_device(registry, project):
+    scheduler = RenderScheduler(
+        project=project,
+        registry=registry,
+        devices=["cuda:0", "cuda:1"],
+        slots_per_device=2,
+        use_worker=True,
+    )
+    assert [s.device for s in scheduler.slots] == ["cuda:0", "cuda:0", "cuda:1", "cuda:1"]
+    assert scheduler.slots[2].worker.env == {"CUDA_VISIBLE_DEVICES": "1"}
+    assert scheduler._queue.maxsize == 8
+    scheduler.close()
+
+
+def test_cancel_queued_job(registry, project):
+    started = threading.Event()
+    release = threading.Event()
+
+    def hook(clip_id, kwargs):
+        if clip_id == "c1":
+            started.set()
+            release.wait(5)
+
+    FakeController.hook = hook
+    with RenderScheduler(
+        project=project, registry=registry, slots_per_device=1, controller_factory=FakeController
+    ) as scheduler:
+        scheduler.submit("c1")
+        started.wait(5)
+        job2 = scheduler.submit("c2")
+        assert _states(registry)["c2"] == "queued"
+        assert scheduler.cancel("c2")
+        release.set()
+        scheduler.join()
+
+    assert job2.state == "cancelled"
+    assert [c[0] for c in FakeController.calls] == ["c1"]
+    assert _states(registry)["c2"] == "cancelled"
+
+
+def test_failed_job_is_rejected(registry, project):
+    def hook(clip_id, kwargs):
+        raise FileNotFoundError(f"No clip spec found for {clip_id}")
+
+    FakeController.hook = hook
+    with RenderScheduler(project=project, registry=registry, controller_factory=FakeController) as scheduler:
+        jobs = scheduler.run_all(["c1"])
+
+    assert jobs["c1"].state == "failed"
+    row = registry.conn.execute("SELECT state, last_error FROM clips WHERE clip_id='c1'").fetchone()
+    assert row == ("rejected", "No clip spec found for c1")
+
+
+def test_controller_receives_timeout_and_cancel(registry, project):
+    seen = {}
+    FakeController.hook = lambda clip_id, kwargs: seen.update(kwargs)
+    with RenderScheduler(
+        project=project, registry=registry, timeout=30, controller_factory=FakeController
+    ) as scheduler:
+        job = scheduler.run_all(["c1"])["c1"]
+
+    assert seen["timeout"] == 30
+    assert seen["cancel_event"] is job.cancel_event
+
+
+def _sleep_command(seconds):
+    # `python -m timeit` runs the statement once; stands in for a long pipeline run.
+    return PipelineCommand(
+        module="timeit", args=["-n", "1", "-r", "1", f"import time; time.sleep({seconds})"], output_path=Path("x")
+    )
+
+
+@pytest.fixture
+def fast_poll(monkeypatch):
+    monkeypatch.setattr(runner_subprocess, "_POLL_INTERVAL", 0.05)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX process handling")
+def test_run_timeout_kills_process(fast_poll):
+    with pytest.raises(subprocess.TimeoutExpired):
+        run(_sleep_command(30), timeout=0.5)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX process handling")
+def test_run_cancel_kills_process(fast_poll):
+    cancel = threading.Event()
+    threading.Timer(0.3, cancel.set).start()
+    with pytest.raises(JobCancelled):
+        run(_sleep_command(30), cancel=cancel)
+
+
+def test_on_done_runs_for_successful_jobs(registry, project):
+    def hook(clip_id, kwargs):
+        if clip_id == "bad":
+            raise RuntimeError("boom")
+
+    FakeController.hook = hook
+    done = []
+    with RenderScheduler(
+        project=project,
+        registry=registry,
+        controller_factory=FakeController,
+        on_done=lambda job: done.append(job.clip_id),
+    ) as scheduler:
+        scheduler.run_all(["ok", "bad"])
+    assert done == ["ok"]
+
+
+def test_render_recorded_as_rejected_is_not_done(registry, project):
+    # Without fail_fast RenderController records the failure and returns instead of raising
+    def hook(clip_id, kwargs):
+        if clip_id == "bad":
+            kwargs["registry"].set_clip_state(
+                project_id="p1", clip_id=clip_id, state="rejected", updated_at="t", last_error="pipeline crashed"
+            )
+
+    FakeController.hook = hook
+    done = []
+    with RenderScheduler(
+        project=project,
+        registry=registry,
+        controller_factory=FakeController,
+        on_done=lambda job: done.append(job.clip_id),
+    ) as scheduler:
+        jobs = scheduler.run_all(["ok", "bad"])
+
+    assert jobs["ok"].state == "done"
+    assert jobs["bad"].state == "failed"
+    assert jobs["bad"].error == "pipeline crashed"
+    assert done == ["ok"]
+
+
+@patch("vtx_app.render.renderer.ModelDownloader")
+@patch("vtx_app.render.renderer.validate_clip_spec")
+@patch("vtx_app.render.renderer.detect_capabilities")
+@patch("vtx_app.render.renderer.compile_prompt")
+@patch("vtx_app.render.renderer.run")
+def test_unchanged_clip_is_not_rerendered_without_cache(
+    mock_run, mock_compile, mock_cap, mock_val, mock_dl, tmp_path, monkeypatch, registry
+):
+    monkeypatch.setenv("VTX_APP_HOME", str(tmp_path / "home"))
+    monkeypatch.setenv("VTX_RENDER_CACHE_MAX_GB", "0")
+    mock_cap.return_value = MagicMock(flags={"--prompt", "--output-path"})
+    mock_compile.return_value = PromptPack(positive="a cat", negative="")
+    mock_run.side_effect = lambda cmd, **kwargs: cmd.output_path.write_bytes(b"video")
+
+    root = tmp_path / "proj"
+    (root / "prompts" / "clips").mkdir(parents=True)
+    (root / "metadata.yaml").write_text("project_id: p1")
+    spec = {"clip_id": "c1", "prompt": {"positive": "a cat"}, "outputs": {"mp4": "renders/c1.mp4"}}
+    (root / "prompts" / "clips" / "c1.yaml").write_text(yaml.safe_dump(spec))
+
+    for _ in range(2):
+        with RenderScheduler(project=Project(root=root), registry=registry) as scheduler:
+            jobs = scheduler.run_all(["c1"])
+        assert jobs["c1"].state == "done"
+    assert mock_run.call_count == 1
+    assert _states(registry)["c1"] == "rendered"
+
+
+def test_queued_and_cancelled_jobs_keep_rendered_clips(registry, project):
+    started = threading.Event()
+    release = threading.Event()
+
+    def hook(clip_id, kwargs):
+        if clip_id == "c1":
+            started.set()
+            release.wait(5)
+
+    FakeController.hook = hook
+    registry.upsert_clip(
+        project_id="p1",
+        clip_id="c2",
+        state="rendered",
+        output_path="out.mp4",
+        render_hash="h",
+        updated_at="t",
+        last_error=None,
+    )
+    with RenderScheduler(
+        project=project, registry=registry, slots_per_device=1, controller_factory=FakeController
+    ) as scheduler:
+        scheduler.submit("c1")
+        started.wait(5)
+        scheduler.submit("c2")
+        assert _states(registry)["c2"] == "rendered"
+        assert scheduler.cancel("c2")
+        release.set()
+        scheduler.join()
+
+    # Resume must not pick up a clip that was rendered before the cancelled run
+    assert _states(registry)["c2"] == "rendered"
+    assert registry.get_clip(project_id="p1", clip_id="c2")["render_hash"] == "h"
+
+
+def test_resume_runs_each_projects_clips_concurrently(registry, tmp_path):
+    for pid in ("p1", "p2"):
+        (tmp_path / pid).mkdir()
+        (tmp_path / pid / "metadata.yaml").write_text(f"project_id: {pid}")
+        registry.upsert_project(project_id=pid, slug=pid, title=pid, path=str(tmp_path / pid), updated_at="t")
+        for cid in ("c1", "c2", "c3"):
+            registry.set_clip_state(project_id=pid, clip_id=cid, state="planned", updated_at=f"{pid}-{cid}")
+    # All of a project's resumed clips must be inside render_clip at once to pass the barrier
+    barrier = threading.Barrier(3, timeout=5)
+    FakeController.hook = lambda clip_id, kwargs: barrier.wait()
+    roots = []
+
+    def scheduler_factory(proj, reg, **options):
+        roots.append(proj.root.name)
+        return RenderScheduler(project=proj, registry=reg, slots_per_device=3, **options)
+
+    jobs = resume_unfinished(
+        registry, scheduler_factory=scheduler_factory, controller_factory=FakeController, max_jobs=6
+    )
+    assert roots == ["p1", "p2"]
+    assert [job.state for job in jobs] == ["done"] * 6
+
+    # max_jobs caps how many clips are resumed, not how many run at once
+    FakeController.calls = []
+    FakeController.hook = None
+    for pid in ("p1", "p2"):
+        for cid in ("c1", "c2", "c3"):
+            state = "cancelled" if pid == "p1" and cid != "c3" else "rendered"
+            registry.set_clip_state(project_id=pid, clip_id=cid, state=state, updated_at=f"{pid}-{cid}")
+    jobs = resume_unfinished(
+        registry, scheduler_factory=scheduler_factory, controller_factory=FakeController, max_jobs=1
+    )
+    assert [c[0] for c in FakeController.calls] == ["c1"]
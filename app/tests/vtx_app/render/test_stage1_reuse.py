@@ -0,0 +1,108 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import yaml
+from vtx_app.project.layout import Project
+from vtx_app.render.renderer import RenderController, stage_1_state_path
+from vtx_app.story.prompt_compiler import PromptPack
+
+TWO_STAGE_FLAGS = {
+    "--prompt",
+    "--output-path",
+    "--width",
+    "--height",
+    "--stage-1-only",
+    "--save-stage-1",
+    "--resume-from-stage-1",
+}
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.setenv("VTX_APP_HOME", str(tmp_path / "home"))
+    # Resumed and from-scratch finals share a render hash; keep the cache out of the way
+    monkeypatch.setenv("VTX_RENDER_CACHE_MAX_GB", "0")
+    root = tmp_path / "proj"
+    (root / "prompts" / "clips").mkdir(parents=True)
+    (root / "metadata.yaml").write_text("project_id: p1")
+    return Project(root=root)
+
+
+def _write_clip(project, approved=False):
+    spec = {
+        "clip_id": "c1",
+        "prompt": {"positive": "a cat"},
+        "render": {"width": 1280, "height": 704, "approved": approved},
+        "outputs": {"mp4": "renders/clips/c1.mp4"},
+    }
+    (project.root / "prompts" / "clips" / "c1.yaml").write_text(yaml.safe_dump(spec))
+
+
+def _flag(args, name):
+    return args[args.index(name) + 1] if name in args else None
+
+
+@pytest.fixture
+def mock_run():
+    def fake_run(cmd, **kwargs):
+        cmd.output_path.parent.mkdir(parents=True, exist_ok=True)
+        cmd.output_path.write_bytes(b"video")
+        state = _flag(cmd.args, "--save-stage-1")
+        if state:
+            with open(state, "wb") as f:
+                f.write(b"latents")
+
+    with (
+        patch("vtx_app.render.renderer.ModelDownloader"),
+        patch("vtx_app.render.renderer.validate_clip_spec"),
+        patch("vtx_app.render.renderer.detect_capabilities", return_value=MagicMock(flags=TWO_STAGE_FLAGS)),
+        patch(
+            "vtx_app.render.renderer.compile_prompt",
+            return_value=PromptPack(positive="a cat", negative=""),
+        ),
+        patch("vtx_app.render.renderer.run", side_effect=fake_run) as run,
+    ):
+        yield run
+
+
+def test_draft_saves_stage_1_and_approved_final_resumes(project, registry, mock_run):
+    _write_clip(project)
+    controller = RenderController(project=project, registry=registry)
+    low_res = project.root / "renders" / "low-res"
+
+    controller.render_clip(clip_id="c1", resolution_scale=0.5, output_dir=low_res)
+    draft_args = mock_run.call_args.args[0].args
+    # Stage 1 only at the target size is exactly the half resolution draft
+    assert "--stage-1-only" in draft_args
+    assert (_flag(draft_args, "--width"), _flag(draft_args, "--height")) == ("1280", "704")
+    state = stage_1_state_path(low_res / "c1.mp4")
+    assert _flag(draft_args, "--save-stage-1") == str(state)
+    assert state.exists()
+
+    # Not approved yet: the final renders from scratch
+    high_res = project.root / "renders" / "high-res"
+    controller.render_clip(clip_id="c1", preset="final", output_dir=high_res)
+    final_args = mock_run.call_args.args[0].args
+    assert "--resume-from-stage-1" not in final_args
+    assert "--stage-1-only" not in final_args
+
+    _write_clip(project, approved=True)
+    (high_res / "c1.mp4").unlink()
+    controller.render_clip(clip_id="c1", preset="final", output_dir=high_res)
+    final_args = mock_run.call_args.args[0].args
+    assert _flag(final_args, "--resume-from-stage-1") == str(state)
+    assert "--save-stage-1" not in final_args
+
+
+def test_draft_rerenders_when_latents_are_missing(project, registry, mock_run):
+    _write_clip(project)
+    controller = RenderController(project=project, registry=registry)
+    low_res = project.root / "renders" / "low-res"
+
+    controller.render_clip(clip_id="c1", resolution_scale=0.5, output_dir=low_res)
+    controller.render_clip(clip_id="c1", resolution_scale=0.5, output_dir=low_res)
+    assert mock_run.call_count == 1
+
+    stage_1_state_path(low_res / "c1.mp4").unlink()
+    controller.render_clip(clip_id="c1", resolution_scale=0.5, output_dir=low_res)
+    assert mock_run.call_count == 2
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from unittest.mock import patch
 
 import pytest
@@ -7,13 +8,14 @@ import yaml
 from typer.testing import CliRunner
 from vtx_app.cli import app
 from vtx_app.project.loader import Project
+from vtx_app.render.status import collect_status
 
 runner = CliRunner()
 
 
 @pytest.fixture
-def mock_registry_load():
-    with patch("vtx_app.cli.Registry.load") as mock:
+def mock_registry_load(registry):
+    with patch("vtx_app.cli.Registry.load", return_value=registry) as mock:
         yield mock
 
 
@@ -27,6 +29,7 @@ def test_render_status(tmp_path, mock_registry_load, mock_project_loader):
     # Setup project structure
     proj_dir = tmp_path / "test_project"
     proj_dir.mkdir()
+    (proj_dir / "metadata.yaml").write_text("project_id: p1")
     clips_dir = proj_dir / "prompts" / "clips"
     clips_dir.mkdir(parents=True)
 
@@ -56,3 +59,71 @@ def test_render_status(tmp_path, mock_registry_load, mock_project_loader):
         assert "Pending" in result.stdout
         assert "clip_03" in result.stdout
         # Rich table formatting might separate columns, but the text should be there.
+
+
+def test_collect_status_reads_registry_and_scans_once(tmp_path, registry):
+    reg = registry
+    root = tmp_path / "proj"
+    clips_dir = root / "prompts" / "clips"
+    clips_dir.mkdir(parents=True)
+    (root / "metadata.yaml").write_text("project_id: p1")
+    renders = root / "renders" / "clips"
+    renders.mkdir(parents=True)
+    for cid in ("c1", "c2", "c3", "c4"):
+        (clips_dir / f"{cid}__shot.yaml").write_text(yaml.safe_dump({"outputs": {"mp4": f"renders/clips/{cid}.mp4"}}))
+    (renders / "c1.mp4").write_bytes(b"x" * 2048)
+
+    def record(cid, state, error=None):
+        reg.upsert_clip(
+            project_id="p1",
+            clip_id=cid,
+            state=state,
+            output_path=str(renders / f"{cid}.mp4"),
+            render_hash=f"hash-{cid}",
+            updated_at="2026-01-01T00:00:00Z",
+            last_error=error,
+        )
+
+    record("c1", "rendered")
+    record("c2", "rendered")  # output deleted since
+    record("c3", "rejected", "OOM")
+    reg.add_render_metrics(
+        {"project_id": "p1", "clip_id": "c1", "preset": "default", "pipeline": "p"}
+        | {
+            "created_at": "2026-01-01T00:00:00Z",
+            "wall_time": 42.0,
+        }
+    )
+
+    project = Project(root=root)
+    collect_status(project, reg)  # index the specs
+    with (
+        patch("vtx_app.project.index._parse") as parse,
+        patch("vtx_app.render.status.os.scandir", side_effect=os.scandir) as scandir,
+    ):
+        clips = {c.clip_id: c for c in collect_status(project, reg)}
+    parse.assert_not_called()
+    # One pass over the specs (index refresh) and one over the output directory
+    assert sorted(str(c.args[0]) for c in scandir.call_args_list) == sorted([str(clips_dir), str(renders)])
+
+    assert clips["c1"].state == "done"
+    assert (clips["c1"].size, clips["c1"].render_time, clips["c1"].render_hash) == (2048, 42.0, "hash-c1")
+    assert clips["c2"].state == "missing"
+    assert (clips["c3"].state, clips["c3"].error) == ("failed", "OOM")
+    assert clips["c4"].state == "pending"
+    assert clips["c4"].output == "renders/clips/c4.mp4"
+
+
+def test_render_status_watch(tmp_path, mock_registry_load, mock_project_loader):
+    proj_dir = tmp_path / "test_project"
+    (proj_dir / "prompts" / "clips").mkdir(parents=True)
+    (proj_dir / "metadata.yaml").write_text("project_id: p1")
+    (proj_dir / "prompts" / "clips" / "clip_01.yaml").write_text(yaml.safe_dump({"outputs": {"mp4": "r/c.mp4"}}))
+    mock_project_loader.return_value.load.return_value = Project(root=proj_dir)
+
+    with patch("vtx_app.cli.time.sleep", side_effect=[None, KeyboardInterrupt]) as sleep:
+        result = runner.invoke(app, ["render", "status", "test_project", "--watch", "--interval", "0.5"])
+    assert result.exit_code == 0
+    assert "clip_01" in result.stdout
+    assert "1 pending" in result.stdout
+    sleep.assert_called_with(0.5)
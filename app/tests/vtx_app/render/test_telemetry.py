@@ -0,0 +1,116 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+import yaml
+from vtx_app.project.layout import Project
+from vtx_app.render.renderer import RenderController
+from vtx_app.render.telemetry import metrics_row, read_sidecar, summarize
+from vtx_app.story.prompt_compiler import PromptPack
+
+SIDECAR = {
+    "version": 1,
+    "wall_time": 95.0,
+    "stages": {"model_load": 10.0, "text_encode": 2.0, "stage_1_denoise": 60.0, "stage_2_denoise": 15.0, "mux": 3.0},
+    "steps": {"stage_1_denoise": 40, "stage_2_denoise": 3},
+    "peak_rss_bytes": 8 * 1024**3,
+    "peak_gpu_bytes": 20 * 1024**3,
+    "output_bytes": 1000,
+}
+
+
+def _row(output_path, wall_time, sidecar=SIDECAR, preset="final"):
+    return metrics_row(
+        project_id="p1",
+        clip_id="c1",
+        preset=preset,
+        pipeline="ti2vid_two_stages",
+        render_hash="h",
+        created_at="2026-01-01T00:00:00",
+        wall_time=wall_time,
+        num_frames=100,
+        width=1280,
+        height=704,
+        output_path=output_path,
+        sidecar=sidecar,
+    )
+
+
+def test_metrics_row_from_sidecar(tmp_path):
+    out = tmp_path / "out.mp4"
+    out.write_bytes(b"12345")
+    row = _row(out, 100.0)
+    assert row["steps"] == 43
+    assert row["denoise_time"] == 75.0
+    assert row["peak_gpu_bytes"] == 20 * 1024**3
+    assert row["output_bytes"] == 1000
+    assert json.loads(row["stages_json"])["mux"] == 3.0
+
+    # No sidecar: only what the app measured itself
+    bare = _row(out, 1.0, sidecar={})
+    assert bare["steps"] is None
+    assert bare["stages_json"] is None
+    assert bare["output_bytes"] == 5
+
+
+def test_read_sidecar_tolerates_missing_and_invalid(tmp_path):
+    assert read_sidecar(tmp_path / "none.json") == {}
+    bad = tmp_path / "bad.json"
+    bad.write_text("{not json")
+    assert read_sidecar(bad) == {}
+
+
+def test_summarize_groups_and_aggregates(tmp_path):
+    out = tmp_path / "missing.mp4"
+    rows = [
+        _row(out, 100.0),
+        _row(out, 200.0),
+        _row(out, 10.0, sidecar={}, preset="draft"),
+    ]
+    summary = summarize(rows)
+    assert [(g["preset"], g["renders"]) for g in summary] == [("draft", 1), ("final", 2)]
+
+    final = summary[1]
+    assert final["wall_mean"] == 150.0
+    assert final["wall_p95"] == 200.0
+    assert final["sec_per_frame"] == 1.5
+    assert final["steps_per_sec"] == pytest.approx(86 / 150)
+    assert list(final["stages"]) == ["model_load", "text_encode", "stage_1_denoise", "stage_2_denoise", "mux"]
+    assert summary[0]["steps_per_sec"] is None
+
+
+@patch("vtx_app.render.renderer.ModelDownloader")
+@patch("vtx_app.render.renderer.validate_clip_spec")
+@patch("vtx_app.render.renderer.detect_capabilities")
+@patch("vtx_app.render.renderer.compile_prompt")
+@patch("vtx_app.render.renderer.run")
+def test_render_records_pipeline_metrics(
+    mock_run, mock_compile, mock_cap, mock_val, mock_dl, tmp_path, monkeypatch, registry
+):
+    monkeypatch.setenv("VTX_APP_HOME", str(tmp_path / "home"))
+    root = tmp_path / "proj"
+    (root / "prompts" / "clips").mkdir(parents=True)
+    (root / "metadata.yaml").write_text("project_id: p1")
+    spec = {"clip_id": "c1", "prompt": {"positive": "a cat"}, "outputs": {"mp4": "renders/c1.mp4"}}
+    (root / "prompts" / "clips" / "c1.yaml").write_text(yaml.safe_dump(spec))
+
+    mock_cap.return_value = MagicMock(flags={"--prompt", "--output-path", "--metrics-path"})
+    mock_compile.return_value = PromptPack(positive="a cat", negative="")
+
+    def fake_run(cmd, **kwargs):
+        cmd.output_path.write_bytes(b"video")
+        sidecar = cmd.args[cmd.args.index("--metrics-path") + 1]
+        with open(sidecar, "w") as f:
+            json.dump(SIDECAR, f)
+
+    mock_run.side_effect = fake_run
+
+    RenderController(project=Project(root=root), registry=registry).render_clip(clip_id="c1", preset="final")
+
+    (row,) = registry.list_render_metrics("p1")
+    assert row["clip_id"] == "c1"
+    assert row["preset"] == "final"
+    assert row["pipeline"] == "ti2vid_two_stages"
+    assert row["steps"] == 43
+    assert row["wall_time"] >= 0
+    assert (root / "renders" / "c1.metrics.json").exists()
@@ -1,3 +1,8 @@
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch
 
 import pytest
@@ -118,3 +123,112 @@ def test_generate_clip_specs_overwrite(project):
         assert new_file.exists()
         content = yaml.safe_load(new_file.read_text())
         assert content["clip_id"] == "A01_S01_SH001"
+
+
+class _StubOpenAI(ThreadingHTTPServer):
+    """Chat completions endpoint answering one clip per requested shot, with a rate limit on the first call."""
+
+    daemon_threads = True
+
+    def __init__(self, scenes):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.scenes = scenes
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            first = server.requests == 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            if first:
+                self._send(429, {"error": {"message": "slow down"}}, {"retry-after": "0"})
+                return
+            cid = re.search(r'"clip_id": "(\w+)"', request["messages"][1]["content"]).group(1)
+            # Later scenes answer first, so completion order is the reverse of shotlist order
+            time.sleep(0.05 * (server.scenes - int(cid[-1])))
+            content = json.dumps({"version": 1, "clips": [{"clip_id": cid, "title": "shot"}]})
+            self._send(
+                200,
+                {
+                    "id": "chatcmpl-1",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": request["model"],
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                },
+            )
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+@pytest.fixture
+def stub_openai(tmp_path, monkeypatch):
+    server = _StubOpenAI(scenes=8)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("VTX_OPENAI_CONCURRENCY", "4")
+    monkeypatch.setenv("VTX_OPENAI_MAX_RETRIES", "2")
+    monkeypatch.setenv("VTX_APP_HOME", str(tmp_path / "home"))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_generate_clip_specs_concurrent_against_stub_server(project, stub_openai):
+    clip_ids = [f"A01_S{i:02d}_SH00{i}" for i in range(1, 9)]
+    shotlist = {"scenes": [{"act": 1, "scene": i, "shots": [{"clip_id": cid}]} for i, cid in enumerate(clip_ids, 1)]}
+    (project.root / "story" / "04_shotlist.yaml").write_text(yaml.safe_dump(shotlist))
+
+    StoryBuilder(project=project).generate_clip_specs()
+
+    files = [project.root / "prompts" / "clips" / f"{cid}__shot.yaml" for cid in clip_ids]
+    assert all(f.exists() for f in files)
+    # Requests overlapped, and the rate-limited one was retried
+    assert stub_openai.max_in_flight > 1
+    assert stub_openai.requests == len(clip_ids) + 1
+    # Written in shotlist order even though later scenes completed first
+    mtimes = [f.stat().st_mtime_ns for f in files]
+    assert mtimes == sorted(mtimes)
+
+    # Re-running (e.g. resuming after a crash) replays the cached responses without calling the API
+    for f in files:
+        f.unlink()
+    StoryBuilder(project=project).generate_clip_specs()
+    assert all(f.exists() for f in files)
+    assert stub_openai.requests == len(clip_ids) + 1
+
+    # An explicit overwrite asks the model again, and stores the fresh responses
+    StoryBuilder(project=project).generate_clip_specs(overwrite=True)
+    assert stub_openai.requests == 2 * len(clip_ids) + 1
+    StoryBuilder(project=project).generate_clip_specs(overwrite=False)
+    assert stub_openai.requests == 2 * len(clip_ids) + 1
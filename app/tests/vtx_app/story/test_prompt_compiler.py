@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from unittest.mock import patch
+
 import pytest
 import yaml
 from vtx_app.story.prompt_compiler import compile_prompt
@@ -105,3 +107,18 @@ def test_compile_bad_continuity_keys(mock_project):
     assert "- missing_char" in pack.positive
     # Moon has empty desc, so just "- moon" wait code says: if desc: ... else: lines.append(f"- {k}")
     assert "- moon" in pack.positive
+
+
+def test_compile_parses_bible_once_and_sees_edits(mock_project):
+    clip_spec = {"continuity": {"characters": ["hero"]}, "prompt": {"positive": "Shot."}}
+    with patch("vtx_app.utils.yaml_cache.yaml.safe_load", side_effect=yaml.safe_load) as parse:
+        for _ in range(5):
+            compile_prompt(project_root=mock_project, clip_spec=clip_spec)
+        # style bible, characters, locations
+        assert parse.call_count == 3
+
+        chars = mock_project / "prompts" / "characters.yaml"
+        chars.write_text(yaml.safe_dump({"characters": {"hero": {"description": "A tired hero."}}}))
+        pack = compile_prompt(project_root=mock_project, clip_spec=clip_spec)
+        assert parse.call_count == 4
+    assert "- hero: A tired hero." in pack.positive
@@ -8,6 +8,8 @@ import pytest
 import yaml
 from typer.testing import CliRunner
 from vtx_app.cli import app
+from vtx_app.render.planner import ClipShape
+from vtx_app.render.status import ClipStatus
 
 runner = CliRunner()
 
@@ -16,6 +18,11 @@ runner = CliRunner()
 class MockSettingsData:
     projects_root: Path = Path("/tmp/projects")
     models_root: Path = Path("/tmp/models")
+    render_worker: bool = False
+    render_devices: str = ""
+    render_slots_per_device: int = 1
+    render_job_timeout: float = 0.0
+    fail_fast: bool = False
 
 
 @pytest.fixture
@@ -47,6 +54,8 @@ def mock_deps():
             patch("vtx_app.cli.Assembler", MockAssembler),
             patch("vtx_app.cli.Director", MockDirector),
             patch("vtx_app.cli.ProposalGenerator", MockProposalGen),
+            # Clip specs live on a patched filesystem here; batches keep file order
+            patch("vtx_app.cli.project_shapes", return_value={}) as MockShapes,
         ):
             reg = MockRegistrySource.load.return_value
             loader = MockLoaderSource.return_value
@@ -61,6 +70,7 @@ def mock_deps():
             # Setup Settings to behave like dataclass for asdict()
             settings_obj = MockSettingsData()
             MockSettingsSource.from_env.return_value = settings_obj
+            proj.settings.return_value = settings_obj
 
             yield {
                 "reg": reg,
@@ -71,6 +81,7 @@ def mock_deps():
                 "assembler": MockAssembler.return_value,
                 "style_mgr": MockStyleMgr.return_value,
                 "proposal_gen": MockProposalGen.return_value,
+                "shapes": MockShapes,
                 "director": MockDirector.return_value,
                 "settings": settings_obj,
                 "load_env": MockLoadEnvSource,
@@ -183,6 +194,28 @@ def test_render_reviews(mock_deps):
         )
 
 
+def test_render_full_queues_clips_by_shape_bucket(mock_deps):
+    mock_deps["reg"].list_render_metrics.return_value = []
+    mock_deps["shapes"].return_value = {
+        "c1": ClipShape("distilled", 97, 1280, 704, 24, 4.0, 1280, 704),
+        "c2": ClipShape("distilled", 257, 1280, 704, 24, 10.0, 1280, 704),
+        "c3": ClipShape("distilled", 97, 1280, 704, 24, 4.0, 1280, 704),
+    }
+    files = [Path(f"{cid}.yaml") for cid in ("c1", "c2", "c3")]
+
+    with (
+        patch("pathlib.Path.exists", return_value=True),
+        patch("pathlib.Path.glob", return_value=files),
+        patch("pathlib.Path.mkdir"),
+    ):
+        result = runner.invoke(app, ["render-full", "slug"])
+    assert result.exit_code == 0
+    # Largest bucket first, file order within a bucket
+    order = [c.kwargs["clip_id"] for c in mock_deps["renderer"].render_clip.call_args_list]
+    assert order == ["c2", "c1", "c3"]
+    assert "Shape buckets" in result.stdout
+
+
 def test_render_review(mock_deps):
     result = runner.invoke(app, ["render-review", "slug", "c1"])
     assert result.exit_code == 0
@@ -387,6 +420,14 @@ def test_story_commands(mock_deps):
         getattr(mock_deps["builder"], method).assert_called()
 
 
+def test_story_refresh_skips_llm_cache(mock_deps):
+    with patch("vtx_app.cli.StoryBuilder") as builder_cls:
+        result = runner.invoke(app, ["story", "outline", "slug", "--refresh"])
+    assert result.exit_code == 0
+    builder_cls.assert_called_once_with(project=mock_deps["project"], refresh=True)
+    builder_cls.return_value.generate_outline.assert_called_once()
+
+
 def test_story_clips(mock_deps):
     result = runner.invoke(app, ["story", "clips", "slug", "--overwrite"])
     assert result.exit_code == 0
@@ -397,23 +438,60 @@ def test_story_clips(mock_deps):
 
 
 def test_render_status(mock_deps):
-    proj = mock_deps["project"]
-    proj.root = Path("/tmp/proj")
-
+    clips = [ClipStatus(clip_id="clip1", state="done", output="renders/c1.mp4", size=2048, render_time=12.5)]
     with (
-        patch("pathlib.Path.exists") as mock_exists,
-        patch("pathlib.Path.glob") as mock_glob,
-        patch("pathlib.Path.read_text"),
+        patch("pathlib.Path.exists", return_value=True),
+        patch("vtx_app.cli.collect_status", return_value=clips) as mock_collect,
     ):
-        mock_exists.return_value = True
-        p = MagicMock()
-        p.stem = "clip1"
-        p.read_text.return_value = "outputs: {mp4: 'renders/c1.mp4'}"
-        mock_glob.return_value = [p]
-
         result = runner.invoke(app, ["render", "status", "slug"])
+    assert result.exit_code == 0
+    assert "clip1" in result.stdout
+    assert "1 done" in result.stdout
+    mock_collect.assert_called_once_with(mock_deps["project"], mock_deps["reg"])
+
+
+def test_render_stats(mock_deps):
+    reg = mock_deps["reg"]
+    mock_deps["project"].load_metadata.return_value = {"project_id": "p1"}
+    reg.list_projects.return_value = [{"project_id": "p1", "slug": "slug"}]
+    reg.list_render_metrics.return_value = [
+        {
+            "project_id": "p1",
+            "clip_id": "c1",
+            "preset": "final",
+            "pipeline": "ti2vid_two_stages",
+            "wall_time": 120.0,
+            "num_frames": 121,
+            "steps": 43,
+            "denoise_time": 86.0,
+            "stages_json": '{"stage_1_denoise": 80.0, "mux": 2.0}',
+        }
+    ]
+
+    result = runner.invoke(app, ["render", "stats", "slug", "--stages"])
+    assert result.exit_code == 0
+    reg.list_render_metrics.assert_called_once_with("p1")
+    assert "ti2vid_two_stages" in result.stdout
+    assert "80.0s" in result.stdout
+    assert "stage_1_denoise" in result.stdout
+
+
+def test_models_prefetch(mock_deps):
+    with (
+        patch("vtx_app.cli.ModelDownloader") as MockDownloader,
+        patch("vtx_app.cli.resolve_project_models", return_value={"LTX_CHECKPOINT_PATH": None}) as mock_resolve,
+    ):
+        prefetch = MockDownloader.return_value.prefetch
+        prefetch.return_value = {"LTX_CHECKPOINT_PATH": "downloaded"}
+        result = runner.invoke(app, ["models", "prefetch", "slug", "--jobs", "2"])
         assert result.exit_code == 0
-        assert "clip1" in result.stdout
+        mock_resolve.assert_called_once_with(mock_deps["project"].root)
+        prefetch.assert_called_once_with({"LTX_CHECKPOINT_PATH": None}, jobs=2, verify=False)
+        assert "downloaded" in result.stdout
+
+        prefetch.return_value = {"LTX_CHECKPOINT_PATH": "failed: boom"}
+        result = runner.invoke(app, ["models", "prefetch", "slug"])
+        assert result.exit_code == 1
 
 
 def test_render_clip(mock_deps):
@@ -444,9 +522,18 @@ def test_render_approve(mock_deps):
 
 
 def test_render_resume(mock_deps):
-    result = runner.invoke(app, ["render", "resume"])
+    with patch("vtx_app.cli.resume_unfinished") as resume:
+        result = runner.invoke(app, ["render", "resume", "--max-jobs", "3", "--slots", "2"])
     assert result.exit_code == 0
-    mock_deps["renderer"].resume.assert_called()
+    resume.assert_called_once_with(
+        mock_deps["reg"],
+        max_jobs=3,
+        worker=None,
+        devices=None,
+        slots=2,
+        timeout=None,
+        controller_factory=ANY,
+    )
 
 
 def test_render_assemble_cmd(mock_deps):
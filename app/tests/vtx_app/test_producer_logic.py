@@ -5,6 +5,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 from vtx_app.producer import Director
 from vtx_app.project.loader import Project
+from vtx_app.render.planner import RenderPlan
 
 
 @pytest.fixture
@@ -54,7 +55,10 @@ def test_director_produce_flow(mock_project):
         builder_instance.generate_shotlist.assert_called_once()
         builder_instance.generate_clip_specs.assert_called_once()
 
-        # Verify render script generation
+        # Verify render plan (clips -> assemble) and the script running it
+        plan = RenderPlan.load(mock_project.root / "render_plan.json")
+        assert [job.id for job in plan.jobs] == ["render:clip_01", "assemble"]
+        assert plan.jobs[1].deps == ["render:clip_01"]
         script = mock_project.root / "render_all.sh"
         assert script.exists()
-        assert "vtx render assemble" in script.read_text()
+        assert "vtx render run-plan test_project" in script.read_text()
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+from unittest.mock import patch
+
 import pytest
+import yaml
 from typer.testing import CliRunner
 from vtx_app.config.settings import Settings
 from vtx_app.tags_commands import tags_app
@@ -132,3 +135,15 @@ def test_cli_update(mock_settings, tag_manager):
     result = runner.invoke(tags_app, ["update-desc", "g", "missing", "new"])
     assert result.exit_code == 0
     assert "not found" in result.stdout
+
+
+def test_process_prompt_parses_each_tag_once(tag_manager):
+    tag_manager.save_tag("style", "noir", {"prompt": "black and white"})
+    with patch("vtx_app.utils.yaml_cache.yaml.safe_load", side_effect=yaml.safe_load) as parse:
+        for _ in range(3):
+            assert tag_manager.process_prompt("[style_noir], [style_noir]") == "black and white, black and white"
+        assert parse.call_count == 1
+
+        tag_manager.save_tag("style", "noir", {"prompt": "high contrast noir"})
+        assert tag_manager.process_prompt("[style_noir]") == "high contrast noir"
+        assert parse.call_count == 2
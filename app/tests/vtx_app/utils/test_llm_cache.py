@@ -0,0 +1,58 @@
+import json
+import os
+import time
+
+from vtx_app.utils.llm_cache import LLMCache
+
+SCHEMA = {"type": "object", "properties": {"title": {"type": "string"}}}
+MESSAGES = [{"role": "user", "content": "Idea: a cat"}]
+
+
+def _key(**overrides):
+    kwargs = {"model": "gpt", "temperature": 0.4, "schema": SCHEMA, "messages": MESSAGES, **overrides}
+    return LLMCache.key(**kwargs)
+
+
+def test_key_covers_model_temperature_schema_and_messages():
+    key = _key()
+    assert key == _key()
+    assert key != _key(model="gpt-mini")
+    assert key != _key(temperature=0.7)
+    assert key != _key(schema={"type": "object"})
+    assert key != _key(messages=[{"role": "user", "content": "Idea: a dog"}])
+
+
+def test_roundtrip_and_disabled(tmp_path):
+    cache = LLMCache(root=tmp_path, max_bytes=1024**2)
+    assert cache.get(_key()) is None
+    cache.put(_key(), {"title": "Cat"})
+    assert cache.get(_key()) == {"title": "Cat"}
+
+    off = LLMCache(root=tmp_path, max_bytes=0)
+    assert off.get(_key()) is None
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = LLMCache(root=tmp_path, max_bytes=1024**2, ttl_seconds=60)
+    cache.put(_key(), {"title": "Cat"})
+    path = cache.entry_path(_key())
+    entry = json.loads(path.read_text())
+    path.write_text(json.dumps({**entry, "created_at": entry["created_at"] - 61}))
+    assert cache.get(_key()) is None
+    assert not path.exists()
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = LLMCache(root=tmp_path, max_bytes=1024**2)
+    keys = [_key(model=f"m{i}") for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, {"title": "x" * 100})
+        os.utime(cache.entry_path(key), (time.time() - 100 + i, time.time() - 100 + i))
+    # Reading the oldest entry makes it the most recently used
+    assert cache.get(keys[0]) is not None
+
+    cache.max_bytes = sum(cache.entry_path(k).stat().st_size for k in (keys[0], keys[2]))
+    removed = cache.evict()
+    assert removed == [cache.entry_path(keys[1])]
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
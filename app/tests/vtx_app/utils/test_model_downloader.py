@@ -0,0 +1,141 @@
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+import yaml
+from vtx_app.utils.model_downloader import (
+    SHARED_MODEL_ENVS,
+    ModelDownloader,
+    ModelManifest,
+    ModelSpec,
+    resolve_project_models,
+)
+
+PAYLOAD = bytes(range(256)) * 4096  # 1 MiB
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves PAYLOAD with Range support and records the Range headers it saw."""
+
+    ranges: list = []
+
+    def do_GET(self):
+        rng = self.headers.get("Range")
+        _Handler.ranges.append(rng)
+        start = int(rng.split("=")[1].rstrip("-")) if rng else 0
+        body = PAYLOAD[start:]
+        self.send_response(206 if rng else 200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.ranges = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}/model.safetensors"
+    httpd.shutdown()
+
+
+@pytest.fixture
+def downloader(tmp_path):
+    return ModelDownloader(MagicMock(), manifest=ModelManifest(tmp_path / "manifest.json"))
+
+
+def _spec(url, sha256=hashlib.sha256(PAYLOAD).hexdigest(), env="TEST_MODEL"):
+    return ModelSpec(env_var_name=env, url=url, sha256=sha256, filename="model.safetensors")
+
+
+def test_download_hashes_while_streaming_and_records_manifest(server, downloader, tmp_path):
+    dest = tmp_path / "models" / "model.safetensors"
+    downloader._download_and_verify(_spec(server), dest)
+
+    assert dest.read_bytes() == PAYLOAD
+    assert not (tmp_path / "models" / "model.safetensors.part").exists()
+    assert downloader.manifest.lookup(dest) == hashlib.sha256(PAYLOAD).hexdigest()
+
+    # Any change to the file invalidates the entry
+    dest.write_bytes(b"tampered")
+    assert downloader.manifest.lookup(dest) is None
+
+
+def test_download_resumes_from_partial_file(server, downloader, tmp_path):
+    dest = tmp_path / "model.safetensors"
+    (tmp_path / "model.safetensors.part").write_bytes(PAYLOAD[:1000])
+
+    downloader._download_and_verify(_spec(server), dest)
+
+    assert _Handler.ranges == ["bytes=1000-"]
+    assert dest.read_bytes() == PAYLOAD
+
+
+def test_hash_mismatch_discards_partial(server, downloader, tmp_path):
+    dest = tmp_path / "model.safetensors"
+    with pytest.raises(ValueError, match="Hash mismatch"):
+        downloader._download_and_verify(_spec(server, sha256="0" * 64), dest)
+    assert not dest.exists()
+    assert not (tmp_path / "model.safetensors.part").exists()
+
+
+def test_prefetch_reports_per_model_status(server, downloader, tmp_path, monkeypatch):
+    present = tmp_path / "present.safetensors"
+    present.write_bytes(b"weights")
+    monkeypatch.setenv("A_MODEL", str(tmp_path / "a.safetensors"))
+    monkeypatch.setenv("B_MODEL", str(tmp_path / "b.safetensors"))
+    monkeypatch.setenv("PRESENT_MODEL", str(present))
+    monkeypatch.setenv("NO_SPEC_MODEL", str(tmp_path / "nowhere.safetensors"))
+    monkeypatch.delenv("UNSET_MODEL", raising=False)
+
+    results = downloader.prefetch(
+        {
+            "A_MODEL": _spec(server, env="A_MODEL"),
+            "B_MODEL": _spec(server, env="B_MODEL"),
+            "PRESENT_MODEL": None,
+            "NO_SPEC_MODEL": None,
+            "UNSET_MODEL": None,
+        },
+        jobs=2,
+        verify=True,
+    )
+
+    assert results["A_MODEL"] == results["B_MODEL"] == "downloaded"
+    assert results["PRESENT_MODEL"] == "verified"
+    assert results["NO_SPEC_MODEL"].startswith("failed")
+    assert results["UNSET_MODEL"] == "unset"
+    assert (tmp_path / "b.safetensors").read_bytes() == PAYLOAD
+    # Recorded digests make the next check a stat()
+    assert downloader.manifest.lookup(present) == hashlib.sha256(b"weights").hexdigest()
+
+
+def test_resolve_project_models(tmp_path, monkeypatch):
+    monkeypatch.setenv("STYLE_LORA", str(tmp_path / "style.safetensors"))
+    clips = tmp_path / "prompts" / "clips"
+    clips.mkdir(parents=True)
+    (clips / "A01.yaml").write_text(yaml.safe_dump({"loras": [{"env": "CLIP_LORA", "weight": 0.5}]}))
+    (clips / "A02.yaml").write_text(yaml.safe_dump({"render": {"final_strategy": "v2v"}}))
+    (tmp_path / "prompts" / "loras.yaml").write_text(
+        yaml.safe_dump(
+            {
+                "bundles": {
+                    "core": [{"env": "LTX_DISTILLED_LORA_PATH", "weight": 0.8}],
+                    "style": [{"env": "STYLE_LORA", "download_url": "http://dl/1"}, {"name": "candidate only"}],
+                }
+            }
+        )
+    )
+
+    models = resolve_project_models(tmp_path)
+
+    assert list(models)[: len(SHARED_MODEL_ENVS)] == list(SHARED_MODEL_ENVS)
+    assert {"CLIP_LORA", "LTX_IC_LORA_PATH", "STYLE_LORA"} <= set(models)
+    assert models["STYLE_LORA"].url == "http://dl/1"
+    assert models["STYLE_LORA"].filename == "style.safetensors"
+    assert models["LTX_DISTILLED_LORA_PATH"] is None
@@ -12,6 +12,9 @@ def mock_settings(tmp_path):
     class MockSettings:
         openai_model = "gpt-model"
         app_home = tmp_path
+        llm_cache_dir = None
+        llm_cache_max_mb = 1
+        llm_cache_ttl_hours = 0
 
     return MockSettings()
 
@@ -46,6 +49,22 @@ def test_analyze_concept_success(generator):
         assert call_kwargs["response_format"]["json_schema"]["name"] == "proposal_metadata"
 
 
+def test_analyze_concept_replays_cached_response(generator):
+    mock_resp = MagicMock()
+    mock_resp.choices[0].message.content = json.dumps({"title": "My Movie"})
+
+    with patch("vtx_app.wizards.proposal.OpenAI") as MockOpenAI:
+        mock_client = MockOpenAI.return_value
+        mock_client.chat.completions.create.return_value = mock_resp
+
+        assert generator.analyze_concept("Input text") == {"title": "My Movie"}
+        assert generator.analyze_concept("Input text") == {"title": "My Movie"}
+        assert mock_client.chat.completions.create.call_count == 1
+
+        generator.analyze_concept("Other text")
+        assert mock_client.chat.completions.create.call_count == 2
+
+
 def test_analyze_concept_failure_openai(generator):
     with patch("vtx_app.wizards.proposal.OpenAI") as MockOpenAI:
         mock_client = MockOpenAI.return_value